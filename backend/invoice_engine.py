@@ -0,0 +1,118 @@
+"""
+Invoice Template Engine for BidVex
+Jinja2 layer behind the invoice_templates_* modules:
+- Templates live in templates/invoices/ and are compiled once per language at
+  import. Translations and asset URLs ([[ ... ]]) are baked into each
+  language's source before compilation, so a render does no string lookups;
+  only translations with arguments go through tf() at render time
+- The logo and stylesheets are shared files under templates/invoices/static,
+  referenced by file:// URL instead of being inlined into every document
+- Document data is HTML-escaped; translations are trusted markup
+
+Usage:
+    from invoice_engine import render_invoice
+
+    html = render_invoice("lots_won", "fr", data=data, hammer_total=1250.0, ...)
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from jinja2 import BaseLoader, Environment, FileSystemLoader, StrictUndefined
+from markupsafe import Markup
+
+from invoice_translations import TRANSLATIONS
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates" / "invoices"
+STATIC_DIR = TEMPLATE_DIR / "static"
+
+LANGUAGES = ("en", "fr")
+DOCUMENTS = ("lots_won", "payment_letter", "seller_statement", "seller_receipt", "commission_invoice")
+
+
+def static_url(name: str) -> str:
+    path = STATIC_DIR / name
+    if not path.exists():
+        raise FileNotFoundError(f"Invoice asset missing: {path}")
+    return path.as_uri()
+
+
+def translations_for(lang: str) -> Dict[str, str]:
+    """Same fallback as get_translation: requested language, then English, then the key"""
+    return {key: text.get(lang, text.get("en", key)) for key, text in TRANSLATIONS.items()}
+
+
+def _money(value: float) -> str:
+    return f"{value:.2f}"
+
+
+def _longdate(value: datetime) -> str:
+    return value.strftime('%B %d, %Y')
+
+
+# Pass 1 ([[ ]], [% %]): resolved once per language when a template is compiled
+_source_env = Environment(
+    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+    variable_start_string="[[",
+    variable_end_string="]]",
+    block_start_string="[%",
+    block_end_string="%]",
+    comment_start_string="[#",
+    comment_end_string="#]",
+    undefined=StrictUndefined,
+    keep_trailing_newline=True,
+)
+
+
+class _LanguageLoader(BaseLoader):
+    """Serves template source with one language's translations already substituted"""
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        self.strings = translations_for(lang)
+
+    def get_source(self, environment, template):
+        _, filename, _ = _source_env.loader.get_source(_source_env, template)
+        source = _source_env.get_template(template).render(t=self.strings, lang=self.lang, static=static_url)
+        return source, filename, lambda: True
+
+
+def _translator(strings: Dict[str, str]) -> Callable[..., Markup]:
+    def tf(key: str, *args) -> Markup:
+        # Markup.format escapes the arguments (titles, names) but not the translation
+        return Markup(strings.get(key, key)).format(*args)
+    return tf
+
+
+def _build_environment(lang: str) -> Environment:
+    loader = _LanguageLoader(lang)
+    env = Environment(loader=loader, autoescape=True, undefined=StrictUndefined, auto_reload=False)
+    env.filters["money"] = _money
+    env.filters["longdate"] = _longdate
+    env.globals["tf"] = _translator(loader.strings)
+    return env
+
+
+_environments = {lang: _build_environment(lang) for lang in LANGUAGES}
+_compiled = {
+    (document, lang): _environments[lang].get_template(f"{document}.html.j2")
+    for document in DOCUMENTS
+    for lang in LANGUAGES
+}
+
+
+def platform_details() -> Dict[str, str]:
+    return {
+        "legal_name": os.environ.get('PLATFORM_LEGAL_NAME', 'BidVex Inc.'),
+        "gst_number": os.environ.get('PLATFORM_GST_NUMBER', 'Pending Registration'),
+        "qst_number": os.environ.get('PLATFORM_QST_NUMBER', 'Pending Registration'),
+    }
+
+
+def render_invoice(document: str, lang: str = "en", **context: Any) -> str:
+    """Render a precompiled document template; unknown languages fall back to English"""
+    template = _compiled.get((document, lang)) or _compiled[(document, "en")]
+    now = datetime.now()
+    return template.render(today=now, year=now.year, platform=platform_details(), **context)
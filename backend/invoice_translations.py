@@ -131,6 +131,10 @@ TRANSLATIONS = {
         "en": "Payment Deadline",
         "fr": "Date limite de paiement"
     },
+    "within_3_business_days": {
+        "en": "Within 3 business days",
+        "fr": "Dans les 3 jours ouvrables"
+    },
     "pickup_information": {
         "en": "PICKUP INFORMATION",
         "fr": "INFORMATIONS DE RAMASSAGE"
@@ -10,9 +10,13 @@ Handles auction lifecycle management including:
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
-from uuid import uuid4
 import logging
 
+from services import marketplace_index
+from services.auction_timer import get_auction_timer
+from services.auction_close import close_due, close_ended_auctions
+from services.bson_dates import to_datetime
+
 logger = logging.getLogger(__name__)
 
 auctions_router = APIRouter(prefix="/auctions", tags=["Auctions"])
@@ -46,276 +50,43 @@ def get_notification_manager():
 async def process_ended_auctions():
     """
     Background task to process all auctions that have ended.
-    This is called by the scheduler every minute.
+    Fired by the auction timer as closes come due, with the scheduler poll as
+    a safety net; overlapping runs are safe (see services.auction_close).
     
-    For each ended auction:
-    1. Determine the winner (highest bidder)
-    2. Update auction status to 'ended'
-    3. Create automated handshake conversation
-    4. Send push notifications
-    5. Update seller analytics
+    For each batch of ended auctions:
+    1. Claim the batch (status -> 'closing')
+    2. Determine the winners (highest bidders) in one aggregation
+    3. Update statuses to 'ended' / 'sold' in bulk
+    4. Create automated handshake conversations
+    5. Create notifications and send push notifications
     """
-    from routes.messages import create_auction_won_conversation
-    
     db = get_db()
-    now = datetime.now(timezone.utc)
-    now_str = now.isoformat()
-    
-    processed_count = 0
     
     try:
-        # ========== PROCESS SINGLE-ITEM LISTINGS ==========
-        ended_listings = await db.listings.find({
-            "status": "active",
-            "auction_end_date": {"$lte": now_str}
-        }).to_list(100)
-        
-        for listing in ended_listings:
-            try:
-                listing_id = listing["id"]
-                seller_id = listing["seller_id"]
-                
-                # Get highest bid
-                highest_bid = await db.bids.find_one(
-                    {"listing_id": listing_id},
-                    sort=[("amount", -1)]
-                )
-                
-                if highest_bid:
-                    winner_id = highest_bid["bidder_id"]
-                    final_price = highest_bid["amount"]
-                    
-                    # Update listing status
-                    await db.listings.update_one(
-                        {"id": listing_id},
-                        {"$set": {
-                            "status": "ended",
-                            "winner_id": winner_id,
-                            "final_price": final_price,
-                            "ended_at": now_str
-                        }}
-                    )
-                    
-                    # Create automated handshake conversation
-                    conversation_id = await create_auction_won_conversation(
-                        db=db,
-                        listing_id=listing_id,
-                        seller_id=seller_id,
-                        winner_id=winner_id,
-                        final_price=final_price,
-                        item_title=listing.get("title", "Unknown Item")
-                    )
-                    
-                    if conversation_id:
-                        logger.info(f"✅ Created handshake for listing {listing_id}, winner: {winner_id}")
-                    
-                    # Send push notification to winner
-                    try:
-                        notification_manager = get_notification_manager()
-                        await notification_manager.send_to_user(winner_id, {
-                            "type": "AUCTION_WON",
-                            "title": "🎉 Congratulations! You Won!",
-                            "message": f"You won the auction for {listing.get('title')} at ${final_price:.2f}",
-                            "listing_id": listing_id,
-                            "conversation_id": conversation_id,
-                            "final_price": final_price
-                        })
-                        
-                        # Also notify seller
-                        await notification_manager.send_to_user(seller_id, {
-                            "type": "AUCTION_SOLD",
-                            "title": "💰 Item Sold!",
-                            "message": f"Your item {listing.get('title')} sold for ${final_price:.2f}",
-                            "listing_id": listing_id,
-                            "winner_id": winner_id,
-                            "final_price": final_price
-                        })
-                    except Exception as e:
-                        logger.warning(f"Could not send push notification: {e}")
-                    
-                    # Create notification records in database
-                    await db.notifications.insert_many([
-                        {
-                            "id": str(uuid4()),
-                            "user_id": winner_id,
-                            "type": "auction_won",
-                            "title": "🎉 Congratulations! You Won!",
-                            "message": f"You won the auction for {listing.get('title')} at ${final_price:.2f}",
-                            "listing_id": listing_id,
-                            "read": False,
-                            "created_at": now_str
-                        },
-                        {
-                            "id": str(uuid4()),
-                            "user_id": seller_id,
-                            "type": "auction_sold",
-                            "title": "💰 Item Sold!",
-                            "message": f"Your item {listing.get('title')} sold for ${final_price:.2f}",
-                            "listing_id": listing_id,
-                            "read": False,
-                            "created_at": now_str
-                        }
-                    ])
-                    
-                    processed_count += 1
-                    
-                else:
-                    # No bids - auction ended without winner
-                    await db.listings.update_one(
-                        {"id": listing_id},
-                        {"$set": {
-                            "status": "ended_no_bids",
-                            "ended_at": now_str
-                        }}
-                    )
-                    
-                    # Notify seller
-                    await db.notifications.insert_one({
-                        "id": str(uuid4()),
-                        "user_id": seller_id,
-                        "type": "auction_ended_no_bids",
-                        "title": "Auction Ended",
-                        "message": f"Your auction for {listing.get('title')} ended without any bids.",
-                        "listing_id": listing_id,
-                        "read": False,
-                        "created_at": now_str
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error processing ended listing {listing.get('id')}: {e}")
-        
-        # ========== PROCESS MULTI-ITEM AUCTION LOTS ==========
-        # Check for individual lots that have ended
-        ended_lots = await db.lots.find({
-            "lot_status": "active",
-            "auction_end_date": {"$lte": now_str}
-        }).to_list(500)
-        
-        for lot in ended_lots:
-            try:
-                lot_id = lot["id"]
-                auction_id = lot["auction_id"]
-                
-                # Get auction details
-                auction = await db.multi_item_listings.find_one({"id": auction_id}, {"_id": 0})
-                if not auction:
-                    continue
-                
-                seller_id = auction["seller_id"]
-                
-                # Get highest bid for this lot
-                highest_bid = await db.lot_bids.find_one(
-                    {"lot_id": lot_id},
-                    sort=[("amount", -1)]
-                )
-                
-                if highest_bid:
-                    winner_id = highest_bid["bidder_id"]
-                    final_price = highest_bid["amount"]
-                    
-                    # Update lot status
-                    await db.lots.update_one(
-                        {"id": lot_id},
-                        {"$set": {
-                            "lot_status": "sold",
-                            "winner_id": winner_id,
-                            "final_price": final_price,
-                            "ended_at": now_str
-                        }}
-                    )
-                    
-                    # Create automated handshake
-                    lot_title = f"{auction.get('title')} - Lot #{lot.get('lot_number', '')}"
-                    conversation_id = await create_auction_won_conversation(
-                        db=db,
-                        listing_id=lot_id,
-                        seller_id=seller_id,
-                        winner_id=winner_id,
-                        final_price=final_price,
-                        item_title=lot_title
-                    )
-                    
-                    if conversation_id:
-                        logger.info(f"✅ Created handshake for lot {lot_id}, winner: {winner_id}")
-                    
-                    # Create notifications
-                    await db.notifications.insert_many([
-                        {
-                            "id": str(uuid4()),
-                            "user_id": winner_id,
-                            "type": "lot_won",
-                            "title": "🎉 You Won a Lot!",
-                            "message": f"You won {lot_title} at ${final_price:.2f}",
-                            "lot_id": lot_id,
-                            "auction_id": auction_id,
-                            "read": False,
-                            "created_at": now_str
-                        },
-                        {
-                            "id": str(uuid4()),
-                            "user_id": seller_id,
-                            "type": "lot_sold",
-                            "title": "💰 Lot Sold!",
-                            "message": f"{lot_title} sold for ${final_price:.2f}",
-                            "lot_id": lot_id,
-                            "read": False,
-                            "created_at": now_str
-                        }
-                    ])
-                    
-                    processed_count += 1
-                    
-                else:
-                    # No bids on lot
-                    await db.lots.update_one(
-                        {"id": lot_id},
-                        {"$set": {
-                            "lot_status": "ended_no_bids",
-                            "ended_at": now_str
-                        }}
-                    )
-                    
-            except Exception as e:
-                logger.error(f"Error processing ended lot {lot.get('id')}: {e}")
-        
-        # ========== UPDATE MULTI-ITEM AUCTION STATUS ==========
-        # Check if all lots in an auction have ended
-        active_auctions = await db.multi_item_listings.find({
-            "status": "active"
-        }).to_list(100)
-        
-        for auction in active_auctions:
-            auction_id = auction["id"]
-            
-            # First check if lots are in separate collection
-            active_lots_count = await db.lots.count_documents({
-                "auction_id": auction_id,
-                "lot_status": "active"
-            })
-            
-            # If no separate lots exist, check embedded lots array
-            if active_lots_count == 0:
-                embedded_lots = auction.get("lots", [])
-                active_lots_count = sum(1 for lot in embedded_lots if lot.get("lot_status") == "active")
-            
-            if active_lots_count == 0:
-                # All lots have ended - close the auction
-                await db.multi_item_listings.update_one(
-                    {"id": auction_id},
-                    {"$set": {
-                        "status": "ended",
-                        "ended_at": now_str
-                    }}
-                )
-                logger.info(f"✅ Auction {auction_id} fully ended - all lots processed")
-        
-        if processed_count > 0:
-            logger.info(f"✅ Processed {processed_count} ended auctions/lots")
+        summary = await close_ended_auctions(db, get_notification_manager())
+        if summary["listings"] or summary["lots"]:
+            logger.info(f"✅ Processed {summary['listings']} ended listing(s) and {summary['lots']} ended lot(s)")
             
     except Exception as e:
         logger.error(f"❌ Error in process_ended_auctions: {e}")
 
 
+async def process_due_closes(keys):
+    """
+    Close only the listings and lot documents whose auction timer keys came due.
+    Same pipeline as process_ended_auctions, scoped to those ids.
+    """
+    db = get_db()
+    
+    try:
+        summary = await close_due(db, get_notification_manager(), keys)
+        if summary["listings"] or summary["lots"]:
+            logger.info(f"✅ Closed {summary['listings']} listing(s) and {summary['lots']} lot(s) on time")
+            
+    except Exception as e:
+        logger.error(f"❌ Error in process_due_closes: {e}")
+
+
 # ========== MANUAL TRIGGER ENDPOINT ==========
 @auctions_router.post("/process-ended")
 async def trigger_process_ended(background_tasks: BackgroundTasks):
@@ -385,17 +156,19 @@ async def extend_auction(auction_id: str, data: Dict[str, Any]):
     # Update listing
     listing = await db.listings.find_one({"id": auction_id})
     if listing:
-        current_end = datetime.fromisoformat(listing["auction_end_date"])
+        current_end = to_datetime(listing["auction_end_date"])
         new_end = current_end + timedelta(minutes=extension_minutes)
         
         await db.listings.update_one(
             {"id": auction_id},
             {"$set": {
-                "auction_end_date": new_end.isoformat(),
+                "auction_end_date": new_end,
                 "extended": True,
                 "extension_reason": reason
             }}
         )
+        await marketplace_index.sync_listing(db, auction_id)
+        await get_auction_timer(db).schedule(("listing", auction_id), new_end)
         
         return {
             "status": "extended",
@@ -406,17 +179,18 @@ async def extend_auction(auction_id: str, data: Dict[str, Any]):
     # Check lots
     lot = await db.lots.find_one({"id": auction_id})
     if lot:
-        current_end = datetime.fromisoformat(lot["auction_end_date"])
+        current_end = to_datetime(lot["auction_end_date"])
         new_end = current_end + timedelta(minutes=extension_minutes)
         
         await db.lots.update_one(
             {"id": auction_id},
             {"$set": {
-                "auction_end_date": new_end.isoformat(),
+                "auction_end_date": new_end,
                 "extended": True,
                 "extension_reason": reason
             }}
         )
+        await get_auction_timer(db).schedule(("lot_doc", auction_id), new_end)
         
         return {
             "status": "extended",
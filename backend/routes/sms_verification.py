@@ -17,6 +17,8 @@ import os
 import logging
 import re
 
+from services.auth_cache import get_auth_cache
+
 logger = logging.getLogger(__name__)
 
 sms_router = APIRouter(prefix="/sms", tags=["SMS Verification"])
@@ -338,6 +340,8 @@ async def verify_otp(request: VerifyOTPRequest, req: Request):
                         "phone_verified_at": datetime.now(timezone.utc).isoformat()
                     }}
                 )
+                # phone_verified gates bidding/selling - drop the cached User now
+                await get_auth_cache().invalidate_user(request.user_id)
                 
                 # Log to admin logs
                 await db.admin_logs.insert_one({
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Header, status, WebSocket, WebSocketDisconnect, Query, UploadFile, File, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response, Header, status, WebSocket, WebSocketDisconnect, Query, UploadFile, File, Form
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import json
 from dotenv import load_dotenv
@@ -16,6 +16,28 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from services.email_service import get_email_service
 from services.sms_notification_service import get_sms_notification_service
+from services import marketplace_index
+from services.bid_engine import get_bid_engine, BidRejected, check_bidder, BID_GRACE_PERIOD
+from services.realtime_backplane import get_backplane
+from services.metrics import get_metrics
+from services.ws_outbound import OutboundQueue, bid_status_targets, coalesce_key_for, status_frames
+from services.config_cache import get_config_cache
+from services.auth_cache import get_auth_cache
+from services.auction_timer import get_auction_timer
+from services.notification_outbox import get_notification_outbox, register_default_channels, outbox_entry
+from services.pdf_renderer import get_pdf_renderer, RenderError, RenderQueueFull
+from services.pdf_cache import get_pdf_cache, etag_matches, CachedPDF
+from services.increment_schedule import SCHEDULES, schedule_for, minimum_increment, next_valid_bids
+from services.proxy_bidding import get_proxy_bidding
+from services.pagination import fetch_page, merge_pages, InvalidCursor
+from services import search_index
+from services.bson_dates import CLIENT_OPTIONS, date_range, to_datetime
+from services.fast_response import ModelShape, dumps as fast_dumps
+from services.blob_storage import (
+    get_blob_storage, upload_chunks, store_documents, decode_document, parse_range, message_blob_access,
+    BlobTooLarge, RangeNotSatisfiable, DOCUMENT_TYPES
+)
+from services import seller_stats
 import os
 import logging
 import uuid
@@ -46,9 +68,19 @@ jwt_secret = os.environ['JWT_SECRET']
 stripe_api_key = os.environ['STRIPE_API_KEY']
 google_maps_key = os.environ.get('GOOGLE_MAPS_API_KEY', '')
 
-client = AsyncIOMotorClient(mongo_url)
+# BSON dates decode as aware UTC datetimes (see services/bson_dates.py)
+client = AsyncIOMotorClient(mongo_url, **CLIENT_OPTIONS)
 db = client[db_name]
 
+# Admin-edited config documents (settings, email templates, site config)
+config_cache = get_config_cache()
+# Decoded JWTs + authenticated users, invalidated on every users write
+auth_cache = get_auth_cache()
+auth_metrics = get_metrics()
+# Outbid SMS / email / in-app notices, delivered off the request path
+notification_outbox = get_notification_outbox(db)
+register_default_channels(notification_outbox)
+
 import stripe
 stripe.api_key = stripe_api_key
 
@@ -174,7 +206,10 @@ EMAIL_TEMPLATE_CATEGORIES = {
 }
 
 async def get_email_templates():
-    """Fetch email templates from database, or return defaults if not set."""
+    """Fetch email templates (cached per worker, invalidated on admin edits), or return defaults if not set."""
+    return await config_cache.get("email_templates", _load_email_templates)
+
+async def _load_email_templates():
     templates = await db.email_settings.find_one({"id": "email_templates"}, {"_id": 0})
     if not templates:
         # Initialize with defaults
@@ -225,7 +260,10 @@ DEFAULT_MARKETPLACE_SETTINGS = {
 }
 
 async def get_marketplace_settings():
-    """Fetch marketplace settings from database, or return defaults if not set."""
+    """Fetch marketplace settings (cached per worker, invalidated on admin edits), or return defaults if not set."""
+    return await config_cache.get("marketplace_settings", _load_marketplace_settings)
+
+async def _load_marketplace_settings():
     settings = await db.settings.find_one({"id": "marketplace_settings"}, {"_id": 0})
     if not settings:
         # Initialize with defaults
@@ -252,18 +290,45 @@ def get_server_timestamp() -> int:
     """Get current server time as Unix epoch timestamp."""
     return int(datetime.now(timezone.utc).timestamp())
 
+ws_metrics = get_metrics()
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, List[WebSocket]] = {}
         self.user_connections: Dict[str, List[WebSocket]] = {}
         # Track user IDs per listing for status updates
         self.listing_viewers: Dict[str, Dict[str, WebSocket]] = {}  # {listing_id: {user_id: websocket}}
+        # One bounded outbound queue + writer task per socket
+        self.outbound: Dict[WebSocket, OutboundQueue] = {}
+        # Cross-worker pub/sub (None = deliver to this worker's sockets only)
+        self.backplane = None
+        self._topics = {
+            "listing_broadcast": lambda p: self.deliver_broadcast(p["listing_id"], p["message"]),
+            "bid_update": lambda p: self.deliver_bid_update(p["listing_id"], p["bid_data"], p["listing_data"]),
+            "user_message": lambda p: self.deliver_to_user(p["user_id"], p["message"]),
+        }
+
+    def attach_backplane(self, backplane):
+        """Route fan-out through the backplane so viewers on every worker receive it"""
+        self.backplane = backplane
+        for topic, handler in self._topics.items():
+            backplane.register(topic, handler)
+
+    async def _fan_out(self, topic: str, payload: dict):
+        if self.backplane:
+            await self.backplane.publish(topic, payload)
+        else:
+            await self._topics[topic](payload)
 
     async def connect(self, websocket: WebSocket, listing_id: str, user_id: str = None):
         await websocket.accept()
         if listing_id not in self.active_connections:
             self.active_connections[listing_id] = []
         self.active_connections[listing_id].append(websocket)
+        # Held until open(): updates arriving meanwhile queue up behind the initial state
+        self.outbound[websocket] = OutboundQueue(
+            websocket, on_dead=lambda ws, reason: self._evict(listing_id, ws), held=True
+        )
         
         # Track user viewing this listing
         if user_id:
@@ -271,7 +336,21 @@ class ConnectionManager:
                 self.listing_viewers[listing_id] = {}
             self.listing_viewers[listing_id][user_id] = websocket
 
+    def open(self, websocket: WebSocket, *messages: dict):
+        """Start delivery on a connected socket, sending `messages` before anything queued since connect"""
+        queue = self.outbound.get(websocket)
+        if queue:
+            queue.release([json.dumps(message) for message in messages])
+
+    def send_frame(self, websocket: WebSocket, message: dict) -> bool:
+        """Queue a frame for one socket (never sent around the queue); False once the socket is gone"""
+        queue = self.outbound.get(websocket)
+        return bool(queue and queue.enqueue(json.dumps(message)))
+
     def disconnect(self, websocket: WebSocket, listing_id: str, user_id: str = None):
+        queue = self.outbound.pop(websocket, None)
+        if queue:
+            queue.close()
         if listing_id in self.active_connections:
             try:
                 self.active_connections[listing_id].remove(websocket)
@@ -283,112 +362,106 @@ class ConnectionManager:
             self.listing_viewers[listing_id].pop(user_id, None)
 
     async def broadcast(self, listing_id: str, message: dict):
-        """Broadcast message to all connections viewing a specific listing"""
-        if listing_id in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[listing_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to connection: {str(e)}")
-                    disconnected.append(connection)
-            
-            # Clean up disconnected websockets
-            for conn in disconnected:
-                try:
-                    self.active_connections[listing_id].remove(conn)
-                except ValueError:
-                    pass
+        """Broadcast message to all connections viewing a specific listing (on every worker)"""
+        await self._fan_out("listing_broadcast", {"listing_id": listing_id, "message": message})
 
     async def broadcast_bid_update(self, listing_id: str, bid_data: dict, listing_data: dict):
+        """Broadcast a personalized bid update to viewers of a listing (on every worker)"""
+        await self._fan_out("bid_update", {"listing_id": listing_id, "bid_data": bid_data, "listing_data": listing_data})
+
+    async def send_to_user(self, user_id: str, message: dict):
+        """Send message to specific user (for notifications, messages, etc.) on every worker"""
+        await self._fan_out("user_message", {"user_id": user_id, "message": message})
+
+    async def deliver_broadcast(self, listing_id: str, message: dict):
+        """Send to this worker's connections viewing a specific listing"""
+        connections = self.active_connections.get(listing_id)
+        if not connections:
+            return
+        encoded = json.dumps(message)
+        await self._send_many(
+            [(connection, encoded) for connection in list(connections)],
+            coalesce_key=coalesce_key_for(message, listing_id)
+        )
+
+    async def deliver_bid_update(self, listing_id: str, bid_data: dict, listing_data: dict):
         """
         Enhanced broadcast with personalized status updates for each user.
         Sends LEADING/OUTBID status based on user_id.
+
+        The shared payload is encoded once; only the trailing bid_status differs
+        per recipient, so there are exactly three frames per update.
         """
         highest_bidder_id = bid_data.get('bidder_id')
         current_price = bid_data.get('amount')
         
-        # Log broadcast attempt
-        viewer_count = len(self.listing_viewers.get(listing_id, {}))
-        connection_count = len(self.active_connections.get(listing_id, []))
-        logger.info(f"📡 Broadcasting bid update: listing_id={listing_id}, price={current_price}, viewers={viewer_count}, connections={connection_count}")
-        
-        sent_count = 0
-        error_count = 0
+        frames = status_frames({
+            'type': 'BID_UPDATE',
+            'listing_id': listing_id,
+            'current_price': current_price,
+            'highest_bidder_id': highest_bidder_id,
+            'bid_count': listing_data.get('bid_count', 0),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'bid_data': bid_data,
+            # Anti-sniping time extension data
+            'time_extended': listing_data.get('time_extended', False),
+            'new_auction_end': listing_data.get('new_auction_end'),
+            'extension_reason': listing_data.get('extension_reason')
+        })
+        # Signed-in viewers get LEADING/OUTBID; anonymous viewers get VIEWER
+        targets = bid_status_targets(
+            self.listing_viewers.get(listing_id, {}),
+            self.active_connections.get(listing_id, []),
+            highest_bidder_id,
+            frames
+        )
         
-        if listing_id in self.listing_viewers:
-            for user_id, websocket in list(self.listing_viewers[listing_id].items()):
-                try:
-                    # Determine bid status for this user
-                    bid_status = 'LEADING' if user_id == highest_bidder_id else 'OUTBID'
-                    
-                    # Personalized message for each user
-                    message = {
-                        'type': 'BID_UPDATE',
-                        'listing_id': listing_id,
-                        'current_price': current_price,
-                        'highest_bidder_id': highest_bidder_id,
-                        'bid_count': listing_data.get('bid_count', 0),
-                        'bid_status': bid_status,  # Personalized status
-                        'timestamp': datetime.now(timezone.utc).isoformat(),
-                        'bid_data': bid_data,
-                        # Anti-sniping time extension data
-                        'time_extended': listing_data.get('time_extended', False),
-                        'new_auction_end': listing_data.get('new_auction_end'),
-                        'extension_reason': listing_data.get('extension_reason')
-                    }
-                    
-                    await websocket.send_json(message)
-                    sent_count += 1
-                    logger.info(f"✅ Sent bid update to user {user_id}: status={bid_status}")
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"❌ Error sending bid update to user {user_id}: {str(e)}")
-                    # Clean up dead connection
-                    try:
-                        self.listing_viewers[listing_id].pop(user_id, None)
-                    except:
-                        pass
-        
-        # Also broadcast to anonymous viewers (non-logged-in)
-        if listing_id in self.active_connections:
-            for connection in list(self.active_connections[listing_id]):
-                if connection not in [ws for ws in self.listing_viewers.get(listing_id, {}).values()]:
-                    try:
-                        message = {
-                            'type': 'BID_UPDATE',
-                            'listing_id': listing_id,
-                            'current_price': current_price,
-                            'highest_bidder_id': highest_bidder_id,
-                            'bid_count': listing_data.get('bid_count', 0),
-                            'bid_status': 'VIEWER',  # Not bidding
-                            'timestamp': datetime.now(timezone.utc).isoformat(),
-                            'bid_data': bid_data,
-                            # Anti-sniping time extension data
-                            'time_extended': listing_data.get('time_extended', False),
-                            'new_auction_end': listing_data.get('new_auction_end'),
-                            'extension_reason': listing_data.get('extension_reason')
-                        }
-                        await connection.send_json(message)
-                        sent_count += 1
-                    except Exception as e:
-                        error_count += 1
-                        # Clean up dead connection
-                        try:
-                            self.active_connections[listing_id].remove(connection)
-                        except:
-                            pass
-        
-        logger.info(f"📊 Broadcast complete: sent={sent_count}, errors={error_count}")
+        queued_count, dropped_count = await self._send_many(targets, coalesce_key=("BID_UPDATE", listing_id, None))
+        logger.info(f"📡 Bid update fan-out: listing_id={listing_id}, price={current_price}, queued={queued_count}, dropped={dropped_count}")
 
-    async def send_to_user(self, user_id: str, message: dict):
-        """Send message to specific user (for notifications, messages, etc.)"""
+    async def _send_many(self, targets: List[tuple], coalesce_key=None) -> tuple:
+        """
+        Hand pre-encoded frames to each socket's outbound queue. Nothing here
+        awaits a client: per-socket writers send, coalesce superseded frames
+        and evict sockets whose queue overflows or whose send times out.
+        """
+        queued_count = 0
+        dropped_count = 0
+        with ws_metrics.timer("ws_fanout_seconds"):
+            for websocket, frame in targets:
+                queue = self.outbound.get(websocket)
+                if queue and queue.enqueue(frame, coalesce_key):
+                    queued_count += 1
+                else:
+                    dropped_count += 1
+        return queued_count, dropped_count
+
+    def _evict(self, listing_id: str, websocket: WebSocket):
+        """Drop a dead or slow socket from every index for this listing and close it"""
+        queue = self.outbound.pop(websocket, None)
+        if queue:
+            queue.close()
+        try:
+            self.active_connections.get(listing_id, []).remove(websocket)
+        except ValueError:
+            pass
+        viewers = self.listing_viewers.get(listing_id, {})
+        for user_id in [u for u, ws in viewers.items() if ws is websocket]:
+            viewers.pop(user_id, None)
+        asyncio.ensure_future(self._close_quietly(websocket))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+
+    async def deliver_to_user(self, user_id: str, message: dict):
+        """Send to this worker's personal-notification sockets for a user"""
         if user_id in self.user_connections:
-            for connection in self.user_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except:
-                    pass
+            encoded = json.dumps(message)
+            await self._send_many([(connection, encoded) for connection in list(self.user_connections[user_id])])
     
     async def connect_user(self, websocket: WebSocket, user_id: str):
         """Connect user for personal notifications"""
@@ -396,9 +469,15 @@ class ConnectionManager:
         if user_id not in self.user_connections:
             self.user_connections[user_id] = []
         self.user_connections[user_id].append(websocket)
+        self.outbound[websocket] = OutboundQueue(
+            websocket, on_dead=lambda ws, reason: self.disconnect_user(ws, user_id)
+        )
     
     def disconnect_user(self, websocket: WebSocket, user_id: str):
         """Disconnect user from personal notifications"""
+        queue = self.outbound.pop(websocket, None)
+        if queue:
+            queue.close()
         if user_id in self.user_connections:
             try:
                 self.user_connections[user_id].remove(websocket)
@@ -422,15 +501,30 @@ class MessageConnectionManager:
         self.user_online_status: Dict[str, datetime] = {}
         # {conversation_id: {user_id: bool}} - typing status
         self.typing_status: Dict[str, Dict[str, bool]] = {}
+        # One bounded outbound queue + writer task per socket
+        self.outbound: Dict[WebSocket, OutboundQueue] = {}
+        # Cross-worker pub/sub (None = deliver to this worker's rooms only)
+        self.backplane = None
+    
+    def attach_backplane(self, backplane):
+        """Route conversation fan-out through the backplane so both participants get it on any worker"""
+        self.backplane = backplane
+        backplane.register(
+            "conversation_message",
+            lambda p: self.deliver_to_conversation(p["conversation_id"], p["message"], p.get("exclude_user"))
+        )
     
     async def connect(self, websocket: WebSocket, conversation_id: str, user_id: str) -> bool:
         """Connect user to a conversation room. Returns False if user not authorized."""
         await websocket.accept()
         
-        # Track connection
+        # Track connection; held until open() so the confirmation goes out first
         if conversation_id not in self.conversation_rooms:
             self.conversation_rooms[conversation_id] = {}
         self.conversation_rooms[conversation_id][user_id] = websocket
+        self.outbound[websocket] = OutboundQueue(
+            websocket, on_dead=lambda ws, reason: self._evict(conversation_id, user_id, ws), held=True
+        )
         
         # Track user's active conversations
         if user_id not in self.user_active_convos:
@@ -448,8 +542,27 @@ class MessageConnectionManager:
         logger.info(f"💬 User {user_id} connected to conversation {conversation_id}")
         return True
     
-    def disconnect(self, conversation_id: str, user_id: str):
-        """Disconnect user from conversation room."""
+    def open(self, websocket: WebSocket, *messages: dict):
+        """Start delivery on a connected socket, sending `messages` before anything queued since connect"""
+        queue = self.outbound.get(websocket)
+        if queue:
+            queue.release([json.dumps(message) for message in messages])
+    
+    def send_frame(self, websocket: WebSocket, message: dict) -> bool:
+        """Queue a frame for one socket (never sent around the queue); False once the socket is gone"""
+        queue = self.outbound.get(websocket)
+        return bool(queue and queue.enqueue(json.dumps(message)))
+    
+    def disconnect(self, conversation_id: str, user_id: str, websocket: WebSocket = None):
+        """Disconnect user from conversation room (only if `websocket` is still their socket there)."""
+        room = self.conversation_rooms.get(conversation_id, {})
+        current = room.get(user_id)
+        queue = self.outbound.pop(websocket or current, None)
+        if queue:
+            queue.close()
+        if websocket is not None and current is not websocket:
+            # The user reconnected on a newer socket; leave that one in place
+            return
         if conversation_id in self.conversation_rooms:
             self.conversation_rooms[conversation_id].pop(user_id, None)
             if not self.conversation_rooms[conversation_id]:
@@ -464,36 +577,38 @@ class MessageConnectionManager:
         
         logger.info(f"💬 User {user_id} disconnected from conversation {conversation_id}")
     
+    def _evict(self, conversation_id: str, user_id: str, websocket: WebSocket):
+        """Drop a dead or slow socket from its room and close it"""
+        self.disconnect(conversation_id, user_id, websocket)
+        asyncio.ensure_future(ConnectionManager._close_quietly(websocket))
+    
     async def send_to_conversation(self, conversation_id: str, message: dict, exclude_user: str = None):
-        """Send message to all users in a conversation except the excluded one."""
+        """Send message to all users in a conversation except the excluded one (on every worker)."""
+        payload = {"conversation_id": conversation_id, "message": message, "exclude_user": exclude_user}
+        if self.backplane:
+            await self.backplane.publish("conversation_message", payload)
+        else:
+            await self.deliver_to_conversation(conversation_id, message, exclude_user)
+    
+    async def deliver_to_conversation(self, conversation_id: str, message: dict, exclude_user: str = None):
+        """Send to this worker's sockets in a conversation except the excluded user."""
         if conversation_id not in self.conversation_rooms:
             return
         
-        disconnected = []
-        for user_id, websocket in self.conversation_rooms[conversation_id].items():
+        encoded = json.dumps(message)
+        for user_id, websocket in list(self.conversation_rooms[conversation_id].items()):
             if user_id == exclude_user:
                 continue
-            try:
-                await websocket.send_json(message)
-                logger.info(f"📤 Sent message to user {user_id} in conversation {conversation_id}")
-            except Exception as e:
-                logger.error(f"❌ Error sending to user {user_id}: {str(e)}")
-                disconnected.append(user_id)
-        
-        # Clean up disconnected users
-        for user_id in disconnected:
-            self.disconnect(conversation_id, user_id)
+            queue = self.outbound.get(websocket)
+            if queue and queue.enqueue(encoded):
+                logger.info(f"📤 Queued message for user {user_id} in conversation {conversation_id}")
     
     async def send_to_user_in_conversation(self, conversation_id: str, user_id: str, message: dict):
         """Send message to a specific user in a conversation."""
         if conversation_id in self.conversation_rooms:
             websocket = self.conversation_rooms[conversation_id].get(user_id)
             if websocket:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.error(f"❌ Error sending to user {user_id}: {str(e)}")
-                    self.disconnect(conversation_id, user_id)
+                self.send_frame(websocket, message)
     
     def is_user_online(self, user_id: str, timeout_seconds: int = 30) -> bool:
         """Check if user is currently online (active within timeout)."""
@@ -559,7 +674,7 @@ async def transition_upcoming_auctions():
         # Find all upcoming auctions where start date has passed
         upcoming_auctions = await db.multi_item_listings.find({
             "status": "upcoming",
-            "auction_start_date": {"$lte": now.isoformat()}
+            **date_range("auction_start_date", {"$lte": now})
         }).to_list(100)
         
         transition_count = 0
@@ -569,6 +684,8 @@ async def transition_upcoming_auctions():
                 {"id": auction["id"]},
                 {"$set": {"status": "active"}}
             )
+            await marketplace_index.sync_auction(db, auction["id"])
+            await get_auction_timer(db).track_auction(auction["id"])
             transition_count += 1
             logger.info(f"Transitioned auction {auction['id']} from upcoming to active")
         
@@ -588,29 +705,167 @@ scheduler.add_job(
     replace_existing=True
 )
 
-# Add job to process ended auctions every minute
+# Closes are driven by the auction timer wheel; the DB poll is only a safety net
+_close_lock = asyncio.Lock()
+
 async def run_process_ended_auctions():
-    """Wrapper to run the async auction end processor"""
+    """Wrapper to run the async auction end processor (one run at a time per worker)"""
     from routes.auctions import process_ended_auctions
-    await process_ended_auctions()
+    async with _close_lock:
+        await process_ended_auctions()
+
+async def close_due_auctions(keys):
+    """Auction timer callback - closes exactly the listings and lots that came due this tick"""
+    from routes.auctions import process_due_closes
+    logger.info(f"⏱️ Auction timer fired for {len(keys)} close(s)")
+    async with _close_lock:
+        await process_due_closes(keys)
 
 scheduler.add_job(
     run_process_ended_auctions,
-    trigger=IntervalTrigger(minutes=1),
+    trigger=IntervalTrigger(minutes=5),
     id='process_ended_auctions',
-    name='Process ended auctions and create handshakes',
+    name='Process ended auctions and create handshakes (safety net)',
+    replace_existing=True
+)
+
+# Pick up auctions that have moved inside the timer's load horizon
+async def run_auction_timer_reload():
+    try:
+        await get_auction_timer(db).load()
+    except Exception as e:
+        logger.error(f"❌ Error reloading auction timer: {str(e)}")
+
+scheduler.add_job(
+    run_auction_timer_reload,
+    trigger=IntervalTrigger(hours=1),
+    id='auction_timer_reload',
+    name='Reload auction close timer wheel',
+    replace_existing=True
+)
+
+# Reconcile the materialized marketplace view (heals any missed write-path sync)
+async def run_marketplace_reconcile():
+    """Wrapper to run the marketplace_items full rebuild"""
+    try:
+        await marketplace_index.rebuild_marketplace_items(db)
+    except Exception as e:
+        logger.error(f"❌ Error in marketplace reconcile: {str(e)}")
+
+scheduler.add_job(
+    run_marketplace_reconcile,
+    trigger=IntervalTrigger(minutes=30),
+    id='marketplace_reconcile',
+    name='Reconcile materialized marketplace items',
+    replace_existing=True
+)
+
+# Backfill and prune the search index (heals any missed write-path update)
+async def run_search_index_rebuild():
+    try:
+        await search_index.rebuild_search_index(db)
+    except Exception as e:
+        logger.error(f"❌ Error rebuilding search index: {str(e)}")
+
+scheduler.add_job(
+    run_search_index_rebuild,
+    trigger=CronTrigger(hour=3, minute=30),
+    id='search_index_rebuild',
+    name='Rebuild listing search index',
+    replace_existing=True
+)
+
+# Recompute seller stats from the source collections (heals any missed increment)
+async def run_seller_stats_rebuild():
+    try:
+        await seller_stats.rebuild_seller_stats(db)
+    except Exception as e:
+        logger.error(f"❌ Error rebuilding seller stats: {str(e)}")
+
+scheduler.add_job(
+    run_seller_stats_rebuild,
+    trigger=CronTrigger(hour=4, minute=30),
+    id='seller_stats_rebuild',
+    name='Rebuild seller stats aggregates',
+    replace_existing=True
+)
+
+# Drop delivered outbox rows past retention
+async def run_outbox_purge():
+    try:
+        purged = await notification_outbox.purge()
+        if purged:
+            logger.info(f"📬 Purged {purged} delivered outbox row(s)")
+    except Exception as e:
+        logger.error(f"❌ Error purging notification outbox: {str(e)}")
+
+scheduler.add_job(
+    run_outbox_purge,
+    trigger=CronTrigger(hour=4, minute=0),
+    id='notification_outbox_purge',
+    name='Purge delivered notification outbox rows',
     replace_existing=True
 )
 
 # Start scheduler on app startup
 @app.on_event("startup")
 async def start_scheduler():
+    # Indexes first so the scheduled scans never run as collection scans
+    try:
+        from services.db_indexes import ensure_indexes
+        await ensure_indexes(db)
+    except Exception as e:
+        logger.error(f"❌ Failed to apply MongoDB index registry: {e}")
+    
+    # Cross-worker WebSocket fan-out
+    backplane = get_backplane(db)
+    try:
+        await backplane.start()
+        manager.attach_backplane(backplane)
+        message_manager.attach_backplane(backplane)
+        config_cache.attach_backplane(backplane)
+        auth_cache.attach_backplane(backplane)
+        get_auction_timer(db).attach_backplane(backplane)
+        logger.info(f"📡 Realtime backplane: {backplane.name}")
+    except Exception as e:
+        logger.error(f"❌ Realtime backplane '{backplane.name}' failed to start, fan-out stays worker-local: {e}")
+    
+    # Backfill the marketplace view on first boot, or if items predate the sort keys
+    if await db.marketplace_items.estimated_document_count() == 0 or \
+            await db.marketplace_items.find_one({"ending_key": {"$exists": False}}, {"_id": 1}):
+        await run_marketplace_reconcile()
+    # Empty, or written before entries carried their filter fields
+    if await db.search_index.estimated_document_count() == 0 or \
+            await db.search_index.find_one({"status": {"$exists": False}}, {"_id": 1}):
+        await run_search_index_rebuild()
+    if await db.seller_stats.estimated_document_count() == 0:
+        await run_seller_stats_rebuild()
+    
+    await notification_outbox.start()
+    
+    try:
+        await get_pdf_renderer().warm()
+    except Exception as e:
+        logger.error(f"❌ PDF renderer failed to warm up, workers start on first render: {e}")
+    
+    auction_timer = get_auction_timer(db)
+    auction_timer.on_due = close_due_auctions
+    try:
+        await auction_timer.start()
+    except Exception as e:
+        logger.error(f"❌ Auction timer failed to start, closes fall back to the DB poll: {e}")
+    
     scheduler.start()
-    logger.info("🚀 APScheduler started - checking auctions every minute, transitions every 5 minutes")
+    logger.info("🚀 APScheduler started - close safety net every 5 minutes, transitions every 5 minutes")
 
 @app.on_event("shutdown")
 async def shutdown_scheduler():
     scheduler.shutdown()
+    await get_auction_timer().stop()
+    await notification_outbox.stop()
+    await get_email_service().close()
+    get_pdf_renderer().stop()
+    await get_backplane().stop()
     logger.info("🛑 APScheduler shut down")
 
 class UserCreate(BaseModel):
@@ -998,6 +1253,43 @@ class MultiItemListing(BaseModel):
     # Seller obligations - collected in Step 4
     seller_obligations: Optional[Dict[str, Any]] = None  # Complete seller obligations data
 
+# Response shapes for the fast list path (services/fast_response.py)
+LISTING_SHAPE = ModelShape(Listing)
+# GET /listings ?sort= values (optionally "-" prefixed); anything else is a 400
+LISTING_SORT_FIELDS = ("created_at", "auction_end_date", "current_price", "starting_price", "bid_count", "views", "title")
+
+# List and carousel responses leave out attachments and long-form text (served by
+# the detail and /documents endpoints) and carry only the first few lots as a preview
+AUCTION_DETAIL_FIELDS = ("documents", "auction_terms_en", "auction_terms_fr", "seller_obligations",
+                         "pickup_locations", "payment_proof_url")
+LOT_PREVIEW_SIZE = int(os.environ.get("LOT_PREVIEW_SIZE", "3"))
+MULTI_ITEM_LISTING_SUMMARY = ModelShape(
+    MultiItemListing,
+    nested={"lots": ModelShape(Lot, exclude=("description",))},
+    exclude=AUCTION_DETAIL_FIELDS,
+    slices={"lots": LOT_PREVIEW_SIZE},
+)
+# Exclusion forms: one projection for queries over both listing collections, and
+# owner/admin views that need every lot but not the attachments
+LISTING_SUMMARY_EXCLUSION = {
+    "_id": 0, "agreement_metadata": 0, **{field: 0 for field in AUCTION_DETAIL_FIELDS},
+    "lots": {"$slice": LOT_PREVIEW_SIZE},
+}
+WITHOUT_ATTACHMENTS = {"_id": 0, "documents": 0}
+
+
+def indexed_filters(kind: str, query: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a list query the search index can apply itself (status, category, location...)"""
+    return {field: query[field] for field in search_index.FILTER_FIELDS[kind] if field in query}
+
+
+def select_fields(shape: ModelShape, fields: Optional[str]) -> ModelShape:
+    """Apply a `fields=` sparse fieldset; unknown or detail-only names are a 400"""
+    try:
+        return shape.select(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 class PaymentTransaction(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -1085,60 +1377,39 @@ def create_access_token(data: dict) -> str:
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, jwt_secret, algorithm="HS256")
 
-# Increment logic helper functions
+# Increment logic helper functions (schedules live in services/increment_schedule.py)
 def get_minimum_increment_tiered(current_bid: float) -> float:
-    """
-    Tiered increment schedule (Option A):
-    $0-$99.99 → $5
-    $100-$499.99 → $10
-    $500-$999.99 → $25
-    $1,000-$4,999.99 → $50
-    $5,000-$9,999.99 → $100
-    $10,000-$49,999.99 → $250
-    $50,000-$99,999.99 → $500
-    $100,000+ → $1,000
-    """
-    if current_bid < 100:
-        return 5
-    elif current_bid < 500:
-        return 10
-    elif current_bid < 1000:
-        return 25
-    elif current_bid < 5000:
-        return 50
-    elif current_bid < 10000:
-        return 100
-    elif current_bid < 50000:
-        return 250
-    elif current_bid < 100000:
-        return 500
-    else:
-        return 1000
+    """Tiered increment schedule (Option A): $5 under $100 up to $1,000 from $100,000"""
+    return SCHEDULES["tiered"].increment(current_bid)
 
 def get_minimum_increment_simplified(current_bid: float) -> float:
-    """
-    Simplified increment schedule (Option B):
-    $0-$100 → $1
-    $100-$1,000 → $5
-    $1,000-$10,000 → $25
-    $10,000+ → $100
-    """
-    if current_bid <= 100:
-        return 1
-    elif current_bid <= 1000:
-        return 5
-    elif current_bid <= 10000:
-        return 25
-    else:
-        return 100
+    """Simplified increment schedule (Option B): $1 up to $100 up to $100 above $10,000"""
+    return SCHEDULES["simplified"].increment(current_bid)
 
 def get_minimum_increment(auction: dict, current_bid: float) -> float:
     """Get minimum increment based on auction's increment_option"""
-    increment_option = auction.get("increment_option", "tiered")
-    if increment_option == "simplified":
-        return get_minimum_increment_simplified(current_bid)
-    else:
-        return get_minimum_increment_tiered(current_bid)
+    return minimum_increment(auction, current_bid)
+
+def _decode_jwt(token: str) -> dict:
+    return jwt.decode(token, jwt_secret, algorithms=["HS256"])
+
+async def _load_user(user_id: str) -> Optional[User]:
+    user_doc = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+    return User(**user_doc) if user_doc else None
+
+async def _authenticate_token(token: str) -> User:
+    """Resolve a bearer/session token to a User through the decoded-JWT and user caches"""
+    with auth_metrics.timer("auth_seconds"):
+        try:
+            user_id = auth_cache.token_subject(token, _decode_jwt)
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        if not user_id:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        user = await auth_cache.get_user(user_id, _load_user)
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        return user
 
 async def get_current_user(request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> User:
     token = None
@@ -1148,17 +1419,7 @@ async def get_current_user(request: Request, credentials: Optional[HTTPAuthoriza
         token = credentials.credentials
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    try:
-        payload = jwt.decode(token, jwt_secret, algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user_doc = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
-        if not user_doc:
-            raise HTTPException(status_code=401, detail="User not found")
-        return User(**user_doc)
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    return await _authenticate_token(token)
 
 async def get_current_user_optional(request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> Optional[User]:
     """Optional authentication - returns None if not authenticated instead of raising an error"""
@@ -1170,15 +1431,8 @@ async def get_current_user_optional(request: Request, credentials: Optional[HTTP
     if not token:
         return None
     try:
-        payload = jwt.decode(token, jwt_secret, algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if not user_id:
-            return None
-        user_doc = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
-        if not user_doc:
-            return None
-        return User(**user_doc)
-    except JWTError:
+        return await _authenticate_token(token)
+    except HTTPException:
         return None
 
 @api_router.post("/auth/register", response_model=TokenResponse)
@@ -1422,6 +1676,7 @@ async def reset_password(request: ResetPasswordRequest):
             {"id": user_doc["id"]},
             {"$set": {"password": hashed_password}}
         )
+        await auth_cache.invalidate_user(user_doc["id"])
         
         # Mark token as used
         await db.password_reset_tokens.update_one(
@@ -1642,6 +1897,8 @@ async def create_rating(
         rating_dict["created_at"] = rating_dict["created_at"].isoformat()
         
         await db.ratings.insert_one(rating_dict)
+        rating_dict.pop("_id", None)
+        await seller_stats.record_rating(db, rating_dict)
         
         return {"message": "Rating submitted successfully", "rating": rating_dict}
         
@@ -1656,43 +1913,20 @@ async def get_user_ratings(user_id: str):
     """
     Get aggregated ratings for a specific seller/auctioneer.
     Returns average rating, count, and recent ratings.
+    Aggregates come from the seller's stats document; only the last 10 ratings are read.
     """
     try:
-        # Get all ratings for this user
-        ratings_cursor = db.ratings.find({"target_user_id": user_id})
-        ratings = await ratings_cursor.to_list(length=None)
-        
-        if not ratings:
-            return {
-                "user_id": user_id,
-                "average_rating": 0,
-                "total_ratings": 0,
-                "ratings_breakdown": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0},
-                "recent_ratings": []
-            }
+        summary = seller_stats.rating_summary(await seller_stats.get_stats(db, user_id))
         
-        # Calculate average
-        total_rating = sum(r["rating"] for r in ratings)
-        average_rating = round(total_rating / len(ratings), 2)
-        
-        # Ratings breakdown
-        ratings_breakdown = {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}
-        for r in ratings:
-            ratings_breakdown[str(r["rating"])] += 1
-        
-        # Get recent ratings (last 10)
-        recent_ratings = sorted(ratings, key=lambda x: x.get("timestamp", ""), reverse=True)[:10]
-        
-        # Remove sensitive IDs from recent ratings
-        for r in recent_ratings:
-            r.pop("_id", None)
-            r.pop("rater_user_id", None)
+        # Recent ratings (last 10), without the rater's ID
+        recent_ratings = await db.ratings.find(
+            {"target_user_id": user_id},
+            {"_id": 0, "rater_user_id": 0}
+        ).sort("timestamp", -1).limit(10).to_list(10)
         
         return {
             "user_id": user_id,
-            "average_rating": average_rating,
-            "total_ratings": len(ratings),
-            "ratings_breakdown": ratings_breakdown,
+            **summary,
             "recent_ratings": recent_ratings
         }
         
@@ -1716,94 +1950,13 @@ async def get_seller_trust_score(seller_id: str):
     - total_ratings: number of ratings
     - metrics breakdown: pickup_speed, item_accuracy, communication
     - is_trusted: True if score >= 4.5
+    
+    Read from the seller's stats document (kept current by the rating,
+    pickup and listing write paths).
     """
     try:
-        # Get all ratings for this seller
-        ratings_cursor = db.ratings.find({"target_user_id": seller_id})
-        ratings = await ratings_cursor.to_list(length=None)
-        
-        # Get automated metrics from completed transactions
-        # Find auctions where this seller's items were marked as "picked_up"
-        completed_transactions_cursor = db.handshakes.find({
-            "seller_id": seller_id,
-            "status": "picked_up"
-        })
-        completed_transactions = await completed_transactions_cursor.to_list(length=None)
-        
-        # Calculate automated pickup speed score
-        pickup_scores = []
-        for transaction in completed_transactions:
-            # Calculate days between auction end and pickup
-            if transaction.get("marked_picked_up_at") and transaction.get("auction_end_date"):
-                try:
-                    pickup_date = datetime.fromisoformat(transaction["marked_picked_up_at"].replace("Z", "+00:00"))
-                    auction_end = datetime.fromisoformat(transaction["auction_end_date"].replace("Z", "+00:00"))
-                    days_to_pickup = (pickup_date - auction_end).days
-                    
-                    # Score based on pickup speed (faster = better)
-                    if days_to_pickup <= 3:
-                        pickup_scores.append(5)
-                    elif days_to_pickup <= 7:
-                        pickup_scores.append(4)
-                    elif days_to_pickup <= 14:
-                        pickup_scores.append(3)
-                    else:
-                        pickup_scores.append(2)
-                except:
-                    pass
-        
-        # Calculate average metrics
-        avg_pickup_speed = sum(pickup_scores) / len(pickup_scores) if pickup_scores else 0
-        
-        # Get rating-based metrics
-        metric_scores = {
-            "pickup_speed": [],
-            "item_accuracy": [],
-            "communication": []
-        }
-        
-        for r in ratings:
-            if r.get("metrics"):
-                for key in metric_scores.keys():
-                    if r["metrics"].get(key):
-                        metric_scores[key].append(r["metrics"][key])
-        
-        # Calculate averages for each metric
-        avg_item_accuracy = sum(metric_scores["item_accuracy"]) / len(metric_scores["item_accuracy"]) if metric_scores["item_accuracy"] else 0
-        avg_communication = sum(metric_scores["communication"]) / len(metric_scores["communication"]) if metric_scores["communication"] else 0
-        
-        # Use automated pickup speed if no rating-based data
-        final_pickup_speed = (
-            sum(metric_scores["pickup_speed"]) / len(metric_scores["pickup_speed"])
-            if metric_scores["pickup_speed"]
-            else avg_pickup_speed
-        )
-        
-        # Calculate overall score (weighted average)
-        if ratings:
-            # If we have ratings, use them
-            overall_from_ratings = sum(r["rating"] for r in ratings) / len(ratings)
-            overall_score = round(overall_from_ratings, 2)
-        elif completed_transactions:
-            # If no ratings but completed transactions, use automated metrics
-            overall_score = round(avg_pickup_speed, 2)
-        else:
-            # New seller, no data
-            overall_score = 0
-        
-        return {
-            "seller_id": seller_id,
-            "overall_score": overall_score,
-            "total_ratings": len(ratings),
-            "total_transactions": len(completed_transactions),
-            "metrics": {
-                "pickup_speed": round(final_pickup_speed, 2),
-                "item_accuracy": round(avg_item_accuracy, 2),
-                "communication": round(avg_communication, 2)
-            },
-            "is_trusted": overall_score >= 4.5,
-            "badge": "BidVex Trusted Seller" if overall_score >= 4.5 else None
-        }
+        stats = await seller_stats.get_stats(db, seller_id)
+        return {"seller_id": seller_id, **seller_stats.seller_trust(stats)}
         
     except Exception as e:
         logger.error(f"Error calculating seller trust score: {str(e)}")
@@ -1849,14 +2002,9 @@ async def get_seller_profile(
             raise HTTPException(status_code=404, detail="Seller not found")
         
         # Get seller ratings
-        ratings_cursor = db.ratings.find({"target_user_id": seller_id})
-        ratings = await ratings_cursor.to_list(length=None)
-        
-        average_rating = 0
-        total_ratings = len(ratings)
-        if ratings:
-            total_rating = sum(r["rating"] for r in ratings)
-            average_rating = round(total_rating / len(ratings), 2)
+        ratings = seller_stats.rating_summary(await seller_stats.get_stats(db, seller_id))
+        average_rating = ratings["average_rating"]
+        total_ratings = ratings["total_ratings"]
         
         # Count active listings
         single_listings_count = await db.listings.count_documents({
@@ -1910,44 +2058,29 @@ async def get_seller_profile(
         raise HTTPException(status_code=500, detail="Failed to fetch seller profile")
 
 @api_router.get("/sellers/{seller_id}/listings")
-async def get_seller_listings(seller_id: str, limit: int = 20, skip: int = 0):
+async def get_seller_listings(seller_id: str, limit: int = 20, cursor: Optional[str] = None):
     """
     Get active listings for a specific seller (both single-item and multi-lot auctions).
+    Both kinds are paged newest first as one stream; pass next_cursor back as cursor.
     """
     try:
-        # Get single-item listings
-        single_listings = await db.listings.find(
-            {"seller_id": seller_id, "status": "active"},
-            {"_id": 0}
-        ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-        
-        # Get multi-item listings
-        multi_listings = await db.multi_item_listings.find(
-            {"seller_id": seller_id, "status": {"$in": ["active", "upcoming"]}},
-            {"_id": 0}
-        ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-        
-        # Format datetime fields
-        for listing in single_listings:
-            if isinstance(listing.get("created_at"), str):
-                listing["created_at"] = datetime.fromisoformat(listing["created_at"])
-            if isinstance(listing.get("auction_end_date"), str):
-                listing["auction_end_date"] = datetime.fromisoformat(listing["auction_end_date"])
-        
-        for listing in multi_listings:
-            if isinstance(listing.get("created_at"), str):
-                listing["created_at"] = datetime.fromisoformat(listing["created_at"])
-            if isinstance(listing.get("auction_end_date"), str):
-                listing["auction_end_date"] = datetime.fromisoformat(listing["auction_end_date"])
-            if isinstance(listing.get("auction_start_date"), str):
-                listing["auction_start_date"] = datetime.fromisoformat(listing["auction_start_date"])
+        (single_listings, multi_listings), next_cursor = await merge_pages(
+            [
+                (db.listings, {"seller_id": seller_id, "status": "active"}),
+                (db.multi_item_listings, {"seller_id": seller_id, "status": {"$in": ["active", "upcoming"]}}),
+            ],
+            "created_at", -1, limit, cursor, LISTING_SUMMARY_EXCLUSION
+        )
         
         return {
             "single_listings": single_listings,
             "multi_listings": multi_listings,
-            "total": len(single_listings) + len(multi_listings)
+            "total": len(single_listings) + len(multi_listings),
+            "next_cursor": next_cursor
         }
         
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching seller listings: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch seller listings")
@@ -1999,6 +2132,7 @@ async def update_profile(updates: Dict[str, Any], current_user: User = Depends(g
     
     if update_data:
         await db.users.update_one({"id": current_user.id}, {"$set": update_data})
+        await auth_cache.invalidate_user(current_user.id)
     return {"message": "Profile updated successfully"}
 
 @api_router.post("/listings", response_model=Listing)
@@ -2064,17 +2198,27 @@ async def create_listing(
     # Add legal agreement metadata
     listing_dict["agreement_metadata"] = agreement_metadata
     
-    listing_dict["auction_end_date"] = listing_dict["auction_end_date"].isoformat()
-    listing_dict["created_at"] = listing_dict["created_at"].isoformat()
     await db.listings.insert_one(listing_dict)
+    await marketplace_index.sync_listing(db, listing.id)
+    await search_index.index_listing(db, listing_dict)
+    await get_auction_timer(db).track_listing(listing.id)
     return listing
 
 @api_router.get("/listings", response_model=List[Listing])
 async def get_listings(
     category: Optional[str] = None, city: Optional[str] = None, region: Optional[str] = None,
     condition: Optional[str] = None, min_price: Optional[float] = None, max_price: Optional[float] = None,
-    search: Optional[str] = None, sort: str = "created_at", limit: int = 50, skip: int = 0
+    search: Optional[str] = None, sort: str = "created_at", limit: int = 50, skip: int = 0,
+    cursor: Optional[str] = None, fields: Optional[str] = None
 ):
+    """
+    Next page: pass the X-Next-Cursor response header back as cursor (skip is deprecated).
+    sort=relevance ranks search results best match first and pages with skip; otherwise
+    sort is one of LISTING_SORT_FIELDS, "-" prefixed for descending.
+    fields=id,title,current_price returns only those fields.
+    Served through the fast list path: projected to the Listing fields, no per-row model.
+    """
+    shape = select_fields(LISTING_SHAPE, fields)
     query = {"status": "active"}
     if category:
         query["category"] = category
@@ -2091,17 +2235,33 @@ async def get_listings(
             query["current_price"]["$lte"] = max_price
         else:
             query["current_price"] = {"$lte": max_price}
-    if search:
-        query["$or"] = [{"title": {"$regex": search, "$options": "i"}}, {"description": {"$regex": search, "$options": "i"}}]
-    sort_order = -1 if sort.startswith("-") else 1
-    sort_field = sort.lstrip("-")
-    listings = await db.listings.find(query, {"_id": 0}).sort(sort_field, sort_order).skip(skip).limit(limit).to_list(limit)
-    for listing in listings:
-        if isinstance(listing.get("created_at"), str):
-            listing["created_at"] = datetime.fromisoformat(listing["created_at"])
-        if isinstance(listing.get("auction_end_date"), str):
-            listing["auction_end_date"] = datetime.fromisoformat(listing["auction_end_date"])
-    return [Listing(**listing) for listing in listings]
+    ranked_ids = await search_index.search_ids(
+        db, "listing", search, indexed_filters("listing", query), ranked=sort == "relevance"
+    ) if search else None
+    if ranked_ids is not None:
+        query["id"] = {"$in": ranked_ids}
+    headers = {}
+    if sort == "relevance" and ranked_ids is not None:
+        listings = await search_index.ranked_page(db.listings, query, ranked_ids, skip, limit, shape.projection)
+    else:
+        if sort == "relevance":
+            sort = "created_at"
+        sort_order = -1 if sort.startswith("-") else 1
+        sort_field = sort[1:] if sort.startswith("-") else sort
+        if sort_field not in LISTING_SORT_FIELDS:
+            raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(LISTING_SORT_FIELDS)}")
+        try:
+            page = await fetch_page(
+                db.listings, query, sort_field, sort_order, limit, cursor,
+                {**shape.projection, sort_field: 1}, skip=skip
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        listings = page.items
+    
+    return Response(fast_dumps(shape.fill_many(listings)), media_type="application/json", headers=headers)
 
 @api_router.get("/listings/{listing_id}", response_model=Listing)
 async def get_listing(listing_id: str):
@@ -2109,10 +2269,6 @@ async def get_listing(listing_id: str):
     if not listing_doc:
         raise HTTPException(status_code=404, detail="Listing not found")
     await db.listings.update_one({"id": listing_id}, {"$inc": {"views": 1}})
-    if isinstance(listing_doc.get("created_at"), str):
-        listing_doc["created_at"] = datetime.fromisoformat(listing_doc["created_at"])
-    if isinstance(listing_doc.get("auction_end_date"), str):
-        listing_doc["auction_end_date"] = datetime.fromisoformat(listing_doc["auction_end_date"])
     return Listing(**listing_doc)
 
 @api_router.put("/listings/{listing_id}", response_model=Listing)
@@ -2126,11 +2282,10 @@ async def update_listing(listing_id: str, updates: Dict[str, Any], current_user:
     update_data = {k: v for k, v in updates.items() if k in allowed_fields}
     if update_data:
         await db.listings.update_one({"id": listing_id}, {"$set": update_data})
+        await marketplace_index.sync_listing(db, listing_id)
     updated_listing = await db.listings.find_one({"id": listing_id}, {"_id": 0})
-    if isinstance(updated_listing.get("created_at"), str):
-        updated_listing["created_at"] = datetime.fromisoformat(updated_listing["created_at"])
-    if isinstance(updated_listing.get("auction_end_date"), str):
-        updated_listing["auction_end_date"] = datetime.fromisoformat(updated_listing["auction_end_date"])
+    if "title" in update_data or "description" in update_data:
+        await search_index.index_listing(db, updated_listing)
     return Listing(**updated_listing)
 
 @api_router.delete("/listings/{listing_id}")
@@ -2141,8 +2296,15 @@ async def delete_listing(listing_id: str, current_user: User = Depends(get_curre
     if listing["seller_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     await db.listings.delete_one({"id": listing_id})
+    await marketplace_index.remove_source(db, listing_id)
+    await search_index.remove(db, listing_id)
     return {"message": "Listing deleted successfully"}
 
+@api_router.get("/search/suggest")
+async def search_suggest(q: str, limit: int = Query(10, ge=1, le=25)):
+    """Autocomplete listing and auction titles as the user types (accent-insensitive, English/French)"""
+    return {"suggestions": await search_index.suggest(db, q, limit)}
+
 @api_router.get("/marketplace/items")
 async def get_marketplace_items(
     search: Optional[str] = None,
@@ -2153,6 +2315,7 @@ async def get_marketplace_items(
     sort: str = "-promoted",  # Default: promoted first
     limit: int = 50,
     skip: int = 0,
+    cursor: Optional[str] = None,
     track_impression: bool = False
 ):
     """
@@ -2162,276 +2325,43 @@ async def get_marketplace_items(
     - Promoted items appear first
     - Each item has individual Buy Now price, bid, and staggered end time
     - Tracks impressions for promoted items
+
+    Served from the materialized `marketplace_items` collection, so filtering,
+    sorting and pagination all run as indexed queries.
+    Next page: pass next_cursor back as cursor (skip is deprecated).
     """
-    # Query active multi-item auctions
-    query = {"status": "active"}
-    
-    if category:
-        query["category"] = category
-    
-    if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}}
-        ]
-    
-    # Fetch all active auctions (multi-item)
-    auctions = await db.multi_item_listings.find(query, {"_id": 0}).to_list(None)
-    
-    # Fetch single listings (non-multi-item)
-    single_query = {"status": "active"}
-    if category:
-        single_query["category"] = category
-    if search:
-        single_query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}}
-        ]
-    
-    single_listings = await db.listings.find(single_query, {"_id": 0}).to_list(None)
-    
-    # Cache seller tax status to avoid repeated DB lookups
-    seller_tax_cache = {}
-    
-    # Decompose lots into individual items
-    items = []
-    
-    for auction in auctions:
-        # Lookup seller's tax registration status (cached)
-        seller_id = auction.get("seller_id")
-        if seller_id not in seller_tax_cache:
-            seller = await db.users.find_one({"id": seller_id}, {"_id": 0, "is_tax_registered": 1})
-            seller_tax_cache[seller_id] = seller.get("is_tax_registered", False) if seller else False
-        
-        seller_is_business = seller_tax_cache[seller_id]
-        
-        # Track impressions for promoted auctions
-        if auction.get("is_promoted") and track_impression:
-            await db.multi_item_listings.update_one(
-                {"id": auction["id"]},
-                {"$inc": {"total_impressions": 1}}
-            )
-        
-        for lot in auction.get("lots", []):
-            # Skip sold out lots
-            if lot.get("lot_status") == "sold_out":
-                continue
-            
-            # Apply price filters
-            current_price = lot.get("current_price", lot.get("starting_price", 0))
-            if min_price is not None and current_price < min_price:
-                continue
-            if max_price is not None and current_price > max_price:
-                continue
-            
-            # Apply condition filter
-            if condition and lot.get("condition") != condition:
-                continue
-            
-            # Calculate staggered end time
-            # Item end time = base auction end + (lot_number * 1 minute)
-            base_end_time = auction.get("auction_end_date")
-            if isinstance(base_end_time, str):
-                base_end_time = datetime.fromisoformat(base_end_time)
-            
-            lot_end_time = lot.get("lot_end_time")
-            if not lot_end_time and base_end_time:
-                # Calculate staggered time: base + (lot_number * 60 seconds)
-                stagger_seconds = lot["lot_number"] * 60
-                lot_end_time = base_end_time + timedelta(seconds=stagger_seconds)
-            elif isinstance(lot_end_time, str):
-                lot_end_time = datetime.fromisoformat(lot_end_time)
-            
-            # Build decomposed item
-            item = {
-                "id": f"{auction['id']}_lot{lot['lot_number']}",  # Composite ID
-                "auction_id": auction["id"],
-                "lot_number": lot["lot_number"],
-                "title": lot["title"],
-                "description": lot["description"],
-                "category": auction.get("category"),
-                "condition": lot.get("condition"),
-                "images": lot.get("images", []),
-                
-                # Pricing
-                "starting_price": lot.get("starting_price"),
-                "current_price": current_price,
-                "buy_now_price": lot.get("buy_now_price"),
-                "buy_now_enabled": lot.get("buy_now_enabled", False),
-                
-                # Quantity
-                "quantity": lot.get("quantity", 1),
-                "available_quantity": lot.get("available_quantity", lot.get("quantity", 1)),
-                "sold_quantity": lot.get("sold_quantity", 0),
-                
-                # Bidding
-                "bid_count": lot.get("bid_count", 0),
-                "highest_bidder_id": lot.get("highest_bidder_id"),
-                
-                # Timing
-                "auction_end_date": lot_end_time.isoformat() if lot_end_time else None,
-                "extension_count": lot.get("extension_count", 0),
-                
-                # Status
-                "lot_status": lot.get("lot_status", "active"),
-                "pricing_mode": lot.get("pricing_mode", "multiplied"),
-                
-                # Promotion (inherited from parent auction)
-                "is_promoted": auction.get("is_promoted", False),
-                "promotion_tier": auction.get("promotion_tier"),
-                "is_featured": auction.get("is_featured", False),
-                
-                # Parent context
-                "parent_auction_title": auction.get("title"),
-                "total_lots_in_auction": len(auction.get("lots", [])),
-                "seller_id": auction.get("seller_id"),
-                "seller_is_business": seller_is_business,  # For Private Sale badge
-                
-                # Location
-                "city": auction.get("city"),
-                "region": auction.get("region"),
-                "country": auction.get("country"),
-                
-                # Metadata
-                "created_at": auction.get("created_at")
-            }
-            
-            items.append(item)
-    
-    # Add single listings to items array
-    for listing in single_listings:
-        # Check price filters
-        current_price = listing.get("current_price", listing.get("starting_price", 0))
-        if min_price is not None and current_price < min_price:
-            continue
-        if max_price is not None and current_price > max_price:
-            continue
-        
-        # Check condition filter
-        if condition and listing.get("condition") != condition:
-            continue
-        
-        # Get seller tax status for Private Sale badge
-        seller_id = listing.get("seller_id")
-        if seller_id not in seller_tax_cache:
-            seller = await db.users.find_one({"id": seller_id}, {"_id": 0, "is_tax_registered": 1})
-            seller_tax_cache[seller_id] = seller.get("is_tax_registered", False) if seller else False
-        
-        seller_is_business = seller_tax_cache[seller_id]
-        
-        # Build item object compatible with marketplace format
-        item = {
-            "id": listing["id"],
-            "auction_id": None,  # Single listing, no parent auction
-            "lot_number": None,
-            "title": listing["title"],
-            "description": listing.get("description"),
-            "category": listing.get("category"),
-            "condition": listing.get("condition"),
-            "images": listing.get("images", []),
-            
-            # Pricing
-            "starting_price": listing.get("starting_price"),
-            "current_price": current_price,
-            "buy_now_price": listing.get("buy_now_price"),
-            "buy_now_enabled": listing.get("buy_now_price") is not None,
-            
-            # Quantity
-            "quantity": 1,
-            "available_quantity": 1,
-            "sold_quantity": 0,
-            
-            # Bidding
-            "bid_count": listing.get("bid_count", 0),
-            "highest_bidder_id": listing.get("highest_bidder_id"),
-            
-            # Timing
-            "auction_end_date": listing.get("auction_end_date"),
-            "extension_count": 0,
-            
-            # Status
-            "lot_status": listing.get("status", "active"),
-            "pricing_mode": "fixed",
-            
-            # Promotion
-            "is_promoted": listing.get("is_promoted", False),
-            "promotion_tier": listing.get("promotion_tier"),
-            "is_featured": listing.get("is_featured", False),
-            
-            # Parent context
-            "parent_auction_title": None,
-            "total_lots_in_auction": 0,
-            "seller_id": listing.get("seller_id"),
-            "seller_is_business": seller_is_business,
-            
-            # Location
-            "city": listing.get("city"),
-            "region": listing.get("region"),
-            "country": listing.get("country"),
-            
-            # Metadata
-            "created_at": listing.get("created_at")
-        }
-        
-        items.append(item)
-    
-    
+    query = marketplace_index.build_query(search, category, min_price, max_price, condition)
+
     # Sorting logic - UPDATED HIERARCHY
     # Level 1: is_featured (pinned)
     # Level 2: Ending soon (last 60 minutes climb to top)
     # Level 3: Standard results
-    now = datetime.now(timezone.utc)
-    
-    if sort == "-promoted":
-        # Promoted items first (by tier), then by created_at
-        promotion_weight = {"premium": 3, "standard": 2, "basic": 1, None: 0}
-        
-        def get_urgency_score(item):
-            """Items in last 60 minutes get urgency boost"""
-            if item.get("auction_end_date"):
-                end_time = datetime.fromisoformat(item["auction_end_date"].replace("Z", "+00:00")) if isinstance(item["auction_end_date"], str) else item["auction_end_date"]
-                if end_time.tzinfo is None:
-                    end_time = end_time.replace(tzinfo=timezone.utc)
-                time_remaining = (end_time - now).total_seconds()
-                if 0 < time_remaining <= 3600:  # Within 60 minutes
-                    return 1000 - time_remaining  # Higher score for less time
-            return 0
-        
-        items.sort(
-            key=lambda x: (
-                -1 if x.get("is_featured") else 0,  # Level 1: Featured FIRST (pinned)
-                -get_urgency_score(x),  # Level 2: Urgency (last 60 min)
-                -promotion_weight.get(x.get("promotion_tier"), 0),  # Then promoted
-                -(x.get("created_at").timestamp() if isinstance(x.get("created_at"), datetime) else 0)  # Newest
-            )
-        )
-    elif sort == "price":
-        items.sort(key=lambda x: x.get("current_price", 0))
-    elif sort == "-price":
-        items.sort(key=lambda x: -x.get("current_price", 0))
-    elif sort == "ending_soon":
-        # Updated: Featured first, then by end time
-        items.sort(
-            key=lambda x: (
-                0 if x.get("is_featured") else 1,  # Featured first
-                datetime.fromisoformat(x["auction_end_date"].replace("Z", "+00:00")) if x.get("auction_end_date") else datetime.max
+    total_items = await db.marketplace_items.count_documents(query)
+    try:
+        page = await marketplace_index.fetch_page(db, query, sort, limit, cursor, skip=0 if cursor else skip)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    paginated_items = page.items
+
+    # Track impressions for promoted auctions shown on this page
+    if track_impression:
+        promoted_auction_ids = list({
+            item["auction_id"] for item in paginated_items
+            if item.get("is_promoted") and item.get("auction_id")
+        })
+        if promoted_auction_ids:
+            await db.multi_item_listings.update_many(
+                {"id": {"$in": promoted_auction_ids}},
+                {"$inc": {"total_impressions": 1}}
             )
-        )
-    else:  # Default: newest first
-        items.sort(
-            key=lambda x: -(x.get("created_at").timestamp() if isinstance(x.get("created_at"), datetime) else 0)
-        )
-    
-    # Pagination
-    total_items = len(items)
-    paginated_items = items[skip:skip + limit]
-    
+
     return {
         "items": paginated_items,
         "total": total_items,
         "limit": limit,
         "skip": skip,
-        "has_more": (skip + limit) < total_items
+        "has_more": page.next_cursor is not None,
+        "next_cursor": page.next_cursor
     }
 
 @api_router.post("/marketplace/items/{item_id}/track-click")
@@ -2451,25 +2381,90 @@ async def track_item_click(item_id: str):
     
     return {"success": True}
 
+async def enqueue_outbid_notifications(
+    user_id: str,
+    bid_id: str,
+    notification: Dict[str, Any],
+    listing_id: str,
+    listing_title: str,
+    images: Optional[List[str]],
+    new_bid_amount: float,
+    previous_bid_amount: float
+):
+    """Queue the in-app, SMS and email outbid notices; keyed by the new bid so retries never duplicate"""
+    key = f"outbid:{bid_id}"
+    await notification_outbox.enqueue([
+        outbox_entry("in_app", "outbid", user_id, notification, key),
+        outbox_entry("sms", "outbid", user_id, {
+            "user_id": user_id,
+            "listing_title": listing_title,
+            "new_bid_amount": new_bid_amount,
+            "previous_bid_amount": previous_bid_amount,
+            "listing_id": listing_id
+        }, key),
+        outbox_entry("email", "outbid", user_id, {
+            "listing": {"id": listing_id, "title": listing_title, "images": (images or [""])[:1]},
+            "new_bid_amount": new_bid_amount
+        }, key),
+    ])
+
+async def notify_listing_outbid(user_id: str, bid_id: str, listing: Dict[str, Any], new_bid_amount: float, previous_bid_amount: float):
+    """Outbid notice for a single listing (in-app + SMS + email via the outbox)"""
+    outbid_notification = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "type": "outbid",
+        "title": "You've been outbid! 🔔",
+        "message": f"Someone placed a higher bid of ${new_bid_amount:.2f} on '{listing.get('title', 'Item')}'. Tap to bid again.",
+        "data": {
+            "listing_id": listing["id"],
+            "current_bid": new_bid_amount,
+            "listing_title": listing.get("title")
+        },
+        "read": False,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    # In-app, SMS and email are queued in one write and delivered off the request path
+    await enqueue_outbid_notifications(
+        user_id=user_id,
+        bid_id=bid_id,
+        notification=outbid_notification,
+        listing_id=listing["id"],
+        listing_title=listing.get("title", "Item"),
+        images=listing.get("images"),
+        new_bid_amount=new_bid_amount,
+        previous_bid_amount=previous_bid_amount
+    )
+    logger.info(f"📢 Outbid notification queued for user {user_id}")
+
+async def require_bidder(current_user: User):
+    """High-trust gate for anything that places bids: phone verified + payment method (admins exempt)"""
+    try:
+        await check_bidder(db, current_user.id, current_user.role, current_user.phone_verified)
+    except BidRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+def anti_snipe_window(settings: dict) -> Optional[int]:
+    """Anti-sniping window in seconds from marketplace settings, None when disabled"""
+    if not settings.get("enable_anti_sniping", True):
+        return None
+    return settings.get("anti_sniping_window_minutes", 2) * 60
+
+def extension_broadcast_fields(new_end: datetime) -> dict:
+    """Broadcast fields announcing an anti-sniping extension (epoch timestamps for timezone safety)"""
+    return {
+        'time_extended': True,
+        'new_auction_end': new_end.isoformat(),
+        'new_auction_end_epoch': get_epoch_timestamp(new_end),
+        'server_time_epoch': get_server_timestamp(),
+        'extension_reason': 'anti_sniping',
+    }
+
 @api_router.post("/bids")
 async def place_bid(bid_data: BidCreate, current_user: User = Depends(get_current_user)):
     # ========== HIGH-TRUST GATEKEEPING ==========
     # Server-side verification check (unless admin)
-    if current_user.role != 'admin':
-        # Check phone verification
-        if not current_user.phone_verified:
-            raise HTTPException(
-                status_code=403, 
-                detail="Phone verification required. Please verify your phone number before placing bids."
-            )
-        
-        # Check payment method
-        payment_methods = await db.payment_methods.count_documents({"user_id": current_user.id})
-        if payment_methods == 0:
-            raise HTTPException(
-                status_code=403, 
-                detail="Payment method required. Please add a payment card before placing bids."
-            )
+    await require_bidder(current_user)
     
     # ========== LOAD MARKETPLACE SETTINGS ==========
     settings = await get_marketplace_settings()
@@ -2479,148 +2474,99 @@ async def place_bid(bid_data: BidCreate, current_user: User = Depends(get_curren
         raise HTTPException(status_code=404, detail="Listing not found")
     if listing["seller_id"] == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot bid on your own listing")
-    if listing["status"] != "active":
-        raise HTTPException(status_code=400, detail="Listing is not active")
-    if isinstance(listing.get("auction_end_date"), str):
-        auction_end = datetime.fromisoformat(listing["auction_end_date"])
-    else:
-        auction_end = listing["auction_end_date"]
-    
-    now = datetime.now(timezone.utc)
     
     # ========== ANTI-SNIPING LOGIC (Configurable) ==========
     # Get anti-sniping settings from admin configuration
-    anti_sniping_enabled = settings.get("enable_anti_sniping", True)
-    anti_sniping_window_minutes = settings.get("anti_sniping_window_minutes", 2)
-    ANTI_SNIPE_WINDOW = anti_sniping_window_minutes * 60  # Convert to seconds
-    GRACE_PERIOD = 5  # 5 second grace for network latency
-    
-    time_remaining = (auction_end - now).total_seconds()
-    extension_applied = False
-    new_auction_end = None
-    
-    # Check if auction has truly ended (beyond grace period)
-    if time_remaining < -GRACE_PERIOD:
-        raise HTTPException(status_code=400, detail="Auction has ended")
-    
-    # If anti-sniping is enabled and bid is within final window, extend
-    if anti_sniping_enabled and time_remaining <= ANTI_SNIPE_WINDOW:
-        # Calculate new end time: Time of Bid + 120 seconds
-        new_auction_end = now + timedelta(seconds=ANTI_SNIPE_WINDOW)
-        extension_applied = True
-        logger.info(f"⏰ Anti-sniping triggered: listing={bid_data.listing_id}, time_remaining={time_remaining:.1f}s, new_end={new_auction_end.isoformat()}")
-    
-    # Calculate minimum bid using configurable increment from settings
-    min_increment = settings.get("minimum_bid_increment", 1.0)
-    min_bid = listing["current_price"] + min_increment
-    
-    if bid_data.amount <= listing["current_price"]:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Your bid must be at least ${min_bid:.2f} to lead."
-        )
+    ANTI_SNIPE_WINDOW = anti_snipe_window(settings)
+    GRACE_PERIOD = BID_GRACE_PERIOD  # grace for network latency; closes wait it out too
     
-    # Also validate the bid meets minimum increment
-    if bid_data.amount < min_bid:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Minimum bid increment is ${min_increment:.2f}. Your bid must be at least ${min_bid:.2f}."
-        )
+    # Minimum increment: the listing's schedule, or the flat increment from settings
+    flat_increment = settings.get("minimum_bid_increment", 1.0)
     
     # Create bid
     bid = Bid(listing_id=bid_data.listing_id, bidder_id=current_user.id, amount=bid_data.amount)
     bid_dict = bid.model_dump()
     bid_dict["created_at"] = bid_dict["created_at"].isoformat()
     
-    # Insert bid and update listing atomically
-    await db.bids.insert_one(bid_dict)
-    new_bid_count = listing.get("bid_count", 0) + 1
+    # Compare-and-set commit: only lands if the price we validated is still current
+    try:
+        outcome = await get_bid_engine(db).place_listing_bid(
+            bid_data.listing_id,
+            current_user.id,
+            bid_data.amount,
+            bid_dict,
+            min_increment_for=lambda snapshot, price: minimum_increment(snapshot, price, flat_increment),
+            anti_snipe_window=ANTI_SNIPE_WINDOW,
+            grace_period=GRACE_PERIOD,
+            snapshot=listing
+        )
+    except BidRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     
-    update_fields = {
-        "current_price": bid_data.amount,
-        "highest_bidder_id": current_user.id
+    listing = outcome["previous"]
+    new_bid_count = outcome["bid_count"]
+    extension_applied = outcome["extension_applied"]
+    new_auction_end = outcome["new_end"]
+    if extension_applied:
+        logger.info(f"⏰ Anti-sniping triggered: listing={bid_data.listing_id}, new_end={new_auction_end.isoformat()}")
+        await get_auction_timer(db).schedule(("listing", bid_data.listing_id), new_auction_end)
+    
+    # ========== PROXY BIDDING ==========
+    # Active Auto-Bid max bids answer this bid in one step (one bulk write, one broadcast)
+    top_bid = {
+        'id': bid_dict['id'],
+        'bidder_id': current_user.id,
+        'amount': bid_data.amount,
+        'created_at': bid_dict['created_at']
     }
-    
-    # Apply time extension if anti-sniping triggered
-    if extension_applied and new_auction_end:
-        update_fields["auction_end_date"] = new_auction_end.isoformat()
-        update_fields["extension_count"] = listing.get("extension_count", 0) + 1
-    
-    await db.listings.update_one(
-        {"id": bid_data.listing_id}, 
-        {
-            "$set": update_fields,
-            "$inc": {"bid_count": 1}
-        }
+    proxy = await get_proxy_bidding(db).run(
+        bid_data.listing_id,
+        increment_for=lambda snapshot, price: minimum_increment(snapshot, price, flat_increment),
+        anti_snipe_window=ANTI_SNIPE_WINDOW
     )
+    if proxy:
+        new_bid_count = proxy["bid_count"]
+        top_bid = {key: proxy["bids"][-1][key] for key in ('id', 'bidder_id', 'amount', 'created_at')}
+        if proxy["extension_applied"]:
+            extension_applied, new_auction_end = True, proxy["new_end"]
+            await get_auction_timer(db).schedule(("listing", bid_data.listing_id), new_auction_end)
+    
+    await marketplace_index.sync_listing(db, bid_data.listing_id)
     
     # Real-time broadcast with personalized status AND time extension
     broadcast_data = {
         'bid_count': new_bid_count,
-        'current_price': bid_data.amount
+        'current_price': top_bid['amount']
     }
     
     # Include time extension info in broadcast (with epoch timestamp for timezone safety)
     if extension_applied and new_auction_end:
-        broadcast_data['time_extended'] = True
-        broadcast_data['new_auction_end'] = new_auction_end.isoformat()
-        broadcast_data['new_auction_end_epoch'] = get_epoch_timestamp(new_auction_end)  # Timezone-safe
-        broadcast_data['server_time_epoch'] = get_server_timestamp()
-        broadcast_data['extension_reason'] = 'anti_sniping'
+        broadcast_data.update(extension_broadcast_fields(new_auction_end))
     
-    await manager.broadcast_bid_update(
-        bid_data.listing_id,
-        {
-            'id': bid_dict['id'],
-            'bidder_id': current_user.id,
-            'amount': bid_data.amount,
-            'created_at': bid_dict['created_at']
-        },
-        broadcast_data
-    )
+    await manager.broadcast_bid_update(bid_data.listing_id, top_bid, broadcast_data)
     
     # ========== OUTBID NOTIFICATION (Single-Item) ==========
-    # Notify previous highest bidder via in-app notification + SMS
+    # Notify the previous highest bidder (unless their max bid took the lead back)
+    # and this bidder when a max bid outbid them immediately
     previous_highest_bidder = listing.get("highest_bidder_id")
     previous_highest_bid = listing.get("current_price", 0)
     
-    if previous_highest_bidder and previous_highest_bidder != current_user.id:
-        # Create in-app notification
-        outbid_notification = {
-            "id": str(uuid.uuid4()),
-            "user_id": previous_highest_bidder,
-            "type": "outbid",
-            "title": "You've been outbid! 🔔",
-            "message": f"Someone placed a higher bid of ${bid_data.amount:.2f} on '{listing.get('title', 'Item')}'. Tap to bid again.",
-            "data": {
-                "listing_id": bid_data.listing_id,
-                "current_bid": bid_data.amount,
-                "listing_title": listing.get("title")
-            },
-            "read": False,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        await db.notifications.insert_one(outbid_notification)
-        logger.info(f"📢 Outbid notification created for user {previous_highest_bidder}")
-        
-        # Send SMS notification (async, non-blocking)
-        try:
-            sms_service = get_sms_notification_service(db)
-            await sms_service.notify_outbid(
-                user_id=previous_highest_bidder,
-                listing_title=listing.get("title", "Item"),
-                new_bid_amount=bid_data.amount,
-                previous_bid_amount=previous_highest_bid,
-                listing_id=bid_data.listing_id
-            )
-        except Exception as sms_error:
-            logger.warning(f"📵 SMS outbid notification failed: {sms_error}")
+    outbid = []
+    if previous_highest_bidder and previous_highest_bidder not in (current_user.id, top_bid['bidder_id']):
+        outbid.append((previous_highest_bidder, bid_dict["id"], previous_highest_bid))
+    if top_bid['bidder_id'] != current_user.id:
+        outbid.append((current_user.id, top_bid['id'], bid_data.amount))
+    
+    for outbid_user_id, outbid_by_bid_id, outbid_amount in outbid:
+        await notify_listing_outbid(outbid_user_id, outbid_by_bid_id, listing, top_bid['amount'], outbid_amount)
     
     logger.info(f"Bid placed: listing={bid_data.listing_id}, bidder={current_user.id}, amount={bid_data.amount}, extension={extension_applied}")
     
     # Return bid with extension info
     response = bid.model_dump()
     response["created_at"] = bid_dict["created_at"]
+    response["current_price"] = top_bid['amount']
+    response["is_leading"] = top_bid['bidder_id'] == current_user.id
     if extension_applied:
         response["extension_applied"] = True
         response["new_auction_end"] = new_auction_end.isoformat()
@@ -2715,13 +2661,21 @@ async def purchase_buy_now(
     if new_available_qty == 0:
         update_fields[f"lots.{lot_index}.lot_status"] = "sold_out"
     
+    # Compare-and-set on the sold quantity we read so concurrent buyers can't oversell
     result = await db.multi_item_listings.update_one(
-        {"id": purchase.auction_id},
+        {
+            "id": purchase.auction_id,
+            "status": "active",
+            f"lots.{lot_index}.lot_number": purchase.lot_number,
+            f"lots.{lot_index}.sold_quantity": target_lot.get("sold_quantity")
+        },
         {"$set": update_fields}
     )
     
     if result.modified_count == 0:
-        raise HTTPException(status_code=500, detail="Failed to update inventory")
+        raise HTTPException(status_code=409, detail="Inventory changed while purchasing. Please try again.")
+    
+    await marketplace_index.sync_lot(db, purchase.auction_id, purchase.lot_number)
     
     # Create transaction record
     transaction = BuyNowTransaction(
@@ -2889,7 +2843,7 @@ async def get_seller_dashboard(current_user: User = Depends(get_current_user)):
     listings = await db.listings.find({"seller_id": current_user.id}, {"_id": 0}).to_list(1000)
     
     # Fetch multi-item listings
-    multi_listings = await db.multi_item_listings.find({"seller_id": current_user.id}, {"_id": 0}).to_list(1000)
+    multi_listings = await db.multi_item_listings.find({"seller_id": current_user.id}, WITHOUT_ATTACHMENTS).to_list(1000)
     
     # Combine both types for dashboard display
     all_listings = listings + multi_listings
@@ -2922,7 +2876,7 @@ async def get_buyer_dashboard(current_user: User = Depends(get_current_user)):
     watchlist_listing_ids = [item["listing_id"] for item in watchlist_items]
     watchlist_listings = await db.listings.find(
         {"id": {"$in": watchlist_listing_ids}, "status": {"$ne": "deleted"}},
-        {"_id": 0}
+        LISTING_SHAPE.projection
     ).to_list(100)
     
     return {
@@ -2966,12 +2920,12 @@ async def get_payment_status(session_id: str, current_user: User = Depends(get_c
     webhook_url = "http://localhost:8001/api/webhook/stripe"
     stripe_checkout = StripeCheckout(api_key=stripe_api_key, webhook_url=webhook_url)
     status: CheckoutStatusResponse = await stripe_checkout.get_checkout_status(session_id)
-    transaction = await db.payment_transactions.find_one({"session_id": session_id}, {"_id": 0})
-    if transaction and status.payment_status == "paid" and transaction["payment_status"] != "paid":
-        await db.payment_transactions.update_one({"session_id": session_id}, {"$set": {"payment_status": "paid"}})
+    transaction = await seller_stats.record_payment(db, session_id) if status.payment_status == "paid" else None
+    if transaction:
         listing_id = transaction.get("listing_id")
         if listing_id:
-            await db.listings.update_one({"id": listing_id}, {"$set": {"status": "sold"}})
+            await seller_stats.set_listing_status(db, listing_id, "sold")
+            await marketplace_index.sync_listing(db, listing_id)
     return status.model_dump()
 
 @api_router.post("/webhook/stripe")
@@ -2983,10 +2937,11 @@ async def stripe_webhook(request: Request):
     try:
         webhook_response = await stripe_checkout.handle_webhook(body, signature)
         if webhook_response.payment_status == "paid":
-            await db.payment_transactions.update_one({"session_id": webhook_response.session_id}, {"$set": {"payment_status": "paid"}})
+            await seller_stats.record_payment(db, webhook_response.session_id)
             transaction = await db.payment_transactions.find_one({"session_id": webhook_response.session_id})
             if transaction and transaction.get("listing_id"):
-                await db.listings.update_one({"id": transaction["listing_id"]}, {"$set": {"status": "sold"}})
+                await seller_stats.set_listing_status(db, transaction["listing_id"], "sold")
+                await marketplace_index.sync_listing(db, transaction["listing_id"])
             # Handle promotion payment
             if transaction and transaction.get("metadata") and transaction["metadata"].get("promotion_id"):
                 promotion_id = transaction["metadata"]["promotion_id"]
@@ -2994,6 +2949,7 @@ async def stripe_webhook(request: Request):
                 promotion = await db.promotions.find_one({"id": promotion_id})
                 if promotion and promotion.get("listing_id"):
                     await db.listings.update_one({"id": promotion["listing_id"]}, {"$set": {"is_promoted": True}})
+                    await marketplace_index.sync_listing(db, promotion["listing_id"])
         return {"status": "success"}
     except Exception as e:
         logger.error(f"Webhook error: {str(e)}")
@@ -3062,15 +3018,15 @@ async def websocket_endpoint(
     logger.info(f"✅ WebSocket connected: listing_id={listing_id}, user_id={user_id}, total_viewers={len(manager.active_connections.get(listing_id, []))}")
     
     try:
-        # Send initial connection confirmation
-        await websocket.send_json({
+        # Initial connection confirmation
+        initial_frames = [{
             'type': 'CONNECTION_ESTABLISHED',
             'listing_id': listing_id,
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'message': 'Real-time updates active'
-        })
+        }]
         
-        # Send current listing state
+        # Current listing state
         listing = await db.listings.find_one({"id": listing_id}, {"_id": 0})
         if listing:
             # Get highest bidder
@@ -3103,7 +3059,7 @@ async def websocket_endpoint(
             else:
                 auction_active = True
             
-            await websocket.send_json({
+            initial_frames.append({
                 'type': 'INITIAL_STATE',
                 'listing_id': listing_id,
                 'current_price': listing.get('current_price'),
@@ -3117,6 +3073,9 @@ async def websocket_endpoint(
                 'timestamp': now.isoformat()
             })
         
+        # Bid updates buffered while the state was read follow it, never precede it
+        manager.open(websocket, *initial_frames)
+        
         # Keep connection alive with heartbeat
         while True:
             try:
@@ -3126,19 +3085,17 @@ async def websocket_endpoint(
                 
                 # Handle ping/pong for connection health
                 if data.get('type') == 'PING':
-                    await websocket.send_json({
+                    manager.send_frame(websocket, {
                         'type': 'PONG',
                         'timestamp': datetime.now(timezone.utc).isoformat()
                     })
                     
             except asyncio.TimeoutError:
-                # Send heartbeat
-                try:
-                    await websocket.send_json({
-                        'type': 'HEARTBEAT',
-                        'timestamp': datetime.now(timezone.utc).isoformat()
-                    })
-                except:
+                # Send heartbeat (the socket was evicted if its queue is gone)
+                if not manager.send_frame(websocket, {
+                    'type': 'HEARTBEAT',
+                    'timestamp': datetime.now(timezone.utc).isoformat()
+                }):
                     break
                     
     except WebSocketDisconnect:
@@ -3212,6 +3169,7 @@ async def update_profile(updates: ProfileUpdate, current_user: User = Depends(ge
     update_data = {k: v for k, v in updates.model_dump().items() if v is not None}
     if update_data:
         await db.users.update_one({"id": current_user.id}, {"$set": update_data})
+        await auth_cache.invalidate_user(current_user.id)
     updated_user = await db.users.find_one({"id": current_user.id}, {"_id": 0, "password": 0})
     return updated_user
 
@@ -3246,13 +3204,6 @@ async def search_by_location(params: LocationSearchParams):
         ]
     
     listings = await db.listings.find(query, {"_id": 0}).limit(50).to_list(50)
-    
-    for listing in listings:
-        if isinstance(listing.get("created_at"), str):
-            listing["created_at"] = datetime.fromisoformat(listing["created_at"])
-        if isinstance(listing.get("auction_end_date"), str):
-            listing["auction_end_date"] = datetime.fromisoformat(listing["auction_end_date"])
-    
     return [Listing(**listing) for listing in listings]
 
 @api_router.get("/config/google-maps-key")
@@ -3409,11 +3360,18 @@ async def get_unread_message_count(current_user: User = Depends(get_current_user
     return {"unread_count": count}
 
 @api_router.get("/messages/{conversation_id}")
-async def get_messages(conversation_id: str, current_user: User = Depends(get_current_user), limit: int = 50):
-    messages = await db.messages.find(
-        {"conversation_id": conversation_id},
-        {"_id": 0}
-    ).sort("created_at", -1).limit(limit).to_list(limit)
+async def get_messages(
+    conversation_id: str, response: Response, current_user: User = Depends(get_current_user),
+    limit: int = 50, cursor: Optional[str] = None
+):
+    """Newest messages first; X-Next-Cursor pages further back in the conversation"""
+    try:
+        page = await fetch_page(db.messages, {"conversation_id": conversation_id}, "created_at", -1, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    messages = page.items
     
     await db.messages.update_many(
         {"conversation_id": conversation_id, "receiver_id": current_user.id},
@@ -3518,6 +3476,7 @@ async def update_tax_profile(
         {"id": current_user.id},
         {"$set": update_data}
     )
+    await auth_cache.invalidate_user(current_user.id)
     
     return {"success": True, "message": "Tax profile updated successfully"}
 
@@ -3603,6 +3562,7 @@ async def approve_tax_verification(
             "tax_verified_by": current_user.id
         }}
     )
+    await auth_cache.invalidate_user(user_id)
     
     # Send notification to user
     # TODO: Email notification
@@ -3654,6 +3614,7 @@ async def reject_tax_verification(
             "tax_rejected_by": current_user.id
         }}
     )
+    await auth_cache.invalidate_user(user_id)
     
     # TODO: Email notification
     
@@ -3688,6 +3649,7 @@ async def reset_tax_status(
             "tax_onboarding_completed": False
         }}
     )
+    await auth_cache.invalidate_user(user_id)
     
     return {"success": True, "message": "Tax status reset - user can resubmit"}
 
@@ -3704,35 +3666,27 @@ async def upload_message_attachment(
     """
     Upload a file attachment in a message conversation (Max 10MB)
     Supported formats: JPG, PNG, GIF, WebP, PDF
+    Streamed into blob storage; the message keeps a link to GET /blobs/{blob_id}.
     """
-    # Validate file size (10MB max)
-    contents = await file.read()
-    if len(contents) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File size must be less than 10MB")
+    from urllib.parse import quote_plus
     
     # Validate file type
     allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp', 'application/pdf']
     if file.content_type not in allowed_types:
         raise HTTPException(status_code=400, detail="Only JPG, PNG, GIF, WebP and PDF files are allowed")
     
-    # Generate unique filename
-    file_ext = file.filename.split('.')[-1] if '.' in file.filename else 'bin'
-    unique_filename = f"msg_{conversation_id}_{uuid.uuid4().hex[:8]}.{file_ext}"
-    
-    # Store file (in production, use S3/Cloudinary)
-    upload_dir = Path("uploads/messages")
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    file_path = upload_dir / unique_filename
-    
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    # Store file (10MB max, enforced while streaming)
+    try:
+        ref = await get_blob_storage(db).put(upload_chunks(file), file.filename, file.content_type, uploader_id=current_user.id)
+    except BlobTooLarge:
+        raise HTTPException(status_code=400, detail="File size must be less than 10MB")
     
     # Get the base URL for the file
     base_url = os.environ.get("BACKEND_URL", os.environ.get("REACT_APP_BACKEND_URL", "http://localhost:8001"))
-    file_url = f"{base_url}/api/uploads/messages/{unique_filename}"
+    file_url = f"{base_url}/api/blobs/{ref['blob_id']}?name={quote_plus(file.filename)}"
     
     # Create message with attachment
-    message_id = str(uuid4())
+    message_id = str(uuid.uuid4())
     message = {
         "id": message_id,
         "conversation_id": conversation_id,
@@ -3744,7 +3698,8 @@ async def upload_message_attachment(
             "url": file_url,
             "name": file.filename,
             "type": file.content_type,
-            "size": len(contents)
+            "size": ref["size"],
+            "blob_id": ref["blob_id"]
         }],
         "is_read": False,
         "created_at": datetime.now(timezone.utc).isoformat()
@@ -3971,7 +3926,7 @@ async def create_auction_won_conversation(
 
 @api_router.get("/uploads/messages/{filename}")
 async def serve_message_attachment(filename: str):
-    """Serve uploaded message attachment files"""
+    """Serve message attachments uploaded before blob storage (new ones link to /blobs)"""
     from fastapi.responses import FileResponse
     
     file_path = Path("uploads/messages") / filename
@@ -4011,6 +3966,8 @@ async def upload_document(
         "content_type": "application/pdf",
         "base64_content": "base64_encoded_string"
     }
+    The file goes to blob storage; the returned reference is what listings embed.
+    Prefer POST /blobs (multipart), which streams instead of decoding in memory.
     """
     import base64
     
@@ -4046,17 +4003,116 @@ async def upload_document(
                 detail=f"File too large. Maximum size is 10MB. File size: {file_size_mb:.2f}MB"
             )
         
+        ref = await get_blob_storage(db).put_bytes(decoded_content, filename, content_type, uploader_id=current_user.id)
         return {
             "success": True,
-            "filename": filename,
-            "content_type": content_type,
-            "size_mb": round(file_size_mb, 2),
-            "base64_content": base64_content
+            **ref,
+            "size_mb": round(file_size_mb, 2)
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid base64 content: {str(e)}")
 
+DOCUMENT_CONTENT_TYPES = ["application/pdf", "image/png", "image/jpeg", "image/jpg"]
+
+@api_router.post("/blobs")
+async def upload_blob(file: UploadFile = File(...), current_user: User = Depends(get_current_user)):
+    """
+    Upload an auction document (PDF or image, max 10MB) as multipart form data.
+    Streamed into blob storage in chunks; returns the reference to put in a listing's documents.
+    """
+    if file.content_type not in DOCUMENT_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed types: PDF, PNG, JPG. Got: {file.content_type}"
+        )
+    try:
+        return await get_blob_storage(db).put(upload_chunks(file), file.filename, file.content_type, uploader_id=current_user.id)
+    except BlobTooLarge as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+BLOB_PUBLIC_CACHE = "public, max-age=31536000, immutable"
+# Message attachments: browser cache only, never shared caches
+BLOB_PRIVATE_CACHE = "private, max-age=3600"
+
+async def blob_download(
+    blob_id: str,
+    filename: Optional[str] = None,
+    range_header: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+    disposition: str = "inline",
+    cache_control: str = BLOB_PUBLIC_CACHE
+):
+    """Stream a blob: single Range requests get 206, the sha256 id is the ETag"""
+    from fastapi.responses import StreamingResponse
+    from urllib.parse import quote
+    
+    storage = get_blob_storage(db)
+    blob = await storage.get(blob_id)
+    if not blob:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    headers = {
+        "ETag": f'"{blob["id"]}"',
+        "Accept-Ranges": "bytes",
+        "Cache-Control": cache_control
+    }
+    if filename:
+        headers["Content-Disposition"] = f"{disposition}; filename*=UTF-8''{quote(filename)}"
+    if etag_matches(if_none_match, blob["id"]):
+        return Response(status_code=304, headers=headers)
+    
+    size = blob["size"]
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(max(end - start + 1, 0))
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        storage.stream(blob, start, end),
+        status_code=206 if byte_range else 200,
+        media_type=blob.get("content_type") or "application/octet-stream",
+        headers=headers
+    )
+
+@api_router.get("/blobs/{blob_id}")
+async def download_blob(
+    blob_id: str,
+    name: Optional[str] = None,
+    range_header: Optional[str] = Header(None, alias="range"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Download a stored file by its content hash (Range and If-None-Match aware).
+    Message attachments are only served to members of the conversation, and never to shared caches.
+    """
+    return await guarded_blob_download(blob_id, current_user, name, range_header, if_none_match)
+
+async def guarded_blob_download(
+    blob_id: str,
+    current_user: Optional[User],
+    filename: Optional[str] = None,
+    range_header: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+    disposition: str = "inline"
+):
+    """blob_download behind message_blob_access: public blobs are cached publicly, message blobs only for members"""
+    access = await message_blob_access(db, blob_id, current_user.id if current_user else None)
+    if access is None:
+        return await blob_download(blob_id, filename, range_header, if_none_match, disposition)
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if not access:
+        raise HTTPException(status_code=404, detail="File not found")
+    return await blob_download(blob_id, filename, range_header, if_none_match, disposition, cache_control=BLOB_PRIVATE_CACHE)
+
 @api_router.post("/multi-item-listings")
 async def create_multi_item_listing(
     listing_data: MultiItemListingCreate, 
@@ -4176,6 +4232,12 @@ async def create_multi_item_listing(
             is_featured = True  # Elite gets homepage carousel placement
         logger.info(f"📣 Seller promoted listing: tier={promotion_tier}, ends={promotion_end}")
     
+    # Inline base64 documents go to blob storage; the listing keeps references
+    try:
+        documents = await store_documents(get_blob_storage(db), listing_data.documents, current_user.id)
+    except (ValueError, BlobTooLarge) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     # Calculate staggered lot_end_time (1 minute per lot)
     # Start from auction_end_date and stagger each lot by 1 minute
     # Each lot ends: auction_end_date + (lot_number * 1 minute)
@@ -4212,7 +4274,7 @@ async def create_multi_item_listing(
         promotion_tier=promotion_tier,
         promotion_start=promotion_start,
         promotion_end=promotion_end,
-        documents=listing_data.documents,
+        documents=documents,
         shipping_info=listing_data.shipping_info,
         visit_availability=listing_data.visit_availability,
         auction_terms_en=listing_data.auction_terms_en,
@@ -4224,10 +4286,6 @@ async def create_multi_item_listing(
     # Add legal agreement metadata
     listing_dict["agreement_metadata"] = agreement_metadata
     
-    listing_dict["auction_end_date"] = listing_dict["auction_end_date"].isoformat()
-    listing_dict["created_at"] = listing_dict["created_at"].isoformat()
-    if listing_dict["auction_start_date"]:
-        listing_dict["auction_start_date"] = listing_dict["auction_start_date"].isoformat()
     if listing_dict["promotion_expiry"]:
         listing_dict["promotion_expiry"] = listing_dict["promotion_expiry"].isoformat()
     if listing_dict.get("promotion_start"):
@@ -4235,25 +4293,34 @@ async def create_multi_item_listing(
     if listing_dict.get("promotion_end"):
         listing_dict["promotion_end"] = listing_dict["promotion_end"].isoformat()
     
-    # Serialize lot_end_time for each lot
-    for lot in listing_dict.get("lots", []):
-        if lot.get("lot_end_time"):
-            lot["lot_end_time"] = lot["lot_end_time"].isoformat()
-    
     await db.multi_item_listings.insert_one(listing_dict)
+    await marketplace_index.sync_auction(db, listing.id)
+    await search_index.index_auction(db, listing_dict)
+    await get_auction_timer(db).track_auction(listing.id)
     
     return listing
 
-@api_router.get("/multi-item-listings")
+@api_router.get("/multi-item-listings", response_model=List[MultiItemListing])
 async def get_multi_item_listings(
     limit: int = 50, 
     skip: int = 0, 
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
     category: Optional[str] = None,
     region: Optional[str] = None,
     currency: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    sort: Optional[str] = None,
+    fields: Optional[str] = None
 ):
+    """
+    Newest first; with search, sort=relevance ranks matches on the auction, lot titles and descriptions.
+    Summaries: documents, terms and lot descriptions are left out and lots holds the first
+    LOT_PREVIEW_SIZE lots (total_lots has the count) - the detail endpoint has the full auction.
+    fields=id,title,lots returns only those fields.
+    Served through the fast list path: projected to the MultiItemListing/Lot fields, no per-row models.
+    """
+    shape = select_fields(MULTI_ITEM_LISTING_SUMMARY, fields)
     # Build query filter
     query = {}
     
@@ -4276,32 +4343,31 @@ async def get_multi_item_listings(
     if currency:
         query["currency"] = currency
     
-    # Search filter (title or description)
-    if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}}
-        ]
-    
-    listings = await db.multi_item_listings.find(
-        query,
-        {"_id": 0}
-    ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-    
-    for listing in listings:
-        if isinstance(listing.get("created_at"), str):
-            listing["created_at"] = datetime.fromisoformat(listing["created_at"])
-        if isinstance(listing.get("auction_end_date"), str):
-            listing["auction_end_date"] = datetime.fromisoformat(listing["auction_end_date"])
-        if isinstance(listing.get("auction_start_date"), str):
-            listing["auction_start_date"] = datetime.fromisoformat(listing["auction_start_date"])
-        
-        # Deserialize lot_end_time for each lot
-        for lot in listing.get("lots", []):
-            if isinstance(lot.get("lot_end_time"), str):
-                lot["lot_end_time"] = datetime.fromisoformat(lot["lot_end_time"])
+    # Search filter (auction title/description and every lot's title/description)
+    ranked_ids = await search_index.search_ids(
+        db, "auction", search, indexed_filters("auction", query), ranked=sort == "relevance"
+    ) if search else None
+    if ranked_ids is not None:
+        query["id"] = {"$in": ranked_ids}
+    
+    headers = {}
+    projection = shape.projection
+    if sort == "relevance" and ranked_ids is not None:
+        listings = await search_index.ranked_page(db.multi_item_listings, query, ranked_ids, skip, limit, projection)
+    else:
+        # Keyset pagination; skip is kept for older clients
+        try:
+            page = await fetch_page(
+                db.multi_item_listings, query, "created_at", -1, limit, cursor,
+                {**projection, "created_at": 1}, skip=skip
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        listings = page.items
     
-    return [MultiItemListing(**listing) for listing in listings]
+    return Response(fast_dumps(shape.fill_many(listings)), media_type="application/json", headers=headers)
 
 @api_router.get("/multi-item-listings/{listing_id}")
 async def get_multi_item_listing(listing_id: str):
@@ -4309,29 +4375,57 @@ async def get_multi_item_listing(listing_id: str):
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found")
     
-    if isinstance(listing.get("created_at"), str):
-        listing["created_at"] = datetime.fromisoformat(listing["created_at"])
-    if isinstance(listing.get("auction_end_date"), str):
-        listing["auction_end_date"] = datetime.fromisoformat(listing["auction_end_date"])
-    if isinstance(listing.get("auction_start_date"), str):
-        listing["auction_start_date"] = datetime.fromisoformat(listing["auction_start_date"])
+    return MultiItemListing(**listing)
+
+@api_router.get("/multi-item-listings/{listing_id}/documents/{document_type}")
+async def download_auction_document(
+    listing_id: str,
+    document_type: str,
+    range_header: Optional[str] = Header(None, alias="range"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    One attached document (terms_conditions, important_info or catalogue) as a file.
+    Only that document is read from the auction; list responses never carry attachments.
+    Streamed from blob storage (Range aware); documents not yet migrated are decoded inline.
+    """
+    from urllib.parse import quote
     
-    # Deserialize lot_end_time for each lot
-    for lot in listing.get("lots", []):
-        if isinstance(lot.get("lot_end_time"), str):
-            lot["lot_end_time"] = datetime.fromisoformat(lot["lot_end_time"])
+    if document_type not in DOCUMENT_TYPES:
+        raise HTTPException(status_code=404, detail="Unknown document type")
     
-    return MultiItemListing(**listing)
+    listing = await db.multi_item_listings.find_one(
+        {"id": listing_id}, {"_id": 0, f"documents.{document_type}": 1}
+    )
+    if not listing:
+        raise HTTPException(status_code=404, detail="Listing not found")
+    document = (listing.get("documents") or {}).get(document_type)
+    if not document or not (document.get("blob_id") or document.get("base64_content")):
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    filename = document.get("filename") or f"{document_type}.pdf"
+    if document.get("blob_id"):
+        return await guarded_blob_download(document["blob_id"], current_user, filename, range_header, if_none_match, "attachment")
+    
+    try:
+        content = decode_document(document)
+    except ValueError:
+        raise HTTPException(status_code=500, detail="Stored document is corrupt")
+    return Response(
+        content,
+        media_type=document.get("content_type") or "application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"}
+    )
 
 @api_router.get("/multi-item-listings/{listing_id}/terms/pdf")
-async def export_auction_terms_pdf(listing_id: str):
+async def export_auction_terms_pdf(listing_id: str, if_none_match: Optional[str] = Header(None)):
     """
     Export auction terms as a PDF file.
     Includes bilingual terms if both EN and FR are provided.
+    Served from the PDF cache; unchanged terms answer If-None-Match with 304.
     """
-    from fastapi.responses import FileResponse
-    from weasyprint import HTML, CSS
-    import os
+    from fastapi.responses import FileResponse, Response
     
     try:
         # Get listing
@@ -4444,20 +4538,22 @@ async def export_auction_terms_pdf(listing_id: str):
         </html>
         """
         
-        # Create PDF
-        pdf_dir = "/app/temp_pdfs"
-        os.makedirs(pdf_dir, exist_ok=True)
         pdf_filename = f"auction_terms_{listing_id}.pdf"
-        pdf_path = os.path.join(pdf_dir, pdf_filename)
+        pdf_cache = get_pdf_cache()
+        etag = pdf_cache.key(html_content)
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "public, no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
         
-        # Generate PDF from HTML
-        HTML(string=html_content).write_pdf(pdf_path)
+        # Cached PDF, rendered on first request
+        cached_pdf = await generate_pdf_from_html(html_content)
         
         return FileResponse(
-            path=pdf_path,
+            path=cached_pdf.path,
             filename=pdf_filename,
             media_type="application/pdf",
             headers={
+                **headers,
                 "Content-Disposition": f"attachment; filename={pdf_filename}"
             }
         )
@@ -4488,6 +4584,7 @@ async def accept_auction_terms(listing_id: str, current_user: User = Depends(get
         {"id": current_user.id},
         {"$set": {agreement_key: datetime.now(timezone.utc).isoformat()}}
     )
+    await auth_cache.invalidate_user(current_user.id)
     
     return {
         "success": True,
@@ -4559,80 +4656,67 @@ async def calculate_fees_endpoint(
             "vip_rate": "2%"
         }
 
-@api_router.post("/multi-item-listings/{listing_id}/lots/{lot_number}/bid")
-async def bid_on_lot(listing_id: str, lot_number: int, data: Dict[str, Any], current_user: User = Depends(get_current_user)):
-    listing = await db.multi_item_listings.find_one({"id": listing_id}, {"_id": 0})
-    if not listing:
-        raise HTTPException(status_code=404, detail="Listing not found")
-    
-    if listing["seller_id"] == current_user.id:
-        raise HTTPException(status_code=400, detail="Cannot bid on your own listing")
-    
-    amount = data.get("amount")
-    bid_type = data.get("bid_type", "normal")  # normal, auto (monster bids removed)
-    lots = listing["lots"]
-    
-    lot_index = next((i for i, lot in enumerate(lots) if lot["lot_number"] == lot_number), None)
-    if lot_index is None:
-        raise HTTPException(status_code=404, detail="Lot not found")
-    
-    current_price = lots[lot_index]["current_price"]
-    
-    # Validate increment for all bids
-    min_increment = get_minimum_increment(listing, current_price)
-    if amount < current_price + min_increment:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Bid must be at least ${current_price + min_increment:.2f} (minimum increment: ${min_increment:.2f})"
-        )
-    
-    # Calculate minimum bid with helpful error message
-    min_bid = current_price + min_increment
-    
-    if amount <= current_price:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Your bid must be at least ${min_bid:.2f} to lead."
-        )
+@api_router.post("/multi-item-listings/{listing_id}/lots/{lot_number}/bid")
+async def bid_on_lot(listing_id: str, lot_number: int, data: Dict[str, Any], current_user: User = Depends(get_current_user)):
+    listing = await db.multi_item_listings.find_one(
+        {"id": listing_id},
+        {"_id": 0, "id": 1, "seller_id": 1, "title": 1, "increment_option": 1}
+    )
+    if not listing:
+        raise HTTPException(status_code=404, detail="Listing not found")
     
-    # Capture previous highest bidder for outbid notification
-    previous_highest_bidder = lot.get("highest_bidder_id")
+    if listing["seller_id"] == current_user.id:
+        raise HTTPException(status_code=400, detail="Cannot bid on your own listing")
     
-    # Update current price
-    lots[lot_index]["current_price"] = amount
-    lots[lot_index]["highest_bidder_id"] = current_user.id
+    amount = data.get("amount")
+    bid_type = data.get("bid_type", "normal")  # normal, auto (monster bids removed)
+    if not isinstance(amount, (int, float)):
+        raise HTTPException(status_code=400, detail="Bid amount is required")
     
     # ========== ANTI-SNIPING LOGIC (2-Minute Rule) ==========
     # If bid is placed within final 2 minutes, extend by 2 minutes from TIME OF BID
     # UNLIMITED extensions - auction only ends when bidding activity truly stops
     ANTI_SNIPE_WINDOW = 120  # 2 minutes in seconds
     
-    now = datetime.now(timezone.utc)
-    lot_end_time_str = lots[lot_index].get("lot_end_time")
-    extension_applied = False
-    new_end_time = None
-    extension_count = lots[lot_index].get("extension_count", 0)
-    
-    if lot_end_time_str:
-        lot_end_time = datetime.fromisoformat(lot_end_time_str) if isinstance(lot_end_time_str, str) else lot_end_time_str
-        time_remaining = (lot_end_time - now).total_seconds()
-        
-        # If within final 2 minutes, extend by 2 minutes from NOW (unlimited extensions)
-        if 0 < time_remaining <= ANTI_SNIPE_WINDOW:
-            # T_new = Time of Bid + 120 seconds
-            new_end_time = now + timedelta(seconds=ANTI_SNIPE_WINDOW)
-            lots[lot_index]["lot_end_time"] = new_end_time.isoformat()
-            lots[lot_index]["extension_count"] = extension_count + 1
-            extension_applied = True
-            logger.info(f"⏰ Anti-sniping triggered: listing={listing_id}, lot={lot_number}, old_end={lot_end_time.isoformat()}, new_end={new_end_time.isoformat()}, extensions={extension_count + 1}")
+    bid = {
+        "id": str(uuid.uuid4()),
+        "listing_id": listing_id,
+        "lot_number": lot_number,
+        "bidder_id": current_user.id,
+        "amount": amount,
+        "bid_type": bid_type,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    # Create a copy of bid for database insertion (MongoDB will add _id field to it)
+    bid_for_db = bid.copy()
     
+    # Compare-and-set commit on this lot only (positional update, siblings untouched)
     # Note: Cascading behavior is INDEPENDENT - Item 1 extension does NOT affect Item 2/3
-    # Each lot maintains its own end time independently
+    try:
+        outcome = await get_bid_engine(db).place_lot_bid(
+            listing_id,
+            lot_number,
+            current_user.id,
+            amount,
+            bid_for_db,
+            min_increment_for=get_minimum_increment,
+            anti_snipe_window=ANTI_SNIPE_WINDOW
+        )
+    except BidRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     
-    await db.multi_item_listings.update_one(
-        {"id": listing_id},
-        {"$set": {"lots": lots}}
-    )
+    now = datetime.now(timezone.utc)
+    lot = outcome["previous"]["lots"][0]
+    previous_highest_bidder = lot.get("highest_bidder_id")
+    previous_bid = lot.get("current_price", 0)
+    extension_applied = outcome["extension_applied"]
+    new_end_time = outcome["new_end"]
+    extension_count = outcome["extension_count"]
+    if extension_applied:
+        logger.info(f"⏰ Anti-sniping triggered: listing={listing_id}, lot={lot_number}, new_end={new_end_time.isoformat()}, extensions={extension_count}")
+    
+    await marketplace_index.sync_lot(db, listing_id, lot_number)
     
     # Broadcast time extension via WebSocket if applied
     if extension_applied and new_end_time:
@@ -4641,27 +4725,11 @@ async def bid_on_lot(listing_id: str, lot_number: int, data: Dict[str, Any], cur
             'listing_id': listing_id,
             'lot_number': lot_number,
             'new_end_time': new_end_time.isoformat(),
-            'extension_count': extension_count + 1,
+            'extension_count': extension_count,
             'reason': 'anti_sniping',
             'timestamp': now.isoformat()
         })
     
-    bid = {
-        "id": str(uuid.uuid4()),
-        "listing_id": listing_id,
-        "lot_number": lot_number,
-        "bidder_id": current_user.id,
-        "amount": amount,
-        "bid_type": bid_type,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    # Create a copy of bid for database insertion
-    bid_for_db = bid.copy()
-    
-    # Insert bid into database (MongoDB will add _id field to bid_for_db)
-    await db.lot_bids.insert_one(bid_for_db)
-    
     # ========== CREATE OUTBID NOTIFICATION ==========
     # Notify the previous highest bidder that they've been outbid
     if previous_highest_bidder and previous_highest_bidder != current_user.id:
@@ -4680,29 +4748,25 @@ async def bid_on_lot(listing_id: str, lot_number: int, data: Dict[str, Any], cur
             "read": False,
             "created_at": datetime.now(timezone.utc).isoformat()
         }
-        await db.notifications.insert_one(outbid_notification)
-        logger.info(f"📢 Outbid notification created for user {previous_highest_bidder}")
-        
-        # Send SMS notification (async, non-blocking)
-        try:
-            sms_service = get_sms_notification_service(db)
-            await sms_service.notify_outbid(
-                user_id=previous_highest_bidder,
-                listing_title=f"{listing.get('title', 'Item')} - Lot #{lot_number}",
-                new_bid_amount=amount,
-                previous_bid_amount=previous_bid,
-                listing_id=listing_id
-            )
-        except Exception as sms_error:
-            logger.warning(f"📵 SMS outbid notification failed: {sms_error}")
+        await enqueue_outbid_notifications(
+            user_id=previous_highest_bidder,
+            bid_id=bid["id"],
+            notification=outbid_notification,
+            listing_id=listing_id,
+            listing_title=f"{listing.get('title', 'Item')} - Lot #{lot_number}",
+            images=lot.get("images"),
+            new_bid_amount=amount,
+            previous_bid_amount=previous_bid
+        )
+        logger.info(f"📢 Outbid notification queued for user {previous_highest_bidder}")
     
     # Return response with clean bid data (original bid dict without MongoDB _id)
     response = {
         "message": "Bid placed successfully",
         "bid": bid,  # Original dict, not mutated by MongoDB
-        "minimum_next_bid": current_price + get_minimum_increment(listing, amount),
+        "minimum_next_bid": amount + get_minimum_increment(listing, amount),
         "extension_applied": extension_applied,
-        "extension_count": lots[lot_index].get("extension_count", 0)
+        "extension_count": extension_count
     }
     
     # Include new end time if extension was applied
@@ -4789,9 +4853,9 @@ async def websocket_messaging(websocket: WebSocket, conversation_id: str, user_i
                 "price": listing.get("current_price") or (listing.get("lots", [{}])[0].get("current_price") if listing.get("lots") else None)
             }
     
-    # Send connection confirmation with initial state
+    # Send connection confirmation with initial state (ahead of anything queued since connect)
     try:
-        await websocket.send_json({
+        message_manager.open(websocket, {
             "type": "CONNECTION_ESTABLISHED",
             "conversation_id": conversation_id,
             "other_user": other_user,
@@ -4831,7 +4895,7 @@ async def websocket_messaging(websocket: WebSocket, conversation_id: str, user_i
                     # Create and persist message
                     content = data.get("content", "").strip()
                     if not content:
-                        await websocket.send_json({"type": "ERROR", "message": "Message content required"})
+                        message_manager.send_frame(websocket, {"type": "ERROR", "message": "Message content required"})
                         continue
                     
                     message = Message(
@@ -4883,7 +4947,7 @@ async def websocket_messaging(websocket: WebSocket, conversation_id: str, user_i
                         })
                     
                     # Confirm to sender
-                    await websocket.send_json({
+                    message_manager.send_frame(websocket, {
                         "type": "MESSAGE_SENT",
                         "message_id": msg_dict["id"],
                         "timestamp": datetime.now(timezone.utc).isoformat()
@@ -4912,19 +4976,17 @@ async def websocket_messaging(websocket: WebSocket, conversation_id: str, user_i
                         await message_manager.broadcast_read_receipt(conversation_id, user_id, message_ids)
                     
                 elif msg_type == "PING":
-                    await websocket.send_json({
+                    message_manager.send_frame(websocket, {
                         "type": "PONG",
                         "timestamp": datetime.now(timezone.utc).isoformat()
                     })
                     
             except asyncio.TimeoutError:
-                # Send heartbeat on timeout
-                try:
-                    await websocket.send_json({
-                        "type": "HEARTBEAT",
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    })
-                except:
+                # Send heartbeat on timeout (the socket was evicted if its queue is gone)
+                if not message_manager.send_frame(websocket, {
+                    "type": "HEARTBEAT",
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                }):
                     break
                     
     except WebSocketDisconnect:
@@ -4933,7 +4995,7 @@ async def websocket_messaging(websocket: WebSocket, conversation_id: str, user_i
         logger.error(f"💬 WebSocket error: {str(e)}")
     finally:
         # Clean up and notify others
-        message_manager.disconnect(conversation_id, user_id)
+        message_manager.disconnect(conversation_id, user_id, websocket)
         
         # Notify other user that this user went offline
         await message_manager.send_to_conversation(
@@ -4967,17 +5029,26 @@ async def get_conversation_online_status(conversation_id: str, current_user: Use
     }
 
 @api_router.get("/admin/users")
-async def admin_get_users(current_user: User = Depends(get_current_user), limit: int = 100, skip: int = 0):
+async def admin_get_users(
+    response: Response, current_user: User = Depends(get_current_user),
+    limit: int = 100, skip: int = 0, cursor: Optional[str] = None
+):
     if not current_user.email.endswith("@bidvex.com"):
         raise HTTPException(status_code=403, detail="Admin access required")
-    users = await db.users.find({}, {"_id": 0, "password": 0}).skip(skip).limit(limit).to_list(limit)
-    return users
+    try:
+        page = await fetch_page(db.users, {}, "created_at", -1, limit, cursor, {"_id": 0, "password": 0}, skip=skip)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @api_router.put("/admin/users/{user_id}/status")
 async def admin_update_user_status(user_id: str, data: Dict[str, str], current_user: User = Depends(get_current_user)):
     if not current_user.email.endswith("@bidvex.com") and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     await db.users.update_one({"id": user_id}, {"$set": {"status": data.get("status")}})
+    await auth_cache.invalidate_user(user_id)
     return {"message": "User status updated"}
 
 # ========== MARKETPLACE SETTINGS API ==========
@@ -5080,6 +5151,7 @@ async def update_marketplace_settings(
         {"$set": update_data},
         upsert=True
     )
+    await config_cache.invalidate("marketplace_settings")
     
     # Log each change with detailed audit trail
     for change in changes:
@@ -5134,6 +5206,7 @@ async def restore_marketplace_defaults(current_user: User = Depends(get_current_
         system_defaults,
         upsert=True
     )
+    await config_cache.invalidate("marketplace_settings")
     
     # Log the reset action with detailed before/after
     log_entry = {
@@ -5250,6 +5323,7 @@ async def update_email_templates(
         },
         upsert=True
     )
+    await config_cache.invalidate("email_templates")
     
     return {
         "message": f"Updated {len(updated_keys)} template(s)",
@@ -5335,7 +5409,7 @@ async def get_all_multi_listings_admin(current_user: User = Depends(get_current_
     if not current_user.email.endswith("@bidvex.com"):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    listings = await db.multi_item_listings.find({}, {"_id": 0}).sort("created_at", -1).to_list(None)
+    listings = await db.multi_item_listings.find({}, WITHOUT_ATTACHMENTS).sort("created_at", -1).to_list(None)
     return listings
 
 
@@ -5453,6 +5527,8 @@ async def approve_deletion_request(
         await db.listings.delete_one({"id": request_doc["listing_id"]})
     else:
         await db.multi_item_listings.delete_one({"id": request_doc["listing_id"]})
+    await marketplace_index.remove_source(db, request_doc["listing_id"])
+    await search_index.remove(db, request_doc["listing_id"])
     
     # Mark request as approved
     await db.deletion_requests.update_one(
@@ -5527,8 +5603,11 @@ async def admin_moderate_listing(listing_id: str, data: Dict[str, str], current_
         await db.listings.update_one({"id": listing_id}, {"$set": {"status": "rejected"}})
     elif action == "remove":
         await db.listings.delete_one({"id": listing_id})
+        await search_index.remove(db, listing_id)
     else:
         raise HTTPException(status_code=400, detail="Invalid action")
+    await marketplace_index.sync_listing(db, listing_id)
+    await get_auction_timer(db).track_listing(listing_id)
     
     return {"message": f"Listing {action}d successfully"}
 
@@ -5539,6 +5618,22 @@ async def admin_get_transactions(current_user: User = Depends(get_current_user),
     transactions = await db.payment_transactions.find({}, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
     return transactions
 
+@api_router.get("/admin/metrics")
+async def admin_get_metrics(current_user: User = Depends(get_current_user)):
+    """Per-worker runtime metrics: WebSocket fan-out latency, evictions, connection counts"""
+    if not current_user.email.endswith("@bidvex.com"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    ws_metrics.set_gauge("ws_listing_connections", sum(len(c) for c in manager.active_connections.values()))
+    ws_metrics.set_gauge("ws_user_connections", sum(len(c) for c in manager.user_connections.values()))
+    ws_metrics.set_gauge("ws_conversation_connections", sum(len(r) for r in message_manager.conversation_rooms.values()))
+    # Backpressure: frames waiting in per-socket outbound queues
+    queue_depths = [queue.depth for queue in manager.outbound.values()]
+    ws_metrics.set_gauge("ws_outbound_queued_frames", sum(queue_depths))
+    ws_metrics.set_gauge("ws_outbound_max_depth", max(queue_depths, default=0))
+    ws_metrics.set_gauge("ws_outbound_high_water", max((q.high_water for q in manager.outbound.values()), default=0))
+    return {"worker_pid": os.getpid(), **ws_metrics.snapshot()}
+
 @api_router.get("/admin/analytics")
 async def admin_get_analytics(current_user: User = Depends(get_current_user)):
     if not current_user.email.endswith("@bidvex.com"):
@@ -5584,6 +5679,7 @@ async def admin_create_promotion(data: Dict[str, Any], current_user: User = Depe
     }
     await db.promotions.insert_one(promotion)
     await db.listings.update_one({"id": data.get("listing_id")}, {"$set": {"is_promoted": True}})
+    await marketplace_index.sync_listing(db, data.get("listing_id"))
     return promotion
 
 @api_router.delete("/admin/promotions/{promotion_id}")
@@ -5595,6 +5691,7 @@ async def admin_delete_promotion(promotion_id: str, current_user: User = Depends
     if promotion:
         await db.listings.update_one({"id": promotion.get("listing_id")}, {"$set": {"is_promoted": False}})
         await db.promotions.delete_one({"id": promotion_id})
+        await marketplace_index.sync_listing(db, promotion.get("listing_id"))
     return {"message": "Promotion deleted"}
 
 @api_router.put("/admin/listings/{listing_id}/feature")
@@ -5604,6 +5701,7 @@ async def admin_feature_listing(listing_id: str, data: Dict[str, bool], current_
     
     is_featured = data.get("is_featured", False)
     await db.listings.update_one({"id": listing_id}, {"$set": {"is_featured": is_featured}})
+    await marketplace_index.sync_listing(db, listing_id)
     return {"message": f"Listing {'featured' if is_featured else 'unfeatured'}"}
 
 # CATEGORY MANAGEMENT
@@ -5658,6 +5756,7 @@ async def admin_pause_auction(listing_id: str, current_user: User = Depends(get_
         raise HTTPException(status_code=403, detail="Admin access required")
     
     await db.listings.update_one({"id": listing_id}, {"$set": {"status": "paused"}})
+    await marketplace_index.sync_listing(db, listing_id)
     return {"message": "Auction paused"}
 
 @api_router.put("/admin/auctions/{listing_id}/resume")
@@ -5666,6 +5765,8 @@ async def admin_resume_auction(listing_id: str, current_user: User = Depends(get
         raise HTTPException(status_code=403, detail="Admin access required")
     
     await db.listings.update_one({"id": listing_id}, {"$set": {"status": "active"}})
+    await marketplace_index.sync_listing(db, listing_id)
+    await get_auction_timer(db).track_listing(listing_id)
     return {"message": "Auction resumed"}
 
 @api_router.put("/admin/auctions/{listing_id}/extend")
@@ -5673,8 +5774,12 @@ async def admin_extend_auction(listing_id: str, data: Dict[str, Any], current_us
     if not current_user.email.endswith("@bidvex.com"):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    new_end_date = data.get("new_end_date")
+    new_end_date = to_datetime(data.get("new_end_date"))
+    if new_end_date is None:
+        raise HTTPException(status_code=400, detail="new_end_date must be an ISO 8601 datetime")
     await db.listings.update_one({"id": listing_id}, {"$set": {"auction_end_date": new_end_date}})
+    await marketplace_index.sync_listing(db, listing_id)
+    await get_auction_timer(db).track_listing(listing_id)
     return {"message": "Auction extended"}
 
 @api_router.delete("/admin/auctions/{listing_id}/cancel")
@@ -5682,7 +5787,8 @@ async def admin_cancel_auction(listing_id: str, current_user: User = Depends(get
     if not current_user.email.endswith("@bidvex.com"):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    await db.listings.update_one({"id": listing_id}, {"$set": {"status": "cancelled"}})
+    await seller_stats.set_listing_status(db, listing_id, "cancelled")
+    await marketplace_index.sync_listing(db, listing_id)
     return {"message": "Auction cancelled"}
 
 # AFFILIATE PROGRAM MANAGEMENT
@@ -5754,6 +5860,7 @@ async def admin_verify_user(user_id: str, data: Dict[str, bool], current_user: U
     
     is_verified = data.get("is_verified", False)
     await db.users.update_one({"id": user_id}, {"$set": {"verified": is_verified, "verified_at": datetime.now(timezone.utc).isoformat()}})
+    await auth_cache.invalidate_user(user_id)
     return {"message": f"User {'verified' if is_verified else 'unverified'}"}
 
 @api_router.get("/admin/analytics/users")
@@ -5776,7 +5883,7 @@ async def admin_get_pending_lots(current_user: User = Depends(get_current_user))
     if not current_user.email.endswith("@bidvex.com"):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    lots = await db.multi_item_listings.find({"status": "pending"}, {"_id": 0}).sort("created_at", -1).to_list(100)
+    lots = await db.multi_item_listings.find({"status": "pending"}, WITHOUT_ATTACHMENTS).sort("created_at", -1).to_list(100)
     return lots
 
 @api_router.put("/admin/lots/{lot_id}/moderate")
@@ -5791,6 +5898,8 @@ async def admin_moderate_lot(lot_id: str, data: Dict[str, str], current_user: Us
         await db.multi_item_listings.update_one({"id": lot_id}, {"$set": {"status": "rejected"}})
     else:
         raise HTTPException(status_code=400, detail="Invalid action")
+    await marketplace_index.sync_auction(db, lot_id)
+    await get_auction_timer(db).track_auction(lot_id)
     
     return {"message": f"Lot {action}d successfully"}
 
@@ -5895,6 +6004,7 @@ async def admin_suspend_messaging(user_id: str, data: Dict[str, bool], current_u
     
     messaging_suspended = data.get("suspended", False)
     await db.users.update_one({"id": user_id}, {"$set": {"messaging_suspended": messaging_suspended}})
+    await auth_cache.invalidate_user(user_id)
     return {"message": f"Messaging {'suspended' if messaging_suspended else 'restored'}"}
 
 # ADMIN ACTION LOGS
@@ -5953,9 +6063,68 @@ async def admin_create_announcement(data: Dict[str, Any], current_user: User = D
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.announcements.insert_one(announcement)
+    announcement.pop("_id", None)
+
+    if data.get("send_email"):
+        # Fire-and-forget: recipients are resolved and emailed in the background
+        announcement["email_job_id"] = await get_email_service().start_bulk_job(
+            db,
+            "announcement",
+            lambda: announcement_email_groups(announcement),
+            created_by=current_user.id
+        )
+        await db.announcements.update_one(
+            {"id": announcement["id"]},
+            {"$set": {"email_job_id": announcement["email_job_id"]}}
+        )
     return announcement
 
 
+async def announcement_email_groups(announcement: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Announcement recipients for the target audience, grouped by language/template"""
+    audience = announcement.get("target_audience", "all")
+    query: Dict[str, Any] = {"email": {"$exists": True, "$ne": None}}
+    if audience == "business":
+        query["account_type"] = "business"
+    elif audience == "sellers":
+        query["id"] = {"$in": await db.listings.distinct("seller_id")}
+    elif audience == "buyers":
+        query["id"] = {"$in": await db.bids.distinct("bidder_id")}
+
+    by_language: Dict[str, List[Dict[str, Any]]] = {}
+    cursor = db.users.find(query, {"_id": 0, "email": 1, "name": 1, "preferred_language": 1})
+    async for user in cursor:
+        language = user.get("preferred_language") or "en"
+        by_language.setdefault(language, []).append({
+            "email": user["email"],
+            "data": {
+                "first_name": (user.get("name") or "").split(" ")[0],
+                "title": announcement.get("title"),
+                "message": announcement.get("message")
+            }
+        })
+
+    return [
+        {
+            "template_id": await get_email_template_id("comm_announcement", language),
+            "language": language,
+            "recipients": recipients
+        }
+        for language, recipients in by_language.items()
+    ]
+
+
+@api_router.get("/admin/email-jobs/{job_id}")
+async def admin_get_email_job(job_id: str, current_user: User = Depends(get_current_user)):
+    if not current_user.email.endswith("@bidvex.com"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    job = await db.email_jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Email job not found")
+    return job
+
+
 
 @api_router.get("/announcements/active")
 async def get_active_announcements():
@@ -5989,39 +6158,10 @@ async def admin_delete_announcement(announcement_id: str, current_user: User = D
 
 async def calculate_trust_score(user_id: str) -> int:
     """Calculate user trust score (0-100)"""
-    user = await db.users.find_one({"id": user_id})
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "created_at": 1, "email_verified": 1, "phone_verified": 1})
     if not user:
         return 0
-    
-    score = 50  # Base score
-    
-    # Account age bonus (max +15)
-    if user.get("created_at"):
-        account_age_days = (datetime.now(timezone.utc) - datetime.fromisoformat(user["created_at"])).days
-        score += min(15, account_age_days // 10)
-    
-    # Verification bonuses
-    if user.get("email_verified"):
-        score += 10
-    if user.get("phone_verified"):
-        score += 10
-    
-    # Transaction history bonus (max +20)
-    transactions = await db.payment_transactions.count_documents({"user_id": user_id, "payment_status": "paid"})
-    score += min(20, transactions * 2)
-    
-    # Report penalties
-    reports_against = await db.reports.count_documents({"reported_user_id": user_id})
-    score -= reports_against * 5
-    
-    # Completion rate bonus
-    completed = await db.listings.count_documents({"seller_id": user_id, "status": "sold"})
-    cancelled = await db.listings.count_documents({"seller_id": user_id, "status": "cancelled"})
-    if completed + cancelled > 0:
-        completion_rate = completed / (completed + cancelled)
-        score += int(completion_rate * 10)
-    
-    return max(0, min(100, score))
+    return seller_stats.trust_score(user, await seller_stats.get_stats(db, user_id))
 
 @api_router.get("/admin/trust-safety/scores")
 async def get_trust_scores(current_user: User = Depends(get_current_user)):
@@ -6029,10 +6169,11 @@ async def get_trust_scores(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Admin access required")
     
     users = await db.users.find({}, {"_id": 0, "password": 0}).to_list(100)
+    stats = await seller_stats.get_many(db, [user["id"] for user in users])
     
     scores = []
     for user in users:
-        trust_score = await calculate_trust_score(user["id"])
+        trust_score = seller_stats.trust_score(user, stats[user["id"]])
         scores.append({
             "user_id": user["id"],
             "name": user.get("name"),
@@ -6363,6 +6504,7 @@ async def execute_auto_action(data: Dict[str, Any], current_user: User = Depends
         await db.users.update_one({"id": user_id}, {"$set": {"email_verified": False, "phone_verified": False, "verification_required": True}})
     elif action == "suspend_account":
         await db.users.update_one({"id": user_id}, {"$set": {"status": "suspended", "suspension_reason": reason}})
+    await auth_cache.invalidate_user(user_id)
     
     # Log the action
     await db.admin_logs.insert_one({
@@ -6395,12 +6537,17 @@ async def create_notification(data: Dict[str, Any]):
     return notification
 
 @api_router.get("/notifications")
-async def get_notifications(current_user: User = Depends(get_current_user), limit: int = 50):
-    notifications = await db.notifications.find(
-        {"user_id": current_user.id},
-        {"_id": 0}
-    ).sort("created_at", -1).limit(limit).to_list(limit)
-    return notifications
+async def get_notifications(
+    response: Response, current_user: User = Depends(get_current_user),
+    limit: int = 50, cursor: Optional[str] = None
+):
+    try:
+        page = await fetch_page(db.notifications, {"user_id": current_user.id}, "created_at", -1, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @api_router.put("/notifications/{notification_id}/read")
 async def mark_notification_read(notification_id: str, current_user: User = Depends(get_current_user)):
@@ -6589,7 +6736,7 @@ async def get_watchlist(current_user: User = Depends(get_current_user)):
             listing_ids = [item.get("item_id") or item.get("listing_id") for item in listing_items]
             listings = await db.listings.find(
                 {"id": {"$in": listing_ids}, "status": {"$ne": "deleted"}},
-                {"_id": 0}
+                LISTING_SHAPE.projection
             ).to_list(100)
             
             listings_map = {listing["id"]: listing for listing in listings}
@@ -6609,8 +6756,9 @@ async def get_watchlist(current_user: User = Depends(get_current_user)):
             auction_ids = [item["item_id"] for item in auction_items]
             auctions = await db.multi_item_listings.find(
                 {"id": {"$in": auction_ids}, "status": {"$ne": "deleted"}},
-                {"_id": 0}
+                MULTI_ITEM_LISTING_SUMMARY.projection
             ).to_list(100)
+            MULTI_ITEM_LISTING_SUMMARY.fill_many(auctions)
             
             auctions_map = {auction["id"]: auction for auction in auctions}
             
@@ -6633,10 +6781,10 @@ async def get_watchlist(current_user: User = Depends(get_current_user)):
                     auction_id, lot_number = item_id.split(":")
                     lot_number = int(lot_number)
                     
-                    # Find the auction
+                    # Find the auction, reading only its title and the watched lot
                     auction = await db.multi_item_listings.find_one(
                         {"id": auction_id},
-                        {"_id": 0}
+                        {"_id": 0, "title": 1, "lots": {"$elemMatch": {"lot_number": lot_number}}}
                     )
                     
                     if auction:
@@ -6831,7 +6979,7 @@ async def get_recently_viewed(limit: int = 10, current_user: User = Depends(get_
         # Fetch listing details
         listings = await db.listings.find(
             {"id": {"$in": listing_ids}, "status": {"$ne": "deleted"}},
-            {"_id": 0}
+            LISTING_SHAPE.projection
         ).to_list(limit)
         
         # Create a map for quick lookup
@@ -6855,8 +7003,9 @@ async def get_recently_viewed(limit: int = 10, current_user: User = Depends(get_
 
 # Carousel Data Endpoints
 @api_router.get("/carousel/ending-soon")
-async def get_ending_soon_listings(limit: int = 12):
+async def get_ending_soon_listings(limit: int = 12, fields: Optional[str] = None):
     """Get listings ending soon (within next 24 hours)"""
+    shape = select_fields(LISTING_SHAPE, fields)
     try:
         current_time = datetime.now(timezone.utc)
         twenty_four_hours_later = current_time + timedelta(hours=24)
@@ -6864,33 +7013,31 @@ async def get_ending_soon_listings(limit: int = 12):
         listings = await db.listings.find(
             {
                 "status": "active",
-                "auction_end_date": {
-                    "$gte": current_time.isoformat(),
-                    "$lte": twenty_four_hours_later.isoformat()
-                }
+                **date_range("auction_end_date", {"$gte": current_time, "$lte": twenty_four_hours_later})
             },
-            {"_id": 0}
+            shape.projection
         ).sort("auction_end_date", 1).limit(limit).to_list(limit)
         
-        return listings
+        return shape.fill_many(listings)
         
     except Exception as e:
         logger.error(f"Error fetching ending soon listings: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch ending soon listings")
 
 @api_router.get("/carousel/featured")
-async def get_featured_listings(limit: int = 12):
+async def get_featured_listings(limit: int = 12, fields: Optional[str] = None):
     """Get featured/promoted listings"""
+    shape = select_fields(LISTING_SHAPE, fields)
     try:
         listings = await db.listings.find(
             {
                 "status": "active",
                 "is_promoted": True
             },
-            {"_id": 0}
+            shape.projection
         ).sort("created_at", -1).limit(limit).to_list(limit)
         
-        return listings
+        return shape.fill_many(listings)
         
     except Exception as e:
         logger.error(f"Error fetching featured listings: {str(e)}")
@@ -6898,8 +7045,9 @@ async def get_featured_listings(limit: int = 12):
 
 
 @api_router.get("/carousel/new-listings")
-async def get_new_listings(limit: int = 12):
+async def get_new_listings(limit: int = 12, fields: Optional[str] = None):
     """Get newest listings (created in last 7 days)"""
+    shape = select_fields(LISTING_SHAPE, fields)
     try:
         seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
         
@@ -6908,27 +7056,28 @@ async def get_new_listings(limit: int = 12):
                 "status": "active",
                 "created_at": {"$gte": seven_days_ago.isoformat()}
             },
-            {"_id": 0}
+            shape.projection
         ).sort("created_at", -1).limit(limit).to_list(limit)
         
-        return listings
+        return shape.fill_many(listings)
         
     except Exception as e:
         logger.error(f"Error fetching new listings: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch new listings")
 
 @api_router.get("/carousel/recently-sold")
-async def get_recently_sold(limit: int = 12):
+async def get_recently_sold(limit: int = 12, fields: Optional[str] = None):
     """Get recently sold items"""
+    shape = select_fields(LISTING_SHAPE, fields)
     try:
         listings = await db.listings.find(
             {
                 "status": "sold"
             },
-            {"_id": 0}
+            shape.projection
         ).sort("sold_at", -1).limit(limit).to_list(limit)
         
-        return listings
+        return shape.fill_many(listings)
         
     except Exception as e:
         logger.error(f"Error fetching recently sold: {str(e)}")
@@ -6955,20 +7104,14 @@ async def get_top_sellers(limit: int = 10):
             })
     return sellers
 
-@api_router.get("/stats/hot-items")
-async def get_hot_items(limit: int = 10):
+@api_router.get("/stats/hot-items", response_model=List[Listing])
+async def get_hot_items(limit: int = 10, fields: Optional[str] = None):
+    shape = select_fields(LISTING_SHAPE, fields)
     listings = await db.listings.find(
         {"status": "active"},
-        {"_id": 0}
+        shape.projection
     ).sort("views", -1).limit(limit).to_list(limit)
-    
-    for listing in listings:
-        if isinstance(listing.get("created_at"), str):
-            listing["created_at"] = datetime.fromisoformat(listing["created_at"])
-        if isinstance(listing.get("auction_end_date"), str):
-            listing["auction_end_date"] = datetime.fromisoformat(listing["auction_end_date"])
-    
-    return [Listing(**listing) for listing in listings]
+    return Response(fast_dumps(shape.fill_many(listings)), media_type="application/json")
 
 @api_router.get("/")
 async def root():
@@ -6981,17 +7124,22 @@ async def health():
 # ==================== INVOICE GENERATION ====================
 
 
-def generate_pdf_from_html(html_content: str, pdf_path: Path):
-    """Lazy import WeasyPrint and generate PDF"""
+async def generate_pdf_from_html(html_content: str, pdf_path: Optional[Path] = None) -> CachedPDF:
+    """
+    Serve the PDF for this HTML from the content-addressed cache, rendering it in
+    the renderer's process pool on a miss (WeasyPrint never runs on the event loop).
+    pdf_path, when given, is linked to the cached file.
+    """
     try:
-        from weasyprint import HTML
-        HTML(string=html_content).write_pdf(pdf_path)
-    except Exception as e:
+        return await get_pdf_cache().get_or_render(html_content, dest_path=pdf_path)
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"PDF generation busy, retry shortly: {str(e)}")
+    except RenderError as e:
         logger.error(f"PDF generation error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {str(e)}")
 
-# WeasyPrint import moved to lazy loading to avoid startup issues
-from invoice_templates import lots_won_template
+# WeasyPrint is only imported inside the renderer's worker processes
+from invoice_templates_bilingual import lots_won_template
 import os
 
 
@@ -7104,9 +7252,21 @@ async def generate_invoice_number(auction_id: str) -> str:
     year = datetime.now().year
     auction_short = auction_id[:8]  # First 8 chars of UUID
     
-    # Count existing invoices for this auction
-    count = await db.invoices.count_documents({"auction_id": auction_id})
-    sequence = count + 1
+    # Atomic per-auction counter (documents for one auction render concurrently).
+    # Seeded from the existing invoice count the first time an auction is seen.
+    existing = await db.invoices.count_documents({"auction_id": auction_id})
+    await db.invoice_counters.update_one(
+        {"auction_id": auction_id},
+        {"$setOnInsert": {"sequence": existing}},
+        upsert=True
+    )
+    counter = await db.invoice_counters.find_one_and_update(
+        {"auction_id": auction_id},
+        {"$inc": {"sequence": 1}},
+        projection={"_id": 0, "sequence": 1},
+        return_document=True
+    )
+    sequence = counter["sequence"]
     
     return f"BV-{year}-{auction_short}-{sequence:04d}"
 
@@ -7182,8 +7342,17 @@ async def generate_lots_won_invoice(
     hammer_total = sum(lot['hammer_price'] for lot in lots_won)
     buyer_fees = calculate_buyer_fees(hammer_total, buyer_subscription)
     
-    # Generate invoice number
-    invoice_number = await generate_invoice_number(auction_id)
+    # Regenerating keeps the invoice number, so unchanged inputs hit the PDF cache
+    existing_invoice = await db.invoices.find_one({
+        "auction_id": auction_id,
+        "user_id": user_id,
+        "invoice_type": "lots_won"
+    }, {"_id": 0, "invoice_number": 1})
+    
+    if existing_invoice:
+        invoice_number = existing_invoice['invoice_number']
+    else:
+        invoice_number = await generate_invoice_number(auction_id)
     
     # Prepare data for template with subscription-aware fees
     template_data = {
@@ -7218,14 +7387,8 @@ async def generate_lots_won_invoice(
         "currency": auction.get('currency', 'CAD')  # Include auction currency
     }
     
-    # Generate HTML
     # Generate bilingual HTML
-    try:
-        from invoice_templates_bilingual import lots_won_template as lots_won_bilingual
-        html_content = lots_won_bilingual(template_data, lang=lang)
-    except ImportError:
-        # Fallback to original template if bilingual not available
-        html_content = lots_won_template(template_data)
+    html_content = lots_won_template(template_data, lang=lang)
     
     # Create user invoice directory
     invoice_dir = Path(f"/app/invoices/{user_id}")
@@ -7235,7 +7398,7 @@ async def generate_lots_won_invoice(
     pdf_filename = f"LotsWon_{auction_id}_{int(datetime.now().timestamp())}.pdf"
     pdf_path = invoice_dir / pdf_filename
     
-    generate_pdf_from_html(html_content, pdf_path)
+    cached_pdf = await generate_pdf_from_html(html_content, pdf_path)
     
     # Save invoice record to database
     invoice_record = {
@@ -7245,6 +7408,7 @@ async def generate_lots_won_invoice(
         "user_id": user_id,
         "auction_id": auction_id,
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "generated_date": datetime.now(timezone.utc).isoformat(),
         "status": "generated"
     }
@@ -7252,8 +7416,10 @@ async def generate_lots_won_invoice(
     
     return {
         "success": True,
+        "invoice_id": invoice_record["id"],
         "invoice_number": invoice_number,
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "paddle_number": paddle_record['paddle_number'],
         "message": "Invoice generated successfully"
     }
@@ -7385,7 +7551,7 @@ async def generate_payment_letter(
     pdf_filename = f"PaymentLetter_{auction_id}.pdf"
     pdf_path = invoice_dir / pdf_filename
     
-    generate_pdf_from_html(html_content, pdf_path)
+    cached_pdf = await generate_pdf_from_html(html_content, pdf_path)
     
     # Save invoice record
     invoice_record = {
@@ -7395,6 +7561,7 @@ async def generate_payment_letter(
         "user_id": user_id,
         "auction_id": auction_id,
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "generated_date": datetime.now(timezone.utc).isoformat(),
         "status": "generated"
     }
@@ -7402,8 +7569,10 @@ async def generate_payment_letter(
     
     return {
         "success": True,
+        "invoice_id": invoice_record["id"],
         "invoice_number": invoice_number,
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "paddle_number": paddle_record['paddle_number'],
         "amount_due": grand_total,
         "message": "Payment letter generated successfully"
@@ -7426,6 +7595,36 @@ async def get_user_invoices(
     
     return invoices
 
+@api_router.get("/invoices/{invoice_id}/pdf")
+async def download_invoice_pdf(
+    invoice_id: str,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user)
+):
+    """Download a generated invoice PDF (ETag / If-None-Match aware)"""
+    from fastapi.responses import FileResponse, Response
+    
+    invoice = await db.invoices.find_one({"id": invoice_id}, {"_id": 0})
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    if current_user.account_type != "admin" and current_user.id != invoice["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    etag = invoice.get("content_hash")
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "private, no-cache"} if etag else {}
+    if etag and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    if not Path(invoice["pdf_path"]).exists():
+        raise HTTPException(status_code=404, detail="Invoice PDF not found")
+    
+    return FileResponse(
+        path=invoice["pdf_path"],
+        filename=Path(invoice["pdf_path"]).name,
+        media_type="application/pdf",
+        headers=headers
+    )
+
 @api_router.post("/invoices/seller-statement/{auction_id}/{seller_id}")
 async def generate_seller_statement(
     auction_id: str,
@@ -7494,7 +7693,7 @@ async def generate_seller_statement(
     pdf_filename = f"SellerStatement_{auction_id}.pdf"
     pdf_path = invoice_dir / pdf_filename
     
-    generate_pdf_from_html(html_content, pdf_path)
+    cached_pdf = await generate_pdf_from_html(html_content, pdf_path)
     
     invoice_record = {
         "id": str(uuid.uuid4()),
@@ -7503,6 +7702,7 @@ async def generate_seller_statement(
         "user_id": seller_id,
         "auction_id": auction_id,
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "generated_date": datetime.now(timezone.utc).isoformat(),
         "status": "generated"
     }
@@ -7510,7 +7710,9 @@ async def generate_seller_statement(
     
     return {
         "success": True,
+        "invoice_id": invoice_record["id"],
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "message": "Seller statement generated successfully"
     }
 
@@ -7539,9 +7741,20 @@ async def generate_seller_receipt(
     lang = seller.get('preferred_language', 'en')
     currency = auction.get('currency', 'CAD')
     
+    # Reuse the receipt number on regeneration (keeps the PDF cacheable)
+    existing_receipt = await db.invoices.find_one({
+        "auction_id": auction_id,
+        "user_id": seller_id,
+        "invoice_type": "seller_receipt"
+    }, {"_id": 0, "invoice_number": 1})
+    receipt_number = (
+        existing_receipt['invoice_number'] if existing_receipt
+        else f"RCPT-{auction_id[:8]}-{int(datetime.now().timestamp())}"
+    )
+    
     from invoice_templates_complete import seller_receipt_template
     template_data = {
-        "receipt_number": f"RCPT-{auction_id[:8]}-{int(datetime.now().timestamp())}",
+        "receipt_number": receipt_number,
         "seller": {
             "name": seller['name'],
             "company_name": seller.get('company_name'),
@@ -7571,7 +7784,7 @@ async def generate_seller_receipt(
     pdf_filename = f"SellerReceipt_{auction_id}.pdf"
     pdf_path = invoice_dir / pdf_filename
     
-    generate_pdf_from_html(html_content, pdf_path)
+    cached_pdf = await generate_pdf_from_html(html_content, pdf_path)
     
     invoice_record = {
         "id": str(uuid.uuid4()),
@@ -7580,6 +7793,7 @@ async def generate_seller_receipt(
         "user_id": seller_id,
         "auction_id": auction_id,
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "generated_date": datetime.now(timezone.utc).isoformat(),
         "status": "generated"
     }
@@ -7587,7 +7801,9 @@ async def generate_seller_receipt(
     
     return {
         "success": True,
+        "invoice_id": invoice_record["id"],
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "receipt_number": template_data['receipt_number'],
         "message": "Seller receipt generated successfully"
     }
@@ -7661,7 +7877,7 @@ async def generate_commission_invoice(
     pdf_filename = f"CommissionInvoice_{auction_id}.pdf"
     pdf_path = invoice_dir / pdf_filename
     
-    generate_pdf_from_html(html_content, pdf_path)
+    cached_pdf = await generate_pdf_from_html(html_content, pdf_path)
     
     invoice_record = {
         "id": str(uuid.uuid4()),
@@ -7670,6 +7886,7 @@ async def generate_commission_invoice(
         "user_id": seller_id,
         "auction_id": auction_id,
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "generated_date": datetime.now(timezone.utc).isoformat(),
         "status": "generated"
     }
@@ -7677,8 +7894,10 @@ async def generate_commission_invoice(
     
     return {
         "success": True,
+        "invoice_id": invoice_record["id"],
         "invoice_number": invoice_number,
         "pdf_path": str(pdf_path),
+        "content_hash": cached_pdf.etag,
         "message": "Commission invoice generated successfully"
     }
 
@@ -7730,8 +7949,17 @@ async def complete_auction_and_send_documents(
         "errors": []
     }
     
+    # Every document renders in the PDF process pool, so seller and buyer
+    # documents are generated concurrently (the renderer's queue bounds the fan-out)
+    async def collect(label: str, generator):
+        try:
+            return await generator
+        except Exception as e:
+            results['errors'].append(f"{label}: {str(e)}")
+            return None
+    
     # ===== SELLER DOCUMENTS =====
-    try:
+    async def seller_documents():
         # Calculate seller totals
         total_hammer = sum(lot['current_price'] for lot in auction['lots'][:3])  # Demo: first 3 sold
         lots_sold = 3
@@ -7739,31 +7967,22 @@ async def complete_auction_and_send_documents(
         commission_amount = total_hammer * (commission_rate / 100)
         net_payout = total_hammer - commission_amount
         
-        seller_pdf_paths = {}
-        
-        # 1. Generate Seller Statement
-        try:
-            statement_response = await generate_seller_statement(auction_id, seller_id, current_user)
-            seller_pdf_paths['statement'] = statement_response['pdf_path']
-            results['documents_generated'].append('seller_statement')
-        except Exception as e:
-            results['errors'].append(f"Seller Statement: {str(e)}")
-        
-        # 2. Generate Seller Receipt
-        try:
-            receipt_response = await generate_seller_receipt(auction_id, seller_id, current_user)
-            seller_pdf_paths['receipt'] = receipt_response['pdf_path']
-            results['documents_generated'].append('seller_receipt')
-        except Exception as e:
-            results['errors'].append(f"Seller Receipt: {str(e)}")
+        # 1. Seller Statement, 2. Seller Receipt, 3. Commission Invoice
+        statement_response, receipt_response, commission_response = await asyncio.gather(
+            collect("Seller Statement", generate_seller_statement(auction_id, seller_id, current_user)),
+            collect("Seller Receipt", generate_seller_receipt(auction_id, seller_id, current_user)),
+            collect("Commission Invoice", generate_commission_invoice(auction_id, seller_id, current_user))
+        )
         
-        # 3. Generate Commission Invoice
-        try:
-            commission_response = await generate_commission_invoice(auction_id, seller_id, current_user)
-            seller_pdf_paths['commission'] = commission_response['pdf_path']
-            results['documents_generated'].append('commission_invoice')
-        except Exception as e:
-            results['errors'].append(f"Commission Invoice: {str(e)}")
+        seller_pdf_paths = {}
+        for key, document, response in (
+            ('statement', 'seller_statement', statement_response),
+            ('receipt', 'seller_receipt', receipt_response),
+            ('commission', 'commission_invoice', commission_response)
+        ):
+            if response:
+                seller_pdf_paths[key] = response['pdf_path']
+                results['documents_generated'].append(document)
         
         # Send seller email (mock)
         if seller_pdf_paths:
@@ -7801,88 +8020,88 @@ async def complete_auction_and_send_documents(
                     }
                 )
     
-    except Exception as e:
-        results['errors'].append(f"Seller documents error: {str(e)}")
-    
     # ===== BUYER DOCUMENTS =====
-    # Find all buyers (paddle numbers assigned to this auction)
-    paddle_records = await db.paddle_numbers.find({"auction_id": auction_id}).to_list(100)
-    
-    for paddle_record in paddle_records:
+    async def buyer_documents(paddle_record):
         buyer_id = paddle_record['user_id']
         paddle_number = paddle_record['paddle_number']
         
-        try:
-            buyer = await db.users.find_one({"id": buyer_id})
-            if not buyer:
-                continue
-            
-            buyer_pdf_paths = {}
-            
-            # 1. Generate Lots Won Summary
-            try:
-                lots_won_response = await generate_lots_won_invoice(auction_id, buyer_id, lang, current_user)
-                buyer_pdf_paths['lots_won'] = lots_won_response['pdf_path']
-                results['documents_generated'].append(f'lots_won_{buyer_id[:8]}')
-                total_due = lots_won_response.get('total_due', 0)
-                invoice_number = lots_won_response.get('invoice_number', 'N/A')
-            except Exception as e:
-                results['errors'].append(f"Lots Won (Buyer {buyer_id[:8]}): {str(e)}")
-                continue
-            
-            # 2. Generate Payment Letter
-            try:
-                payment_letter_response = await generate_payment_letter(auction_id, buyer_id, current_user)
-                buyer_pdf_paths['payment_letter'] = payment_letter_response['pdf_path']
-                results['documents_generated'].append(f'payment_letter_{buyer_id[:8]}')
-            except Exception as e:
-                results['errors'].append(f"Payment Letter (Buyer {buyer_id[:8]}): {str(e)}")
-            
-            # Send buyer email (mock)
-            if buyer_pdf_paths:
-                email_sent = await email_service.send_buyer_invoice_email(
-                    recipient_email=buyer['email'],
-                    recipient_name=buyer['name'],
-                    auction_title=auction['title'],
-                    invoice_number=invoice_number,
-                    total_due=total_due,
-                    paddle_number=paddle_number,
-                    pdf_paths=buyer_pdf_paths,
-                    lang=lang
-                )
-                
-                if email_sent:
-                    results['emails_sent'].append({
-                        "type": "buyer_invoice",
-                        "recipient": buyer['email'],
-                        "paddle_number": paddle_number,
-                        "documents": list(buyer_pdf_paths.keys())
-                    })
-                    
-                    # Update invoice records with email tracking
-                    await db.invoices.update_many(
-                        {
-                            "auction_id": auction_id,
-                            "user_id": buyer_id,
-                            "invoice_type": {"$in": ["lots_won", "payment_letter"]}
-                        },
-                        {
-                            "$set": {
-                                "email_sent": True,
-                                "sent_timestamp": datetime.now(timezone.utc).isoformat(),
-                                "recipient_email": buyer['email']
-                            }
-                        }
-                    )
+        buyer = await db.users.find_one({"id": buyer_id})
+        if not buyer:
+            return
         
-        except Exception as e:
-            results['errors'].append(f"Buyer documents error (buyer {buyer_id[:8]}): {str(e)}")
+        # 1. Lots Won Summary - no payment letter for a buyer whose summary failed
+        lots_won_response = await collect(
+            f"Lots Won (Buyer {buyer_id[:8]})", generate_lots_won_invoice(auction_id, buyer_id, lang, current_user)
+        )
+        if not lots_won_response:
+            return
+        
+        buyer_pdf_paths = {'lots_won': lots_won_response['pdf_path']}
+        results['documents_generated'].append(f'lots_won_{buyer_id[:8]}')
+        total_due = lots_won_response.get('total_due', 0)
+        invoice_number = lots_won_response.get('invoice_number', 'N/A')
+        
+        # 2. Payment Letter
+        payment_letter_response = await collect(
+            f"Payment Letter (Buyer {buyer_id[:8]})", generate_payment_letter(auction_id, buyer_id, current_user)
+        )
+        if payment_letter_response:
+            buyer_pdf_paths['payment_letter'] = payment_letter_response['pdf_path']
+            results['documents_generated'].append(f'payment_letter_{buyer_id[:8]}')
+        
+        # Send buyer email (mock)
+        email_sent = await email_service.send_buyer_invoice_email(
+            recipient_email=buyer['email'],
+            recipient_name=buyer['name'],
+            auction_title=auction['title'],
+            invoice_number=invoice_number,
+            total_due=total_due,
+            paddle_number=paddle_number,
+            pdf_paths=buyer_pdf_paths,
+            lang=lang
+        )
+        
+        if email_sent:
+            results['emails_sent'].append({
+                "type": "buyer_invoice",
+                "recipient": buyer['email'],
+                "paddle_number": paddle_number,
+                "documents": list(buyer_pdf_paths.keys())
+            })
+            
+            # Update invoice records with email tracking
+            await db.invoices.update_many(
+                {
+                    "auction_id": auction_id,
+                    "user_id": buyer_id,
+                    "invoice_type": {"$in": ["lots_won", "payment_letter"]}
+                },
+                {
+                    "$set": {
+                        "email_sent": True,
+                        "sent_timestamp": datetime.now(timezone.utc).isoformat(),
+                        "recipient_email": buyer['email']
+                    }
+                }
+            )
+    
+    # Find all buyers (paddle numbers assigned to this auction)
+    paddle_records = await db.paddle_numbers.find({"auction_id": auction_id}).to_list(100)
+    
+    await asyncio.gather(
+        collect("Seller documents error", seller_documents()),
+        *(
+            collect(f"Buyer documents error (buyer {record['user_id'][:8]})", buyer_documents(record))
+            for record in paddle_records
+        )
+    )
     
     # Update auction status to 'ended'
     await db.multi_item_listings.update_one(
         {"id": auction_id},
         {"$set": {"status": "ended"}}
     )
+    await marketplace_index.sync_auction(db, auction_id)
     
     results['success'] = len(results['errors']) == 0
     results['summary'] = {
@@ -8032,6 +8251,7 @@ async def review_currency_appeal(
                 }
             }
         )
+        await auth_cache.invalidate_user(appeal['user_id'])
     
     return {
         "success": True,
@@ -8096,6 +8316,7 @@ app.add_middleware(
     CORSMiddleware, allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"], allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ==================== WISHLIST ENDPOINTS ====================
@@ -8163,7 +8384,9 @@ async def get_user_wishlist(current_user: User = Depends(get_current_user)):
         
         # Fetch auction details for each wishlist item
         auction_ids = list(set([item["auction_id"] for item in wishlist_items]))
-        auctions = await db.multi_item_listings.find({"id": {"$in": auction_ids}}).to_list(100)
+        auctions = await db.multi_item_listings.find(
+            {"id": {"$in": auction_ids}}, MULTI_ITEM_LISTING_SUMMARY.projection
+        ).to_list(100)
         
         # Map auctions by ID
         auctions_map = {auction["id"]: auction for auction in auctions}
@@ -8198,13 +8421,16 @@ async def setup_auto_bid(listing_id: str, max_bid: float, current_user: User = D
                 detail="Auto-Bid Bot is a Premium feature. Upgrade to Premium or VIP to use this feature."
             )
         
+        # A max bid places bids on the user's behalf: same gate as a manual bid
+        await require_bidder(current_user)
+        
         # Get listing
         listing = await db.listings.find_one({"id": listing_id})
         if not listing:
             raise HTTPException(status_code=404, detail="Listing not found")
         
         # Check if max_bid is valid
-        current_bid = listing.get("current_bid", listing.get("starting_price", 0))
+        current_bid = listing.get("current_price", listing.get("starting_price", 0))
         if max_bid <= current_bid:
             raise HTTPException(status_code=400, detail="Max bid must be higher than current bid")
         
@@ -8221,7 +8447,7 @@ async def setup_auto_bid(listing_id: str, max_bid: float, current_user: User = D
                 {"id": existing["id"]},
                 {"$set": {"max_bid": max_bid}}
             )
-            return {"message": "Auto-Bid updated", "auto_bid_id": existing["id"]}
+            message, auto_bid_id = "Auto-Bid updated", existing["id"]
         else:
             # Create new auto-bid
             auto_bid = AutoBid(
@@ -8230,7 +8456,39 @@ async def setup_auto_bid(listing_id: str, max_bid: float, current_user: User = D
                 max_bid=max_bid
             )
             await db.auto_bids.insert_one(auto_bid.model_dump())
-            return {"message": "Auto-Bid activated", "auto_bid_id": auto_bid.id}
+            message, auto_bid_id = "Auto-Bid activated", auto_bid.id
+        
+        # A new max bid competes right away rather than waiting for the next manual bid
+        settings = await get_marketplace_settings()
+        flat_increment = settings.get("minimum_bid_increment", 1.0)
+        proxy = await get_proxy_bidding(db).run(
+            listing_id,
+            increment_for=lambda snapshot, price: minimum_increment(snapshot, price, flat_increment),
+            anti_snipe_window=anti_snipe_window(settings)
+        )
+        if proxy:
+            top_bid = proxy["bids"][-1]
+            broadcast_data = {'bid_count': proxy["bid_count"], 'current_price': top_bid['amount']}
+            if proxy["extension_applied"]:
+                logger.info(f"⏰ Anti-sniping triggered by max bid: listing={listing_id}, new_end={proxy['new_end'].isoformat()}")
+                await get_auction_timer(db).schedule(("listing", listing_id), proxy["new_end"])
+                broadcast_data.update(extension_broadcast_fields(proxy["new_end"]))
+            await marketplace_index.sync_listing(db, listing_id)
+            await manager.broadcast_bid_update(
+                listing_id,
+                {key: top_bid[key] for key in ('id', 'bidder_id', 'amount', 'created_at')},
+                broadcast_data
+            )
+            previous_leader = proxy["previous_leader_id"]
+            if previous_leader and previous_leader != top_bid['bidder_id']:
+                await notify_listing_outbid(previous_leader, top_bid['id'], listing, top_bid['amount'], proxy["previous_price"])
+        
+        return {
+            "message": message,
+            "auto_bid_id": auto_bid_id,
+            "current_price": proxy["price"] if proxy else current_bid,
+            "is_leading": (proxy["leader_id"] if proxy else listing.get("highest_bidder_id")) == current_user.id
+        }
     except HTTPException:
         raise
     except Exception as e:
@@ -8301,6 +8559,7 @@ async def request_data_deletion(reason: Optional[str] = None, current_user: User
                 }
             }
         )
+        await auth_cache.invalidate_user(current_user.id)
         
         logger.info(f"Data deletion request created for user {current_user.id}")
         
@@ -8357,6 +8616,7 @@ async def cancel_data_deletion(current_user: User = Depends(get_current_user)):
                 {"id": current_user.id},
                 {"$unset": {"deletion_requested": "", "deletion_request_date": ""}}
             )
+            await auth_cache.invalidate_user(current_user.id)
             return {"success": True, "message": "Data deletion request cancelled"}
         else:
             return {"success": False, "message": "No pending deletion request found"}
@@ -8412,26 +8672,7 @@ async def get_increment_info(listing_id: str):
             raise HTTPException(status_code=404, detail="Listing not found")
         
         increment_option = listing.get("increment_option", "tiered")
-        
-        # Get increment schedule
-        if increment_option == "simplified":
-            schedule = [
-                {"range": "$0-$100", "increment": "$1"},
-                {"range": "$100-$1,000", "increment": "$5"},
-                {"range": "$1,000-$10,000", "increment": "$25"},
-                {"range": "$10,000+", "increment": "$100"}
-            ]
-        else:
-            schedule = [
-                {"range": "$0-$99.99", "increment": "$5"},
-                {"range": "$100-$499.99", "increment": "$10"},
-                {"range": "$500-$999.99", "increment": "$25"},
-                {"range": "$1,000-$4,999.99", "increment": "$50"},
-                {"range": "$5,000-$9,999.99", "increment": "$100"},
-                {"range": "$10,000-$49,999.99", "increment": "$250"},
-                {"range": "$50,000-$99,999.99", "increment": "$500"},
-                {"range": "$100,000+", "increment": "$1,000"}
-            ]
+        schedule = schedule_for(listing).describe()
         
         return {
             "increment_option": increment_option,
@@ -8442,6 +8683,47 @@ async def get_increment_info(listing_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/listings/{listing_id}/next-bids")
+async def get_listing_next_bids(listing_id: str, n: int = Query(5, ge=1, le=20)):
+    """Next n valid bids on a single listing (quick-bid buttons)"""
+    listing = await db.listings.find_one(
+        {"id": listing_id},
+        {"_id": 0, "id": 1, "current_price": 1, "increment_option": 1}
+    )
+    if not listing:
+        raise HTTPException(status_code=404, detail="Listing not found")
+
+    settings = await get_marketplace_settings()
+    flat_increment = settings.get("minimum_bid_increment", 1.0)
+    current_price = listing.get("current_price") or 0
+
+    return {
+        "listing_id": listing_id,
+        "current_price": current_price,
+        "increment_option": schedule_for(listing, flat_increment).name,
+        "next_bids": next_valid_bids(listing, n, current_price, flat_increment)
+    }
+
+@api_router.get("/multi-item-listings/{listing_id}/lots/{lot_number}/next-bids")
+async def get_lot_next_bids(listing_id: str, lot_number: int, n: int = Query(5, ge=1, le=20)):
+    """Next n valid bids on one lot of a multi-item auction (quick-bid buttons)"""
+    listing = await db.multi_item_listings.find_one(
+        {"id": listing_id, "lots.lot_number": lot_number},
+        {"_id": 0, "id": 1, "increment_option": 1, "lots.$": 1}
+    )
+    if not listing:
+        raise HTTPException(status_code=404, detail="Lot not found")
+
+    current_price = listing["lots"][0].get("current_price") or 0
+
+    return {
+        "listing_id": listing_id,
+        "lot_number": lot_number,
+        "current_price": current_price,
+        "increment_option": schedule_for(listing).name,
+        "next_bids": next_valid_bids(listing, n, current_price)
+    }
+
 # ==================== SUBSCRIPTION MANAGEMENT ====================
 
 @api_router.get("/subscription/status")
@@ -8587,7 +8869,10 @@ DEFAULT_SITE_CONFIG = {
 }
 
 async def get_site_config():
-    """Fetch site configuration from database, or return defaults if not set."""
+    """Fetch site configuration (cached per worker, invalidated on admin edits), or return defaults if not set."""
+    return await config_cache.get("site_config", _load_site_config)
+
+async def _load_site_config():
     config = await db.site_config.find_one({"id": "site_config"}, {"_id": 0})
     if not config:
         config = {**DEFAULT_SITE_CONFIG, "updated_at": datetime.now(timezone.utc).isoformat()}
@@ -8679,6 +8964,7 @@ async def update_site_branding(
         }},
         upsert=True
     )
+    await config_cache.invalidate("site_config")
     
     # Log the change
     log_entry = {
@@ -8742,6 +9028,7 @@ async def update_homepage_layout(
         }},
         upsert=True
     )
+    await config_cache.invalidate("site_config")
     
     # Log the change
     log_entry = {
@@ -9035,8 +9322,9 @@ async def get_active_banners():
 # ========== PROMOTED LISTINGS ENDPOINTS ==========
 
 @api_router.get("/promoted-listings")
-async def get_promoted_listings(limit: int = 12, tier: Optional[str] = None):
+async def get_promoted_listings(limit: int = 12, tier: Optional[str] = None, fields: Optional[str] = None):
     """Get promoted listings for homepage Hot Items carousel"""
+    shape = select_fields(MULTI_ITEM_LISTING_SUMMARY, fields)
     now = datetime.now(timezone.utc)
     
     query = {
@@ -9057,17 +9345,21 @@ async def get_promoted_listings(limit: int = 12, tier: Optional[str] = None):
         ("promotion_start", -1)
     ]
     
-    listings = await db.multi_item_listings.find(query, {"_id": 0}).sort(sort_order).limit(limit).to_list(limit)
+    listings = await db.multi_item_listings.find(
+        query, {**shape.projection, "seller_id": 1}
+    ).sort(sort_order).limit(limit).to_list(limit)
+    keys = [(listing["id"], listing.get("seller_id")) for listing in listings]
+    shape.fill_many(listings)
     
     # Enrich with seller info
-    for listing in listings:
-        seller = await db.users.find_one({"id": listing.get("seller_id")}, {"_id": 0, "name": 1, "picture": 1})
+    for listing, (listing_id, seller_id) in zip(listings, keys):
+        seller = await db.users.find_one({"id": seller_id}, {"_id": 0, "name": 1, "picture": 1})
         listing["seller_name"] = seller.get("name") if seller else "Unknown Seller"
         listing["seller_picture"] = seller.get("picture") if seller else None
         
         # Track impression
         await db.multi_item_listings.update_one(
-            {"id": listing["id"]},
+            {"id": listing_id},
             {"$inc": {"total_impressions": 1}}
         )
     
@@ -9126,12 +9418,13 @@ async def get_admin_listings_promotions(current_user: User = Depends(get_current
 # ========== NOTIFICATION CENTER ENDPOINTS ==========
 
 @api_router.get("/notifications")
-async def get_notifications(limit: int = 15, current_user: User = Depends(get_current_user)):
+async def get_notifications(limit: int = 15, cursor: Optional[str] = None, current_user: User = Depends(get_current_user)):
     """Get user notifications for the Notification Center"""
-    notifications = await db.notifications.find(
-        {"user_id": current_user.id},
-        {"_id": 0}
-    ).sort("created_at", -1).limit(limit).to_list(limit)
+    try:
+        page = await fetch_page(db.notifications, {"user_id": current_user.id}, "created_at", -1, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    notifications = page.items
     
     unread_count = await db.notifications.count_documents({
         "user_id": current_user.id,
@@ -9140,7 +9433,8 @@ async def get_notifications(limit: int = 15, current_user: User = Depends(get_cu
     
     return {
         "notifications": notifications,
-        "unread_count": unread_count
+        "unread_count": unread_count,
+        "next_cursor": page.next_cursor
     }
 
 
@@ -9749,7 +10043,7 @@ async def seed_legal_pages(
 # ==================== FEE CALCULATION & TRANSPARENCY ENGINE ====================
 # Real-time cost calculation for radical transparency
 
-from services.fee_calculator import FeeCalculator, calculate_buyer_total, calculate_seller_net
+from services.fee_calculator import FeeCalculator, calculate_buyer_total, calculate_buyer_totals, calculate_seller_net
 from decimal import Decimal
 
 @api_router.get("/fees/calculate-buyer-cost")
@@ -9928,6 +10222,40 @@ async def estimate_full_transaction(
         logger.error(f"Error estimating transaction: {e}")
         raise HTTPException(status_code=500, detail="Failed to estimate transaction")
 
+FEE_BATCH_QUOTE_MAX = int(os.environ.get("FEE_BATCH_QUOTE_MAX", "10000"))
+
+class FeeBatchQuoteRequest(BaseModel):
+    prices: List[float]
+    region: str = "QC"
+    seller_is_business: bool = False
+
+@api_router.post("/fees/batch-quote")
+async def batch_quote_buyer_costs(
+    request: FeeBatchQuoteRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Buyer cost for many hammer prices in one call (e.g. every lot on a catalogue page)
+    Columns follow the order of `prices`; amounts are rounded to the cent
+    """
+    if len(request.prices) > FEE_BATCH_QUOTE_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {FEE_BATCH_QUOTE_MAX} prices per request")
+    
+    try:
+        quotes = calculate_buyer_totals(
+            request.prices,
+            tier=current_user.subscription_tier or "free",
+            region=request.region,
+            seller_is_business=request.seller_is_business
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "success": True,
+        **quotes
+    }
+
 
 # Include all API routes - MUST be after all routes are defined
 app.include_router(api_router)
@@ -7,9 +7,10 @@ import os
 import json
 import logging
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import openai
 from services.ai_knowledge_base import get_knowledge_base
+from services.bson_dates import date_range, to_datetime
 
 logger = logging.getLogger(__name__)
 
@@ -390,7 +391,7 @@ Remember: You are not just an assistant - you are the Master Concierge, the face
             
             query = {
                 "status": "active",
-                "auction_end_date": {"$gt": datetime.utcnow()}
+                **date_range("auction_end_date", {"$gt": datetime.now(timezone.utc)})
             }
             
             if category:
@@ -473,11 +474,7 @@ Remember: You are not just an assistant - you are the Master Concierge, the face
             return "Unknown"
         
         try:
-            if isinstance(end_date, str):
-                from dateutil import parser
-                end_date = parser.parse(end_date)
-            
-            delta = end_date - datetime.utcnow()
+            delta = to_datetime(end_date) - datetime.now(timezone.utc)
             
             if delta.total_seconds() < 0:
                 return "Ended"
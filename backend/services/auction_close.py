@@ -0,0 +1,501 @@
+"""
+BidVex Auction Close Pipeline
+Closes ended listings and lots in batches instead of one document at a time:
+- Claims a batch atomically (status -> "closing", stamped with a claim token)
+  once the bid grace period after the end has passed; claims left behind by a
+  crashed worker are re-claimed after CLOSE_CLAIM_TIMEOUT
+- The winner is the claimed document's highest_bidder_id/current_price (what
+  the bid compare-and-set committed); documents without them fall back to one
+  $group aggregation over the bids
+- Writes final statuses with one bulk_write per collection
+- Creates handshake conversations, system messages and notifications in bulk
+- Idempotency keys (unique sparse indexes) make overlapping runs harmless:
+  nothing is closed twice and nobody is notified twice
+
+Usage:
+    summary = await close_ended_auctions(db, notification_manager)
+    summary = await close_due(db, notification_manager, [("listing", listing_id)])
+"""
+
+import os
+import time
+import asyncio
+import logging
+from uuid import uuid4
+from typing import Any, Dict, List, Optional, Set
+from datetime import datetime, timezone, timedelta
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from services import marketplace_index, search_index
+from services.bid_engine import BID_GRACE_PERIOD
+from services.bson_dates import date_range
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+CLOSE_BATCH_SIZE = int(os.environ.get("AUCTION_CLOSE_BATCH_SIZE", "500"))
+CLOSE_CLAIM_TIMEOUT = int(os.environ.get("AUCTION_CLOSE_CLAIM_TIMEOUT", "300"))
+# Upper bound on batches per run so one run can't monopolise the worker
+CLOSE_MAX_BATCHES = 20
+
+DUPLICATE_KEY = 11000
+
+# Committed leader fields read from every claimed document
+WINNER_FIELDS = {"highest_bidder_id": 1, "current_price": 1}
+
+metrics = get_metrics()
+
+
+# ========== PRIMITIVES ==========
+
+async def insert_idempotent(collection, docs: List[Dict[str, Any]]) -> Set[str]:
+    """
+    insert_many(ordered=False) where every doc carries an `idempotency_key`.
+    Duplicates (already written by an earlier or overlapping run) are skipped;
+    returns the keys that were actually inserted by this call.
+    """
+    if not docs:
+        return set()
+    try:
+        await collection.insert_many(docs, ordered=False)
+        return {doc["idempotency_key"] for doc in docs}
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(err.get("code") != DUPLICATE_KEY for err in errors):
+            raise
+        skipped = {err["index"] for err in errors}
+        return {doc["idempotency_key"] for i, doc in enumerate(docs) if i not in skipped}
+
+
+async def claim_batch(collection, status_field: str, now: datetime, token: str,
+                      projection: Dict[str, int], batch_size: int = CLOSE_BATCH_SIZE,
+                      ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Atomically move up to batch_size ended documents to "closing" under `token`.
+    A document is ended once BID_GRACE_PERIOD has passed since its end time, so
+    no bid the engine still accepts can land after the claim. Only documents
+    this call actually flipped are returned, so two overlapping runs never close
+    the same document. `ids` restricts the claim to those documents.
+    """
+    now_str = now.isoformat()
+    stale = (now - timedelta(seconds=CLOSE_CLAIM_TIMEOUT)).isoformat()
+    ended = now - timedelta(seconds=BID_GRACE_PERIOD)
+    claimable = {"$or": [
+        {status_field: "active", **date_range("auction_end_date", {"$lte": ended})},
+        {status_field: "closing", "closing_at": {"$lte": stale}},
+    ]}
+
+    scope = {"id": {"$in": ids}} if ids is not None else {}
+    ids = [doc["id"] async for doc in collection.find({**scope, **claimable}, {"_id": 0, "id": 1}).limit(batch_size)]
+    if not ids:
+        return []
+
+    await collection.update_many(
+        {"id": {"$in": ids}, **claimable},
+        {"$set": {status_field: "closing", "close_claim": token, "closing_at": now_str}}
+    )
+    return await collection.find({"id": {"$in": ids}, "close_claim": token}, projection).to_list(len(ids))
+
+
+async def resolve_winners(collection, key_field: str, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Highest bid per id in one aggregation (walks the {key_field, amount desc} index)"""
+    if not ids:
+        return {}
+    pipeline = [
+        {"$match": {key_field: {"$in": ids}}},
+        {"$sort": {key_field: 1, "amount": -1}},
+        {"$group": {"_id": f"${key_field}", "bidder_id": {"$first": "$bidder_id"}, "amount": {"$first": "$amount"}}},
+    ]
+    return {row["_id"]: row async for row in collection.aggregate(pipeline)}
+
+
+async def claimed_winners(collection, key_field: str, docs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Winner per claimed document. The committed highest_bidder_id/current_price
+    is authoritative (the bid document is inserted after that update lands);
+    only documents without a recorded leader are resolved from the bids.
+    """
+    winners = {
+        doc["id"]: {"bidder_id": doc["highest_bidder_id"], "amount": doc.get("current_price")}
+        for doc in docs if doc.get("highest_bidder_id")
+    }
+    winners.update(await resolve_winners(collection, key_field, [doc["id"] for doc in docs if doc["id"] not in winners]))
+    return winners
+
+
+def _final_status_op(doc_id: str, token: str, fields: Dict[str, Any]) -> UpdateOne:
+    return UpdateOne(
+        {"id": doc_id, "close_claim": token},
+        {"$set": fields, "$unset": {"close_claim": "", "closing_at": ""}}
+    )
+
+
+# ========== HANDSHAKES ==========
+
+async def create_handshakes(db, wins: List[Dict[str, Any]], now_str: str) -> Dict[str, str]:
+    """
+    Bulk equivalent of create_auction_won_conversation for a batch of wins.
+    Each win: {source_id, seller_id, winner_id, final_price, item_title}.
+    Returns {source_id: conversation_id}.
+    """
+    if not wins:
+        return {}
+    source_ids = [w["source_id"] for w in wins]
+
+    # Reuse a conversation the pair already has about this item
+    conversation_ids: Dict[str, str] = {}
+    async for conv in db.conversations.find(
+        {"listing_id": {"$in": source_ids}}, {"_id": 0, "id": 1, "listing_id": 1, "participants": 1}
+    ):
+        for win in wins:
+            if win["source_id"] == conv["listing_id"] and {win["seller_id"], win["winner_id"]} <= set(conv.get("participants", [])):
+                conversation_ids.setdefault(win["source_id"], conv["id"])
+
+    new_conversations = [
+        {
+            "id": str(uuid4()),
+            "idempotency_key": f"auction_won:{w['source_id']}",
+            "participants": [w["seller_id"], w["winner_id"]],
+            "listing_id": w["source_id"],
+            "created_at": now_str,
+            "updated_at": now_str,
+            "last_message": "🎉 Auction won! Contact details shared.",
+            "last_message_time": now_str
+        }
+        for w in wins if w["source_id"] not in conversation_ids
+    ]
+    inserted = await insert_idempotent(db.conversations, new_conversations)
+    for conv in new_conversations:
+        if conv["idempotency_key"] in inserted:
+            conversation_ids[conv["listing_id"]] = conv["id"]
+    lost = [c["idempotency_key"] for c in new_conversations if c["idempotency_key"] not in inserted]
+    if lost:
+        # An overlapping run created these first
+        async for conv in db.conversations.find({"idempotency_key": {"$in": lost}}, {"_id": 0, "id": 1, "listing_id": 1}):
+            conversation_ids[conv["listing_id"]] = conv["id"]
+
+    sellers = {
+        user["id"]: user
+        async for user in db.users.find(
+            {"id": {"$in": list({w["seller_id"] for w in wins})}},
+            {"_id": 0, "id": 1, "name": 1, "email": 1, "phone": 1}
+        )
+    }
+    messages = []
+    for win in wins:
+        seller = sellers.get(win["seller_id"])
+        messages.append({
+            "id": str(uuid4()),
+            "idempotency_key": f"auction_won:{win['source_id']}",
+            "conversation_id": conversation_ids[win["source_id"]],
+            "sender_id": "system",
+            "receiver_id": win["winner_id"],
+            "content": f"Congratulations! You have won the auction for {win['item_title']}.",
+            "message_type": "auction_won",
+            "system_data": {
+                "item_title": win["item_title"],
+                "final_price": win["final_price"],
+                "listing_id": win["source_id"],
+                "seller_name": seller.get("name") if seller else "Seller",
+                "seller_email": seller.get("email") if seller else None,
+                "seller_phone": seller.get("phone") if seller else None
+            },
+            "is_read": False,
+            "created_at": now_str
+        })
+    await insert_idempotent(db.messages, messages)
+    return conversation_ids
+
+
+# ========== NOTIFICATIONS ==========
+
+def _notification(user_id: str, type_: str, title: str, message: str, source_key: str, now_str: str, **refs) -> Dict[str, Any]:
+    return {
+        "id": str(uuid4()),
+        "idempotency_key": f"{type_}:{source_key}:{user_id}",
+        "user_id": user_id,
+        "type": type_,
+        "title": title,
+        "message": message,
+        **refs,
+        "read": False,
+        "created_at": now_str
+    }
+
+
+async def _notify(db, notification_manager, notifications: List[Dict[str, Any]], pushes: Dict[str, List[tuple]]):
+    """
+    Insert notification rows idempotently and send the WebSocket pushes tied to
+    rows this run inserted - a re-run never pushes twice.
+    pushes: {idempotency_key: [(user_id, payload), ...]}
+    """
+    inserted = await insert_idempotent(db.notifications, notifications)
+    send = getattr(notification_manager, "send_to_user", None)
+    if not send:
+        return
+    sends = [send(user_id, payload) for key in inserted for user_id, payload in pushes.get(key, [])]
+    results = await asyncio.gather(*sends, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Could not send push notification: {result}")
+
+
+# ========== LISTINGS ==========
+
+async def close_listing_batch(db, notification_manager, now: datetime, ids: Optional[List[str]] = None) -> int:
+    token = str(uuid4())
+    now_str = now.isoformat()
+    listings = await claim_batch(
+        db.listings, "status", now, token, {"_id": 0, "id": 1, "seller_id": 1, "title": 1, **WINNER_FIELDS}, ids=ids
+    )
+    if not listings:
+        return 0
+
+    winners = await claimed_winners(db.bids, "listing_id", listings)
+
+    ops, wins, notifications, pushes = [], [], [], {}
+    for listing in listings:
+        listing_id, seller_id = listing["id"], listing["seller_id"]
+        title = listing.get("title")
+        bid = winners.get(listing_id)
+        if not bid:
+            ops.append(_final_status_op(listing_id, token, {"status": "ended_no_bids", "ended_at": now_str}))
+            notifications.append(_notification(
+                seller_id, "auction_ended_no_bids", "Auction Ended",
+                f"Your auction for {title} ended without any bids.",
+                listing_id, now_str, listing_id=listing_id
+            ))
+            continue
+
+        winner_id, final_price = bid["bidder_id"], bid["amount"]
+        ops.append(_final_status_op(listing_id, token, {
+            "status": "ended",
+            "winner_id": winner_id,
+            "final_price": final_price,
+            "ended_at": now_str
+        }))
+        wins.append({
+            "source_id": listing_id,
+            "seller_id": seller_id,
+            "winner_id": winner_id,
+            "final_price": final_price,
+            "item_title": title or "Unknown Item"
+        })
+
+    await db.listings.bulk_write(ops, ordered=False)
+    await marketplace_index.remove_sources(db, [l["id"] for l in listings])
+    won_ids = {win["source_id"] for win in wins}
+    await search_index.set_status(db, list(won_ids), "ended")
+    await search_index.set_status(db, [l["id"] for l in listings if l["id"] not in won_ids], "ended_no_bids")
+
+    conversation_ids = await create_handshakes(db, wins, now_str)
+    for win in wins:
+        listing_id, title, final_price = win["source_id"], win["item_title"], win["final_price"]
+        won = _notification(
+            win["winner_id"], "auction_won", "🎉 Congratulations! You Won!",
+            f"You won the auction for {title} at ${final_price:.2f}",
+            listing_id, now_str, listing_id=listing_id
+        )
+        sold = _notification(
+            win["seller_id"], "auction_sold", "💰 Item Sold!",
+            f"Your item {title} sold for ${final_price:.2f}",
+            listing_id, now_str, listing_id=listing_id
+        )
+        notifications += [won, sold]
+        pushes[won["idempotency_key"]] = [(win["winner_id"], {
+            "type": "AUCTION_WON",
+            "title": won["title"],
+            "message": won["message"],
+            "listing_id": listing_id,
+            "conversation_id": conversation_ids.get(listing_id),
+            "item_title": title,
+            "final_price": final_price
+        })]
+        pushes[sold["idempotency_key"]] = [(win["seller_id"], {
+            "type": "AUCTION_SOLD",
+            "title": sold["title"],
+            "message": sold["message"],
+            "listing_id": listing_id,
+            "winner_id": win["winner_id"],
+            "final_price": final_price
+        })]
+
+    await _notify(db, notification_manager, notifications, pushes)
+    return len(listings)
+
+
+# ========== LOTS ==========
+
+async def close_lot_batch(db, notification_manager, now: datetime, ids: Optional[List[str]] = None) -> int:
+    token = str(uuid4())
+    now_str = now.isoformat()
+    lots = await claim_batch(db.lots, "lot_status", now, token, {"_id": 0, "id": 1, "auction_id": 1, "lot_number": 1, **WINNER_FIELDS}, ids=ids)
+    if not lots:
+        return 0
+
+    auctions = {
+        a["id"]: a
+        async for a in db.multi_item_listings.find(
+            {"id": {"$in": list({lot["auction_id"] for lot in lots})}},
+            {"_id": 0, "id": 1, "seller_id": 1, "title": 1}
+        )
+    }
+    orphans = [lot["id"] for lot in lots if lot["auction_id"] not in auctions]
+    if orphans:
+        # Parent auction is gone - hand the lots back untouched
+        await db.lots.update_many(
+            {"id": {"$in": orphans}, "close_claim": token},
+            {"$set": {"lot_status": "active"}, "$unset": {"close_claim": "", "closing_at": ""}}
+        )
+    lots = [lot for lot in lots if lot["auction_id"] in auctions]
+    if not lots:
+        return 0
+
+    winners = await claimed_winners(db.lot_bids, "lot_id", lots)
+
+    ops, wins = [], []
+    for lot in lots:
+        bid = winners.get(lot["id"])
+        if not bid:
+            ops.append(_final_status_op(lot["id"], token, {"lot_status": "ended_no_bids", "ended_at": now_str}))
+            continue
+        auction = auctions[lot["auction_id"]]
+        ops.append(_final_status_op(lot["id"], token, {
+            "lot_status": "sold",
+            "winner_id": bid["bidder_id"],
+            "final_price": bid["amount"],
+            "ended_at": now_str
+        }))
+        wins.append({
+            "source_id": lot["id"],
+            "auction_id": lot["auction_id"],
+            "seller_id": auction["seller_id"],
+            "winner_id": bid["bidder_id"],
+            "final_price": bid["amount"],
+            "item_title": f"{auction.get('title')} - Lot #{lot.get('lot_number', '')}"
+        })
+
+    await db.lots.bulk_write(ops, ordered=False)
+
+    conversation_ids = await create_handshakes(db, wins, now_str)
+    notifications, pushes = [], {}
+    for win in wins:
+        lot_id, lot_title, final_price = win["source_id"], win["item_title"], win["final_price"]
+        won = _notification(
+            win["winner_id"], "lot_won", "🎉 You Won a Lot!",
+            f"You won {lot_title} at ${final_price:.2f}",
+            lot_id, now_str, lot_id=lot_id, auction_id=win["auction_id"]
+        )
+        notifications += [
+            won,
+            _notification(
+                win["seller_id"], "lot_sold", "💰 Lot Sold!",
+                f"{lot_title} sold for ${final_price:.2f}",
+                lot_id, now_str, lot_id=lot_id
+            )
+        ]
+        pushes[won["idempotency_key"]] = [(win["winner_id"], {
+            "type": "AUCTION_WON",
+            "listing_id": lot_id,
+            "conversation_id": conversation_ids.get(lot_id),
+            "item_title": lot_title,
+            "final_price": final_price
+        })]
+
+    await _notify(db, notification_manager, notifications, pushes)
+    return len(lots)
+
+
+# ========== AUCTION ROLL-UP ==========
+
+async def close_finished_auctions(db, now: datetime, auction_ids: Optional[List[str]] = None) -> int:
+    """End multi-item auctions with no active lots left (lots collection or embedded)"""
+    scope = {"id": {"$in": auction_ids}} if auction_ids is not None else {}
+    auctions = await db.multi_item_listings.find(
+        {**scope, "status": "active"}, {"_id": 0, "id": 1, "lots.lot_status": 1}
+    ).to_list(CLOSE_BATCH_SIZE)
+    if not auctions:
+        return 0
+
+    ids = [a["id"] for a in auctions]
+    with_active_lots = {
+        row["_id"]
+        async for row in db.lots.aggregate([
+            {"$match": {"auction_id": {"$in": ids}, "lot_status": "active"}},
+            {"$group": {"_id": "$auction_id"}},
+        ])
+    }
+    finished = [
+        a["id"] for a in auctions
+        if a["id"] not in with_active_lots
+        and not any(lot.get("lot_status") == "active" for lot in a.get("lots", []))
+    ]
+    if not finished:
+        return 0
+
+    await db.multi_item_listings.update_many(
+        {"id": {"$in": finished}, "status": "active"},
+        {"$set": {"status": "ended", "ended_at": now.isoformat()}}
+    )
+    await marketplace_index.remove_sources(db, finished)
+    await search_index.set_status(db, finished, "ended")
+    logger.info(f"✅ {len(finished)} auction(s) fully ended - all lots processed")
+    return len(finished)
+
+
+# ========== ENTRY POINTS ==========
+
+def _record(summary: Dict[str, int], started: float):
+    metrics.inc("auction_close_listings", summary["listings"])
+    metrics.inc("auction_close_lots", summary["lots"])
+    metrics.observe("auction_close_run_seconds", time.perf_counter() - started)
+
+
+async def close_ended_auctions(db, notification_manager=None, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Drain every ended listing and lot in claimed batches, then roll up auctions"""
+    now = now or datetime.now(timezone.utc)
+    started = time.perf_counter()
+    summary = {"listings": 0, "lots": 0, "auctions": 0}
+
+    for key, close_batch in (("listings", close_listing_batch), ("lots", close_lot_batch)):
+        for _ in range(CLOSE_MAX_BATCHES):
+            closed = await close_batch(db, notification_manager, now)
+            summary[key] += closed
+            if closed < CLOSE_BATCH_SIZE:
+                break
+
+    summary["auctions"] = await close_finished_auctions(db, now)
+
+    _record(summary, started)
+    return summary
+
+
+async def close_due(db, notification_manager, keys: List[tuple], now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Close exactly the documents named by due auction timer keys:
+    ("listing", id) and ("lot_doc", id). Only the parents of those lots are
+    rolled up. Keys whose end date moved past `now` are left alone by the claim.
+    """
+    now = now or datetime.now(timezone.utc)
+    started = time.perf_counter()
+    due: Dict[str, List[str]] = {"listing": [], "lot_doc": []}
+    for key in keys:
+        if key[0] in due:
+            due[key[0]].append(key[1])
+        else:
+            logger.warning(f"⚠️ Ignoring auction timer key nothing closes: {key!r}")
+
+    summary = {"listings": 0, "lots": 0, "auctions": 0}
+    for kind, field, close_batch in (("listing", "listings", close_listing_batch), ("lot_doc", "lots", close_lot_batch)):
+        ids = due[kind]
+        for start in range(0, len(ids), CLOSE_BATCH_SIZE):
+            summary[field] += await close_batch(db, notification_manager, now, ids=ids[start:start + CLOSE_BATCH_SIZE])
+
+    if due["lot_doc"]:
+        parents = await db.lots.distinct("auction_id", {"id": {"$in": due["lot_doc"]}})
+        summary["auctions"] = await close_finished_auctions(db, now, auction_ids=parents)
+
+    _record(summary, started)
+    return summary
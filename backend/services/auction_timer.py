@@ -0,0 +1,251 @@
+"""
+BidVex Auction Timer
+In-memory hierarchical timer wheel that fires auction closes on time:
+- 1-second ticks; levels of 60s, 60m, 24h, 30d; beyond that an overflow set
+- O(1) schedule / reschedule / cancel - anti-sniping extensions just move the key
+- Loaded from indexed queries at startup and refreshed periodically; bid and
+  extension writes reschedule; schedules fan out to every worker
+- Keys are ("listing", id) and ("lot_doc", id) - the documents the close
+  pipeline claims; everything due in the same tick is closed as one batch of
+  exactly those ids
+- Keys fire BID_GRACE_PERIOD after the end time, once bids in flight can no
+  longer land
+
+The APScheduler DB poll stays on as a safety net.
+
+Usage:
+    timer = get_auction_timer(db)
+    timer.on_due = close_callback        # async def close_callback(keys)
+    await timer.start()
+    await timer.schedule(("listing", listing_id), end_datetime)
+"""
+
+import os
+import time
+import math
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+from datetime import datetime, timezone, timedelta
+
+from services.bid_engine import BID_GRACE_PERIOD
+from services.bson_dates import date_range
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = 1.0
+WHEEL_SIZES = (60, 60, 24, 30)  # seconds, minutes, hours, days
+LOAD_HORIZON_HOURS = int(os.environ.get("AUCTION_TIMER_HORIZON_HOURS", "48"))
+
+SCHEDULE_TOPIC = "auction_timer_schedule"
+
+metrics = get_metrics()
+
+
+def _to_epoch(value) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _close_deadline(end) -> Optional[float]:
+    """When a close may run: the end time plus the bid grace period"""
+    deadline = _to_epoch(end)
+    return None if deadline is None else deadline + BID_GRACE_PERIOD
+
+
+LOT_PROJECTION = {"_id": 0, "id": 1, "auction_end_date": 1}
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel keyed by arbitrary hashable keys.
+    Deadlines are absolute epoch seconds; advance(now) returns due keys.
+    """
+
+    def __init__(self, start: Optional[float] = None, tick: float = TICK_SECONDS, sizes: Tuple[int, ...] = WHEEL_SIZES):
+        self.tick = tick
+        self.sizes = sizes
+        # Ticks covered by one slot of each level
+        self.spans = [math.prod(sizes[:i]) for i in range(len(sizes))]
+        self.slots: List[List[Set[Hashable]]] = [[set() for _ in range(size)] for size in sizes]
+        self.overflow: Set[Hashable] = set()
+        self.current_tick = int((start if start is not None else time.time()) // tick)
+        self.deadlines: Dict[Hashable, int] = {}
+        self._where: Dict[Hashable, Set[Hashable]] = {}
+
+    def __len__(self):
+        return len(self.deadlines)
+
+    def schedule(self, key: Hashable, deadline: float):
+        """Add or move a key; deadline is epoch seconds"""
+        self.cancel(key)
+        deadline_tick = max(int(math.ceil(deadline / self.tick)), self.current_tick + 1)
+        self.deadlines[key] = deadline_tick
+        self._place(key, deadline_tick)
+
+    def cancel(self, key: Hashable):
+        bucket = self._where.pop(key, None)
+        if bucket is not None:
+            bucket.discard(key)
+        self.deadlines.pop(key, None)
+
+    def _place(self, key: Hashable, deadline_tick: int):
+        delta = deadline_tick - self.current_tick
+        bucket = self.overflow
+        for level, size in enumerate(self.sizes):
+            if delta < self.spans[level] * size:
+                bucket = self.slots[level][(deadline_tick // self.spans[level]) % size]
+                break
+        bucket.add(key)
+        self._where[key] = bucket
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the wheel to `now` and return every key whose deadline has passed"""
+        target_tick = int(now // self.tick)
+        due: List[Hashable] = []
+        while self.current_tick < target_tick:
+            self.current_tick += 1
+            # Cascade higher levels down as their slot boundaries are crossed
+            for level in range(len(self.sizes) - 1, 0, -1):
+                if self.current_tick % self.spans[level] == 0:
+                    self._redistribute(self.slots[level][(self.current_tick // self.spans[level]) % self.sizes[level]])
+            top_span = self.spans[-1] * self.sizes[-1]
+            if self.current_tick % top_span == 0:
+                self._redistribute(self.overflow)
+
+            bucket = self.slots[0][self.current_tick % self.sizes[0]]
+            for key in list(bucket):
+                if self.deadlines.get(key, 0) <= self.current_tick:
+                    self.cancel(key)
+                    due.append(key)
+                else:
+                    # Wrapped-around placement - not due yet
+                    bucket.discard(key)
+                    self._place(key, self.deadlines[key])
+        return due
+
+    def _redistribute(self, bucket: Set[Hashable]):
+        keys = list(bucket)
+        bucket.clear()
+        for key in keys:
+            self._place(key, self.deadlines[key])
+
+
+class AuctionTimer:
+    def __init__(self, db):
+        self.db = db
+        self.wheel = TimerWheel()
+        self.on_due: Optional[Callable[[List[Hashable]], Awaitable[None]]] = None
+        self.backplane = None
+        self._task: Optional[asyncio.Task] = None
+
+    def attach_backplane(self, backplane):
+        """Receive schedule changes made on other workers"""
+        self.backplane = backplane
+        backplane.register(SCHEDULE_TOPIC, self._apply_remote)
+
+    async def _apply_remote(self, payload: Dict[str, Any]):
+        self._schedule_local(tuple(payload["key"]), payload["deadline"])
+
+    def _schedule_local(self, key: Hashable, deadline: Optional[float]):
+        if deadline is None:
+            self.wheel.cancel(key)
+        else:
+            self.wheel.schedule(key, deadline)
+        metrics.set_gauge("auction_timer_pending", len(self.wheel))
+
+    async def schedule(self, key: Tuple, end) -> None:
+        """(Re)schedule a close - call after creating an auction or moving its end time"""
+        deadline = _close_deadline(end)
+        if deadline is None:
+            return
+        if self.backplane:
+            await self.backplane.publish(SCHEDULE_TOPIC, {"key": list(key), "deadline": deadline})
+        else:
+            self._schedule_local(key, deadline)
+
+    async def load(self) -> int:
+        """Schedule everything ending within the load horizon (indexed queries)"""
+        horizon = datetime.now(timezone.utc) + timedelta(hours=LOAD_HORIZON_HOURS)
+        loaded = 0
+
+        async for listing in self.db.listings.find(
+            {"status": "active", **date_range("auction_end_date", {"$lte": horizon})},
+            {"_id": 0, "id": 1, "auction_end_date": 1}
+        ):
+            self._schedule_local(("listing", listing["id"]), _close_deadline(listing["auction_end_date"]))
+            loaded += 1
+
+        async for lot in self.db.lots.find(
+            {"lot_status": "active", **date_range("auction_end_date", {"$lte": horizon})}, LOT_PROJECTION
+        ):
+            self._schedule_local(("lot_doc", lot["id"]), _close_deadline(lot["auction_end_date"]))
+            loaded += 1
+
+        logger.info(f"⏱️ Auction timer loaded {loaded} close(s) ending within {LOAD_HORIZON_HOURS}h")
+        return loaded
+
+    async def track_listing(self, listing_id: str):
+        """Schedule a single listing from its stored end date (no-op unless active)"""
+        listing = await self.db.listings.find_one(
+            {"id": listing_id, "status": "active"}, {"_id": 0, "auction_end_date": 1}
+        )
+        if listing:
+            await self.schedule(("listing", listing_id), listing.get("auction_end_date"))
+
+    async def track_auction(self, auction_id: str):
+        """Schedule every open lot document of a multi-item auction (no-op unless active)"""
+        if not await self.db.multi_item_listings.find_one({"id": auction_id, "status": "active"}, {"_id": 0, "id": 1}):
+            return
+        async for lot in self.db.lots.find({"auction_id": auction_id, "lot_status": "active"}, LOT_PROJECTION):
+            await self.schedule(("lot_doc", lot["id"]), lot.get("auction_end_date"))
+
+    async def start(self):
+        await self.load()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            try:
+                # Wake just after the next tick boundary
+                await asyncio.sleep(TICK_SECONDS - (time.time() % TICK_SECONDS) + 0.01)
+                now = time.time()
+                due = self.wheel.advance(now)
+                metrics.observe("auction_timer_tick_lag", now - self.wheel.current_tick * TICK_SECONDS)
+                metrics.set_gauge("auction_timer_pending", len(self.wheel))
+                if due and self.on_due:
+                    metrics.inc("auction_timer_fired", len(due))
+                    started = time.perf_counter()
+                    await self.on_due(due)
+                    metrics.observe("auction_timer_batch_seconds", time.perf_counter() - started)
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                logger.error(f"❌ Auction timer tick failed: {e}")
+
+
+# Singleton instance
+_auction_timer = None
+
+
+def get_auction_timer(db=None) -> AuctionTimer:
+    """Get or create the auction timer singleton"""
+    global _auction_timer
+    if _auction_timer is None:
+        _auction_timer = AuctionTimer(db)
+    return _auction_timer
@@ -0,0 +1,150 @@
+"""
+BidVex Auth Cache
+Short-lived per-worker caches for request authentication:
+- Decoded-JWT cache: token -> subject, never outliving the token's own `exp`
+- Authenticated-user LRU: user_id -> validated User model, short TTL
+- Invalidated on profile, role, verification and suspension writes; the
+  invalidation fans out to every worker through the realtime backplane
+- Hit/miss counters in the metrics registry
+
+Usage:
+    cache = get_auth_cache()
+    user_id = cache.token_subject(token, decode_fn)
+    user = await cache.get_user(user_id, load_fn)
+    await cache.invalidate_user(user_id)
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+AUTH_USER_CACHE_TTL = float(os.environ.get("AUTH_USER_CACHE_TTL", "30"))
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL = float(os.environ.get("AUTH_TOKEN_CACHE_TTL", "300"))
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "20000"))
+
+INVALIDATE_TOPIC = "user_invalidate"
+
+metrics = get_metrics()
+
+
+class LRUCache:
+    """OrderedDict LRU with per-entry deadlines (time.monotonic)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class AuthCache:
+    def __init__(
+        self,
+        user_ttl: float = AUTH_USER_CACHE_TTL,
+        user_size: int = AUTH_USER_CACHE_SIZE,
+        token_ttl: float = AUTH_TOKEN_CACHE_TTL,
+        token_size: int = AUTH_TOKEN_CACHE_SIZE,
+    ):
+        self.user_ttl = user_ttl
+        self.token_ttl = token_ttl
+        self.users = LRUCache(user_size)
+        self.tokens = LRUCache(token_size)
+        self.backplane = None
+
+    def attach_backplane(self, backplane):
+        """Receive user invalidations published by other workers"""
+        self.backplane = backplane
+        backplane.register(INVALIDATE_TOPIC, lambda payload: self._drop_user(payload.get("user_id")))
+
+    def token_subject(self, token: str, decode: Callable[[str], dict]) -> Optional[str]:
+        """
+        Return the token's `sub`, decoding (and verifying) only on a cache miss.
+        Decode errors propagate and are never cached.
+        """
+        subject = self.tokens.get(token)
+        if subject is not None:
+            metrics.inc("auth_token_cache_hit")
+            return subject
+
+        metrics.inc("auth_token_cache_miss")
+        payload = decode(token)
+        subject = payload.get("sub")
+        if subject:
+            deadline = time.monotonic() + self.token_ttl
+            exp = payload.get("exp")
+            if exp:
+                # Never serve a token past its own expiry
+                deadline = min(deadline, time.monotonic() + (float(exp) - time.time()))
+            self.tokens.set(token, subject, deadline)
+        return subject
+
+    async def get_user(self, user_id: str, load: Callable[[str], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """Return a copy of the cached User, loading it on a miss (misses are not cached)"""
+        user = self.users.get(user_id)
+        if user is not None:
+            metrics.inc("auth_user_cache_hit")
+            return user.model_copy()
+
+        metrics.inc("auth_user_cache_miss")
+        user = await load(user_id)
+        if user is not None:
+            self.users.set(user_id, user, time.monotonic() + self.user_ttl)
+            return user.model_copy()
+        return None
+
+    async def invalidate_user(self, user_id: Optional[str]):
+        """Drop a user on this worker and every other worker after any write to it"""
+        if not user_id:
+            return
+        if self.backplane:
+            await self.backplane.publish(INVALIDATE_TOPIC, {"user_id": user_id})
+        else:
+            await self._drop_user(user_id)
+
+    async def _drop_user(self, user_id: Optional[str]):
+        if user_id:
+            self.users.pop(user_id)
+            metrics.inc("auth_user_invalidations")
+
+
+# Singleton instance
+_auth_cache = None
+
+
+def get_auth_cache() -> AuthCache:
+    """Get or create the auth cache singleton"""
+    global _auth_cache
+    if _auth_cache is None:
+        _auth_cache = AuthCache()
+    return _auth_cache
@@ -0,0 +1,312 @@
+"""
+BidVex Bid Engine
+Race-free bid placement for single listings and multi-item lots:
+- Compare-and-set commits: the update only matches if the price and end time
+  read by this request are still current and the auction is still active
+- Positional `lots.$` updates so a lot bid never rewrites sibling lots
+- Bounded retry: on a lost race the listing is re-read and the bid re-validated
+- Optional per-listing asyncio lock shards serialize hot listings inside a
+  worker without blocking bids on unrelated listings
+- One bidder gate (phone verified + payment method on file, admins exempt)
+  shared by manual bids, max bids and the proxy engine
+
+Usage:
+    engine = get_bid_engine(db)
+    outcome = await engine.place_lot_bid(auction_id, lot_number, bidder_id, amount, bid_doc,
+                                         min_increment_for=get_minimum_increment)
+"""
+
+import os
+import zlib
+import asyncio
+import logging
+import contextlib
+from typing import Dict, Any, Iterable, Optional, Callable, Set
+from datetime import datetime, timezone, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Lock shards per worker (0 disables in-process serialization, CAS still applies)
+DEFAULT_LOCK_SHARDS = int(os.environ.get("BID_LOCK_SHARDS", "64"))
+# Attempts before a bid is refused as a conflict
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get("BID_MAX_ATTEMPTS", "5"))
+# Seconds past the end time a bid in flight is still accepted; closes wait this long
+BID_GRACE_PERIOD = int(os.environ.get("BID_GRACE_PERIOD", "5"))
+
+# Lots in these states no longer accept bids
+CLOSED_LOT_STATUSES = ["sold_out", "sold", "ended", "ended_no_bids", "closing"]
+
+LISTING_FIELDS = {
+    "_id": 0, "id": 1, "seller_id": 1, "status": 1, "title": 1,
+    "current_price": 1, "highest_bidder_id": 1, "bid_count": 1,
+    "auction_end_date": 1, "extension_count": 1, "increment_option": 1,
+}
+
+AUCTION_FIELDS = {
+    "_id": 0, "id": 1, "seller_id": 1, "status": 1, "title": 1,
+    "increment_option": 1, "auction_end_date": 1, "lots.$": 1,
+}
+
+
+PHONE_REQUIRED = "Phone verification required. Please verify your phone number before placing bids."
+PAYMENT_REQUIRED = "Payment method required. Please add a payment card before placing bids."
+
+
+class BidRejected(Exception):
+    """A bid that cannot be accepted; carries the HTTP status the API should return"""
+
+    def __init__(self, message: str, status_code: int = 400, current_price: Optional[float] = None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.current_price = current_price
+
+
+def _parse_end(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _same_type(reference, value: datetime):
+    """Store a new end time in the same representation as the one it replaces"""
+    return value if isinstance(reference, datetime) else value.isoformat()
+
+
+def _end_guard(stored, cutoff: datetime):
+    """Filter clause for 'end time is still after cutoff', typed like the stored value"""
+    if stored is None:
+        return None
+    return {"$gt": _same_type(stored, cutoff)}
+
+
+async def check_bidder(db, user_id: str, role: Optional[str], phone_verified: bool) -> None:
+    """Raise BidRejected (403) unless the user may bid: phone verified and a payment method on file"""
+    if role == "admin":
+        return
+    if not phone_verified:
+        raise BidRejected(PHONE_REQUIRED, status_code=403)
+    if await db.payment_methods.count_documents({"user_id": user_id}, limit=1) == 0:
+        raise BidRejected(PAYMENT_REQUIRED, status_code=403)
+
+
+async def eligible_bidders(db, user_ids: Iterable[str]) -> Set[str]:
+    """The subset of user_ids that currently pass check_bidder (two queries for the whole set)"""
+    ids = list(set(user_ids))
+    if not ids:
+        return set()
+    users = await db.users.find(
+        {"id": {"$in": ids}}, {"_id": 0, "id": 1, "role": 1, "phone_verified": 1}
+    ).to_list(len(ids))
+    with_payment = set(await db.payment_methods.distinct("user_id", {"user_id": {"$in": ids}}))
+    return {
+        user["id"] for user in users
+        if user.get("role") == "admin" or (user.get("phone_verified") and user["id"] in with_payment)
+    }
+
+
+class BidEngine:
+    def __init__(self, db, lock_shards: int = DEFAULT_LOCK_SHARDS, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.db = db
+        self.max_attempts = max(1, max_attempts)
+        self._locks = [asyncio.Lock() for _ in range(lock_shards)] if lock_shards > 0 else []
+        self.stats = {"committed": 0, "conflicts": 0, "rejected": 0, "exhausted": 0}
+
+    def _shard(self, key: str):
+        """Lock for the shard owning `key` (a no-op context when sharding is disabled)"""
+        if not self._locks:
+            return contextlib.nullcontext()
+        return self._locks[zlib.crc32(key.encode()) % len(self._locks)]
+
+    def _reject(self, message: str, current_price: Optional[float] = None, status_code: int = 400):
+        self.stats["rejected"] += 1
+        return BidRejected(message, status_code=status_code, current_price=current_price)
+
+    def _check_amount(self, amount: float, current_price: float, min_increment: float):
+        min_bid = current_price + min_increment
+        if amount <= current_price:
+            raise self._reject(f"Your bid must be at least ${min_bid:.2f} to lead.", current_price)
+        if amount < min_bid:
+            raise self._reject(
+                f"Minimum bid increment is ${min_increment:.2f}. Your bid must be at least ${min_bid:.2f}.",
+                current_price
+            )
+
+    # ========== SINGLE LISTINGS ==========
+
+    async def place_listing_bid(
+        self,
+        listing_id: str,
+        bidder_id: str,
+        amount: float,
+        bid_doc: Dict[str, Any],
+        min_increment_for: Callable[[Dict[str, Any], float], float],
+        anti_snipe_window: Optional[int] = None,
+        grace_period: int = BID_GRACE_PERIOD,
+        snapshot: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Commit a bid on a single listing.
+
+        Returns the pre-bid listing snapshot plus extension details. The bid
+        document is inserted into `bids` only once the price update committed.
+        """
+        async with self._shard(listing_id):
+            for attempt in range(1, self.max_attempts + 1):
+                if snapshot is None:
+                    snapshot = await self.db.listings.find_one({"id": listing_id}, LISTING_FIELDS)
+                if not snapshot:
+                    raise self._reject("Listing not found", status_code=404)
+                if snapshot.get("status") != "active":
+                    raise self._reject("Listing is not active")
+
+                now = datetime.now(timezone.utc)
+                stored_end = snapshot.get("auction_end_date")
+                auction_end = _parse_end(stored_end)
+                time_remaining = (auction_end - now).total_seconds() if auction_end else None
+                if time_remaining is not None and time_remaining < -grace_period:
+                    raise self._reject("Auction has ended")
+
+                current_price = snapshot["current_price"]
+                self._check_amount(amount, current_price, min_increment_for(snapshot, current_price))
+
+                new_end = None
+                if anti_snipe_window and time_remaining is not None and time_remaining <= anti_snipe_window:
+                    new_end = now + timedelta(seconds=anti_snipe_window)
+
+                cas_filter = {"id": listing_id, "status": "active", "current_price": current_price}
+                end_guard = _end_guard(stored_end, now - timedelta(seconds=grace_period))
+                if end_guard:
+                    cas_filter["auction_end_date"] = end_guard
+
+                update = {
+                    "$set": {"current_price": amount, "highest_bidder_id": bidder_id},
+                    "$inc": {"bid_count": 1},
+                }
+                if new_end:
+                    update["$set"]["auction_end_date"] = _same_type(stored_end, new_end)
+                    update["$inc"]["extension_count"] = 1
+
+                result = await self.db.listings.update_one(cas_filter, update)
+                if result.modified_count == 1:
+                    await self.db.bids.insert_one(bid_doc)
+                    self.stats["committed"] += 1
+                    return {
+                        "previous": snapshot,
+                        "bid_count": snapshot.get("bid_count", 0) + 1,
+                        "extension_applied": new_end is not None,
+                        "new_end": new_end,
+                        "attempts": attempt,
+                    }
+
+                # Lost the race to another writer - re-read and re-validate
+                self.stats["conflicts"] += 1
+                snapshot = None
+
+        self.stats["exhausted"] += 1
+        logger.warning(f"⚠️ Bid on listing {listing_id} gave up after {self.max_attempts} conflicting attempts")
+        raise BidRejected("Bidding is very active on this item. Please try again.", status_code=409)
+
+    # ========== MULTI-ITEM LOTS ==========
+
+    async def place_lot_bid(
+        self,
+        auction_id: str,
+        lot_number: int,
+        bidder_id: str,
+        amount: float,
+        bid_doc: Dict[str, Any],
+        min_increment_for: Callable[[Dict[str, Any], float], float],
+        anti_snipe_window: Optional[int] = None,
+        grace_period: int = BID_GRACE_PERIOD,
+    ) -> Dict[str, Any]:
+        """
+        Commit a bid on one lot of a multi-item auction with a positional update.
+
+        Returns the pre-bid auction snapshot (`lots` holds only the target lot)
+        plus extension details. The bid document is inserted into `lot_bids`
+        only once the price update committed.
+        """
+        async with self._shard(f"{auction_id}:{lot_number}"):
+            for attempt in range(1, self.max_attempts + 1):
+                snapshot = await self.db.multi_item_listings.find_one(
+                    {"id": auction_id, "lots.lot_number": lot_number},
+                    AUCTION_FIELDS
+                )
+                if not snapshot:
+                    raise self._reject("Lot not found", status_code=404)
+                if snapshot.get("status") != "active":
+                    raise self._reject("Auction is not active")
+
+                lot = snapshot["lots"][0]
+                if lot.get("lot_status") in CLOSED_LOT_STATUSES:
+                    raise self._reject("This lot is no longer accepting bids")
+
+                now = datetime.now(timezone.utc)
+                stored_end = lot.get("lot_end_time")
+                lot_end = _parse_end(stored_end)
+                time_remaining = (lot_end - now).total_seconds() if lot_end else None
+                if time_remaining is not None and time_remaining < -grace_period:
+                    raise self._reject("This lot has ended")
+
+                current_price = lot.get("current_price", lot.get("starting_price", 0))
+                self._check_amount(amount, current_price, min_increment_for(snapshot, current_price))
+
+                new_end = None
+                if anti_snipe_window and time_remaining is not None and 0 < time_remaining <= anti_snipe_window:
+                    new_end = now + timedelta(seconds=anti_snipe_window)
+
+                lot_match = {
+                    "lot_number": lot_number,
+                    "current_price": current_price,
+                    "lot_status": {"$nin": CLOSED_LOT_STATUSES},
+                }
+                end_guard = _end_guard(stored_end, now - timedelta(seconds=grace_period))
+                if end_guard:
+                    lot_match["lot_end_time"] = end_guard
+
+                update = {
+                    "$set": {"lots.$.current_price": amount, "lots.$.highest_bidder_id": bidder_id},
+                    "$inc": {"lots.$.bid_count": 1},
+                }
+                if new_end:
+                    update["$set"]["lots.$.lot_end_time"] = _same_type(stored_end, new_end)
+                    update["$inc"]["lots.$.extension_count"] = 1
+
+                result = await self.db.multi_item_listings.update_one(
+                    {"id": auction_id, "status": "active", "lots": {"$elemMatch": lot_match}},
+                    update
+                )
+                if result.modified_count == 1:
+                    await self.db.lot_bids.insert_one(bid_doc)
+                    self.stats["committed"] += 1
+                    return {
+                        "previous": snapshot,
+                        "extension_applied": new_end is not None,
+                        "new_end": new_end,
+                        "extension_count": lot.get("extension_count", 0) + (1 if new_end else 0),
+                        "attempts": attempt,
+                    }
+
+                # Lost the race to another writer - re-read and re-validate
+                self.stats["conflicts"] += 1
+
+        self.stats["exhausted"] += 1
+        logger.warning(f"⚠️ Bid on lot {auction_id}#{lot_number} gave up after {self.max_attempts} conflicting attempts")
+        raise BidRejected("Bidding is very active on this lot. Please try again.", status_code=409)
+
+
+# Singleton instance
+_bid_engine = None
+
+
+def get_bid_engine(db) -> BidEngine:
+    """Get or create the bid engine singleton"""
+    global _bid_engine
+    if _bid_engine is None:
+        _bid_engine = BidEngine(db)
+    return _bid_engine
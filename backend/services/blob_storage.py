@@ -0,0 +1,468 @@
+"""
+BidVex Blob Storage
+Attachments (auction documents, message files) stored outside the documents
+that reference them:
+- Uploads stream through in BLOB_CHUNK_SIZE chunks; the size cap is enforced
+  and the sha256 computed on the way in, never holding a whole file in memory
+- Content-addressed: the sha256 is the blob id, so identical files are stored
+  once and the id doubles as the HTTP ETag
+- Backends (BLOB_BACKEND): "gridfs" (default, same database), "local"
+  filesystem, or "s3" for any S3-compatible store (boto3)
+- Listings and messages keep only a reference: {blob_id, filename,
+  content_type, size, sha256}; blobs referenced by a message are private
+  to that conversation (message_blob_access)
+- Each blob records who uploaded it; a listing may only reference blobs its
+  seller uploaded and that no message carries
+- Downloads stream in chunks from any offset, for HTTP Range requests
+
+Usage:
+    storage = get_blob_storage(db)
+    ref = await storage.put(upload_chunks(file), file.filename, file.content_type)
+    blob = await storage.get(ref["blob_id"])
+    start, end = parse_range(request.headers.get("range"), blob["size"]) or (0, blob["size"] - 1)
+    StreamingResponse(storage.stream(blob, start, end), ...)
+    python -m services.blob_storage [--dry-run]   # move base64 auction documents into storage
+"""
+
+import os
+import sys
+import base64
+import asyncio
+import binascii
+import hashlib
+import logging
+import tempfile
+from uuid import uuid4
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from services.metrics import get_metrics
+
+try:
+    import boto3
+except ImportError:  # pragma: no cover - only needed for BLOB_BACKEND=s3
+    boto3 = None
+
+logger = logging.getLogger(__name__)
+
+BLOB_BACKEND = os.environ.get("BLOB_BACKEND", "gridfs")
+BLOB_CHUNK_SIZE = int(os.environ.get("BLOB_CHUNK_SIZE", str(256 * 1024)))
+BLOB_MAX_BYTES = int(os.environ.get("BLOB_MAX_BYTES", str(10 * 1024 * 1024)))
+BLOB_LOCAL_DIR = os.environ.get("BLOB_LOCAL_DIR", "/app/uploads/blobs")
+BLOB_GRIDFS_BUCKET = os.environ.get("BLOB_GRIDFS_BUCKET", "blob_data")
+BLOB_S3_BUCKET = os.environ.get("BLOB_S3_BUCKET", "")
+BLOB_S3_PREFIX = os.environ.get("BLOB_S3_PREFIX", "blobs/")
+BLOB_S3_ENDPOINT_URL = os.environ.get("BLOB_S3_ENDPOINT_URL") or None
+
+# Auction document slots (multi_item_listings.documents)
+DOCUMENT_TYPES = ("terms_conditions", "important_info", "catalogue")
+
+metrics = get_metrics()
+
+
+class BlobTooLarge(Exception):
+    """Upload exceeded the size cap; nothing was stored"""
+
+
+class RangeNotSatisfiable(Exception):
+    """Range header outside the blob (HTTP 416)"""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) inclusive for a single-range "bytes=" header, or None to
+    send the whole blob (no header, or a form we don't serve such as
+    multiple ranges). Raises RangeNotSatisfiable past the end.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable(header)
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+async def upload_chunks(upload, chunk_size: int = BLOB_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Chunks from a FastAPI UploadFile (already spooled to disk by Starlette)"""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def bytes_chunks(data: bytes, chunk_size: int = BLOB_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset:offset + chunk_size]
+
+
+# ========== BACKENDS ==========
+# Each backend stages an upload while it is hashed, then commits it under a
+# key. Local and S3 keys are the sha256 itself, so committing a duplicate is
+# idempotent; GridFS keys are file ids.
+
+class GridFSBackend:
+    name = "gridfs"
+
+    def __init__(self, db, bucket_name: str = BLOB_GRIDFS_BUCKET):
+        from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name, chunk_size_bytes=BLOB_CHUNK_SIZE)
+
+    async def stage(self):
+        return self.bucket.open_upload_stream(uuid4().hex)
+
+    async def write(self, staged, chunk: bytes):
+        await staged.write(chunk)
+
+    async def commit(self, staged, sha256: str) -> str:
+        await staged.close()
+        return str(staged._id)
+
+    async def discard(self, staged):
+        await staged.abort()
+
+    async def read(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        from bson import ObjectId
+        grid_out = await self.bucket.open_download_stream(ObjectId(key))
+        grid_out.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await grid_out.read(min(BLOB_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    async def delete(self, key: str):
+        from bson import ObjectId
+        await self.bucket.delete(ObjectId(key))
+
+
+class LocalBackend:
+    name = "local"
+
+    def __init__(self, root: str = BLOB_LOCAL_DIR):
+        self.root = Path(root)
+        self.staging = self.root / ".staging"
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    async def stage(self):
+        self.staging.mkdir(parents=True, exist_ok=True)
+        return await asyncio.to_thread(open, self.staging / uuid4().hex, "wb")
+
+    async def write(self, staged, chunk: bytes):
+        await asyncio.to_thread(staged.write, chunk)
+
+    async def commit(self, staged, sha256: str) -> str:
+        key = f"{sha256[:2]}/{sha256}"
+        await asyncio.to_thread(staged.close)
+        self._path(key).parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged.name, self._path(key))
+        return key
+
+    async def discard(self, staged):
+        await asyncio.to_thread(staged.close)
+        Path(staged.name).unlink(missing_ok=True)
+
+    async def read(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        handle = await asyncio.to_thread(open, self._path(key), "rb")
+        try:
+            await asyncio.to_thread(handle.seek, start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await asyncio.to_thread(handle.read, min(BLOB_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            handle.close()
+
+    async def delete(self, key: str):
+        self._path(key).unlink(missing_ok=True)
+
+
+class S3Backend:
+    name = "s3"
+
+    def __init__(self, bucket: str = BLOB_S3_BUCKET, prefix: str = BLOB_S3_PREFIX,
+                 endpoint_url: Optional[str] = BLOB_S3_ENDPOINT_URL):
+        if boto3 is None:
+            raise RuntimeError("BLOB_BACKEND=s3 requires boto3")
+        if not bucket:
+            raise RuntimeError("BLOB_BACKEND=s3 requires BLOB_S3_BUCKET")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    async def stage(self):
+        # Spools to disk past one chunk; boto3 uploads it multipart on commit
+        return tempfile.SpooledTemporaryFile(max_size=BLOB_CHUNK_SIZE)
+
+    async def write(self, staged, chunk: bytes):
+        await asyncio.to_thread(staged.write, chunk)
+
+    async def commit(self, staged, sha256: str) -> str:
+        key = f"{self.prefix}{sha256}"
+        try:
+            staged.seek(0)
+            await asyncio.to_thread(self.client.upload_fileobj, staged, self.bucket, key)
+        finally:
+            staged.close()
+        return key
+
+    async def discard(self, staged):
+        staged.close()
+
+    async def read(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        response = await asyncio.to_thread(
+            self.client.get_object, Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}"
+        )
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, BLOB_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+
+def make_backend(db, name: str = BLOB_BACKEND):
+    if name == "gridfs":
+        return GridFSBackend(db)
+    if name == "local":
+        return LocalBackend()
+    if name == "s3":
+        return S3Backend()
+    raise ValueError(f"Unknown BLOB_BACKEND: {name}")
+
+
+# ========== STORAGE ==========
+
+class BlobStorage:
+    """Blob records live in db.blobs ({id: sha256, size, content_type, backend, key}); bytes in the backend"""
+
+    def __init__(self, db, backend=None, max_bytes: int = BLOB_MAX_BYTES):
+        self.db = db
+        self.backend = backend if backend is not None else make_backend(db)
+        self.max_bytes = max_bytes
+
+    async def put(self, chunks: AsyncIterator[bytes], filename: str, content_type: str,
+                  max_bytes: Optional[int] = None, uploader_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Stream an upload into storage; returns the reference to embed. Raises BlobTooLarge.
+        uploader_id is added to the blob's `uploaders`, whether or not the content was new.
+        """
+        limit = max_bytes or self.max_bytes
+        digest = hashlib.sha256()
+        size = 0
+        staged = await self.backend.stage()
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > limit:
+                    raise BlobTooLarge(f"File too large. Maximum size is {limit / (1024 * 1024):.0f}MB")
+                digest.update(chunk)
+                await self.backend.write(staged, chunk)
+        except BaseException:
+            await self.backend.discard(staged)
+            raise
+
+        sha256 = digest.hexdigest()
+        existing = await self.db.blobs.find_one({"id": sha256}, {"_id": 0})
+        if existing:
+            await self.backend.discard(staged)
+            metrics.inc("blob_dedup_hits")
+        else:
+            key = await self.backend.commit(staged, sha256)
+            record = {
+                "id": sha256, "size": size, "content_type": content_type,
+                "backend": self.backend.name, "key": key, "created_at": datetime.now(timezone.utc),
+                "uploaders": [uploader_id] if uploader_id else [],
+            }
+            try:
+                await self.db.blobs.insert_one(record)
+                metrics.inc("blob_bytes_written", size)
+            except DuplicateKeyError:
+                # Same content uploaded concurrently; keep the first copy
+                existing = await self.db.blobs.find_one({"id": sha256}, {"_id": 0})
+                if existing and existing["key"] != key:
+                    await self.backend.delete(key)
+        if existing and uploader_id:
+            await self.db.blobs.update_one({"id": sha256}, {"$addToSet": {"uploaders": uploader_id}})
+        metrics.inc("blob_uploads")
+        return {"blob_id": sha256, "filename": filename, "content_type": content_type, "size": size, "sha256": sha256}
+
+    async def put_bytes(self, data: bytes, filename: str, content_type: str,
+                        uploader_id: Optional[str] = None) -> Dict[str, Any]:
+        return await self.put(bytes_chunks(data), filename, content_type, uploader_id=uploader_id)
+
+    async def get(self, blob_id: str) -> Optional[Dict[str, Any]]:
+        return await self.db.blobs.find_one({"id": blob_id}, {"_id": 0})
+
+    async def stream(self, blob: Dict[str, Any], start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Bytes start..end (inclusive) of a blob record"""
+        end = blob["size"] - 1 if end is None else end
+        if blob["size"] == 0 or end < start:
+            return
+        async for chunk in self.backend.read(blob["key"], start, end):
+            yield chunk
+
+
+_blob_storage: Optional[BlobStorage] = None
+
+
+def get_blob_storage(db=None) -> BlobStorage:
+    global _blob_storage
+    if _blob_storage is None:
+        if db is None:
+            raise RuntimeError("Blob storage not initialized")
+        _blob_storage = BlobStorage(db)
+    return _blob_storage
+
+
+# ========== ACCESS ==========
+
+async def message_blob_access(db, blob_id: str, user_id: Optional[str]) -> Optional[bool]:
+    """
+    None if no message carries the blob (public document); otherwise whether
+    the user sent or received one, or is a participant of its conversation
+    """
+    messages = await db.messages.find(
+        {"attachments.blob_id": blob_id},
+        {"_id": 0, "conversation_id": 1, "sender_id": 1, "receiver_id": 1}
+    ).to_list(100)
+    if not messages:
+        return None
+    if not user_id:
+        return False
+    if any(user_id in (m.get("sender_id"), m.get("receiver_id")) for m in messages):
+        return True
+    conversation = await db.conversations.find_one(
+        {"id": {"$in": list({m.get("conversation_id") for m in messages})}, "participants": user_id},
+        {"_id": 1}
+    )
+    return conversation is not None
+
+
+# ========== AUCTION DOCUMENTS ==========
+
+def decode_document(document: Dict[str, Any]) -> bytes:
+    """Bytes of a legacy inline document ({filename, content_type, base64_content}); ValueError if corrupt"""
+    content = document.get("base64_content") or ""
+    try:
+        return base64.b64decode(content.split("base64,")[-1])
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"Invalid base64 content: {e}")
+
+
+async def check_document_blob(db, blob_id: str, owner_id: str) -> None:
+    """ValueError unless owner_id uploaded the blob and no message carries it"""
+    if not await db.blobs.find_one({"id": blob_id, "uploaders": owner_id}, {"_id": 1}):
+        raise ValueError(f"Unknown document file: {blob_id}")
+    if await message_blob_access(db, blob_id, None) is not None:
+        raise ValueError(f"Unknown document file: {blob_id}")
+
+
+async def store_documents(storage: BlobStorage, documents: Optional[Dict[str, Any]],
+                          owner_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Replace inline base64 documents with blob references uploaded as owner_id.
+    Existing references must pass check_document_blob; ValueError otherwise.
+    """
+    if not documents:
+        return documents
+    stored = {}
+    for doc_type, document in documents.items():
+        if isinstance(document, dict) and document.get("base64_content"):
+            stored[doc_type] = await storage.put_bytes(
+                decode_document(document),
+                document.get("filename") or f"{doc_type}.pdf",
+                document.get("content_type") or "application/octet-stream",
+                uploader_id=owner_id,
+            )
+        else:
+            if isinstance(document, dict) and document.get("blob_id"):
+                await check_document_blob(storage.db, document["blob_id"], owner_id)
+            stored[doc_type] = document
+    return stored
+
+
+async def migrate_documents(db, storage: BlobStorage, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Move inline base64 documents of existing auctions into blob storage.
+    Each write is guarded on the base64 content that was read, so a document
+    replaced by the seller mid-migration is left alone (counted as "changed").
+    """
+    query = {"$or": [{f"documents.{t}.base64_content": {"$exists": True}} for t in DOCUMENT_TYPES]}
+    stats = {"auctions": 0, "documents": 0, "invalid": 0, "changed": 0}
+    async for auction in db.multi_item_listings.find(query, {"_id": 1, "id": 1, "seller_id": 1, "documents": 1}):
+        inline = {t: d for t, d in auction["documents"].items() if isinstance(d, dict) and d.get("base64_content")}
+        updates = {}
+        for doc_type, document in inline.items():
+            if dry_run:
+                updates[doc_type] = None
+                continue
+            try:
+                updates[f"documents.{doc_type}"] = (await store_documents(storage, {doc_type: document}, auction.get("seller_id")))[doc_type]
+            except ValueError as e:
+                stats["invalid"] += 1
+                logger.warning(f"⚠️ Auction {auction.get('id')} {doc_type}: {e}")
+        if updates and not dry_run:
+            guard = {f"{path}.base64_content": inline[path.split(".", 1)[1]]["base64_content"] for path in updates}
+            result = await db.multi_item_listings.update_one({"_id": auction["_id"], **guard}, {"$set": updates})
+            if result.modified_count == 0:
+                stats["changed"] += 1
+                logger.warning(f"⚠️ Auction {auction.get('id')} documents changed during migration - skipped")
+                continue
+        stats["auctions"] += 1 if updates else 0
+        stats["documents"] += len(updates)
+    return stats
+
+
+async def _main(argv: List[str]) -> int:
+    import argparse
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    parser = argparse.ArgumentParser(description="Move inline base64 auction documents into blob storage")
+    parser.add_argument("--dry-run", action="store_true", help="count documents that would move without writing")
+    args = parser.parse_args(argv)
+
+    load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[os.environ.get("DB_NAME", "bidvex")]
+
+    try:
+        stats = await migrate_documents(db, BlobStorage(db), args.dry_run)
+        verb = "Would move" if args.dry_run else "Moved"
+        print(f"{verb} {stats['documents']} document(s) from {stats['auctions']} auction(s), "
+              f"{stats['invalid']} unreadable, {stats['changed']} auction(s) changed mid-run")
+        return 1 if stats["invalid"] else 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
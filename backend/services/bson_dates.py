@@ -0,0 +1,191 @@
+"""
+BidVex BSON Dates
+Listing and auction timestamps as native BSON datetimes instead of ISO strings:
+- CLIENT_OPTIONS makes the driver decode every BSON date as a timezone-aware
+  UTC datetime, so endpoints return documents without per-row fromisoformat
+- DATE_FIELDS lists the timestamp fields migrated per collection
+- migrate() converts remaining ISO strings in batches, guarded per document
+  so a concurrent write (bid extension, admin edit) is never overwritten
+- date_range() builds range filters that also match not-yet-migrated strings
+  until LEGACY_STRING_DATES is switched off; string comparisons only order
+  correctly when every value carries the same UTC offset
+
+Usage:
+    client = AsyncIOMotorClient(mongo_url, **CLIENT_OPTIONS)
+    query.update(date_range("auction_end_date", {"$lte": now}))
+    python -m services.bson_dates [--dry-run] [--batch-size 500]
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+CLIENT_OPTIONS = {"tz_aware": True}
+
+# Range queries also match ISO strings until the migration has been run everywhere
+LEGACY_STRING_DATES = os.environ.get("LEGACY_STRING_DATES", "true").lower() == "true"
+
+MIGRATION_BATCH_SIZE = int(os.environ.get("DATE_MIGRATION_BATCH_SIZE", "500"))
+
+# {collection: [fields]}; "lots.lot_end_time" is a field of each embedded lot
+DATE_FIELDS: Dict[str, List[str]] = {
+    "listings": ["created_at", "auction_end_date"],
+    "multi_item_listings": ["created_at", "auction_end_date", "auction_start_date", "lots.lot_end_time"],
+    "lots": ["created_at", "auction_end_date"],
+}
+
+
+def to_datetime(value) -> Optional[datetime]:
+    """Aware UTC datetime from a BSON date, ISO string or naive datetime; None if unparseable"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def date_range(field: str, bounds: Dict[str, datetime]) -> Dict[str, Any]:
+    """
+    Filter for `field` within `bounds` ({"$lte": dt, ...}). While legacy
+    strings remain, a second branch compares them as ISO strings the way the
+    old queries did; both branches are index range scans.
+    """
+    native = {field: dict(bounds)}
+    if not LEGACY_STRING_DATES:
+        return native
+    legacy = {field: {op: when.isoformat() for op, when in bounds.items()}}
+    return {"$or": [native, legacy]}
+
+
+# ========== MIGRATION ==========
+
+def _array_field(field: str):
+    array, _, leaf = field.partition(".")
+    return (array, leaf) if leaf else (None, field)
+
+
+def _string_filter(fields: List[str]) -> Dict[str, Any]:
+    return {"$or": [{field: {"$type": "string"}} for field in fields]}
+
+
+def conversions(doc: Dict[str, Any], fields: List[str]) -> Dict[str, tuple]:
+    """
+    {path: (stored string, datetime)} for every string timestamp in `doc`.
+    Array fields expand to positional paths (lots.3.lot_end_time).
+    Unparseable strings map to (string, None) and are left in place.
+    """
+    found: Dict[str, tuple] = {}
+    for field in fields:
+        array, leaf = _array_field(field)
+        if array is None:
+            value = doc.get(leaf)
+            if isinstance(value, str):
+                found[leaf] = (value, to_datetime(value))
+            continue
+        for index, element in enumerate(doc.get(array) or []):
+            value = element.get(leaf) if isinstance(element, dict) else None
+            if isinstance(value, str):
+                found[f"{array}.{index}.{leaf}"] = (value, to_datetime(value))
+    return found
+
+
+def conversion_update(doc_id, found: Dict[str, tuple]) -> Optional[UpdateOne]:
+    """Guarded update: only applies if every converted field still holds the string we read"""
+    converted = {path: when for path, (_, when) in found.items() if when is not None}
+    if not converted:
+        return None
+    guard = {"_id": doc_id, **{path: found[path][0] for path in converted}}
+    return UpdateOne(guard, {"$set": converted})
+
+
+async def migrate_collection(collection, fields: List[str], batch_size: int = MIGRATION_BATCH_SIZE,
+                             dry_run: bool = False) -> Dict[str, int]:
+    """Convert string timestamps in one collection, walking _id in batches"""
+    projection = {_array_field(f)[0] or f: 1 for f in fields}
+    stats = {"scanned": 0, "converted": 0, "skipped": 0, "invalid": 0}
+    last_id = None
+
+    while True:
+        query = _string_filter(fields)
+        if last_id is not None:
+            query = {"$and": [{"_id": {"$gt": last_id}}, query]}
+        batch = await collection.find(query, projection).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+
+        operations = []
+        for doc in batch:
+            found = conversions(doc, fields)
+            stats["scanned"] += 1
+            stats["invalid"] += sum(1 for _, when in found.values() if when is None)
+            update = conversion_update(doc["_id"], found)
+            if update is not None:
+                operations.append(update)
+
+        if operations and not dry_run:
+            result = await collection.bulk_write(operations, ordered=False)
+            stats["converted"] += result.modified_count
+            # Guards that missed lost a race with a live write; rerun to pick them up
+            stats["skipped"] += len(operations) - result.modified_count
+        elif operations:
+            stats["converted"] += len(operations)
+
+    return stats
+
+
+async def migrate(db, batch_size: int = MIGRATION_BATCH_SIZE, dry_run: bool = False,
+                  collections: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+    """Run the migration over every registered collection (or the named ones)"""
+    report = {}
+    for name, fields in DATE_FIELDS.items():
+        if collections and name not in collections:
+            continue
+        report[name] = await migrate_collection(db[name], fields, batch_size, dry_run)
+        logger.info(f"🗓️ {name}: {report[name]}")
+    return report
+
+
+async def _main(argv: List[str]) -> int:
+    import argparse
+    from dotenv import load_dotenv
+    from pathlib import Path
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    parser = argparse.ArgumentParser(description="Convert ISO-string timestamps to BSON dates")
+    parser.add_argument("--dry-run", action="store_true", help="count documents that would change without writing")
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE)
+    parser.add_argument("--collection", action="append", choices=sorted(DATE_FIELDS), help="limit to a collection (repeatable)")
+    args = parser.parse_args(argv)
+
+    load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"), **CLIENT_OPTIONS)
+    db = client[os.environ.get("DB_NAME", "bidvex")]
+
+    try:
+        report = await migrate(db, args.batch_size, args.dry_run, args.collection)
+        verb = "Would convert" if args.dry_run else "Converted"
+        for name, stats in report.items():
+            print(f"{name}: {verb} {stats['converted']}/{stats['scanned']} document(s), "
+                  f"{stats['skipped']} raced, {stats['invalid']} unparseable value(s)")
+        return 1 if any(stats["skipped"] for stats in report.values()) else 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,95 @@
+"""
+BidVex Config Cache
+In-process, TTL-bounded cache for admin-edited configuration documents
+(marketplace settings, email templates, site config):
+- One database read per key per TTL window per worker (single-flight on miss)
+- Admin writes invalidate immediately; invalidations fan out to every worker
+  through the realtime backplane
+- Hit/miss counters in the metrics registry
+
+Usage:
+    cache = get_config_cache()
+    settings = await cache.get("marketplace_settings", load_settings_from_db)
+    await cache.invalidate("marketplace_settings")
+"""
+
+import os
+import copy
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on staleness if an invalidation is ever missed
+CONFIG_CACHE_TTL = float(os.environ.get("CONFIG_CACHE_TTL", "60"))
+
+INVALIDATE_TOPIC = "config_invalidate"
+
+metrics = get_metrics()
+
+
+class ConfigCache:
+    def __init__(self, ttl: float = CONFIG_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.backplane = None
+
+    def attach_backplane(self, backplane):
+        """Receive invalidations published by other workers"""
+        self.backplane = backplane
+        backplane.register(INVALIDATE_TOPIC, lambda payload: self._drop(payload.get("key")))
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return a private copy of the cached value, loading it on a miss.
+        Callers may mutate the result freely.
+        """
+        entry = self._entries.get(key)
+        if entry and entry[1] > time.monotonic():
+            metrics.inc(f"config_cache_hit:{key}")
+            return copy.deepcopy(entry[0])
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have loaded it while we waited
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                metrics.inc(f"config_cache_hit:{key}")
+                return copy.deepcopy(entry[0])
+
+            metrics.inc(f"config_cache_miss:{key}")
+            value = await loader()
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            return copy.deepcopy(value)
+
+    async def invalidate(self, key: Optional[str] = None):
+        """Drop one key (or everything) on this worker and every other worker"""
+        if self.backplane:
+            await self.backplane.publish(INVALIDATE_TOPIC, {"key": key})
+        else:
+            await self._drop(key)
+
+    async def _drop(self, key: Optional[str]):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+        metrics.inc("config_cache_invalidations")
+        logger.debug(f"Config cache invalidated: {key or 'all'}")
+
+
+# Singleton instance
+_config_cache = None
+
+
+def get_config_cache() -> ConfigCache:
+    """Get or create the config cache singleton"""
+    global _config_cache
+    if _config_cache is None:
+        _config_cache = ConfigCache()
+    return _config_cache
@@ -0,0 +1,377 @@
+"""
+BidVex MongoDB Index Registry
+Declares the compound indexes that back every hot query in the API:
+- Applied idempotently at startup (see server.py startup hooks)
+- Drift detection: missing, mismatched and undeclared indexes are reported
+- Query shape checks: explain() every registered shape and flag COLLSCANs
+
+Usage:
+    python -m services.db_indexes            # apply registry and print drift report
+    python -m services.db_indexes --check    # explain() each query shape, exit 1 on COLLSCAN
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+
+# ========== INDEX REGISTRY ==========
+# {collection: [{name, keys, unique, sparse}]}
+# Names are explicit so drift can be detected by name across deployments.
+INDEX_REGISTRY: Dict[str, List[Dict[str, Any]]] = {
+    "users": [
+        {"name": "users_id", "keys": [("id", ASCENDING)], "unique": True},
+        {"name": "users_email", "keys": [("email", ASCENDING)]},
+        {"name": "users_created_id", "keys": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    ],
+    "listings": [
+        {"name": "listings_id", "keys": [("id", ASCENDING)], "unique": True},
+        {"name": "listings_status_created_id", "keys": [("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]},
+        {"name": "listings_status_end", "keys": [("status", ASCENDING), ("auction_end_date", ASCENDING)]},
+        {"name": "listings_status_category_created_id", "keys": [("status", ASCENDING), ("category", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]},
+        {"name": "listings_seller_status_created_id", "keys": [("seller_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]},
+    ],
+    "multi_item_listings": [
+        {"name": "multi_id", "keys": [("id", ASCENDING)], "unique": True},
+        {"name": "multi_status_created_id", "keys": [("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]},
+        {"name": "multi_status_start", "keys": [("status", ASCENDING), ("auction_start_date", ASCENDING)]},
+        {"name": "multi_seller_status_created_id", "keys": [("seller_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]},
+    ],
+    "bids": [
+        {"name": "bids_listing_amount", "keys": [("listing_id", ASCENDING), ("amount", DESCENDING)]},
+        {"name": "bids_listing_created", "keys": [("listing_id", ASCENDING), ("created_at", DESCENDING)]},
+        {"name": "bids_bidder_created", "keys": [("bidder_id", ASCENDING), ("created_at", DESCENDING)]},
+    ],
+    "auto_bids": [
+        {"name": "auto_bids_listing_active_max", "keys": [("listing_id", ASCENDING), ("is_active", ASCENDING), ("max_bid", DESCENDING)]},
+        {"name": "auto_bids_user_active", "keys": [("user_id", ASCENDING), ("is_active", ASCENDING)]},
+    ],
+    "lot_bids": [
+        {"name": "lot_bids_lot_amount", "keys": [("lot_id", ASCENDING), ("amount", DESCENDING)]},
+        {"name": "lot_bids_listing_lot_amount", "keys": [("listing_id", ASCENDING), ("lot_number", ASCENDING), ("amount", DESCENDING)]},
+        {"name": "lot_bids_bidder_created", "keys": [("bidder_id", ASCENDING), ("created_at", DESCENDING)]},
+    ],
+    "lots": [
+        {"name": "lots_id", "keys": [("id", ASCENDING)], "unique": True},
+        {"name": "lots_status_end", "keys": [("lot_status", ASCENDING), ("auction_end_date", ASCENDING)]},
+        {"name": "lots_auction_status", "keys": [("auction_id", ASCENDING), ("lot_status", ASCENDING)]},
+    ],
+    "watchlist": [
+        {"name": "watchlist_user_added", "keys": [("user_id", ASCENDING), ("added_at", DESCENDING)]},
+        {"name": "watchlist_user_item", "keys": [("user_id", ASCENDING), ("item_id", ASCENDING), ("item_type", ASCENDING)]},
+    ],
+    "messages": [
+        {"name": "messages_conversation_created_id", "keys": [("conversation_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]},
+        {"name": "messages_conversation_receiver_read", "keys": [("conversation_id", ASCENDING), ("receiver_id", ASCENDING), ("is_read", ASCENDING)]},
+        {"name": "messages_receiver_read", "keys": [("receiver_id", ASCENDING), ("is_read", ASCENDING)]},
+        {"name": "messages_idempotency", "keys": [("idempotency_key", ASCENDING)], "unique": True, "sparse": True},
+        {"name": "messages_attachment_blob", "keys": [("attachments.blob_id", ASCENDING)], "sparse": True},
+    ],
+    "conversations": [
+        {"name": "conversations_id", "keys": [("id", ASCENDING)], "unique": True},
+        {"name": "conversations_participants_last", "keys": [("participants", ASCENDING), ("last_message_at", DESCENDING)]},
+        {"name": "conversations_listing", "keys": [("listing_id", ASCENDING)]},
+        {"name": "conversations_idempotency", "keys": [("idempotency_key", ASCENDING)], "unique": True, "sparse": True},
+    ],
+    "notifications": [
+        {"name": "notifications_user_created_id", "keys": [("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]},
+        {"name": "notifications_user_read", "keys": [("user_id", ASCENDING), ("read", ASCENDING)]},
+        {"name": "notifications_idempotency", "keys": [("idempotency_key", ASCENDING)], "unique": True, "sparse": True},
+    ],
+    "notification_outbox": [
+        {"name": "outbox_id", "keys": [("id", ASCENDING)], "unique": True},
+        {"name": "outbox_idempotency", "keys": [("idempotency_key", ASCENDING)], "unique": True},
+        {"name": "outbox_channel_status_next", "keys": [("channel", ASCENDING), ("status", ASCENDING), ("next_attempt_at", ASCENDING)]},
+        {"name": "outbox_status_created", "keys": [("status", ASCENDING), ("created_at", ASCENDING)]},
+    ],
+    "invoice_counters": [
+        {"name": "invoice_counters_auction", "keys": [("auction_id", ASCENDING)], "unique": True},
+    ],
+    "email_jobs": [
+        {"name": "email_jobs_id", "keys": [("id", ASCENDING)], "unique": True},
+    ],
+    "analytics_impressions": [
+        {"name": "impressions_listing_timestamp", "keys": [("listing_id", ASCENDING), ("timestamp", ASCENDING)]},
+    ],
+    "analytics_clicks": [
+        {"name": "clicks_listing_timestamp", "keys": [("listing_id", ASCENDING), ("timestamp", ASCENDING)]},
+    ],
+    "marketplace_items": [
+        {"name": "marketplace_id", "keys": [("id", ASCENDING)], "unique": True},
+        {"name": "marketplace_source", "keys": [("source_id", ASCENDING)]},
+        # Keyset pages: every sort key is followed by id
+        {"name": "marketplace_featured_promotion_key", "keys": [("is_featured", DESCENDING), ("promotion_key", DESCENDING), ("id", DESCENDING)]},
+        {"name": "marketplace_featured_end_id", "keys": [("is_featured", DESCENDING), ("lot_end_time", ASCENDING), ("id", ASCENDING)]},
+        {"name": "marketplace_ending_key", "keys": [("ending_key", ASCENDING), ("id", ASCENDING)]},
+        {"name": "marketplace_category_created_id", "keys": [("category", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]},
+        {"name": "marketplace_price_id", "keys": [("current_price", ASCENDING), ("id", ASCENDING)]},
+        {"name": "marketplace_created_id", "keys": [("created_at", DESCENDING), ("id", DESCENDING)]},
+        {"name": "marketplace_synced", "keys": [("synced_at", ASCENDING)]},
+        {"name": "marketplace_search_terms", "keys": [("search_terms", ASCENDING)]},
+    ],
+    "search_index": [
+        {"name": "search_id", "keys": [("id", ASCENDING)], "unique": True},
+        {"name": "search_kind_terms", "keys": [("kind", ASCENDING), ("terms", ASCENDING)]},
+        {"name": "search_prefixes_created", "keys": [("prefixes", ASCENDING), ("created_at", DESCENDING)]},
+        {"name": "search_indexed", "keys": [("indexed_at", ASCENDING)]},
+    ],
+    "blobs": [
+        {"name": "blobs_id", "keys": [("id", ASCENDING)], "unique": True},
+    ],
+    "ratings": [
+        {"name": "ratings_target_timestamp", "keys": [("target_user_id", ASCENDING), ("timestamp", DESCENDING)]},
+    ],
+    "seller_stats": [
+        {"name": "seller_stats_id", "keys": [("id", ASCENDING)], "unique": True},
+        {"name": "seller_stats_rebuilt", "keys": [("rebuilt_at", ASCENDING)]},
+    ],
+}
+
+
+# ========== REGISTERED QUERY SHAPES ==========
+# Representative filters/sorts for the hot paths. Values are placeholders -
+# explain() only cares about the shape of the predicate.
+QUERY_SHAPES: List[Dict[str, Any]] = [
+    {"name": "get_current_user", "collection": "users", "filter": {"id": "x"}},
+    {"name": "login", "collection": "users", "filter": {"email": "x"}},
+    {"name": "admin_users", "collection": "users", "filter": {}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "get_listings", "collection": "listings", "filter": {"status": "active"}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "get_listings_by_category", "collection": "listings", "filter": {"status": "active", "category": "x"}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "process_ended_listings", "collection": "listings", "filter": {"status": "active", "auction_end_date": {"$lte": "x"}}},
+    {"name": "get_seller_listings", "collection": "listings", "filter": {"seller_id": "x", "status": "active"}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "get_multi_item_listings", "collection": "multi_item_listings", "filter": {"status": {"$in": ["active", "upcoming"]}}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "transition_upcoming_auctions", "collection": "multi_item_listings", "filter": {"status": "upcoming", "auction_start_date": {"$lte": "x"}}},
+    {"name": "get_seller_multi_listings", "collection": "multi_item_listings", "filter": {"seller_id": "x", "status": {"$in": ["active", "upcoming"]}}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "highest_bid", "collection": "bids", "filter": {"listing_id": "x"}, "sort": [("amount", DESCENDING)]},
+    {"name": "get_listing_bids", "collection": "bids", "filter": {"listing_id": "x"}, "sort": [("created_at", DESCENDING)]},
+    {"name": "buyer_dashboard_bids", "collection": "bids", "filter": {"bidder_id": "x"}},
+    {"name": "proxy_competitors", "collection": "auto_bids", "filter": {"listing_id": "x", "is_active": True, "max_bid": {"$gte": 1}}, "sort": [("max_bid", DESCENDING)]},
+    {"name": "user_auto_bids", "collection": "auto_bids", "filter": {"user_id": "x", "is_active": True}},
+    {"name": "highest_lot_bid", "collection": "lot_bids", "filter": {"lot_id": "x"}, "sort": [("amount", DESCENDING)]},
+    {"name": "process_ended_lots", "collection": "lots", "filter": {"lot_status": "active", "auction_end_date": {"$lte": "x"}}},
+    {"name": "active_lots_count", "collection": "lots", "filter": {"auction_id": "x", "lot_status": "active"}},
+    {"name": "close_claim_listings", "collection": "listings", "filter": {"status": "closing", "closing_at": {"$lte": "x"}}},
+    {"name": "close_claim_lots", "collection": "lots", "filter": {"lot_status": "closing", "closing_at": {"$lte": "x"}}},
+    {"name": "handshake_conversations", "collection": "conversations", "filter": {"listing_id": {"$in": ["x"]}}},
+    {"name": "outbox_due", "collection": "notification_outbox", "filter": {"channel": "x", "status": "pending", "next_attempt_at": {"$lte": "x"}}},
+    {"name": "email_job_status", "collection": "email_jobs", "filter": {"id": "x"}},
+    {"name": "get_watchlist", "collection": "watchlist", "filter": {"user_id": "x"}, "sort": [("added_at", DESCENDING)]},
+    {"name": "watchlist_exists", "collection": "watchlist", "filter": {"user_id": "x", "item_id": "x", "item_type": "x"}},
+    {"name": "get_messages", "collection": "messages", "filter": {"conversation_id": "x"}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "conversation_unread", "collection": "messages", "filter": {"conversation_id": "x", "receiver_id": "x", "is_read": False}},
+    {"name": "unread_message_count", "collection": "messages", "filter": {"receiver_id": "x", "is_read": False}},
+    {"name": "message_blob_access", "collection": "messages", "filter": {"attachments.blob_id": "x"}},
+    {"name": "get_conversations", "collection": "conversations", "filter": {"participants": "x"}, "sort": [("last_message_at", DESCENDING)]},
+    {"name": "get_notifications", "collection": "notifications", "filter": {"user_id": "x"}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "unread_notifications", "collection": "notifications", "filter": {"user_id": "x", "read": False}},
+    {"name": "impressions_timeline", "collection": "analytics_impressions", "filter": {"listing_id": "x", "timestamp": {"$gte": "x"}}},
+    {"name": "clicks_timeline", "collection": "analytics_clicks", "filter": {"listing_id": "x", "timestamp": {"$gte": "x"}}},
+    {"name": "marketplace_newest", "collection": "marketplace_items", "filter": {}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "marketplace_by_category", "collection": "marketplace_items", "filter": {"category": "x"}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "marketplace_by_price", "collection": "marketplace_items", "filter": {}, "sort": [("current_price", ASCENDING), ("id", ASCENDING)]},
+    {"name": "marketplace_ending_soon", "collection": "marketplace_items", "filter": {}, "sort": [("ending_key", ASCENDING), ("id", ASCENDING)]},
+    {"name": "marketplace_featured_urgent", "collection": "marketplace_items", "filter": {"is_featured": True, "lot_end_time": {"$gt": "x", "$lte": "x"}}, "sort": [("lot_end_time", ASCENDING), ("id", ASCENDING)]},
+    {"name": "marketplace_promoted", "collection": "marketplace_items", "filter": {"is_featured": True}, "sort": [("promotion_key", DESCENDING), ("id", DESCENDING)]},
+    {"name": "marketplace_search", "collection": "marketplace_items", "filter": {"search_terms": {"$all": ["x", "y"]}}, "sort": [("created_at", DESCENDING), ("id", DESCENDING)]},
+    {"name": "search_listings", "collection": "search_index", "filter": {"kind": "listing", "terms": {"$all": ["x", "y"]}}},
+    {"name": "search_suggest", "collection": "search_index", "filter": {"prefixes": "x"}, "sort": [("created_at", DESCENDING)]},
+    {"name": "blob_lookup", "collection": "blobs", "filter": {"id": "x"}},
+    {"name": "recent_ratings", "collection": "ratings", "filter": {"target_user_id": "x"}, "sort": [("timestamp", DESCENDING)]},
+    {"name": "seller_stats_lookup", "collection": "seller_stats", "filter": {"id": "x"}},
+    {"name": "marketplace_source_sync", "collection": "marketplace_items", "filter": {"source_id": "x"}},
+]
+
+
+def _normalize_keys(keys) -> List[tuple]:
+    """
+    Normalize index key specs from the registry or index_information().
+    Numeric directions (1.0 from some servers) become ints; special index
+    types ("text", "2dsphere", "hashed", ...) pass through unchanged.
+    """
+    return [
+        (field, int(direction) if isinstance(direction, (int, float)) else direction)
+        for field, direction in keys
+    ]
+
+
+async def detect_index_drift(db) -> Dict[str, Any]:
+    """
+    Compare the registry against the indexes that actually exist.
+
+    Returns:
+        {
+            "missing": [{collection, name}],
+            "mismatched": [{collection, name, expected, actual}],
+            "undeclared": [{collection, name, keys}]
+        }
+    """
+    report = {"missing": [], "mismatched": [], "undeclared": []}
+
+    for collection, specs in INDEX_REGISTRY.items():
+        existing = await db[collection].index_information()
+        declared_names = set()
+
+        for spec in specs:
+            declared_names.add(spec["name"])
+            actual = existing.get(spec["name"])
+            if actual is None:
+                report["missing"].append({"collection": collection, "name": spec["name"]})
+                continue
+
+            expected_keys = _normalize_keys(spec["keys"])
+            actual_keys = _normalize_keys(actual["key"])
+            if expected_keys != actual_keys or bool(spec.get("unique")) != bool(actual.get("unique")):
+                report["mismatched"].append({
+                    "collection": collection,
+                    "name": spec["name"],
+                    "expected": {"keys": expected_keys, "unique": bool(spec.get("unique"))},
+                    "actual": {"keys": actual_keys, "unique": bool(actual.get("unique"))}
+                })
+
+        for name, info in existing.items():
+            if name == "_id_" or name in declared_names:
+                continue
+            report["undeclared"].append({
+                "collection": collection,
+                "name": name,
+                "keys": _normalize_keys(info["key"])
+            })
+
+    return report
+
+
+async def ensure_indexes(db) -> Dict[str, Any]:
+    """
+    Create every missing registry index and report drift.
+    Mismatched indexes are reported but never dropped automatically -
+    an operator has to decide whether the existing index is still in use.
+    """
+    drift = await detect_index_drift(db)
+    missing = {(m["collection"], m["name"]) for m in drift["missing"]}
+
+    created = []
+    errors = []
+
+    for collection, specs in INDEX_REGISTRY.items():
+        models = [
+            IndexModel(spec["keys"], name=spec["name"], unique=spec.get("unique", False), sparse=spec.get("sparse", False))
+            for spec in specs
+            if (collection, spec["name"]) in missing
+        ]
+        for model in models:
+            try:
+                await db[collection].create_indexes([model])
+                created.append({"collection": collection, "name": model.document["name"]})
+            except OperationFailure as e:
+                # Duplicate keys on a unique index, conflicting options, etc.
+                errors.append({
+                    "collection": collection,
+                    "name": model.document["name"],
+                    "error": str(e)[:300]
+                })
+
+    if created:
+        logger.info(f"🗂️ Created {len(created)} MongoDB index(es): {', '.join(c['name'] for c in created)}")
+    for item in drift["mismatched"]:
+        logger.warning(f"⚠️ Index drift on {item['collection']}.{item['name']}: expected {item['expected']}, found {item['actual']}")
+    for item in drift["undeclared"]:
+        logger.info(f"ℹ️ Undeclared index {item['collection']}.{item['name']} {item['keys']}")
+    for item in errors:
+        logger.error(f"❌ Failed to create index {item['collection']}.{item['name']}: {item['error']}")
+
+    return {
+        "created": created,
+        "mismatched": drift["mismatched"],
+        "undeclared": drift["undeclared"],
+        "errors": errors
+    }
+
+
+def _collect_stages(plan: Optional[Dict[str, Any]]) -> List[str]:
+    """Flatten all stage names of an explain() plan tree"""
+    if not plan:
+        return []
+    stages = [plan.get("stage")] if plan.get("stage") else []
+    if "inputStage" in plan:
+        stages.extend(_collect_stages(plan["inputStage"]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_collect_stages(child))
+    # Slot-based engine wraps the classic plan in queryPlan
+    if "queryPlan" in plan:
+        stages.extend(_collect_stages(plan["queryPlan"]))
+    return stages
+
+
+async def check_query_shapes(db) -> List[Dict[str, Any]]:
+    """
+    Run explain() for every registered query shape.
+    Each result carries the winning plan's stages and a collscan flag.
+    """
+    results = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape.get("sort"):
+            cursor = cursor.sort(shape["sort"])
+        explain = await cursor.explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        stages = _collect_stages(winning_plan)
+        results.append({
+            "name": shape["name"],
+            "collection": shape["collection"],
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages
+        })
+    return results
+
+
+async def _main(argv: List[str]) -> int:
+    import argparse
+    from dotenv import load_dotenv
+    from pathlib import Path
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    parser = argparse.ArgumentParser(description="Apply or verify the BidVex MongoDB index registry")
+    parser.add_argument("--check", action="store_true", help="explain() each registered query shape and fail on COLLSCAN")
+    args = parser.parse_args(argv)
+
+    load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[os.environ.get("DB_NAME", "bidvex")]
+
+    try:
+        if args.check:
+            results = await check_query_shapes(db)
+            failures = [r for r in results if r["collscan"]]
+            for r in results:
+                marker = "❌ COLLSCAN" if r["collscan"] else "✅"
+                print(f"{marker} {r['collection']}.{r['name']}: {' <- '.join(r['stages'])}")
+            print(f"\n{len(results) - len(failures)}/{len(results)} query shapes use an index")
+            return 1 if failures else 0
+
+        report = await ensure_indexes(db)
+        print(f"Created: {len(report['created'])}")
+        for c in report["created"]:
+            print(f"  + {c['collection']}.{c['name']}")
+        print(f"Mismatched: {len(report['mismatched'])}")
+        for m in report["mismatched"]:
+            print(f"  ~ {m['collection']}.{m['name']}: expected {m['expected']}, found {m['actual']}")
+        print(f"Undeclared: {len(report['undeclared'])}")
+        for u in report["undeclared"]:
+            print(f"  ? {u['collection']}.{u['name']} {u['keys']}")
+        print(f"Errors: {len(report['errors'])}")
+        for e in report["errors"]:
+            print(f"  ! {e['collection']}.{e['name']}: {e['error']}")
+        return 1 if report["errors"] else 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
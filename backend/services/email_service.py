@@ -2,15 +2,20 @@
 BidVex Email Service - SendGrid Integration
 
 Provides a scalable, production-ready email system with:
-- SendGrid Dynamic Templates
+- SendGrid Dynamic Templates over the v3 Web API
+- Non-blocking transport: one pooled, keep-alive httpx.AsyncClient per worker
 - Bilingual support (EN/FR)
-- Retry logic with exponential backoff
+- Retry logic with exponential backoff (honours 429 Retry-After)
+- Token-bucket rate limiting shared by every send on the worker
+- Bulk sends batched as SendGrid personalizations (up to 1,000 recipients
+  per API call) with bounded concurrency
+- Fire-and-forget bulk jobs with progress tracked in the email_jobs collection
 - Event tracking via webhooks
 - Comprehensive error logging
 
 Usage:
     from services.email_service import EmailService
-    
+
     email_service = EmailService()
     await email_service.send_email(
         to='user@example.com',
@@ -18,32 +23,77 @@ Usage:
         dynamic_data={'name': 'John', 'amount': 100},
         language='en'
     )
+
+    job_id = await email_service.start_bulk_job(db, 'announcement', build_groups, created_by=admin_id)
 """
 
 import os
+import time
+import uuid
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content
-from python_http_client.exceptions import HTTPError
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from datetime import datetime, timezone
+
+import httpx
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+SENDGRID_API_URL = os.environ.get('SENDGRID_API_URL', 'https://api.sendgrid.com/v3/mail/send')
+SENDGRID_MAX_CONNECTIONS = int(os.environ.get('SENDGRID_MAX_CONNECTIONS', '20'))
+SENDGRID_TIMEOUT = float(os.environ.get('SENDGRID_TIMEOUT', '15'))
+# API calls per second per worker (each call may carry up to 1,000 recipients)
+SENDGRID_RATE_LIMIT = float(os.environ.get('SENDGRID_RATE_LIMIT', '10'))
+SENDGRID_BULK_CONCURRENCY = int(os.environ.get('SENDGRID_BULK_CONCURRENCY', '4'))
+PERSONALIZATIONS_PER_REQUEST = 1000
+
+# Errors kept on a job document (the counters are always exact)
+JOB_ERROR_LIMIT = 50
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class SendGridError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = True):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
 
 class EmailService:
     """
     Production-grade email service using SendGrid.
     Supports dynamic templates, bilingual content, and event tracking.
     """
-    
-    def __init__(self):
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.api_key = os.environ.get('SENDGRID_API_KEY')
         self.from_email = os.environ.get('SENDGRID_FROM_EMAIL', 'support@bidvex.com')
         self.from_name = os.environ.get('SENDGRID_FROM_NAME', 'BidVex Auctions')
-        
+        self.rate_limiter = TokenBucket(SENDGRID_RATE_LIMIT)
+        self._jobs: set = set()
+
         if not self.api_key:
             logger.warning(
                 "SENDGRID_API_KEY not configured. Email service will be disabled. "
@@ -51,13 +101,74 @@ class EmailService:
             )
             self.client = None
         else:
-            self.client = SendGridAPIClient(self.api_key)
+            # Pooled keep-alive connections; `transport` lets tests plug in a fake SendGrid
+            self.client = httpx.AsyncClient(
+                headers={'Authorization': f'Bearer {self.api_key}'},
+                timeout=SENDGRID_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=SENDGRID_MAX_CONNECTIONS,
+                    max_keepalive_connections=SENDGRID_MAX_CONNECTIONS
+                ),
+                transport=transport
+            )
             logger.info("SendGrid email service initialized successfully")
-    
+
     def is_configured(self) -> bool:
         """Check if SendGrid is properly configured."""
         return self.client is not None
-    
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+
+    async def _post(self, payload: Dict[str, Any], max_retries: int = 3) -> httpx.Response:
+        """
+        POST one /mail/send request through the rate limiter.
+        Retries 429, 5xx and transport errors with exponential backoff;
+        other 4xx responses fail immediately.
+        """
+        for attempt in range(max_retries):
+            await self.rate_limiter.acquire()
+            try:
+                response = await self.client.post(SENDGRID_API_URL, json=payload)
+            except httpx.HTTPError as e:
+                error = SendGridError(f"transport error: {e}")
+                delay = 2 ** attempt
+            else:
+                if response.status_code < 300:
+                    return response
+                error = SendGridError(
+                    response.text[:500],
+                    status_code=response.status_code,
+                    retryable=response.status_code == 429 or response.status_code >= 500
+                )
+                retry_after = response.headers.get('Retry-After')
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+
+            logger.error(
+                f"SendGrid error (attempt {attempt + 1}/{max_retries}): "
+                f"status={error.status_code}, error={error}"
+            )
+            if not error.retryable or attempt == max_retries - 1:
+                raise error
+
+            # Exponential backoff: 1s, 2s, 4s (or whatever SendGrid asked for)
+            await asyncio.sleep(delay)
+
+    def _personalization(self, to: str, dynamic_data: Dict[str, Any], language: str) -> Dict[str, Any]:
+        data = dict(dynamic_data)
+        # Add language to dynamic data for template selection
+        data['language'] = language
+        data['current_year'] = datetime.now().year
+        return {'to': [{'email': to}], 'dynamic_template_data': data}
+
+    def _payload(self, template_id: str, personalizations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'from': {'email': self.from_email, 'name': self.from_name},
+            'template_id': template_id,
+            'personalizations': personalizations
+        }
+
     async def send_email(
         self,
         to: str,
@@ -71,7 +182,7 @@ class EmailService:
     ) -> Dict[str, Any]:
         """
         Send email using SendGrid Dynamic Template.
-        
+
         Args:
             to: Recipient email address
             template_id: SendGrid dynamic template ID
@@ -81,12 +192,9 @@ class EmailService:
             bcc: Optional BCC recipients
             reply_to: Optional reply-to address
             max_retries: Maximum retry attempts (default: 3)
-            
+
         Returns:
             Dict with status and message_id
-            
-        Raises:
-            Exception: If email fails after all retries
         """
         if not self.is_configured():
             logger.error(f"Email send failed: SendGrid not configured. Recipient: {to}")
@@ -95,95 +203,63 @@ class EmailService:
                 "error": "Email service not configured",
                 "message_id": None
             }
-        
-        # Add language to dynamic data for template selection
-        dynamic_data['language'] = language
-        dynamic_data['current_year'] = datetime.now().year
-        
-        # Build message
-        message = Mail(
-            from_email=Email(self.from_email, self.from_name),
-            to_emails=To(to)
-        )
-        
-        # Set template ID
-        message.template_id = template_id
-        
-        # Add dynamic template data
-        message.dynamic_template_data = dynamic_data
-        
+
+        personalization = self._personalization(to, dynamic_data, language)
+
         # Add CC/BCC if provided
         if cc:
-            for cc_email in cc:
-                message.add_cc(cc_email)
+            personalization['cc'] = [{'email': cc_email} for cc_email in cc]
         if bcc:
-            for bcc_email in bcc:
-                message.add_bcc(bcc_email)
-        
+            personalization['bcc'] = [{'email': bcc_email} for bcc_email in bcc]
+
+        payload = self._payload(template_id, [personalization])
+
         # Set reply-to
         if reply_to:
-            message.reply_to = Email(reply_to)
-        
-        # Retry logic with exponential backoff
-        for attempt in range(max_retries):
-            try:
-                response = self.client.send(message)
-                
-                logger.info(
-                    f"Email sent successfully: to={to}, template={template_id}, "
-                    f"status={response.status_code}, message_id={response.headers.get('X-Message-Id')}"
-                )
-                
-                return {
-                    "success": True,
-                    "message_id": response.headers.get('X-Message-Id'),
-                    "status_code": response.status_code
-                }
-                
-            except HTTPError as e:
-                error_body = e.body if hasattr(e, 'body') else str(e)
-                logger.error(
-                    f"SendGrid HTTP error (attempt {attempt + 1}/{max_retries}): "
-                    f"to={to}, error={error_body}"
-                )
-                
-                # If final attempt, raise exception
-                if attempt == max_retries - 1:
-                    # Notify admin of failed email
-                    await self._notify_admin_of_failure(to, template_id, error_body)
-                    return {
-                        "success": False,
-                        "error": str(error_body),
-                        "message_id": None
-                    }
-                
-                # Exponential backoff: 1s, 2s, 4s
-                await asyncio.sleep(2 ** attempt)
-                
-            except Exception as e:
-                logger.exception(f"Unexpected email error: to={to}, error={str(e)}")
-                if attempt == max_retries - 1:
-                    return {
-                        "success": False,
-                        "error": str(e),
-                        "message_id": None
-                    }
-                await asyncio.sleep(2 ** attempt)
-    
+            payload['reply_to'] = {'email': reply_to}
+
+        try:
+            response = await self._post(payload, max_retries=max_retries)
+        except SendGridError as e:
+            # Notify admin of failed email
+            await self._notify_admin_of_failure(to, template_id, str(e))
+            return {
+                "success": False,
+                "error": str(e),
+                "message_id": None
+            }
+
+        logger.info(
+            f"Email sent successfully: to={to}, template={template_id}, "
+            f"status={response.status_code}, message_id={response.headers.get('X-Message-Id')}"
+        )
+
+        return {
+            "success": True,
+            "message_id": response.headers.get('X-Message-Id'),
+            "status_code": response.status_code
+        }
+
     async def send_bulk_email(
         self,
         recipients: List[Dict[str, Any]],
         template_id: str,
-        language: str = 'en'
+        language: str = 'en',
+        on_progress: Optional[Callable[[int, int, List[Dict[str, Any]]], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         Send bulk emails with personalized data for each recipient.
-        
+
+        Recipients are packed into requests of up to 1,000 personalizations
+        (one email each - recipients never see each other) and the requests
+        are sent SENDGRID_BULK_CONCURRENCY at a time.
+
         Args:
-            recipients: List of dicts with 'email' and 'data' keys
+            recipients: List of dicts with 'email', 'data' and optional 'language' keys
             template_id: SendGrid template ID
             language: Default language
-            
+            on_progress: Optional async callback(sent, failed, errors) after each request
+
         Returns:
             Dict with success/failure counts
         """
@@ -193,34 +269,108 @@ class EmailService:
             "failed": 0,
             "errors": []
         }
-        
-        for recipient in recipients:
-            email = recipient.get('email')
-            data = recipient.get('data', {})
-            
-            result = await self.send_email(
-                to=email,
-                template_id=template_id,
-                dynamic_data=data,
-                language=language
-            )
-            
-            if result['success']:
-                results['success'] += 1
-            else:
-                results['failed'] += 1
-                results['errors'].append({
-                    'email': email,
-                    'error': result.get('error')
-                })
-        
+
+        if not self.is_configured():
+            results['failed'] = len(recipients)
+            results['errors'].append({'email': None, 'error': 'Email service not configured'})
+            return results
+
+        batches = [
+            recipients[i:i + PERSONALIZATIONS_PER_REQUEST]
+            for i in range(0, len(recipients), PERSONALIZATIONS_PER_REQUEST)
+        ]
+        semaphore = asyncio.Semaphore(SENDGRID_BULK_CONCURRENCY)
+
+        async def send_batch(batch: List[Dict[str, Any]]):
+            personalizations = [
+                self._personalization(r['email'], r.get('data', {}), r.get('language', language))
+                for r in batch
+            ]
+            async with semaphore:
+                try:
+                    await self._post(self._payload(template_id, personalizations))
+                    sent, failed, errors = len(batch), 0, []
+                except SendGridError as e:
+                    sent, failed = 0, len(batch)
+                    errors = [{'email': r['email'], 'error': str(e)} for r in batch]
+            results['success'] += sent
+            results['failed'] += failed
+            results['errors'].extend(errors)
+            if on_progress:
+                await on_progress(sent, failed, errors)
+
+        await asyncio.gather(*(send_batch(batch) for batch in batches))
+
         logger.info(
-            f"Bulk email completed: total={results['total']}, "
+            f"Bulk email completed: total={results['total']}, requests={len(batches)}, "
             f"success={results['success']}, failed={results['failed']}"
         )
-        
+
         return results
-    
+
+    async def start_bulk_job(
+        self,
+        db,
+        kind: str,
+        build_groups: Callable[[], Awaitable[List[Dict[str, Any]]]],
+        created_by: Optional[str] = None
+    ) -> str:
+        """
+        Fire-and-forget bulk send. Returns a job id immediately; progress is
+        tracked in db.email_jobs.
+
+        build_groups resolves (in the background) to
+            [{'template_id': ..., 'language': ..., 'recipients': [...]}, ...]
+        so recipient queries never run on the request path either.
+        """
+        job_id = str(uuid.uuid4())
+        await db.email_jobs.insert_one({
+            "id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "total": 0,
+            "sent": 0,
+            "failed": 0,
+            "errors": [],
+            "created_by": created_by,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
+        task = asyncio.create_task(self._run_bulk_job(db, job_id, build_groups))
+        # Keep a reference so the task isn't garbage-collected mid-run
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+        return job_id
+
+    async def _run_bulk_job(self, db, job_id: str, build_groups) -> None:
+        try:
+            groups = await build_groups()
+            await db.email_jobs.update_one({"id": job_id}, {"$set": {
+                "status": "running",
+                "total": sum(len(g['recipients']) for g in groups),
+                "started_at": datetime.now(timezone.utc).isoformat()
+            }})
+
+            async def on_progress(sent, failed, errors):
+                await db.email_jobs.update_one({"id": job_id}, {
+                    "$inc": {"sent": sent, "failed": failed},
+                    "$push": {"errors": {"$each": errors[:JOB_ERROR_LIMIT], "$slice": JOB_ERROR_LIMIT}}
+                })
+
+            for group in groups:
+                await self.send_bulk_email(
+                    group['recipients'], group['template_id'], group.get('language', 'en'),
+                    on_progress=on_progress
+                )
+            status = "completed"
+        except Exception as e:
+            logger.exception(f"Bulk email job {job_id} failed: {e}")
+            status = "failed"
+
+        await db.email_jobs.update_one({"id": job_id}, {"$set": {
+            "status": status,
+            "finished_at": datetime.now(timezone.utc).isoformat()
+        }})
+
     async def _notify_admin_of_failure(
         self,
         recipient: str,
@@ -231,24 +381,24 @@ class EmailService:
         Send notification to admin about email delivery failure.
         """
         admin_email = os.environ.get('ADMIN_EMAIL', 'admin@bidvex.com')
-        
+
         try:
             # Simple text email to admin (not using template)
-            message = Mail(
-                from_email=Email(self.from_email, 'BidVex System'),
-                to_emails=To(admin_email),
-                subject='[BidVex] Email Delivery Failure',
-                plain_text_content=Content(
-                    'text/plain',
-                    "Failed to send email after multiple retries.\n\n"
-                    f"Recipient: {recipient}\n"
-                    f"Template ID: {template_id}\n"
-                    f"Error: {error}\n"
-                    f"Time: {datetime.now().isoformat()}"
-                )
-            )
-            
-            self.client.send(message)
+            await self._post({
+                'from': {'email': self.from_email, 'name': 'BidVex System'},
+                'personalizations': [{'to': [{'email': admin_email}]}],
+                'subject': '[BidVex] Email Delivery Failure',
+                'content': [{
+                    'type': 'text/plain',
+                    'value': (
+                        "Failed to send email after multiple retries.\n\n"
+                        f"Recipient: {recipient}\n"
+                        f"Template ID: {template_id}\n"
+                        f"Error: {error}\n"
+                        f"Time: {datetime.now().isoformat()}"
+                    )
+                }]
+            }, max_retries=1)
             logger.info(f"Admin notified of email failure for {recipient}")
         except Exception as e:
             logger.error(f"Failed to notify admin: {str(e)}")
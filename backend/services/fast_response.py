@@ -0,0 +1,135 @@
+"""
+BidVex Fast List Responses
+Opt-in serialization path for read-only list endpoints:
+- ModelShape derives a find() projection from a response model (nested
+  list models included), and fill() drops any other key - so documents
+  carry exactly the model's fields even when a caller widens the projection
+  (sort keys, enrichment ids): nothing internal such as agreement_metadata
+  or search fields leaks out
+- Missing fields are filled with the model's defaults; no per-row model
+  construction or validation, and no second response_model pass
+- Summary shapes leave detail-only fields (base64 documents, terms HTML)
+  out of the projection and read embedded arrays as a short $slice preview
+- select() narrows a shape to a `fields=` sparse fieldset
+- dumps() encodes with orjson when installed (UTC datetimes as "Z", like
+  Pydantic), else the stdlib encoder
+
+Only for documents written by our own create/update paths: values are
+returned as stored, without Pydantic's type coercion.
+
+Usage:
+    LISTING_SHAPE = ModelShape(Listing)
+    shape = LISTING_SHAPE.select(fields)  # ValueError on unknown fields
+    docs = await db.listings.find(query, shape.projection).to_list(limit)
+    return Response(dumps(shape.fill_many(docs)), media_type="application/json")
+"""
+
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class ModelShape:
+    def __init__(self, model: Type[BaseModel], nested: Optional[Dict[str, "ModelShape"]] = None,
+                 exclude: Iterable[str] = (), slices: Optional[Dict[str, int]] = None,
+                 only: Optional[Iterable[str]] = None):
+        """
+        nested: shapes for list-of-model fields. exclude: fields never read
+        (detail-only). slices: {array field: n} reads only the first n
+        elements. only: sparse fieldset. fill() drops every key outside the
+        shape's fields, including anything read only for paging.
+        """
+        self.model = model
+        self.nested = dict(nested or {})
+        self.exclude = frozenset(exclude)
+        self.slices = dict(slices or {})
+        self.only = frozenset(only) if only is not None else None
+        self.fields = [
+            name for name in model.model_fields
+            if name not in self.exclude and (self.only is None or name in self.only)
+        ]
+        self._keep = frozenset(self.fields)
+        self.projection: Dict[str, Any] = {"_id": 0}
+        # (field, default, factory) for every optional field
+        self.defaults: List[Tuple[str, Any, Optional[Callable[[], Any]]]] = []
+
+        for name in self.fields:
+            field = model.model_fields[name]
+            if name in self.slices:
+                # $slice returns whole elements; the nested shape trims them
+                self.projection[name] = {"$slice": self.slices[name]}
+                child = self.nested[name]
+                self.nested[name] = ModelShape(child.model, child.nested, child.exclude, child.slices, child.fields)
+            elif name in self.nested:
+                for child in self.nested[name].projection:
+                    if child != "_id":
+                        self.projection[f"{name}.{child}"] = 1
+            else:
+                self.projection[name] = 1
+            if field.default_factory is not None:
+                self.defaults.append((name, None, field.default_factory))
+            elif field.default is not PydanticUndefined:
+                self.defaults.append((name, field.default, None))
+
+        # Cursors, ranking and enrichment key on id, so a sparse fieldset still reads it
+        if self.only is not None and "id" in model.model_fields and "id" not in self.exclude:
+            self.projection["id"] = 1
+        self.nested = {name: shape for name, shape in self.nested.items() if name in self.fields}
+
+    def select(self, fields: Optional[str]) -> "ModelShape":
+        """This shape narrowed to a comma-separated field list; None or "" keeps it whole"""
+        if not fields:
+            return self
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(names) - set(self.fields))
+        if unknown:
+            raise ValueError(f"Unknown or detail-only field(s): {', '.join(unknown)}")
+        return ModelShape(self.model, self.nested, self.exclude, self.slices, names)
+
+    def fill(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop keys outside the shape, apply defaults in place (nested lists included) and return the document"""
+        for key in [key for key in doc if key not in self._keep]:
+            del doc[key]
+        for name, default, factory in self.defaults:
+            if name not in doc:
+                doc[name] = factory() if factory is not None else (
+                    list(default) if isinstance(default, list) else default
+                )
+        for name, shape in self.nested.items():
+            for child in doc.get(name) or []:
+                shape.fill(child)
+        return doc
+
+    def fill_many(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for doc in docs:
+            self.fill(doc)
+        return docs
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, (date, timedelta)):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """JSON bytes for a response body"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
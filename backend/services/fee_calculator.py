@@ -2,10 +2,19 @@
 BidVex Fee & Cost Calculation Engine
 Handles buyer premiums, seller commissions, taxes, and subscription-based discounts
 Updated: Percentage-based fees with NO maximum cap
+Batch quotes: calculate_buyer_totals() prices a whole catalogue page in one call
+(integer cents, vectorized with NumPy when it is installed)
 """
 
-from typing import Dict, Tuple
-from decimal import Decimal
+from typing import Dict, List, Sequence, Tuple
+from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # Pure-Python integer path
+    np = None
 
 # Global fee constants - No cap, percentage-based
 DEFAULT_BUYER_PREMIUM = Decimal("0.05")  # 5%
@@ -329,6 +338,141 @@ class FeeCalculator:
         }
 
 
+# ========== BATCH QUOTES ==========
+# Every amount calculate_buyer_total returns is the hammer price times a constant
+# that depends only on (tier, region, seller type). The batch path derives those
+# constants once as exact fractions and applies them to integer cents, rounding
+# half-up: each value equals the scalar result rounded to the cent.
+
+BATCH_QUOTE_FIELDS = (
+    "hammer_price", "buyer_premium", "subtotal", "tax",
+    "tax_on_hammer", "tax_on_premium", "total", "tax_savings",
+)
+INT64_MAX = 2 ** 63 - 1
+
+
+@lru_cache(maxsize=64)
+def _quote_plan(buyer_tier: str, region: str, seller_is_business: bool) -> Tuple[Dict[str, Fraction], Dict[str, Fraction], Dict[str, float]]:
+    """Per-dollar coefficients for the quote fields and tax breakdown, plus the rates shown"""
+    premium = Fraction(FeeCalculator.get_buyer_premium(buyer_tier))
+    tax_rates = {k: Fraction(v) for k, v in TAX_RATES.get(region, TAX_RATES["QC"]).items() if k != "name"}
+    taxable = 1 + premium if seller_is_business else premium
+
+    # Same branch order as calculate_buyer_total
+    components: Dict[str, Fraction] = {}
+    if "gst" in tax_rates and "qst" in tax_rates:
+        components["gst"] = taxable * tax_rates["gst"]
+        components["qst"] = (taxable + components["gst"]) * tax_rates["qst"]
+    elif "hst" in tax_rates:
+        components["hst"] = taxable * tax_rates["hst"]
+    elif "gst" in tax_rates and "pst" in tax_rates:
+        components["gst"] = taxable * tax_rates["gst"]
+        components["pst"] = taxable * tax_rates["pst"]
+    elif "gst" in tax_rates:
+        components["gst"] = taxable * tax_rates["gst"]
+    elif "vat" in tax_rates:
+        components["vat"] = taxable * tax_rates["vat"]
+
+    tax = sum(components.values(), Fraction(0))
+    tax_on_hammer = tax / (1 + premium) if seller_is_business else Fraction(0)
+    tax_on_premium = tax - tax_on_hammer
+
+    savings = Fraction(0)
+    if not seller_is_business and "gst" in tax_rates and "qst" in tax_rates:
+        gst = tax_rates["gst"]
+        savings = gst + (1 + gst) * tax_rates["qst"]
+
+    fields = {
+        "hammer_price": Fraction(1),
+        "buyer_premium": premium,
+        "subtotal": 1 + premium,
+        "tax": tax,
+        "tax_on_hammer": tax_on_hammer,
+        "tax_on_premium": tax_on_premium,
+        "total": 1 + premium + tax,
+        "tax_savings": savings,
+    }
+    breakdown = dict(components)
+    if components:
+        breakdown["tax_on_hammer"] = tax_on_hammer
+        breakdown["tax_on_premium"] = tax_on_premium
+    rates = {f"{name}_rate": float(rate) for name, rate in tax_rates.items() if name in components}
+    return fields, breakdown, rates
+
+
+def _whole_cents(prices: Sequence):
+    """Fast path: numeric prices already in whole cents (None if any price is not)"""
+    try:
+        scaled = np.asarray(prices, dtype=np.float64) * 100
+    except (TypeError, ValueError):
+        return None
+    if not np.isfinite(scaled).all() or np.abs(scaled).max() >= 2 ** 52:
+        return None
+    rounded = np.rint(scaled)
+    # Whole-cent floats land within float error of an integer
+    if (np.abs(scaled - rounded) >= 1e-6).any():
+        return None
+    return rounded.astype(np.int64).tolist()
+
+
+def _to_cents(prices: Sequence) -> List[int]:
+    cents = _whole_cents(prices) if np is not None and len(prices) else None
+    if cents is None:
+        amounts = [Decimal(str(price)) for price in prices]
+        if not all(amount.is_finite() for amount in amounts):
+            raise ValueError("Hammer prices must be finite numbers")
+        cents = [int(amount.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * 100) for amount in amounts]
+    if cents and min(cents) < 0:
+        raise ValueError("Hammer prices must be non-negative")
+    return cents
+
+
+def _apply(cents, coefficient: Fraction):
+    """cents * coefficient, rounded half-up to whole cents"""
+    k, d = coefficient.numerator, coefficient.denominator
+    if np is not None and isinstance(cents, np.ndarray):
+        return (2 * k * cents + d) // (2 * d)
+    return [(2 * k * c + d) // (2 * d) for c in cents]
+
+
+def _as_dollars(cents) -> List[float]:
+    if np is not None and isinstance(cents, np.ndarray):
+        return (cents / 100).tolist()
+    return [c / 100 for c in cents]
+
+
+def calculate_buyer_totals(
+    prices: Sequence,
+    tier: str = "free",
+    region: str = "QC",
+    seller_is_business: bool = False
+) -> Dict:
+    """
+    Batch version of calculate_buyer_total for many hammer prices.
+    Prices are taken to the cent; results are column lists in the order given,
+    each equal to the scalar result rounded to the cent.
+    """
+    fields, breakdown, rates = _quote_plan((tier or "free").lower(), region, seller_is_business)
+    cents = _to_cents(prices)
+
+    if np is not None and cents:
+        # Stay in int64 only while 2 * cents * numerator + denominator cannot overflow
+        worst = max(2 * c.numerator * max(cents) + c.denominator for c in (*fields.values(), *breakdown.values()))
+        if worst <= INT64_MAX:
+            cents = np.array(cents, dtype=np.int64)
+
+    return {
+        "count": len(prices),
+        **{name: _as_dollars(_apply(cents, fields[name])) for name in BATCH_QUOTE_FIELDS},
+        "tax_breakdown": {name: _as_dollars(_apply(cents, coefficient)) for name, coefficient in breakdown.items()},
+        "tax_rates": rates,
+        "buyer_premium_percent": float(fields["buyer_premium"] * 100),
+        "region": region,
+        "tier": tier,
+        "seller_type": "business" if seller_is_business else "individual",
+    }
+
+
 # Helper function for quick calculations
 def calculate_buyer_total(amount: float, tier: str = "free", region: str = "QC", seller_is_business: bool = False) -> Dict:
     """Quick helper to calculate buyer total"""
@@ -0,0 +1,126 @@
+"""
+BidVex Increment Schedules
+Table-driven bid increments shared by single listings and multi-item lots:
+- Each schedule is a sorted list of price thresholds plus the increment for
+  each band; lookup is a bisect instead of an if/elif chain
+- "tiered" (Option A) bands are [low, high); "simplified" (Option B) bands
+  are (low, high], matching the original helpers boundary for boundary
+- Single listings without an increment_option keep the flat
+  minimum_bid_increment from marketplace settings
+- next_valid_bids() walks the ladder so the UI can render quick-bid buttons
+  without a round trip per step
+
+Usage:
+    schedule = schedule_for(auction)
+    min_increment = schedule.increment(current_price)
+    ladder = next_valid_bids(auction, 5, current_price=lot["current_price"])
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_OPTION = "tiered"
+MAX_LADDER_STEPS = 20
+
+
+class IncrementSchedule:
+    def __init__(self, name: str, thresholds: Sequence[float], increments: Sequence[float], upper_inclusive: bool = False):
+        if len(increments) != len(thresholds) + 1:
+            raise ValueError("A schedule needs one more increment than thresholds")
+        if list(thresholds) != sorted(thresholds):
+            raise ValueError("Schedule thresholds must be ascending")
+        self.name = name
+        self.thresholds = list(thresholds)
+        self.increments = list(increments)
+        self.upper_inclusive = upper_inclusive
+        self._band = bisect_left if upper_inclusive else bisect_right
+
+    def increment(self, current_price: float) -> float:
+        return self.increments[self._band(self.thresholds, current_price)]
+
+    def next_bid(self, current_price: float) -> float:
+        return round(current_price + self.increment(current_price), 2)
+
+    def ladder(self, current_price: float, n: int) -> List[float]:
+        """The next n minimum bids, each one increment above the previous"""
+        bids = []
+        price = current_price
+        for _ in range(n):
+            price = self.next_bid(price)
+            bids.append(price)
+        return bids
+
+    def describe(self) -> List[Dict[str, str]]:
+        """Human-readable bands, e.g. {"range": "$100-$499.99", "increment": "$10"}"""
+        bounds = [0, *self.thresholds]
+        rows = []
+        for i, increment in enumerate(self.increments):
+            low = bounds[i]
+            if i == len(self.thresholds):
+                label = f"{_money(low)}+"
+            else:
+                high = self.thresholds[i] if self.upper_inclusive else self.thresholds[i] - 0.01
+                label = f"{_money(low)}-{_money(high)}"
+            rows.append({"range": label, "increment": _money(increment)})
+        return rows
+
+
+def _money(value: float) -> str:
+    return f"${value:,.0f}" if float(value).is_integer() else f"${value:,.2f}"
+
+
+SCHEDULES: Dict[str, IncrementSchedule] = {
+    # $0-$99.99 → $5 ... $100,000+ → $1,000
+    "tiered": IncrementSchedule(
+        "tiered",
+        thresholds=[100, 500, 1000, 5000, 10000, 50000, 100000],
+        increments=[5, 10, 25, 50, 100, 250, 500, 1000],
+    ),
+    # $0-$100 → $1 ... $10,000+ → $100
+    "simplified": IncrementSchedule(
+        "simplified",
+        thresholds=[100, 1000, 10000],
+        increments=[1, 5, 25, 100],
+        upper_inclusive=True,
+    ),
+}
+
+_flat_schedules: Dict[float, IncrementSchedule] = {}
+
+
+def flat_schedule(increment: float) -> IncrementSchedule:
+    schedule = _flat_schedules.get(increment)
+    if schedule is None:
+        schedule = _flat_schedules[increment] = IncrementSchedule("flat", [], [increment])
+    return schedule
+
+
+def schedule_for(listing: Dict[str, Any], flat_increment: Optional[float] = None) -> IncrementSchedule:
+    """
+    The listing's increment_option schedule. Listings without one use the flat
+    increment when given (single listings), otherwise the tiered default.
+    """
+    option = listing.get("increment_option")
+    if option is None and flat_increment is not None:
+        return flat_schedule(flat_increment)
+    return SCHEDULES.get(option or DEFAULT_OPTION, SCHEDULES[DEFAULT_OPTION])
+
+
+def minimum_increment(listing: Dict[str, Any], current_price: float, flat_increment: Optional[float] = None) -> float:
+    return schedule_for(listing, flat_increment).increment(current_price)
+
+
+def next_valid_bids(
+    listing: Dict[str, Any],
+    n: int,
+    current_price: Optional[float] = None,
+    flat_increment: Optional[float] = None,
+) -> List[float]:
+    """
+    Next n valid bids for a listing (or, with current_price, one of its lots).
+    n is clamped to MAX_LADDER_STEPS.
+    """
+    if current_price is None:
+        current_price = listing.get("current_price") or 0
+    n = max(0, min(n, MAX_LADDER_STEPS))
+    return schedule_for(listing, flat_increment).ladder(current_price, n)
@@ -0,0 +1,507 @@
+"""
+BidVex Marketplace Item Index
+Materializes the decomposed marketplace view into the `marketplace_items`
+collection - one document per sellable lot or single listing:
+- Kept in sync by the create, bid, buy-now and moderation write paths
+- Precomputed lot_end_time, seller_is_business and promotion_weight, plus
+  single-field sort keys (promotion_key, ending_key) for the compound orders
+- Only currently visible items are stored (active source, lot not sold out)
+- search_terms embeds each item's tokenized title/description (see search_index)
+
+`/marketplace/items` then becomes an indexed, server-side sorted, paginated
+query instead of expanding every active auction on each request. Pages are
+read with keyset cursors (services/pagination.py) per sort segment, so page
+500 costs one index seek like page 1.
+"""
+
+import json
+import base64
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timezone, timedelta
+
+from pymongo import UpdateOne
+
+from services import search_index
+from services.pagination import InvalidCursor, Page, clamp_limit, decode_cursor, fetch_page as fetch_keyset_page
+
+logger = logging.getLogger(__name__)
+
+# Same weights the in-memory sort used
+PROMOTION_WEIGHT = {"premium": 3, "standard": 2, "basic": 1}
+
+# Items ending within this window climb to the top of the default sort
+URGENCY_WINDOW = timedelta(minutes=60)
+
+# Auction fields needed to build an item (never pull documents/terms HTML)
+AUCTION_PROJECTION = {
+    "_id": 0, "id": 1, "seller_id": 1, "title": 1, "category": 1, "status": 1,
+    "city": 1, "region": 1, "country": 1, "created_at": 1, "auction_end_date": 1,
+    "is_promoted": 1, "promotion_tier": 1, "is_featured": 1, "total_lots": 1,
+}
+
+# Internal fields never returned by the endpoint
+PUBLIC_PROJECTION = {
+    "_id": 0, "source_id": 0, "promotion_weight": 0, "lot_end_time": 0, "synced_at": 0, "search_terms": 0,
+    "promotion_key": 0, "ending_key": 0,
+}
+
+# ending_key for items without an end time: after every dated item, as the in-memory sort had it
+UNDATED = "~"
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    """Parse stored ISO strings / naive datetimes into aware UTC datetimes"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _key_time(value: Optional[datetime]) -> Optional[str]:
+    # Fixed-width UTC text, so string order is time order
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f") if value else None
+
+
+def sort_keys(item: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Single-field keys for the compound orders, so each sort segment pages
+    with a plain (key, id) keyset:
+    - promotion_key: promotion weight, then newest (sorted descending)
+    - ending_key: featured first, then soonest end, undated last (ascending)
+    """
+    return {
+        "promotion_key": f"{item['promotion_weight']}|{_key_time(item.get('created_at')) or ''}",
+        "ending_key": f"{0 if item.get('is_featured') else 1}|{_key_time(item.get('lot_end_time')) or UNDATED}",
+    }
+
+
+def _with_sort_keys(item: Dict[str, Any]) -> Dict[str, Any]:
+    item.update(sort_keys(item))
+    return item
+
+
+async def _seller_is_business(db, seller_id: Optional[str]) -> bool:
+    if not seller_id:
+        return False
+    seller = await db.users.find_one({"id": seller_id}, {"_id": 0, "is_tax_registered": 1})
+    return seller.get("is_tax_registered", False) if seller else False
+
+
+def build_lot_item(auction: Dict[str, Any], lot: Dict[str, Any], seller_is_business: bool) -> Dict[str, Any]:
+    """Build the marketplace document for one lot of a multi-item auction"""
+    lot_end_time = _to_datetime(lot.get("lot_end_time"))
+    if not lot_end_time:
+        # Staggered fallback: base auction end + (lot_number * 1 minute)
+        base_end_time = _to_datetime(auction.get("auction_end_date"))
+        if base_end_time:
+            lot_end_time = base_end_time + timedelta(seconds=lot["lot_number"] * 60)
+
+    return _with_sort_keys({
+        "id": f"{auction['id']}_lot{lot['lot_number']}",  # Composite ID
+        "source_id": auction["id"],
+        "auction_id": auction["id"],
+        "lot_number": lot["lot_number"],
+        "title": lot["title"],
+        "description": lot["description"],
+        "category": auction.get("category"),
+        "condition": lot.get("condition"),
+        "images": lot.get("images", []),
+
+        # Pricing
+        "starting_price": lot.get("starting_price"),
+        "current_price": lot.get("current_price", lot.get("starting_price", 0)),
+        "buy_now_price": lot.get("buy_now_price"),
+        "buy_now_enabled": lot.get("buy_now_enabled", False),
+
+        # Quantity
+        "quantity": lot.get("quantity", 1),
+        "available_quantity": lot.get("available_quantity", lot.get("quantity", 1)),
+        "sold_quantity": lot.get("sold_quantity", 0),
+
+        # Bidding
+        "bid_count": lot.get("bid_count", 0),
+        "highest_bidder_id": lot.get("highest_bidder_id"),
+
+        # Timing
+        "auction_end_date": lot_end_time.isoformat() if lot_end_time else None,
+        "lot_end_time": lot_end_time,
+        "extension_count": lot.get("extension_count", 0),
+
+        # Status
+        "lot_status": lot.get("lot_status", "active"),
+        "pricing_mode": lot.get("pricing_mode", "multiplied"),
+
+        # Promotion (inherited from parent auction)
+        "is_promoted": auction.get("is_promoted", False),
+        "promotion_tier": auction.get("promotion_tier"),
+        "promotion_weight": PROMOTION_WEIGHT.get(auction.get("promotion_tier"), 0),
+        "is_featured": auction.get("is_featured", False),
+
+        # Parent context
+        "parent_auction_title": auction.get("title"),
+        "total_lots_in_auction": auction.get("total_lots") or 0,
+        "seller_id": auction.get("seller_id"),
+        "seller_is_business": seller_is_business,  # For Private Sale badge
+
+        # Location
+        "city": auction.get("city"),
+        "region": auction.get("region"),
+        "country": auction.get("country"),
+
+        # Metadata
+        "created_at": _to_datetime(auction.get("created_at")),
+        **search_index.marketplace_fields(lot["title"], lot["description"], auction.get("title")),
+    })
+
+
+def build_listing_item(listing: Dict[str, Any], seller_is_business: bool) -> Dict[str, Any]:
+    """Build the marketplace document for a single (non multi-item) listing"""
+    end_time = _to_datetime(listing.get("auction_end_date"))
+
+    return _with_sort_keys({
+        "id": listing["id"],
+        "source_id": listing["id"],
+        "auction_id": None,  # Single listing, no parent auction
+        "lot_number": None,
+        "title": listing["title"],
+        "description": listing.get("description"),
+        "category": listing.get("category"),
+        "condition": listing.get("condition"),
+        "images": listing.get("images", []),
+
+        # Pricing
+        "starting_price": listing.get("starting_price"),
+        "current_price": listing.get("current_price", listing.get("starting_price", 0)),
+        "buy_now_price": listing.get("buy_now_price"),
+        "buy_now_enabled": listing.get("buy_now_price") is not None,
+
+        # Quantity
+        "quantity": 1,
+        "available_quantity": 1,
+        "sold_quantity": 0,
+
+        # Bidding
+        "bid_count": listing.get("bid_count", 0),
+        "highest_bidder_id": listing.get("highest_bidder_id"),
+
+        # Timing
+        "auction_end_date": end_time.isoformat() if end_time else None,
+        "lot_end_time": end_time,
+        "extension_count": listing.get("extension_count", 0),
+
+        # Status
+        "lot_status": listing.get("status", "active"),
+        "pricing_mode": "fixed",
+
+        # Promotion
+        "is_promoted": listing.get("is_promoted", False),
+        "promotion_tier": listing.get("promotion_tier"),
+        "promotion_weight": PROMOTION_WEIGHT.get(listing.get("promotion_tier"), 0),
+        "is_featured": listing.get("is_featured", False),
+
+        # Parent context
+        "parent_auction_title": None,
+        "total_lots_in_auction": 0,
+        "seller_id": listing.get("seller_id"),
+        "seller_is_business": seller_is_business,
+
+        # Location
+        "city": listing.get("city"),
+        "region": listing.get("region"),
+        "country": listing.get("country"),
+
+        # Metadata
+        "created_at": _to_datetime(listing.get("created_at")),
+        **search_index.marketplace_fields(listing["title"], listing.get("description")),
+    })
+
+
+def _lot_is_visible(lot: Dict[str, Any]) -> bool:
+    return lot.get("lot_status") != "sold_out"
+
+
+# ========== WRITE-PATH SYNC ==========
+# All sync helpers are best-effort: a failure is logged and healed by the
+# periodic reconcile, it never fails the user-facing write.
+
+async def sync_listing(db, listing_id: str) -> None:
+    """Re-materialize a single listing after any write to it"""
+    try:
+        listing = await db.listings.find_one(
+            {"id": listing_id},
+            {"_id": 0, "agreement_metadata": 0}
+        )
+        if listing:
+            await search_index.set_status(db, [listing_id], listing.get("status"))
+        if not listing or listing.get("status") != "active":
+            await db.marketplace_items.delete_many({"source_id": listing_id})
+            return
+
+        item = build_listing_item(listing, await _seller_is_business(db, listing.get("seller_id")))
+        item["synced_at"] = datetime.now(timezone.utc)
+        await db.marketplace_items.replace_one({"id": item["id"]}, item, upsert=True)
+    except Exception as e:
+        logger.error(f"❌ Marketplace index sync failed for listing {listing_id}: {e}")
+
+
+async def sync_auction(db, auction_id: str) -> None:
+    """Re-materialize every lot of a multi-item auction (create, moderation, status changes)"""
+    try:
+        auction = await db.multi_item_listings.find_one(
+            {"id": auction_id},
+            {**AUCTION_PROJECTION, "lots": 1}
+        )
+        if auction:
+            await search_index.set_status(db, [auction_id], auction.get("status"))
+        if not auction or auction.get("status") != "active":
+            await db.marketplace_items.delete_many({"source_id": auction_id})
+            return
+
+        seller_is_business = await _seller_is_business(db, auction.get("seller_id"))
+        now = datetime.now(timezone.utc)
+        operations = []
+        visible_ids = []
+        for lot in auction.get("lots", []):
+            if not _lot_is_visible(lot):
+                continue
+            item = build_lot_item(auction, lot, seller_is_business)
+            item["synced_at"] = now
+            visible_ids.append(item["id"])
+            operations.append(UpdateOne({"id": item["id"]}, {"$set": item}, upsert=True))
+
+        if operations:
+            await db.marketplace_items.bulk_write(operations, ordered=False)
+        await db.marketplace_items.delete_many({"source_id": auction_id, "id": {"$nin": visible_ids}})
+    except Exception as e:
+        logger.error(f"❌ Marketplace index sync failed for auction {auction_id}: {e}")
+
+
+async def sync_lot(db, auction_id: str, lot_number: int) -> None:
+    """Re-materialize one lot (bid and buy-now hot paths) without touching its siblings"""
+    try:
+        auction = await db.multi_item_listings.find_one(
+            {"id": auction_id, "lots.lot_number": lot_number},
+            {**AUCTION_PROJECTION, "lots.$": 1}
+        )
+        item_id = f"{auction_id}_lot{lot_number}"
+        if not auction or auction.get("status") != "active" or not _lot_is_visible(auction["lots"][0]):
+            await db.marketplace_items.delete_one({"id": item_id})
+            return
+
+        item = build_lot_item(auction, auction["lots"][0], await _seller_is_business(db, auction.get("seller_id")))
+        item["synced_at"] = datetime.now(timezone.utc)
+        await db.marketplace_items.replace_one({"id": item_id}, item, upsert=True)
+    except Exception as e:
+        logger.error(f"❌ Marketplace index sync failed for lot {auction_id}#{lot_number}: {e}")
+
+
+async def remove_source(db, source_id: str) -> None:
+    """Drop every item materialized from a deleted listing or auction"""
+    try:
+        await db.marketplace_items.delete_many({"source_id": source_id})
+    except Exception as e:
+        logger.error(f"❌ Marketplace index removal failed for {source_id}: {e}")
+
+
+async def remove_sources(db, source_ids: List[str]) -> None:
+    """Batch form of remove_source for the auction close pipeline"""
+    if not source_ids:
+        return
+    try:
+        await db.marketplace_items.delete_many({"source_id": {"$in": source_ids}})
+    except Exception as e:
+        logger.error(f"❌ Marketplace index removal failed for {len(source_ids)} source(s): {e}")
+
+
+async def rebuild_marketplace_items(db) -> Dict[str, int]:
+    """
+    Full reconcile: re-materialize every active source and drop stale items.
+    Used to backfill an empty collection and as a periodic safety net.
+    """
+    run_started = datetime.now(timezone.utc)
+    seller_cache: Dict[str, bool] = {}
+    upserted = 0
+
+    async def seller_flag(seller_id):
+        if seller_id not in seller_cache:
+            seller_cache[seller_id] = await _seller_is_business(db, seller_id)
+        return seller_cache[seller_id]
+
+    async def flush(operations):
+        if operations:
+            await db.marketplace_items.bulk_write(operations, ordered=False)
+        return []
+
+    operations = []
+    async for auction in db.multi_item_listings.find({"status": "active"}, {**AUCTION_PROJECTION, "lots": 1}):
+        seller_is_business = await seller_flag(auction.get("seller_id"))
+        for lot in auction.get("lots", []):
+            if not _lot_is_visible(lot):
+                continue
+            item = build_lot_item(auction, lot, seller_is_business)
+            item["synced_at"] = run_started
+            operations.append(UpdateOne({"id": item["id"]}, {"$set": item}, upsert=True))
+            upserted += 1
+        if len(operations) >= 500:
+            operations = await flush(operations)
+
+    async for listing in db.listings.find({"status": "active"}, {"_id": 0, "agreement_metadata": 0}):
+        item = build_listing_item(listing, await seller_flag(listing.get("seller_id")))
+        item["synced_at"] = run_started
+        operations.append(UpdateOne({"id": item["id"]}, {"$set": item}, upsert=True))
+        upserted += 1
+        if len(operations) >= 500:
+            operations = await flush(operations)
+
+    await flush(operations)
+
+    # Anything not touched by this run is no longer visible
+    removed = await db.marketplace_items.delete_many({"synced_at": {"$lt": run_started}})
+
+    logger.info(f"🔄 Marketplace index rebuilt: {upserted} item(s), {removed.deleted_count} stale removed")
+    return {"upserted": upserted, "removed": removed.deleted_count}
+
+
+# ========== READ PATH ==========
+
+def build_query(
+    search: Optional[str] = None,
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    condition: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Translate marketplace filters into a marketplace_items query"""
+    query: Dict[str, Any] = {}
+    if category:
+        query["category"] = category
+    if condition:
+        query["condition"] = condition
+    if min_price is not None or max_price is not None:
+        query["current_price"] = {}
+        if min_price is not None:
+            query["current_price"]["$gte"] = min_price
+        if max_price is not None:
+            query["current_price"]["$lte"] = max_price
+    terms = search_index.query_terms(search)
+    if terms:
+        query.update(search_index.match_filter(terms, "search_terms"))
+    return query
+
+
+def _and(query: Dict[str, Any], extra: Dict[str, Any]) -> Dict[str, Any]:
+    return {"$and": [query, extra]} if query else extra
+
+
+# (filter, sort field, direction); concatenating the segments yields the full order
+Segment = Tuple[Dict[str, Any], str, int]
+
+
+def sort_segments(query: Dict[str, Any], sort: str, now: datetime) -> List[Segment]:
+    """
+    Express a marketplace sort as an ordered list of single-key segments.
+    Each segment is an indexed query paged by (key, id).
+
+    The default "-promoted" hierarchy is:
+      1. Featured (pinned)
+      2. Ending within the next 60 minutes, soonest first
+      3. Promotion tier weight, then newest
+    """
+    if sort == "-promoted":
+        urgent = {"lot_end_time": {"$gt": now, "$lte": now + URGENCY_WINDOW}}
+        not_urgent = {"$or": [
+            {"lot_end_time": {"$lte": now}},
+            {"lot_end_time": {"$gt": now + URGENCY_WINDOW}},
+            {"lot_end_time": None},
+        ]}
+        return [
+            (_and(query, {"is_featured": True, **urgent}), "lot_end_time", 1),
+            (_and(query, {"$and": [{"is_featured": True}, not_urgent]}), "promotion_key", -1),
+            (_and(query, {"is_featured": {"$ne": True}, **urgent}), "lot_end_time", 1),
+            (_and(query, {"$and": [{"is_featured": {"$ne": True}}, not_urgent]}), "promotion_key", -1),
+        ]
+    if sort == "price":
+        return [(query, "current_price", 1)]
+    if sort == "-price":
+        return [(query, "current_price", -1)]
+    if sort == "ending_soon":
+        return [(query, "ending_key", 1)]
+    # Default: newest first
+    return [(query, "created_at", -1)]
+
+
+def encode_page_cursor(sort: str, now: datetime, segment: int, inner: Optional[str]) -> str:
+    """Segment position plus the segment's keyset cursor; `now` pins the urgency window across pages"""
+    payload = {"s": sort, "now": now.isoformat(), "seg": segment, "c": inner}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_page_cursor(cursor: str, sort: str) -> Tuple[datetime, int, Optional[str]]:
+    """(now, segment index, segment cursor) of a cursor issued for `sort`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        issued_for, now = payload["s"], datetime.fromisoformat(payload["now"])
+        segment, inner = int(payload["seg"]), payload["c"]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor("Malformed pagination cursor")
+    if issued_for != sort:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    return now, segment, inner
+
+
+async def fetch_page(
+    db,
+    query: Dict[str, Any],
+    sort: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    now: Optional[datetime] = None,
+    skip: int = 0,
+) -> Page:
+    """
+    One page in `sort` order and the cursor for the next (None on the last
+    page). Every segment is read by keyset, so the cost does not grow with
+    the page number. skip is only honoured for legacy offset clients: the
+    skipped rows are still read, in cursor-sized steps.
+    """
+    now = now or datetime.now(timezone.utc)
+    while skip > 0:
+        skipped = await fetch_page(db, query, sort, clamp_limit(skip), cursor, now)
+        if skipped.next_cursor is None:
+            return Page([], None)
+        cursor, skip = skipped.next_cursor, skip - len(skipped.items)
+    limit = clamp_limit(limit)
+    segment, inner = 0, None
+    if cursor:
+        now, segment, inner = decode_page_cursor(cursor, sort)
+    segments = sort_segments(query, sort, now)
+    if not 0 <= segment <= len(segments):
+        raise InvalidCursor("Malformed pagination cursor")
+
+    items: List[Dict[str, Any]] = []
+    for index in range(segment, len(segments)):
+        need = limit - len(items)
+        if need <= 0:
+            return Page(items, encode_page_cursor(sort, now, index, None))
+        segment_filter, field, direction = segments[index]
+        if inner:
+            decode_cursor(inner, field, direction)  # validate before querying
+        # The sort key is read for the cursor, then dropped with the other internal fields
+        projection = {k: v for k, v in PUBLIC_PROJECTION.items() if k != field}
+        page = await fetch_keyset_page(db.marketplace_items, segment_filter, field, direction, need, inner, projection)
+        inner = None
+        for item in page.items:
+            if PUBLIC_PROJECTION.get(field) == 0:
+                item.pop(field, None)
+        items.extend(page.items)
+        if page.next_cursor:
+            return Page(items, encode_page_cursor(sort, now, index, page.next_cursor))
+    return Page(items, None)
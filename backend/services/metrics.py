@@ -0,0 +1,126 @@
+"""
+BidVex In-Process Metrics
+Lightweight counters, gauges and latency histograms for hot paths:
+- Counters: monotonically increasing event counts
+- Gauges: point-in-time values (queue depths, connection counts)
+- Histograms: bounded reservoir of recent samples with p50/p90/p99/max
+
+Metrics are per worker and exposed through the admin metrics endpoint.
+
+Usage:
+    metrics = get_metrics()
+    metrics.inc("ws_sent")
+    metrics.observe("ws_send_seconds", 0.004)
+    metrics.snapshot()
+"""
+
+import time
+import random
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+# Recent samples kept per histogram (percentiles are computed over these)
+RESERVOIR_SIZE = 2048
+
+
+class LatencyHistogram:
+    """Reservoir-sampled latency distribution (seconds)"""
+
+    def __init__(self, size: int = RESERVOIR_SIZE):
+        self.size = size
+        self.samples: List[float] = []
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if len(self.samples) < self.size:
+            self.samples.append(value)
+        else:
+            # Algorithm R: every sample seen so far has equal odds of being kept
+            slot = random.randrange(self.count)
+            if slot < self.size:
+                self.samples[slot] = value
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else None,
+            "p50_ms": self._ms(self.percentile(50)),
+            "p90_ms": self._ms(self.percentile(90)),
+            "p99_ms": self._ms(self.percentile(99)),
+            "max_ms": self._ms(self.max) if self.count else None,
+        }
+
+    @staticmethod
+    def _ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 3) if value is not None else None
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def inc(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def set_gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Observe the wall time of a block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "latency": {name: h.summary() for name, h in self.histograms.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+
+# Singleton instance
+_metrics = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get or create the metrics registry singleton"""
+    global _metrics
+    if _metrics is None:
+        _metrics = MetricsRegistry()
+    return _metrics
@@ -0,0 +1,253 @@
+"""
+BidVex Notification Outbox
+Transactional outbox for user notifications (in-app, SMS, email):
+- Request handlers write outbox rows and return; Twilio / SendGrid latency
+  never sits on the bid path
+- A background dispatcher per channel claims due rows in batches, with a
+  per-channel concurrency limit, exponential-backoff retries and a terminal
+  "failed" status after OUTBOX_MAX_ATTEMPTS
+- Idempotency keys dedupe rows, so a retried request never notifies twice
+- Provider calls never block the loop: the Twilio SDK runs in a thread pool,
+  SendGrid is called over a pooled async HTTP client
+
+Usage:
+    outbox = get_notification_outbox(db)
+    register_default_channels(outbox)
+    await outbox.start()
+    await outbox.enqueue([
+        outbox_entry("in_app", "outbid", user_id, notification_doc, key),
+        outbox_entry("sms", "outbid", user_id, notify_kwargs, key),
+    ])
+"""
+
+import os
+import asyncio
+import logging
+from uuid import uuid4
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone, timedelta
+
+from services.auction_close import insert_idempotent
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_RETRY_BASE = float(os.environ.get("OUTBOX_RETRY_BASE", "2"))
+OUTBOX_RETRY_CAP = float(os.environ.get("OUTBOX_RETRY_CAP", "300"))
+OUTBOX_POLL_INTERVAL = float(os.environ.get("OUTBOX_POLL_INTERVAL", "1.0"))
+OUTBOX_CLAIM_TIMEOUT = int(os.environ.get("OUTBOX_CLAIM_TIMEOUT", "120"))
+OUTBOX_RETENTION_DAYS = int(os.environ.get("OUTBOX_RETENTION_DAYS", "7"))
+
+# Concurrent deliveries per channel per worker
+CHANNEL_CONCURRENCY = {
+    "in_app": int(os.environ.get("OUTBOX_IN_APP_CONCURRENCY", "50")),
+    "sms": int(os.environ.get("OUTBOX_SMS_CONCURRENCY", "8")),
+    "email": int(os.environ.get("OUTBOX_EMAIL_CONCURRENCY", "8")),
+}
+
+# Handler returns the terminal status ("sent" or "skipped"); raising schedules a retry
+ChannelHandler = Callable[[Dict[str, Any]], Awaitable[str]]
+
+metrics = get_metrics()
+
+
+def outbox_entry(channel: str, kind: str, user_id: str, payload: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+    """Build an outbox row; the key is scoped per channel so each channel dedupes independently"""
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(uuid4()),
+        "idempotency_key": f"{channel}:{idempotency_key}",
+        "channel": channel,
+        "kind": kind,
+        "user_id": user_id,
+        "payload": payload,
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now
+    }
+
+
+class NotificationOutbox:
+    def __init__(
+        self,
+        db,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        retry_base: float = OUTBOX_RETRY_BASE,
+        poll_interval: float = OUTBOX_POLL_INTERVAL,
+    ):
+        self.db = db
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.poll_interval = poll_interval
+        self.channels: Dict[str, Tuple[ChannelHandler, int]] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def register_channel(self, channel: str, handler: ChannelHandler, concurrency: Optional[int] = None):
+        self.channels[channel] = (handler, concurrency or CHANNEL_CONCURRENCY.get(channel, 4))
+        self._wakeups[channel] = asyncio.Event()
+
+    async def enqueue(self, entries: List[Dict[str, Any]]) -> Set[str]:
+        """One insert for all rows; duplicates are dropped. Returns the keys actually queued."""
+        queued = await insert_idempotent(self.db.notification_outbox, entries)
+        for entry in entries:
+            metrics.inc(f"outbox_enqueued:{entry['channel']}")
+            wakeup = self._wakeups.get(entry["channel"])
+            if wakeup:
+                wakeup.set()
+        return queued
+
+    # ========== DISPATCH ==========
+
+    async def _claim(self, channel: str, limit: int) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        now_str = now.isoformat()
+        stale = (now - timedelta(seconds=OUTBOX_CLAIM_TIMEOUT)).isoformat()
+        claimable = {"channel": channel, "$or": [
+            {"status": "pending", "next_attempt_at": {"$lte": now_str}},
+            {"status": "sending", "claimed_at": {"$lte": stale}},
+        ]}
+        ids = [doc["id"] async for doc in self.db.notification_outbox.find(claimable, {"_id": 0, "id": 1}).limit(limit)]
+        if not ids:
+            return []
+        token = str(uuid4())
+        await self.db.notification_outbox.update_many(
+            {"id": {"$in": ids}, **claimable},
+            {"$set": {"status": "sending", "claim": token, "claimed_at": now_str}}
+        )
+        return await self.db.notification_outbox.find({"id": {"$in": ids}, "claim": token}, {"_id": 0}).to_list(len(ids))
+
+    async def _deliver(self, handler: ChannelHandler, semaphore: asyncio.Semaphore, entry: Dict[str, Any]):
+        channel = entry["channel"]
+        attempts = entry.get("attempts", 0) + 1
+        async with semaphore:
+            try:
+                with metrics.timer(f"outbox_deliver:{channel}"):
+                    status = await handler(entry)
+            except Exception as e:
+                if attempts >= self.max_attempts:
+                    update = {"status": "failed"}
+                    metrics.inc(f"outbox_failed:{channel}")
+                    logger.error(f"❌ Outbox {channel}/{entry['kind']} gave up after {attempts} attempts: {e}")
+                else:
+                    delay = min(self.retry_base * (2 ** (attempts - 1)), OUTBOX_RETRY_CAP)
+                    update = {
+                        "status": "pending",
+                        "next_attempt_at": (datetime.now(timezone.utc) + timedelta(seconds=delay)).isoformat()
+                    }
+                    metrics.inc(f"outbox_retry:{channel}")
+                update.update({"attempts": attempts, "last_error": str(e)[:500]})
+            else:
+                update = {"status": status or "sent", "attempts": attempts, "sent_at": datetime.now(timezone.utc).isoformat()}
+                metrics.inc(f"outbox_{update['status']}:{channel}")
+
+        await self.db.notification_outbox.update_one(
+            {"id": entry["id"], "claim": entry["claim"]},
+            {"$set": update, "$unset": {"claim": "", "claimed_at": ""}}
+        )
+
+    async def dispatch_once(self, channel: str) -> int:
+        """Claim and deliver one batch for a channel; returns the batch size"""
+        handler, concurrency = self.channels[channel]
+        batch = await self._claim(channel, concurrency * 4)
+        if batch:
+            semaphore = asyncio.Semaphore(concurrency)
+            await asyncio.gather(*(self._deliver(handler, semaphore, entry) for entry in batch))
+        return len(batch)
+
+    async def _run_channel(self, channel: str):
+        # Channels drain independently: a slow SMS provider never delays in-app rows
+        wakeup = self._wakeups[channel]
+        while True:
+            try:
+                if await self.dispatch_once(channel):
+                    continue
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                logger.error(f"❌ Outbox dispatcher ({channel}) error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def start(self):
+        for channel in self.channels:
+            self._tasks.append(asyncio.create_task(self._run_channel(channel)))
+        logger.info(f"📬 Notification outbox dispatching: {', '.join(self.channels)}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def purge(self, retention_days: int = OUTBOX_RETENTION_DAYS) -> int:
+        """Drop delivered/skipped rows past retention (failed rows are kept for inspection)"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).isoformat()
+        result = await self.db.notification_outbox.delete_many(
+            {"status": {"$in": ["sent", "skipped"]}, "created_at": {"$lte": cutoff}}
+        )
+        return result.deleted_count
+
+
+# ========== DEFAULT CHANNELS ==========
+
+def register_default_channels(outbox: NotificationOutbox):
+    """in_app writes the notification row; sms / email call the provider services"""
+    db = outbox.db
+
+    async def deliver_in_app(entry):
+        doc = {**entry["payload"], "idempotency_key": entry["idempotency_key"]}
+        await insert_idempotent(db.notifications, [doc])
+        return "sent"
+
+    async def deliver_sms(entry):
+        from services.sms_notification_service import get_sms_notification_service
+
+        sms_service = get_sms_notification_service(db)
+        result = await getattr(sms_service, f"notify_{entry['kind']}")(**entry["payload"])
+        if result.get("status") == "error":
+            raise RuntimeError(result.get("message"))
+        return "sent" if result.get("status") == "sent" else "skipped"
+
+    async def deliver_email(entry):
+        from services.email_service import get_email_service
+        from config import email_templates
+
+        email_service = get_email_service()
+        if not email_service.is_configured():
+            return "skipped"
+        user = await db.users.find_one(
+            {"id": entry["user_id"]},
+            {"_id": 0, "id": 1, "name": 1, "email": 1, "preferred_language": 1, "notification_preferences": 1}
+        )
+        if not user or not user.get("email"):
+            return "skipped"
+        if not user.get("notification_preferences", {}).get(f"email_{entry['kind']}", True):
+            return "skipped"
+
+        send = getattr(email_templates, f"send_{entry['kind']}_notification")
+        result = await send(email_service, user, language=user.get("preferred_language", "en"), **entry["payload"])
+        if not result or not result.get("success"):
+            raise RuntimeError((result or {}).get("error", "email send failed"))
+        return "sent"
+
+    outbox.register_channel("in_app", deliver_in_app)
+    outbox.register_channel("sms", deliver_sms)
+    outbox.register_channel("email", deliver_email)
+
+
+# Singleton instance
+_notification_outbox = None
+
+
+def get_notification_outbox(db=None) -> NotificationOutbox:
+    """Get or create the notification outbox singleton"""
+    global _notification_outbox
+    if _notification_outbox is None:
+        _notification_outbox = NotificationOutbox(db)
+    return _notification_outbox
@@ -0,0 +1,208 @@
+"""
+BidVex Keyset Pagination
+Opaque cursors for list endpoints instead of skip/limit:
+- A cursor encodes the last row's (sort_key, id); the next page is the rows
+  strictly after it in (sort_key, id) order, so page 500 costs one index
+  seek like page 1, and inserts between requests never shift rows
+- id breaks ties between equal sort keys; registry indexes end in id
+- Cursors are bound to the sort they were issued for; replaying one against
+  a different sort is rejected
+- merge_pages() pages two collections sorted the same way (a seller's single
+  and multi-item listings) with one cursor
+- Sort keys of mixed BSON types (ISO strings next to BSON dates while the
+  date migration is pending) page in MongoDB's type order - nulls, numbers,
+  strings, dates - so the keyset, the server sort and merge_pages() agree
+  and no row of the other type is skipped
+
+Usage:
+    page = await fetch_page(db.listings, {"status": "active"}, "created_at", -1, limit, cursor)
+    page.items, page.next_cursor
+"""
+
+import json
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from services.bson_dates import to_datetime
+
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class Page:
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+
+
+def _encode_value(value: Any) -> Any:
+    # Datetimes are tagged so the cursor compares against the stored BSON type
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {"$dt"}:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(sort_field: str, direction: int, sort_value: Any, item_id: str) -> str:
+    payload = {"f": sort_field, "d": direction, "v": _encode_value(sort_value), "id": item_id}
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_field: str, direction: int) -> Tuple[Any, str]:
+    """(sort_value, id) of the last row of the previous page"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value, item_id = _decode_value(payload["v"]), payload["id"]
+        issued_for = (payload["f"], payload["d"])
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor("Malformed pagination cursor")
+    if issued_for != (sort_field, direction):
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    return sort_value, item_id
+
+
+# BSON sort order of the types sort keys take (after null); $lt/$gt only
+# match values of the operand's own type, so other types need their own clause
+BSON_TYPE_ORDER = ("number", "string", "date")
+# Types a single sort key is expected to mix: timestamps mid-migration
+MIXED_KEY_TYPES = ("string", "date")
+
+
+def bson_type(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, datetime):
+        return "date"
+    return None
+
+
+def keyset_filter(sort_field: str, direction: int, sort_value: Any, item_id: str) -> Dict[str, Any]:
+    """Rows strictly after (sort_value, item_id) in (sort_field, id) order"""
+    op = "$lt" if direction < 0 else "$gt"
+    if sort_value is None:
+        # Nulls sort lowest: after a null row only nulls remain (descending),
+        # or every non-null row follows (ascending)
+        after_nulls = [{sort_field: None, "id": {op: item_id}}]
+        if direction > 0:
+            after_nulls.append({sort_field: {"$ne": None}})
+        return {"$or": after_nulls}
+    clauses = [
+        {sort_field: {op: sort_value}},
+        {sort_field: sort_value, "id": {op: item_id}},
+    ]
+    kind = bson_type(sort_value)
+    if kind in MIXED_KEY_TYPES:
+        # Every row of the other timestamp type that sorts after this one in `direction`
+        rank = MIXED_KEY_TYPES.index(kind)
+        later = MIXED_KEY_TYPES[:rank][::-1] if direction < 0 else MIXED_KEY_TYPES[rank + 1:]
+        clauses.extend({sort_field: {"$type": other}} for other in later)
+    if direction < 0:
+        clauses.append({sort_field: None})
+    return {"$or": clauses}
+
+
+def sort_spec(sort_field: str, direction: int) -> List[Tuple[str, int]]:
+    return [(sort_field, direction), ("id", direction)]
+
+
+def after_cursor(query: Dict[str, Any], sort_field: str, direction: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """Add the keyset condition for `cursor` to a find() filter"""
+    if not cursor:
+        return query
+    keyset = keyset_filter(sort_field, direction, *decode_cursor(cursor, sort_field, direction))
+    return {"$and": [query, keyset]} if query else keyset
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _page(items: List[Dict[str, Any]], sort_field: str, direction: int, limit: int) -> Page:
+    if len(items) <= limit:
+        return Page(items, None)
+    items = items[:limit]
+    last = items[-1]
+    return Page(items, encode_cursor(sort_field, direction, last.get(sort_field), last["id"]))
+
+
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    sort_field: str,
+    direction: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+    skip: int = 0,
+) -> Page:
+    """
+    One page of `collection`; next_cursor is None on the last page.
+    skip is only honoured for legacy offset clients and still costs O(skip).
+    """
+    limit = clamp_limit(limit)
+    find = collection.find(
+        after_cursor(query, sort_field, direction, cursor),
+        projection if projection is not None else {"_id": 0}
+    ).sort(sort_spec(sort_field, direction))
+    if skip > 0:
+        find = find.skip(skip)
+    items = await find.limit(limit + 1).to_list(limit + 1)
+    return _page(items, sort_field, direction, limit)
+
+
+def _order_key(item: Dict[str, Any], sort_field: str):
+    """MongoDB's ascending order: nulls, then BSON type, then value (dates normalized to aware UTC)"""
+    value = item.get(sort_field)
+    if value is None:
+        return (0, 0, None, item["id"])
+    kind = bson_type(value)
+    if kind == "date":
+        value = to_datetime(value)
+    rank = BSON_TYPE_ORDER.index(kind) if kind is not None else len(BSON_TYPE_ORDER)
+    return (1, rank, value, item["id"])
+
+
+async def merge_pages(
+    sources: Sequence[Tuple[Any, Dict[str, Any]]],
+    sort_field: str,
+    direction: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[List[Dict[str, Any]]], Optional[str]]:
+    """
+    Page several (collection, query) sources as one stream sharing a cursor.
+    Returns each source's share of the page (in source order) and the next cursor.
+    """
+    limit = clamp_limit(limit)
+    fetched = []
+    for index, (collection, query) in enumerate(sources):
+        items = await collection.find(
+            after_cursor(query, sort_field, direction, cursor),
+            projection if projection is not None else {"_id": 0}
+        ).sort(sort_spec(sort_field, direction)).limit(limit + 1).to_list(limit + 1)
+        fetched.extend((index, item) for item in items)
+
+    fetched.sort(key=lambda pair: _order_key(pair[1], sort_field), reverse=direction < 0)
+    page = _page([item for _, item in fetched], sort_field, direction, limit)
+
+    shares: List[List[Dict[str, Any]]] = [[] for _ in sources]
+    for index, item in fetched[:len(page.items)]:
+        shares[index].append(item)
+    return shares, page.next_cursor
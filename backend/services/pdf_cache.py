@@ -0,0 +1,223 @@
+"""
+BidVex PDF Cache
+Content-addressed store for generated PDFs (invoices, statements, auction terms):
+- Key = sha256(template version + rendered HTML); identical inputs never
+  reach WeasyPrint twice
+- The key doubles as the HTTP ETag, so If-None-Match answers 304 without
+  touching disk
+- Template version hashes the invoice template modules and files (plus
+  PDF_TEMPLATE_VERSION for templates that live elsewhere), so a template
+  change invalidates every cached document
+- LRU eviction keeps the cache under PDF_CACHE_MAX_BYTES; per-user invoice
+  paths are hard links to the cached blob, so they share its storage
+- Concurrent requests for the same key render once
+
+Usage:
+    cache = get_pdf_cache()
+    cached = await cache.get_or_render(html_content, dest_path=invoice_dir / "Invoice.pdf")
+    cached.path, cached.etag, cached.hit
+"""
+
+import os
+import shutil
+import asyncio
+import hashlib
+import logging
+from uuid import uuid4
+from pathlib import Path
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+
+from services.metrics import get_metrics
+from services.pdf_renderer import get_pdf_renderer
+
+logger = logging.getLogger(__name__)
+
+PDF_CACHE_DIR = os.environ.get("PDF_CACHE_DIR", "/app/invoices/.pdf_cache")
+PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+# Bump when a PDF template outside the invoice_templates* modules changes (e.g. auction terms)
+PDF_TEMPLATE_VERSION = os.environ.get("PDF_TEMPLATE_VERSION", "1")
+
+TEMPLATE_MODULES = (
+    "invoice_templates_bilingual.py",
+    "invoice_templates_complete.py",
+    "invoice_translations.py",
+    "invoice_engine.py",
+)
+# Jinja templates, stylesheets and the logo used by invoice_engine
+TEMPLATE_DIRS = ("templates/invoices",)
+
+metrics = get_metrics()
+
+
+def template_version(backend_dir: Union[str, Path] = Path(__file__).resolve().parent.parent) -> str:
+    """Hash of the invoice template sources plus the manual version"""
+    digest = hashlib.sha256(PDF_TEMPLATE_VERSION.encode())
+    for name in TEMPLATE_MODULES:
+        path = Path(backend_dir) / name
+        if path.exists():
+            digest.update(name.encode())
+            digest.update(path.read_bytes())
+    for name in TEMPLATE_DIRS:
+        root = Path(backend_dir) / name
+        for path in sorted(p for p in root.rglob("*") if p.is_file()):
+            digest.update(path.relative_to(root).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 weak comparison against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/").strip('"') == etag for tag in candidates)
+
+
+@dataclass
+class CachedPDF:
+    path: str
+    etag: str
+    hit: bool
+
+    @property
+    def etag_header(self) -> str:
+        return f'"{self.etag}"'
+
+
+class PDFCache:
+    def __init__(
+        self,
+        directory: Union[str, Path] = PDF_CACHE_DIR,
+        max_bytes: int = PDF_CACHE_MAX_BYTES,
+        version: Optional[str] = None,
+        renderer=None,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.version = version or template_version()
+        self.renderer = renderer or get_pdf_renderer()
+        # key -> size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._loaded = False
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def key(self, html_content: str) -> str:
+        digest = hashlib.sha256(self.version.encode())
+        digest.update(b"\0")
+        digest.update(html_content.encode())
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pdf"
+
+    def _load(self):
+        """Rebuild the LRU index from disk (mtime = last use) once per worker"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.directory.exists():
+            return
+        found = []
+        for path in self.directory.glob("*/*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+
+    def _touch(self, key: str, path: Path) -> bool:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker
+            self._forget(key)
+            return False
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        else:
+            self._remember(key, path)
+        return True
+
+    def _remember(self, key: str, path: Path):
+        self._forget(key)
+        size = path.stat().st_size
+        self._entries[key] = size
+        self._bytes += size
+
+    def _forget(self, key: str):
+        self._bytes -= self._entries.pop(key, 0)
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, _ = next(iter(self._entries.items()))
+            self._forget(key)
+            try:
+                self.path_for(key).unlink()
+            except FileNotFoundError:
+                pass
+            metrics.inc("pdf_cache_evicted")
+
+    async def _render(self, key: str, html_content: str) -> Path:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await self.renderer.render(html_content, path)
+        self._remember(key, path)
+        self._evict()
+        return path
+
+    async def get_or_render(self, html_content: str, dest_path: Optional[Union[str, Path]] = None) -> CachedPDF:
+        """
+        Serve the cached PDF for this HTML, rendering it on a miss.
+        With dest_path, the PDF is also linked to that path (e.g. a per-user invoice file).
+        """
+        self._load()
+        key = self.key(html_content)
+        path = self.path_for(key)
+
+        if path.exists() and self._touch(key, path):
+            hit = True
+            metrics.inc("pdf_cache_hit")
+        else:
+            hit = False
+            metrics.inc("pdf_cache_miss")
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(self._render(key, html_content))
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            path = await asyncio.shield(task)
+
+        if dest_path is not None:
+            self._link(path, Path(dest_path))
+        return CachedPDF(path=str(path), etag=key, hit=hit)
+
+    @staticmethod
+    def _link(source: Path, dest: Path):
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{uuid4().hex}.tmp")
+        try:
+            os.link(source, tmp)
+        except OSError:
+            # Different filesystem (or no hard links): fall back to a copy
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, dest)
+
+
+# Singleton instance
+_pdf_cache = None
+
+
+def get_pdf_cache() -> PDFCache:
+    """Get or create the PDF cache singleton"""
+    global _pdf_cache
+    if _pdf_cache is None:
+        _pdf_cache = PDFCache()
+    return _pdf_cache
@@ -0,0 +1,255 @@
+"""
+BidVex PDF Renderer
+Renders invoices, statements and auction terms off the event loop:
+- WeasyPrint runs in a process pool, so a one-second render never stalls
+  bids or WebSocket heartbeats
+- Workers are warm: WeasyPrint, fontconfig and the invoice font stack are
+  loaded once per process (plus an optional shared stylesheet)
+- A bounded queue applies backpressure; callers wait for a slot up to
+  PDF_RENDER_QUEUE_TIMEOUT and then get RenderQueueFull
+- Per-job timeouts: a hung render is abandoned and its pool recycled
+- submit() returns a RenderJob handle; render() is submit + wait
+
+Usage:
+    renderer = get_pdf_renderer()
+    renderer.start()
+    job = await renderer.submit(html_content, pdf_path)
+    await job.result()
+    # or simply
+    await renderer.render(html_content, pdf_path)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from uuid import uuid4
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Union
+
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+PDF_RENDER_WORKERS = int(os.environ.get("PDF_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Jobs allowed to wait for a worker on top of the ones being rendered
+PDF_RENDER_QUEUE = int(os.environ.get("PDF_RENDER_QUEUE", "32"))
+PDF_RENDER_QUEUE_TIMEOUT = float(os.environ.get("PDF_RENDER_QUEUE_TIMEOUT", "30"))
+PDF_RENDER_TIMEOUT = float(os.environ.get("PDF_RENDER_TIMEOUT", "60"))
+# Recycle worker processes after this many renders (bounds WeasyPrint memory growth)
+PDF_RENDER_MAX_TASKS = int(os.environ.get("PDF_RENDER_MAX_TASKS", "200"))
+PDF_RENDER_BASE_CSS = os.environ.get("PDF_RENDER_BASE_CSS")
+# "spawn" keeps the Motor client, scheduler threads and event loop out of the workers
+PDF_RENDER_START_METHOD = os.environ.get("PDF_RENDER_START_METHOD", "spawn")
+
+WARMUP_HTML = (
+    "<html><head><style>body { font-family: 'Arial', 'Helvetica', sans-serif; }</style></head>"
+    "<body><h1>BidVex</h1><p><strong>Invoice</strong> 0123456789 $ € é</p></body></html>"
+)
+
+metrics = get_metrics()
+
+
+class RenderError(Exception):
+    pass
+
+
+class RenderTimeout(RenderError):
+    pass
+
+
+class RenderQueueFull(RenderError):
+    pass
+
+
+# ========== WORKER PROCESS ==========
+
+_font_config = None
+_stylesheets = []
+
+
+def _warm_worker(base_css: Optional[str] = None):
+    """Pool initializer: import WeasyPrint and load fonts once per process"""
+    global _font_config, _stylesheets
+    try:
+        from weasyprint import HTML, CSS
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:
+        # Rendering will raise with the real error; keep the worker alive for tests / fakes
+        return
+
+    _font_config = FontConfiguration()
+    if base_css and os.path.exists(base_css):
+        _stylesheets = [CSS(filename=base_css, font_config=_font_config)]
+    HTML(string=WARMUP_HTML).write_pdf(stylesheets=_stylesheets, font_config=_font_config)
+
+
+def render_html_to_pdf(html_content: str, pdf_path: str) -> str:
+    """Worker entry point. Writes to a temp file and renames, so readers never see a partial PDF."""
+    from weasyprint import HTML
+
+    tmp_path = f"{pdf_path}.{os.getpid()}.tmp"
+    HTML(string=html_content).write_pdf(tmp_path, stylesheets=_stylesheets, font_config=_font_config)
+    os.replace(tmp_path, pdf_path)
+    return pdf_path
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# ========== ASYNC FRONT END ==========
+
+class RenderJob:
+    """Handle for one submitted render"""
+
+    def __init__(self, pdf_path: str):
+        self.id = str(uuid4())
+        self.pdf_path = pdf_path
+        self.status = "queued"  # queued, rendering, done, failed, timeout
+        self.error: Optional[str] = None
+        self.submitted_at = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+
+    def done(self) -> bool:
+        return self.status in ("done", "failed", "timeout")
+
+    async def result(self) -> str:
+        """Wait for the render; returns the PDF path or raises RenderError"""
+        return await asyncio.shield(self.task)
+
+
+class PDFRenderer:
+    def __init__(
+        self,
+        workers: int = PDF_RENDER_WORKERS,
+        queue_size: int = PDF_RENDER_QUEUE,
+        timeout: float = PDF_RENDER_TIMEOUT,
+        queue_timeout: float = PDF_RENDER_QUEUE_TIMEOUT,
+        render_fn: Callable[[str, str], str] = render_html_to_pdf,
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.render_fn = render_fn
+        self._slots = asyncio.Semaphore(workers + queue_size)
+        self._running = asyncio.Semaphore(workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self._pending = 0
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(PDF_RENDER_START_METHOD),
+            initializer=_warm_worker,
+            initargs=(PDF_RENDER_BASE_CSS,),
+            max_tasks_per_child=PDF_RENDER_MAX_TASKS,
+        )
+
+    def start(self):
+        if self._pool is None:
+            self._pool = self._new_pool()
+            logger.info(f"🖨️ PDF renderer started with {self.workers} worker processes")
+
+    async def warm(self):
+        """Spin every worker up now instead of on the first invoice"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(self._pool, _ping) for _ in range(self.workers)))
+        logger.info(f"🖨️ PDF renderer warmed ({len(set(pids))} processes)")
+
+    def stop(self):
+        if self._pool is not None:
+            self._kill_pool(self._pool)
+            self._pool = None
+
+    @staticmethod
+    def _kill_pool(pool: ProcessPoolExecutor):
+        # A hung WeasyPrint render won't return on its own; terminate the processes
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _recycle(self, generation: int):
+        # Only the first timeout of a generation replaces the pool
+        if generation != self._generation or self._pool is None:
+            return
+        self._generation += 1
+        old, self._pool = self._pool, self._new_pool()
+        self._kill_pool(old)
+        metrics.inc("pdf_render_pool_recycled")
+        logger.warning("♻️ PDF render pool recycled after a timed-out job")
+
+    async def submit(self, html_content: str, pdf_path: Union[str, Path]) -> RenderJob:
+        """Queue a render and return its handle once it holds a queue slot"""
+        self.start()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            metrics.inc("pdf_render_rejected")
+            raise RenderQueueFull("PDF render queue is full")
+
+        job = RenderJob(str(pdf_path))
+        self._pending += 1
+        metrics.set_gauge("pdf_render_pending", self._pending)
+        job.task = asyncio.create_task(self._run(job, html_content))
+        return job
+
+    async def render(self, html_content: str, pdf_path: Union[str, Path]) -> str:
+        job = await self.submit(html_content, pdf_path)
+        return await job.result()
+
+    async def _run(self, job: RenderJob, html_content: str) -> str:
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._running:
+                metrics.observe("pdf_render_queue_seconds", time.monotonic() - job.submitted_at)
+                for attempt in (1, 2):
+                    job.status = "rendering"
+                    generation = self._generation
+                    started = time.monotonic()
+                    future = loop.run_in_executor(self._pool, self.render_fn, html_content, job.pdf_path)
+                    try:
+                        path = await asyncio.wait_for(future, timeout=self.timeout)
+                    except asyncio.TimeoutError:
+                        job.status, job.error = "timeout", f"render exceeded {self.timeout:.0f}s"
+                        metrics.inc("pdf_render_timeouts")
+                        self._recycle(generation)
+                        raise RenderTimeout(job.error)
+                    except BrokenProcessPool:
+                        # Pool torn down under us (another job's timeout); retry once on the new one
+                        if attempt == 2:
+                            raise
+                        continue
+                    metrics.observe("pdf_render_seconds", time.monotonic() - started)
+                    job.status = "done"
+                    return path
+        except RenderError:
+            raise
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+            metrics.inc("pdf_render_failed")
+            logger.error(f"❌ PDF render failed ({job.pdf_path}): {e}")
+            raise RenderError(str(e)) from e
+        finally:
+            self._pending -= 1
+            metrics.set_gauge("pdf_render_pending", self._pending)
+            self._slots.release()
+
+
+# Singleton instance
+_pdf_renderer = None
+
+
+def get_pdf_renderer() -> PDFRenderer:
+    """Get or create the PDF renderer singleton"""
+    global _pdf_renderer
+    if _pdf_renderer is None:
+        _pdf_renderer = PDFRenderer()
+    return _pdf_renderer
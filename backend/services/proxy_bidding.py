@@ -0,0 +1,205 @@
+"""
+BidVex Proxy Bidding
+Executes Auto-Bid max bids (db.auto_bids) on single listings:
+- Runs once after a bid lands (or a max bid is set): one indexed query loads
+  every active max bid that can still compete
+- The contest is resolved in memory, eBay-style: the highest max wins and
+  pays the runner-up's max plus one increment (capped at its own max); ties
+  go to the earlier max bid
+- The resulting bid sequence is written with one insert_many, after one
+  compare-and-set listing update; a lost race leaves the listing untouched
+  and the newer bid's own run resolves the contest
+- Max bids whose owner no longer passes the bidder gate are ignored, and a
+  contest that lands inside the anti-snipe window extends the end like a
+  manual bid does (callers reschedule the close timer from `new_end`)
+- Callers broadcast the final state once instead of one update per step
+
+Usage:
+    engine = get_proxy_bidding(db)
+    outcome = await engine.run(listing_id, increment_for=lambda listing, price: 5,
+                               anti_snipe_window=120)
+    if outcome:
+        outcome["leader_id"], outcome["price"], outcome["bids"], outcome["new_end"]
+"""
+
+import os
+import uuid
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.bid_engine import LISTING_FIELDS, _end_guard, _parse_end, _same_type, eligible_bidders
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Max bids loaded per run; only the top two decide the price
+PROXY_MAX_COMPETITORS = int(os.environ.get("PROXY_MAX_COMPETITORS", "50"))
+
+metrics = get_metrics()
+
+
+@dataclass
+class ProxyResolution:
+    leader_id: str
+    price: float
+    # (bidder_id, amount, max_bid) in the order the bids are recorded
+    bids: List[Tuple[str, float, float]] = field(default_factory=list)
+
+
+def _priority(proxy: Dict[str, Any]):
+    """Highest max first, then the earliest max bid"""
+    created = _parse_end(proxy.get("created_at")) or datetime.max.replace(tzinfo=timezone.utc)
+    return (-proxy["max_bid"], created)
+
+
+def resolve_proxy_bids(
+    current_price: float,
+    leader_id: Optional[str],
+    proxies: List[Dict[str, Any]],
+    increment: Callable[[float], float],
+) -> Optional[ProxyResolution]:
+    """
+    Resolve the standing bid against every active max bid.
+
+    proxies are auto_bids documents ({user_id, max_bid, created_at}). Returns
+    None when no max bid can beat the current price by a full increment.
+    """
+    min_next = round(current_price + increment(current_price), 2)
+    leader_proxy = next((p for p in proxies if p["user_id"] == leader_id), None)
+    challengers = sorted(
+        (p for p in proxies if p["user_id"] != leader_id and p["max_bid"] >= min_next),
+        key=_priority,
+    )
+    if not challengers:
+        return None
+
+    top = challengers[0]
+    if leader_proxy and _priority(leader_proxy) < _priority(top):
+        # The leader's own max bid holds: raise it just enough to stay ahead
+        price = min(leader_proxy["max_bid"], round(top["max_bid"] + increment(top["max_bid"]), 2))
+        losing = [(p["user_id"], p["max_bid"], p["max_bid"]) for p in challengers]
+        winner = (leader_id, price, leader_proxy["max_bid"])
+    else:
+        runner_up = current_price
+        if leader_proxy:
+            runner_up = max(runner_up, leader_proxy["max_bid"])
+        if len(challengers) > 1:
+            runner_up = max(runner_up, challengers[1]["max_bid"])
+        price = min(top["max_bid"], round(runner_up + increment(runner_up), 2))
+        losing = [(p["user_id"], p["max_bid"], p["max_bid"]) for p in challengers[1:]]
+        if leader_proxy and leader_proxy["max_bid"] > current_price:
+            losing.append((leader_id, leader_proxy["max_bid"], leader_proxy["max_bid"]))
+        winner = (top["user_id"], price, top["max_bid"])
+
+    losing.sort(key=lambda bid: bid[1])
+    return ProxyResolution(leader_id=winner[0], price=winner[1], bids=[*losing, winner])
+
+
+class ProxyBiddingEngine:
+    def __init__(self, db, max_competitors: int = PROXY_MAX_COMPETITORS):
+        self.db = db
+        self.max_competitors = max_competitors
+        self.stats = {"resolved": 0, "conflicts": 0}
+
+    async def run(
+        self,
+        listing_id: str,
+        increment_for: Callable[[Dict[str, Any], float], float],
+        anti_snipe_window: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolve max bids on a listing and commit the outcome.
+
+        Returns None when nothing changed, otherwise the new leader, price,
+        bid documents written, the previous leader/price and extension details.
+        """
+        listing = await self.db.listings.find_one({"id": listing_id}, LISTING_FIELDS)
+        if not listing or listing.get("status") != "active":
+            return None
+        stored_end = listing.get("auction_end_date")
+        end = _parse_end(stored_end)
+        if end and end <= datetime.now(timezone.utc):
+            return None
+
+        current_price = listing.get("current_price") or 0
+        leader_id = listing.get("highest_bidder_id")
+        proxies = await self.db.auto_bids.find(
+            {"listing_id": listing_id, "is_active": True, "max_bid": {"$gte": current_price}},
+            {"_id": 0, "id": 1, "user_id": 1, "max_bid": 1, "created_at": 1}
+        ).sort("max_bid", -1).limit(self.max_competitors).to_list(self.max_competitors)
+        proxies = [p for p in proxies if p["user_id"] != listing.get("seller_id")]
+        # Owners who lost phone verification or their payment method no longer bid
+        allowed = await eligible_bidders(self.db, (p["user_id"] for p in proxies))
+        proxies = [p for p in proxies if p["user_id"] in allowed]
+
+        resolution = resolve_proxy_bids(current_price, leader_id, proxies, lambda price: increment_for(listing, price))
+        if resolution is None:
+            return None
+
+        now = datetime.now(timezone.utc)
+        bids = [
+            {
+                "id": str(uuid.uuid4()),
+                "listing_id": listing_id,
+                "bidder_id": bidder_id,
+                "amount": amount,
+                "bid_type": "auto",
+                "auto_bid_max": max_bid,
+                # Microsecond steps keep the sequence ordered in bid history
+                "created_at": (now + timedelta(microseconds=i)).isoformat(),
+            }
+            for i, (bidder_id, amount, max_bid) in enumerate(resolution.bids)
+        ]
+
+        new_end = None
+        if anti_snipe_window and end and (end - now).total_seconds() <= anti_snipe_window:
+            new_end = now + timedelta(seconds=anti_snipe_window)
+
+        cas_filter = {"id": listing_id, "status": "active", "current_price": current_price, "highest_bidder_id": leader_id}
+        end_guard = _end_guard(stored_end, now)
+        if end_guard:
+            cas_filter["auction_end_date"] = end_guard
+        update = {
+            "$set": {"current_price": resolution.price, "highest_bidder_id": resolution.leader_id},
+            "$inc": {"bid_count": len(bids)},
+        }
+        if new_end:
+            update["$set"]["auction_end_date"] = _same_type(stored_end, new_end)
+            update["$inc"]["extension_count"] = 1
+
+        result = await self.db.listings.update_one(cas_filter, update)
+        if result.modified_count != 1:
+            # A newer bid landed; its own run resolves the contest
+            self.stats["conflicts"] += 1
+            metrics.inc("proxy_bid_conflicts")
+            return None
+
+        await self.db.bids.insert_many([dict(bid) for bid in bids])
+        self.stats["resolved"] += 1
+        metrics.inc("proxy_bids_placed", len(bids))
+        logger.info(f"🤖 Proxy bids on {listing_id}: {len(bids)} bids, {resolution.leader_id} leads at ${resolution.price:.2f}")
+
+        return {
+            "leader_id": resolution.leader_id,
+            "price": resolution.price,
+            "bids": bids,
+            "bid_count": listing.get("bid_count", 0) + len(bids),
+            "previous_leader_id": leader_id,
+            "previous_price": current_price,
+            "extension_applied": new_end is not None,
+            "new_end": new_end,
+        }
+
+
+# Singleton instance
+_proxy_bidding = None
+
+
+def get_proxy_bidding(db) -> ProxyBiddingEngine:
+    """Get or create the proxy bidding singleton"""
+    global _proxy_bidding
+    if _proxy_bidding is None:
+        _proxy_bidding = ProxyBiddingEngine(db)
+    return _proxy_bidding
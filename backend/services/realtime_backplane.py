@@ -0,0 +1,217 @@
+"""
+BidVex Realtime Backplane
+Pub/sub layer behind the WebSocket connection managers so fan-out works
+across uvicorn workers and hosts:
+- InProcessBackplane: single worker, delivers locally (default)
+- RedisBackplane: Redis pub/sub, one channel per topic
+- MongoChangeStreamBackplane: inserts into `realtime_events` and tails a
+  change stream (requires a replica set; no extra infrastructure)
+
+Every publish is delivered to the local handler immediately and forwarded to
+the other workers, which skip their own events by worker id.
+
+Usage:
+    backplane = get_backplane(db)          # REALTIME_BACKPLANE=memory|redis|mongo
+    backplane.register("bid_update", manager.deliver_bid_update)
+    await backplane.start()
+    await backplane.publish("bid_update", {"listing_id": "...", ...})
+"""
+
+import os
+import json
+import uuid
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Callable, Awaitable
+from datetime import datetime, timezone
+
+from services.fast_response import dumps
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Unique per process - lets a worker recognise (and skip) its own events
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+REDIS_CHANNEL_PREFIX = "bidvex:realtime:"
+EVENT_TTL_SECONDS = 60
+
+
+class Backplane:
+    """Base backplane: topic handler registry plus local delivery"""
+
+    name = "base"
+
+    def __init__(self):
+        self.handlers: Dict[str, Handler] = {}
+        self.stats = {"published": 0, "delivered_local": 0, "delivered_remote": 0, "errors": 0}
+
+    def register(self, topic: str, handler: Handler):
+        """Register the local delivery coroutine for a topic"""
+        self.handlers[topic] = handler
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, topic: str, payload: Dict[str, Any]):
+        """Deliver to this worker's sockets and forward to every other worker"""
+        self.stats["published"] += 1
+        await self._deliver(topic, payload, remote=False)
+        try:
+            await self._forward(topic, payload)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"❌ Backplane {self.name} failed to forward {topic}: {e}")
+
+    async def _forward(self, topic: str, payload: Dict[str, Any]):
+        """Send the event to other workers (no-op for a single process)"""
+        pass
+
+    async def _deliver(self, topic: str, payload: Dict[str, Any], remote: bool):
+        handler = self.handlers.get(topic)
+        if not handler:
+            return
+        try:
+            await handler(payload)
+            self.stats["delivered_remote" if remote else "delivered_local"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"❌ Backplane delivery failed for {topic}: {e}")
+
+    async def _receive(self, envelope: Dict[str, Any]):
+        """Deliver an event that arrived from the shared transport"""
+        if envelope.get("origin") == WORKER_ID:
+            return  # Already delivered locally at publish time
+        await self._deliver(envelope["topic"], envelope["payload"], remote=True)
+
+    @staticmethod
+    def _envelope(topic: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {"origin": WORKER_ID, "topic": topic, "payload": payload}
+
+
+class InProcessBackplane(Backplane):
+    """Single-worker deployment: local delivery only"""
+
+    name = "memory"
+
+
+class RedisBackplane(Backplane):
+    """Redis pub/sub transport (pattern subscription on every topic channel)"""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+        self._redis = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self):
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.error("❌ redis package not installed - RedisBackplane cannot start")
+            raise
+
+        self._redis = aioredis.from_url(self.url)
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.psubscribe(f"{REDIS_CHANNEL_PREFIX}*")
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"✅ Redis realtime backplane started (worker {WORKER_ID})")
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+        if self._pubsub:
+            await self._pubsub.close()
+        if self._redis:
+            await self._redis.close()
+
+    async def _forward(self, topic: str, payload: Dict[str, Any]):
+        await self._redis.publish(f"{REDIS_CHANNEL_PREFIX}{topic}", dumps(self._envelope(topic, payload)))
+
+    async def _listen(self):
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    await self._receive(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"❌ Redis backplane listener error, resubscribing: {e}")
+                await asyncio.sleep(1)
+
+
+class MongoChangeStreamBackplane(Backplane):
+    """
+    MongoDB transport: events are inserted into `realtime_events` (TTL-expired)
+    and every worker tails the collection's change stream.
+    """
+
+    name = "mongo"
+
+    def __init__(self, db):
+        super().__init__()
+        self.db = db
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self):
+        await self.db.realtime_events.create_index(
+            "created_at", name="realtime_events_ttl", expireAfterSeconds=EVENT_TTL_SECONDS
+        )
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"✅ MongoDB change-stream realtime backplane started (worker {WORKER_ID})")
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+
+    async def _forward(self, topic: str, payload: Dict[str, Any]):
+        event = self._envelope(topic, payload)
+        event["created_at"] = datetime.now(timezone.utc)
+        await self.db.realtime_events.insert_one(event)
+
+    async def _listen(self):
+        pipeline = [{"$match": {"operationType": "insert"}}]
+        resume_token = None
+        while True:
+            try:
+                async with self.db.realtime_events.watch(pipeline, resume_after=resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        await self._receive(change["fullDocument"])
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"❌ Change-stream backplane error, reopening: {e}")
+                await asyncio.sleep(1)
+
+
+# Singleton instance
+_backplane = None
+
+
+def create_backplane(kind: str, db=None, redis_url: Optional[str] = None) -> Backplane:
+    """Build a backplane by name: memory, redis or mongo"""
+    if kind == "redis":
+        return RedisBackplane(redis_url or os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+    if kind == "mongo":
+        return MongoChangeStreamBackplane(db)
+    return InProcessBackplane()
+
+
+def get_backplane(db=None) -> Backplane:
+    """Get or create the backplane singleton configured by REALTIME_BACKPLANE"""
+    global _backplane
+    if _backplane is None:
+        _backplane = create_backplane(os.environ.get("REALTIME_BACKPLANE", "memory"), db=db)
+    return _backplane
@@ -0,0 +1,302 @@
+"""
+BidVex Search Index
+Embedded inverted index for listing, auction and lot search, replacing the
+unanchored case-insensitive $regex scans over title/description:
+- One tokenizer for English and French: accents folded (é -> e), elisions
+  split (l'armoire -> armoire), stopwords dropped, plurals reduced
+- `search_index` holds one entry per listing / multi-item auction with its
+  terms (auctions include every lot title and description) on a multikey
+  index; marketplace items embed their own lot's terms
+- Entries carry the source's status and basic filter fields (FILTER_FIELDS),
+  so status / category / location filters run inside the search pipeline
+  and never compete with sold or ended titles for candidate slots
+- Relevance: every query term must match; title hits outrank description
+  and lot hits, newer sources break ties. Only relevance-ranked searches are
+  capped at SEARCH_MAX_CANDIDATES; other sorts get every match
+- Autocomplete: edge prefixes of title words, so "chai" suggests "Chaise";
+  only live (active / upcoming) titles are suggested
+- Entries are written on create/update, their status follows the source's
+  status transitions and they are dropped on delete; a periodic rebuild
+  backfills older documents and removes stale entries
+
+Usage:
+    ids = await search_ids(db, "listing", "chaise en bois", {"status": "active"})   # None if no usable terms
+    query["id"] = {"$in": ids}
+    suggestions = await suggest(db, "chai")
+"""
+
+import os
+import re
+import logging
+import unicodedata
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Ranked source ids a relevance search may return; queries are "best N matches"
+SEARCH_MAX_CANDIDATES = int(os.environ.get("SEARCH_MAX_CANDIDATES", "1000"))
+# Source fields copied onto the entry so list filters apply before the cap
+FILTER_FIELDS = {
+    "listing": ("status", "category", "city", "region", "condition"),
+    "auction": ("status", "category", "region", "currency"),
+}
+# Statuses whose titles autocomplete offers
+SUGGEST_STATUSES = ("active", "upcoming")
+# Autocomplete indexes title word prefixes between these lengths
+PREFIX_MIN_LENGTH = 2
+PREFIX_MAX_LENGTH = int(os.environ.get("SEARCH_PREFIX_MAX_LENGTH", "12"))
+# A title hit counts this many times more than a description / lot hit
+TITLE_WEIGHT = 3
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from in is it of on or the this to with
+au aux avec ce ces dans de des du en et la le les leur ou par pour qui sur un une
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+metrics = get_metrics()
+
+
+def fold(text: Optional[str]) -> str:
+    """Lowercase and strip accents so "Élégant" and "elegant" index alike"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _words(text: Optional[str]) -> List[str]:
+    # Apostrophes are separators, which splits French elisions (l', d', qu')
+    return [w for w in _WORD.findall(fold(text)) if (len(w) > 1 or w.isdigit()) and w not in STOPWORDS]
+
+
+def stem(word: str) -> str:
+    """Reduce English/French plurals; applied identically to documents and queries"""
+    if word.isdigit() or len(word) <= 3:
+        return word
+    if word.endswith("aux") and len(word) > 4:
+        return word[:-3] + "al"     # chevaux -> cheval, journaux -> journal
+    if word.endswith(("s", "x")) and not word.endswith("ss"):
+        return word[:-1]            # chairs -> chair, chaises -> chaise, bijoux -> bijou
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [stem(w) for w in _words(text)]
+
+
+def query_terms(search: Optional[str]) -> List[str]:
+    """Distinct terms of a search string, in order"""
+    return list(dict.fromkeys(tokenize(search)))
+
+
+def _prefixes(words: Iterable[str]) -> List[str]:
+    prefixes = set()
+    for word in words:
+        for n in range(PREFIX_MIN_LENGTH, min(len(word), PREFIX_MAX_LENGTH) + 1):
+            prefixes.add(word[:n])
+    return sorted(prefixes)
+
+
+def search_fields(titles: Iterable[Optional[str]], texts: Iterable[Optional[str]]) -> Dict[str, List[str]]:
+    """
+    Index fields for a document.
+
+    titles: the document's own title(s); texts: descriptions, lot titles and
+    lot descriptions. Returns terms (everything), title_terms and prefixes.
+    """
+    titles = list(titles)
+    title_terms = {t for title in titles for t in tokenize(title)}
+    terms = set(title_terms)
+    for text in texts:
+        terms.update(tokenize(text))
+    return {
+        "terms": sorted(terms),
+        "title_terms": sorted(title_terms),
+        "prefixes": _prefixes(w for title in titles for w in _words(title)),
+    }
+
+
+def _filter_values(kind: str, source: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: source.get(field) for field in FILTER_FIELDS[kind]}
+
+
+def listing_entry(listing: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": listing["id"],
+        "kind": "listing",
+        "title": listing.get("title"),
+        "created_at": listing.get("created_at"),
+        **_filter_values("listing", listing),
+        **search_fields([listing.get("title")], [listing.get("description")]),
+    }
+
+
+def auction_entry(auction: Dict[str, Any]) -> Dict[str, Any]:
+    texts = [auction.get("description")]
+    for lot in auction.get("lots") or []:
+        texts += [lot.get("title"), lot.get("description")]
+    return {
+        "id": auction["id"],
+        "kind": "auction",
+        "title": auction.get("title"),
+        "created_at": auction.get("created_at"),
+        **_filter_values("auction", auction),
+        **search_fields([auction.get("title")], texts),
+    }
+
+
+def marketplace_fields(title: Optional[str], description: Optional[str], parent_title: Optional[str] = None) -> Dict[str, List[str]]:
+    """Embedded fields for a marketplace_items document (one lot or listing)"""
+    fields = search_fields([title], [description, parent_title])
+    return {"search_terms": fields["terms"]}
+
+
+def match_filter(terms: List[str], field: str = "terms") -> Dict[str, Any]:
+    """Every term must be present; the first one drives the multikey index"""
+    return {field: {"$all": terms}}
+
+
+# ========== WRITE PATH ==========
+# Best-effort like the marketplace sync: failures are logged and healed by
+# the periodic rebuild, they never fail the user-facing write.
+
+async def _upsert(db, entry: Dict[str, Any]) -> None:
+    try:
+        entry["indexed_at"] = datetime.now(timezone.utc)
+        await db.search_index.replace_one({"id": entry["id"]}, entry, upsert=True)
+    except Exception as e:
+        logger.error(f"❌ Search index update failed for {entry['id']}: {e}")
+
+
+async def index_listing(db, listing: Dict[str, Any]) -> None:
+    """(Re)index a single listing from the document just written"""
+    await _upsert(db, listing_entry(listing))
+
+
+async def index_auction(db, auction: Dict[str, Any]) -> None:
+    """(Re)index a multi-item auction and all of its lots"""
+    await _upsert(db, auction_entry(auction))
+
+
+async def set_status(db, source_ids: List[str], status: Optional[str]) -> None:
+    """Follow a source status transition; a no-op when the entry already has it"""
+    if not source_ids:
+        return
+    try:
+        await db.search_index.update_many(
+            {"id": {"$in": list(source_ids)}, "status": {"$ne": status}},
+            {"$set": {"status": status}}
+        )
+    except Exception as e:
+        logger.error(f"❌ Search index status update failed for {len(source_ids)} source(s): {e}")
+
+
+async def remove(db, source_id: str) -> None:
+    try:
+        await db.search_index.delete_one({"id": source_id})
+    except Exception as e:
+        logger.error(f"❌ Search index removal failed for {source_id}: {e}")
+
+
+async def rebuild_search_index(db) -> Dict[str, int]:
+    """Index every listing and auction, then drop entries whose source is gone"""
+    run_started = datetime.now(timezone.utc)
+    indexed = 0
+    operations = []
+
+    async def flush(operations):
+        if operations:
+            await db.search_index.bulk_write(operations, ordered=False)
+        return []
+
+    base = {"_id": 0, "id": 1, "title": 1, "description": 1, "created_at": 1}
+    sources = [
+        (db.listings, {**base, **{f: 1 for f in FILTER_FIELDS["listing"]}}, listing_entry),
+        (db.multi_item_listings, {**base, **{f: 1 for f in FILTER_FIELDS["auction"]},
+                                  "lots.title": 1, "lots.description": 1}, auction_entry),
+    ]
+    for collection, projection, build in sources:
+        async for doc in collection.find({}, projection):
+            entry = build(doc)
+            entry["indexed_at"] = run_started
+            operations.append(UpdateOne({"id": entry["id"]}, {"$set": entry}, upsert=True))
+            indexed += 1
+            if len(operations) >= 500:
+                operations = await flush(operations)
+    await flush(operations)
+
+    removed = await db.search_index.delete_many({"indexed_at": {"$lt": run_started}})
+    logger.info(f"🔎 Search index rebuilt: {indexed} source(s), {removed.deleted_count} stale removed")
+    return {"indexed": indexed, "removed": removed.deleted_count}
+
+
+# ========== READ PATH ==========
+
+async def search_ids(db, kind: str, search: Optional[str], filters: Optional[Dict[str, Any]] = None,
+                     ranked: bool = True) -> Optional[List[str]]:
+    """
+    Ids of `kind` ("listing" or "auction") matching every term of `search`
+    and `filters` (conditions on FILTER_FIELDS, e.g. {"status": "active"}).
+    ranked: best match first, capped at SEARCH_MAX_CANDIDATES; otherwise
+    every match, unordered, for callers that sort on a source field.
+    None when the search has no indexable terms (only stopwords or
+    punctuation), so callers can skip the filter.
+    """
+    terms = query_terms(search)
+    if not terms:
+        return None
+    unknown = set(filters or {}) - set(FILTER_FIELDS[kind])
+    if unknown:
+        raise ValueError(f"Not an indexed {kind} filter: {', '.join(sorted(unknown))}")
+    metrics.inc("search_queries")
+    match = {"kind": kind, **match_filter(terms), **(filters or {})}
+    if not ranked:
+        return [doc["id"] async for doc in db.search_index.find(match, {"_id": 0, "id": 1})]
+    pipeline = [
+        {"$match": match},
+        {"$project": {"_id": 0, "id": 1, "created_at": 1, "score": {
+            "$multiply": [TITLE_WEIGHT, {"$size": {"$setIntersection": ["$title_terms", terms]}}]
+        }}},
+        {"$sort": {"score": -1, "created_at": -1, "id": -1}},
+        {"$limit": SEARCH_MAX_CANDIDATES},
+    ]
+    return [doc["id"] async for doc in db.search_index.aggregate(pipeline)]
+
+
+async def ranked_page(collection, query: Dict[str, Any], ranked_ids: List[str], skip: int, limit: int,
+                      projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    One page of `collection` in relevance order. `query` already restricts
+    id to ranked_ids; only ids are read until the page is known.
+    """
+    visible = {doc["id"] async for doc in collection.find(query, {"_id": 0, "id": 1})}
+    page_ids = [i for i in ranked_ids if i in visible][max(skip, 0):max(skip, 0) + limit]
+    if not page_ids:
+        return []
+    docs = await collection.find({"id": {"$in": page_ids}}, projection or {"_id": 0}).to_list(len(page_ids))
+    position = {item_id: n for n, item_id in enumerate(page_ids)}
+    return sorted(docs, key=lambda doc: position[doc["id"]])
+
+
+async def suggest(db, text: Optional[str], limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Autocomplete: live titles whose words start with the last word typed and
+    that contain the earlier words. Newest first.
+    """
+    words = _words(text)
+    if not words or len(words[-1]) < PREFIX_MIN_LENGTH:
+        return []
+    query: Dict[str, Any] = {"prefixes": words[-1][:PREFIX_MAX_LENGTH], "status": {"$in": list(SUGGEST_STATUSES)}}
+    complete = [stem(w) for w in words[:-1]]
+    if complete:
+        query.update(match_filter(complete))
+    return await db.search_index.find(
+        query, {"_id": 0, "id": 1, "kind": 1, "title": 1}
+    ).sort("created_at", -1).limit(limit).to_list(limit)
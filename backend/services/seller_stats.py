@@ -0,0 +1,412 @@
+"""
+BidVex Seller Stats
+Per-user running aggregates behind ratings, seller trust scores and the admin
+trust & safety scores, so those endpoints read one document instead of
+re-scanning ratings, handshakes and listings on every request:
+- `seller_stats` holds sums and counts per metric: ratings (with the star
+  breakdown and the optional per-metric ratings), pickup-speed scores,
+  sold / cancelled listings, paid transactions and reports against the user
+- Write paths $inc it as they happen: record_rating, record_pickup,
+  set_listing_status and record_payment (the last two are guarded so a
+  repeated transition or webhook is only counted once)
+- rebuild_seller_stats() recomputes every document from the source
+  collections: run once to backfill, then nightly to heal missed updates.
+  Every $inc bumps the document's `version`; the rebuild only overwrites a
+  document whose version is unchanged since before it read the sources
+
+Usage:
+    await record_rating(db, rating_dict)
+    stats = await get_stats(db, seller_id)
+    seller_trust(stats)["overall_score"], rating_summary(stats)["average_rating"]
+    python -m services.seller_stats [--batch-size 500]
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from services.bson_dates import to_datetime
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Optional per-metric scores a rating may carry (rating["metrics"])
+RATING_METRICS = ("pickup_speed", "item_accuracy", "communication")
+# Listing statuses counted for the completion rate
+COUNTED_STATUSES = ("sold", "cancelled")
+TRUSTED_SELLER_SCORE = 4.5
+# Passes over users whose counters moved while a rebuild was computing
+REBUILD_ATTEMPTS = 3
+
+DUPLICATE_KEY = 11000
+
+metrics = get_metrics()
+
+
+def empty_stats(user_id: str) -> Dict[str, Any]:
+    return {
+        "id": user_id,
+        "ratings": {"count": 0, "sum": 0, "stars": {str(star): 0 for star in range(1, 6)}},
+        "rating_metrics": {name: {"count": 0, "sum": 0} for name in RATING_METRICS},
+        "pickups": {"count": 0, "scored": 0, "score_sum": 0},
+        "listings": {status: 0 for status in COUNTED_STATUSES},
+        "paid_transactions": 0,
+        "reports_against": 0,
+    }
+
+
+def _merge(base: Dict[str, Any], stored: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in stored.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def pickup_score(marked_picked_up_at, auction_end_date) -> Optional[int]:
+    """5 within 3 days of the auction end, 4 within a week, 3 within two, else 2; None if undated"""
+    picked_up, ended = to_datetime(marked_picked_up_at), to_datetime(auction_end_date)
+    if picked_up is None or ended is None:
+        return None
+    days = (picked_up - ended).days
+    if days <= 3:
+        return 5
+    if days <= 7:
+        return 4
+    if days <= 14:
+        return 3
+    return 2
+
+
+def rating_increments(rating: Dict[str, Any]) -> Dict[str, int]:
+    """$inc for one rating document"""
+    inc = {"ratings.count": 1, "ratings.sum": rating["rating"], f"ratings.stars.{rating['rating']}": 1}
+    for name in RATING_METRICS:
+        value = (rating.get("metrics") or {}).get(name)
+        if value:
+            inc[f"rating_metrics.{name}.count"] = 1
+            inc[f"rating_metrics.{name}.sum"] = value
+    return inc
+
+
+async def _inc(db, user_id: Optional[str], inc: Dict[str, int]):
+    if not user_id or not inc:
+        return
+    await db.seller_stats.update_one(
+        {"id": user_id},
+        {"$inc": {**inc, "version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+    metrics.inc("seller_stats_updates")
+
+
+# ========== WRITE PATHS ==========
+
+async def record_rating(db, rating: Dict[str, Any]):
+    await _inc(db, rating.get("target_user_id"), rating_increments(rating))
+
+
+async def record_pickup(db, handshake: Dict[str, Any]):
+    """Call once when a handshake is marked picked_up"""
+    score = pickup_score(handshake.get("marked_picked_up_at"), handshake.get("auction_end_date"))
+    inc = {"pickups.count": 1}
+    if score is not None:
+        inc["pickups.score_sum"] = score
+        inc["pickups.scored"] = 1
+    await _inc(db, handshake.get("seller_id"), inc)
+
+
+async def set_listing_status(db, listing_id: str, status: str) -> Optional[Dict[str, Any]]:
+    """
+    Move a single-item listing to `status` and adjust the seller's counters.
+    Returns the listing as it was, or None if it was already in that status.
+    """
+    before = await db.listings.find_one_and_update(
+        {"id": listing_id, "status": {"$ne": status}},
+        {"$set": {"status": status}},
+        projection={"_id": 0, "seller_id": 1, "status": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        return None
+    inc = {}
+    if status in COUNTED_STATUSES:
+        inc[f"listings.{status}"] = 1
+    if before.get("status") in COUNTED_STATUSES:
+        inc[f"listings.{before['status']}"] = -1
+    await _inc(db, before.get("seller_id"), inc)
+    return before
+
+
+async def record_payment(db, session_id: str) -> Optional[Dict[str, Any]]:
+    """Mark a checkout transaction paid; returns it, or None if it was already paid"""
+    transaction = await db.payment_transactions.find_one_and_update(
+        {"session_id": session_id, "payment_status": {"$ne": "paid"}},
+        {"$set": {"payment_status": "paid"}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if transaction is not None:
+        await _inc(db, transaction.get("user_id"), {"paid_transactions": 1})
+    return transaction
+
+
+# ========== READS ==========
+
+async def get_stats(db, user_id: str) -> Dict[str, Any]:
+    stored = await db.seller_stats.find_one({"id": user_id}, {"_id": 0})
+    return _merge(empty_stats(user_id), stored or {})
+
+
+async def get_many(db, user_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    ids = list(user_ids)
+    found = {doc["id"]: doc async for doc in db.seller_stats.find({"id": {"$in": ids}}, {"_id": 0})}
+    return {user_id: _merge(empty_stats(user_id), found.get(user_id, {})) for user_id in ids}
+
+
+def _average(total, count) -> float:
+    return total / count if count else 0
+
+
+def rating_summary(stats: Dict[str, Any]) -> Dict[str, Any]:
+    ratings = stats["ratings"]
+    return {
+        "average_rating": round(_average(ratings["sum"], ratings["count"]), 2),
+        "total_ratings": ratings["count"],
+        "ratings_breakdown": dict(ratings["stars"]),
+    }
+
+
+def seller_trust(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Trust score body: buyer ratings when there are any, else automated
+    pickup-speed scores. Rating-based metric scores win over automated ones.
+    """
+    ratings, pickups, rated = stats["ratings"], stats["pickups"], stats["rating_metrics"]
+    avg_pickup_speed = _average(pickups["score_sum"], pickups["scored"])
+    final_pickup_speed = (
+        _average(rated["pickup_speed"]["sum"], rated["pickup_speed"]["count"])
+        if rated["pickup_speed"]["count"]
+        else avg_pickup_speed
+    )
+
+    if ratings["count"]:
+        overall_score = round(ratings["sum"] / ratings["count"], 2)
+    elif pickups["count"]:
+        overall_score = round(avg_pickup_speed, 2)
+    else:
+        overall_score = 0
+
+    return {
+        "overall_score": overall_score,
+        "total_ratings": ratings["count"],
+        "total_transactions": pickups["count"],
+        "metrics": {
+            "pickup_speed": round(final_pickup_speed, 2),
+            "item_accuracy": round(_average(rated["item_accuracy"]["sum"], rated["item_accuracy"]["count"]), 2),
+            "communication": round(_average(rated["communication"]["sum"], rated["communication"]["count"]), 2),
+        },
+        "is_trusted": overall_score >= TRUSTED_SELLER_SCORE,
+        "badge": "BidVex Trusted Seller" if overall_score >= TRUSTED_SELLER_SCORE else None,
+    }
+
+
+def trust_score(user: Dict[str, Any], stats: Dict[str, Any], now: Optional[datetime] = None) -> int:
+    """Admin trust & safety score (0-100) from the user document and its stats"""
+    score = 50  # Base score
+
+    # Account age bonus (max +15)
+    created_at = to_datetime(user.get("created_at"))
+    if created_at:
+        score += min(15, ((now or datetime.now(timezone.utc)) - created_at).days // 10)
+
+    # Verification bonuses
+    if user.get("email_verified"):
+        score += 10
+    if user.get("phone_verified"):
+        score += 10
+
+    # Transaction history bonus (max +20)
+    score += min(20, stats["paid_transactions"] * 2)
+
+    # Report penalties
+    score -= stats["reports_against"] * 5
+
+    # Completion rate bonus
+    completed, cancelled = stats["listings"]["sold"], stats["listings"]["cancelled"]
+    if completed + cancelled > 0:
+        score += int(completed / (completed + cancelled) * 10)
+
+    return max(0, min(100, score))
+
+
+# ========== BACKFILL ==========
+
+def _rating_group() -> Dict[str, Any]:
+    group: Dict[str, Any] = {"_id": "$target_user_id", "count": {"$sum": 1}, "sum": {"$sum": "$rating"}}
+    for star in range(1, 6):
+        group[f"star_{star}"] = {"$sum": {"$cond": [{"$eq": ["$rating", star]}, 1, 0]}}
+    for name in RATING_METRICS:
+        present = {"$gt": [f"$metrics.{name}", 0]}
+        group[f"{name}_count"] = {"$sum": {"$cond": [present, 1, 0]}}
+        group[f"{name}_sum"] = {"$sum": {"$cond": [present, f"$metrics.{name}", 0]}}
+    return group
+
+
+async def compute_all(db) -> Dict[str, Dict[str, Any]]:
+    """Every user's stats, recomputed from ratings, handshakes, listings, payments and reports"""
+    stats: Dict[str, Dict[str, Any]] = {}
+
+    def of(user_id):
+        if user_id not in stats:
+            stats[user_id] = empty_stats(user_id)
+        return stats[user_id]
+
+    async for row in db.ratings.aggregate([{"$group": _rating_group()}]):
+        if not row["_id"]:
+            continue
+        doc = of(row["_id"])
+        doc["ratings"] = {
+            "count": row["count"], "sum": row["sum"],
+            "stars": {str(star): row[f"star_{star}"] for star in range(1, 6)},
+        }
+        for name in RATING_METRICS:
+            doc["rating_metrics"][name] = {"count": row[f"{name}_count"], "sum": row[f"{name}_sum"]}
+
+    projection = {"_id": 0, "seller_id": 1, "marked_picked_up_at": 1, "auction_end_date": 1}
+    async for handshake in db.handshakes.find({"status": "picked_up"}, projection):
+        if not handshake.get("seller_id"):
+            continue
+        pickups = of(handshake["seller_id"])["pickups"]
+        pickups["count"] += 1
+        score = pickup_score(handshake.get("marked_picked_up_at"), handshake.get("auction_end_date"))
+        if score is not None:
+            pickups["score_sum"] += score
+            pickups["scored"] += 1
+
+    pipeline = [
+        {"$match": {"status": {"$in": list(COUNTED_STATUSES)}}},
+        {"$group": {"_id": {"seller_id": "$seller_id", "status": "$status"}, "count": {"$sum": 1}}},
+    ]
+    async for row in db.listings.aggregate(pipeline):
+        if row["_id"].get("seller_id"):
+            of(row["_id"]["seller_id"])["listings"][row["_id"]["status"]] = row["count"]
+
+    pipeline = [{"$match": {"payment_status": "paid"}}, {"$group": {"_id": "$user_id", "count": {"$sum": 1}}}]
+    async for row in db.payment_transactions.aggregate(pipeline):
+        if row["_id"]:
+            of(row["_id"])["paid_transactions"] = row["count"]
+
+    async for row in db.reports.aggregate([{"$group": {"_id": "$reported_user_id", "count": {"$sum": 1}}}]):
+        if row["_id"]:
+            of(row["_id"])["reports_against"] = row["count"]
+
+    return stats
+
+
+def _version_guard(user_id: str, version: Optional[int]) -> Dict[str, Any]:
+    """Match the stats document only if no $inc has landed since `version` was read"""
+    return {"id": user_id, "version": version if version else {"$in": [None, 0]}}
+
+
+async def _versions(db, user_ids: Optional[Set[str]] = None) -> Dict[str, int]:
+    query = {"id": {"$in": list(user_ids)}} if user_ids is not None else {}
+    return {doc["id"]: doc.get("version") or 0 async for doc in db.seller_stats.find(query, {"_id": 0, "id": 1, "version": 1})}
+
+
+async def _write_guarded(db, user_ids: List[str], operations: List[UpdateOne]) -> Tuple[int, Set[str]]:
+    """
+    Guarded upserts: a failed guard turns into an insert that hits the unique
+    id index. Returns (documents created, users whose guard failed).
+    """
+    try:
+        return (await db.seller_stats.bulk_write(operations, ordered=False)).upserted_count, set()
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(err.get("code") != DUPLICATE_KEY for err in errors):
+            raise
+        return e.details.get("nUpserted", 0), {user_ids[err["index"]] for err in errors}
+
+
+async def rebuild_seller_stats(db, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Backfill / reconcile: overwrite every stats document with recomputed values
+    and drop documents for users that no longer have any activity.
+    Versions are read before the sources, so a user whose counters moved
+    mid-rebuild is recomputed on the next pass; after REBUILD_ATTEMPTS it keeps
+    its incremental values until the next run.
+    """
+    started = datetime.now(timezone.utc)
+    report = {"users": 0, "created": 0, "removed": 0, "conflicts": 0}
+    pending: Optional[Set[str]] = None
+
+    for _ in range(REBUILD_ATTEMPTS):
+        versions = await _versions(db, pending)
+        stats = await compute_all(db)
+        if pending is None:
+            report["users"] = len(stats)
+        targets = [user_id for user_id in stats if pending is None or user_id in pending]
+
+        conflicts: Set[str] = set()
+        for start in range(0, len(targets), batch_size):
+            batch = targets[start:start + batch_size]
+            operations = [
+                UpdateOne(
+                    _version_guard(user_id, versions.get(user_id)),
+                    {"$set": {**stats[user_id], "updated_at": started, "rebuilt_at": started}},
+                    upsert=True
+                )
+                for user_id in batch
+            ]
+            created, failed = await _write_guarded(db, batch, operations)
+            report["created"] += created
+            conflicts |= failed
+
+        gone = [DeleteOne(_version_guard(user_id, version)) for user_id, version in versions.items() if user_id not in stats]
+        if gone:
+            report["removed"] += (await db.seller_stats.bulk_write(gone, ordered=False)).deleted_count
+
+        pending = conflicts
+        if not pending:
+            break
+
+    report["conflicts"] = len(pending)
+    if pending:
+        logger.warning(f"⚠️ Seller stats for {len(pending)} user(s) kept changing during the rebuild - left as is")
+    logger.info(f"📊 Seller stats rebuilt: {report}")
+    return report
+
+
+async def _main(argv: List[str]) -> int:
+    import argparse
+    from dotenv import load_dotenv
+    from pathlib import Path
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from services.bson_dates import CLIENT_OPTIONS
+
+    parser = argparse.ArgumentParser(description="Rebuild seller_stats from ratings, handshakes, listings, payments and reports")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"), **CLIENT_OPTIONS)
+    db = client[os.environ.get("DB_NAME", "bidvex")]
+
+    try:
+        report = await rebuild_seller_stats(db, args.batch_size)
+        print(f"Rebuilt stats for {report['users']} user(s): {report['created']} new, {report['removed']} removed, "
+              f"{report['conflicts']} left unchanged")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
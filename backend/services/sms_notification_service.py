@@ -7,12 +7,21 @@ Handles Twilio-powered SMS notifications for:
 """
 
 import os
+import asyncio
 import logging
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# The Twilio SDK is blocking - its HTTP calls run here, never on the event loop
+_twilio_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("TWILIO_THREADS", "8")),
+    thread_name_prefix="twilio"
+)
+
 # SMS notification templates
 SMS_TEMPLATES = {
     "outbid": {
@@ -139,11 +148,10 @@ class SMSNotificationService:
             if len(message) > 1600:
                 message = message[:1597] + "..."
             
-            # Send via Twilio
-            sms = self.client.messages.create(
-                body=message,
-                from_=self.from_number,
-                to=to_phone
+            # Send via Twilio (blocking SDK call, off the event loop)
+            sms = await asyncio.get_running_loop().run_in_executor(
+                _twilio_pool,
+                partial(self.client.messages.create, body=message, from_=self.from_number, to=to_phone)
             )
             
             logger.info(f"✅ SMS sent: {notification_type} to {to_phone[:6]}*** (SID: {sms.sid})")
@@ -0,0 +1,185 @@
+"""
+BidVex WebSocket Outbound Queues
+One bounded outbound queue and writer task per WebSocket:
+- Fan-out only enqueues pre-encoded frames, it never awaits a client
+- Coalescing: a newer frame with the same key (e.g. BID_UPDATE for a listing)
+  replaces an unsent older one in place - last value wins
+- Backpressure: a full queue or a send exceeding the timeout evicts the socket
+- Metrics: queue wait, send latency, coalesced/overflow counters
+- Personalised frames: a message is encoded once and only the trailing
+  bid_status is spliced in per recipient
+- Held queues buffer (and coalesce) fan-out while a new connection builds
+  its initial state; release() puts the initial frames first and starts the
+  writer, so a stale snapshot never arrives after a newer update
+
+Usage:
+    queue = OutboundQueue(websocket, on_dead=lambda ws, reason: ..., held=True)
+    queue.enqueue(frame, coalesce_key=("BID_UPDATE", listing_id))
+    queue.release([connection_frame, initial_state_frame])
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import itertools
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+WS_QUEUE_MAX_FRAMES = int(os.environ.get("WS_QUEUE_MAX_FRAMES", "64"))
+WS_SEND_TIMEOUT = float(os.environ.get("WS_SEND_TIMEOUT", "2.0"))  # seconds before a socket counts as slow
+
+# Frame types where only the latest state matters
+COALESCED_TYPES = {"BID_UPDATE", "TIME_EXTENSION"}
+
+BID_STATUSES = ("LEADING", "OUTBID", "VIEWER")
+
+metrics = get_metrics()
+
+
+def coalesce_key_for(message: dict, listing_id: str) -> Optional[Hashable]:
+    """Key under which newer frames supersede older ones (None = always deliver)"""
+    message_type = message.get("type")
+    if message_type not in COALESCED_TYPES:
+        return None
+    return (message_type, listing_id, message.get("lot_number"))
+
+
+def status_frames(message: dict, statuses: Iterable[str] = BID_STATUSES) -> Dict[str, str]:
+    """Encode `message` once; one frame per status with "bid_status" appended as the last key"""
+    base = json.dumps(message)[:-1]
+    separator = ", " if message else ""
+    return {status: f'{base}{separator}"bid_status": {json.dumps(status)}}}' for status in statuses}
+
+
+def bid_status_targets(viewers: Dict[str, Any], connections: Iterable[Any], leader_id: Optional[str],
+                       frames: Dict[str, str]) -> List[Tuple[Any, str]]:
+    """
+    (socket, frame) per recipient: signed-in viewers get LEADING or OUTBID,
+    every other socket on the listing gets VIEWER
+    """
+    targets = [
+        (websocket, frames["LEADING"] if user_id == leader_id else frames["OUTBID"])
+        for user_id, websocket in list(viewers.items())
+    ]
+    viewer_sockets = set(viewers.values())
+    targets.extend((connection, frames["VIEWER"]) for connection in list(connections) if connection not in viewer_sockets)
+    return targets
+
+
+class OutboundQueue:
+    def __init__(
+        self,
+        websocket,
+        on_dead: Callable[[Any, str], None],
+        max_frames: int = WS_QUEUE_MAX_FRAMES,
+        send_timeout: float = WS_SEND_TIMEOUT,
+        held: bool = False,
+    ):
+        self.websocket = websocket
+        self.on_dead = on_dead
+        self.max_frames = max_frames
+        self.send_timeout = send_timeout
+        self.closed = False
+        self.held = held
+        self.high_water = 0
+        # {key: (frame, first_enqueued_at)} in send order
+        self._pending: "OrderedDict[Hashable, Tuple[str, float]]" = OrderedDict()
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, frame: str, coalesce_key: Optional[Hashable] = None) -> bool:
+        """Queue a frame without blocking; returns False if the socket was dropped"""
+        if self.closed:
+            return False
+
+        if coalesce_key is not None and coalesce_key in self._pending:
+            # Last value wins, but the frame keeps its place (and its age) in line
+            _, enqueued_at = self._pending[coalesce_key]
+            self._pending[coalesce_key] = (frame, enqueued_at)
+            metrics.inc("ws_frames_coalesced")
+            return True
+
+        if len(self._pending) >= self.max_frames:
+            metrics.inc("ws_queue_overflow")
+            self._fail("outbound queue full")
+            return False
+
+        key = coalesce_key if coalesce_key is not None else ("seq", next(self._seq))
+        self._pending[key] = (frame, time.perf_counter())
+        self.high_water = max(self.high_water, len(self._pending))
+        self._start()
+        return True
+
+    def release(self, first_frames: Iterable[str] = ()) -> bool:
+        """Stop holding: `first_frames` go ahead of everything buffered, then the writer starts"""
+        if self.closed:
+            return False
+        frames = list(first_frames)
+        keys = [("seq", next(self._seq)) for _ in frames]
+        now = time.perf_counter()
+        for key, frame in zip(keys, frames):
+            self._pending[key] = (frame, now)
+        for key in reversed(keys):
+            self._pending.move_to_end(key, last=False)
+        self.high_water = max(self.high_water, len(self._pending))
+        self.held = False
+        self._start()
+        return True
+
+    def _start(self):
+        if self.held:
+            return
+        self._wakeup.set()
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        try:
+            while not self.closed:
+                if not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                _, (frame, enqueued_at) = self._pending.popitem(last=False)
+                started = time.perf_counter()
+                metrics.observe("ws_queue_wait_seconds", started - enqueued_at)
+                try:
+                    await asyncio.wait_for(self.websocket.send_text(frame), timeout=self.send_timeout)
+                except Exception as e:
+                    self._fail(f"send failed: {type(e).__name__}")
+                    return
+                metrics.observe("ws_send_seconds", time.perf_counter() - started)
+                metrics.inc("ws_frames_sent")
+        except asyncio.CancelledError:
+            pass
+
+    def _fail(self, reason: str):
+        if self.closed:
+            return
+        self.close()
+        metrics.inc("ws_evicted")
+        logger.debug(f"Evicting websocket: {reason}")
+        try:
+            self.on_dead(self.websocket, reason)
+        except Exception as e:
+            logger.error(f"❌ Error evicting websocket: {e}")
+
+    def close(self):
+        """Stop the writer and drop anything unsent"""
+        self.closed = True
+        self._pending.clear()
+        self._wakeup.set()
+        if self._task and not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Listing serialization benchmark
+Times /listings-style pages from BSON bytes to JSON: ISO-string timestamps
+(decoded, re-parsed per row with fromisoformat, validated, dumped) against
+native BSON dates decoded tz-aware by the driver, stage by stage.
+
+    python date_serialization_benchmark.py [--rows 50] [--pages 200]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import bson
+from bson.codec_options import CodecOptions
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from services.bson_dates import CLIENT_OPTIONS
+
+
+class ListingRow(BaseModel):
+    """Field-for-field copy of server.Listing (server.py needs the full app environment)"""
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    seller_id: str
+    title: str
+    description: str
+    category: str
+    condition: str
+    starting_price: float
+    current_price: float
+    buy_now_price: Optional[float] = None
+    images: List[str] = []
+    location: str
+    city: str
+    region: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    auction_end_date: datetime
+    created_at: datetime
+    status: str = "active"
+    bid_count: int = 0
+    is_promoted: bool = False
+    views: int = 0
+    shipping_info: Optional[Dict[str, Any]] = None
+    visit_availability: Optional[Dict[str, Any]] = None
+
+
+ROWS = TypeAdapter(List[ListingRow])
+
+
+def make_rows(count, as_strings, rng):
+    base = datetime(2026, 5, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(count):
+        created = base + timedelta(seconds=rng.randint(0, 10_000_000))
+        end = created + timedelta(days=7)
+        rows.append({
+            "id": f"listing-{i}", "seller_id": "seller", "title": f"Lot {i}",
+            "description": "Solid oak dresser, three drawers, minor wear. " * 8,
+            "category": "furniture", "condition": "used", "starting_price": 10.0,
+            "current_price": rng.randint(100, 500_000) / 100, "images": [f"/uploads/{i}-{n}.jpg" for n in range(4)],
+            "location": "Montréal, QC", "city": "Montréal", "region": "QC", "latitude": 45.5, "longitude": -73.6,
+            "created_at": created.isoformat() if as_strings else created,
+            "auction_end_date": end.isoformat() if as_strings else end,
+            "bid_count": rng.randint(0, 40), "views": rng.randint(0, 5000),
+            "shipping_info": {"available": True, "methods": ["pickup"]},
+        })
+    return rows
+
+
+def decode(raw_pages, options):
+    return [[bson.decode(doc, codec_options=options) for doc in raw] for raw in raw_pages]
+
+
+def reparse(pages):
+    for listings in pages:
+        for listing in listings:
+            if isinstance(listing.get("created_at"), str):
+                listing["created_at"] = datetime.fromisoformat(listing["created_at"])
+            if isinstance(listing.get("auction_end_date"), str):
+                listing["auction_end_date"] = datetime.fromisoformat(listing["auction_end_date"])
+
+
+def respond(pages):
+    for listings in pages:
+        ROWS.dump_json(ROWS.validate_python(listings))
+
+
+def timed(fn, repeat=7):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def stages(raw_pages, options, with_reparse):
+    decode_ms = timed(lambda: decode(raw_pages, options))
+    reparse_ms = timed(lambda: reparse(decode(raw_pages, options))) - decode_ms if with_reparse else 0.0
+    pages = decode(raw_pages, options)
+    reparse(pages)
+    return decode_ms, max(reparse_ms, 0.0), timed(lambda: respond(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Listing serialization benchmark")
+    parser.add_argument("--rows", type=int, default=50, help="rows per page")
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    strings = [[bson.encode(r) for r in make_rows(args.rows, True, rng)] for _ in range(args.pages)]
+    native = [[bson.encode(r) for r in make_rows(args.rows, False, rng)] for _ in range(args.pages)]
+
+    print(f"{args.pages} pages x {args.rows} listings, BSON -> JSON (ms)\n")
+    print(f"{'':<28}{'decode':>10}{'reparse':>10}{'respond':>10}{'total':>10}")
+    for label, raw, options, with_reparse in [
+        ("ISO strings", strings, CodecOptions(), True),
+        ("BSON dates, tz-aware", native, CodecOptions(**CLIENT_OPTIONS), False),
+    ]:
+        decode_ms, reparse_ms, respond_ms = stages(raw, options, with_reparse)
+        total = decode_ms + reparse_ms + respond_ms
+        print(f"{label:<28}{decode_ms:>10.1f}{reparse_ms:>10.1f}{respond_ms:>10.1f}{total:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Fee quote benchmark
+Quotes 10,000 hammer prices with the scalar calculate_buyer_total loop and the
+batch calculate_buyer_totals (with and without NumPy).
+
+    python fee_quote_benchmark.py [--count 10000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from services import fee_calculator
+from services.fee_calculator import calculate_buyer_total, calculate_buyer_totals
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fee quote benchmark")
+    parser.add_argument("--count", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    prices = [rng.randint(100, 5_000_000) / 100 for _ in range(args.count)]
+
+    print(f"{args.count} prices, VIP buyer, QC, business seller\n")
+    scalar = timed(lambda: [calculate_buyer_total(p, "vip", "QC", True) for p in prices], repeat=1)
+    print(f"{'scalar loop':<24}{scalar:>10.1f} ms")
+
+    if fee_calculator.np is not None:
+        batch = timed(lambda: calculate_buyer_totals(prices, "vip", "QC", True))
+        print(f"{'batch (numpy)':<24}{batch:>10.1f} ms")
+
+    numpy, fee_calculator.np = fee_calculator.np, None
+    try:
+        batch = timed(lambda: calculate_buyer_totals(prices, "vip", "QC", True))
+        print(f"{'batch (pure python)':<24}{batch:>10.1f} ms")
+    finally:
+        fee_calculator.np = numpy
+
+
+if __name__ == "__main__":
+    main()
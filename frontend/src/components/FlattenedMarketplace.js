@@ -60,7 +60,7 @@ const FlattenedMarketplace = ({
   const [loading, setLoading] = useState(true);
   const [total, setTotal] = useState(0);
   const [hasMore, setHasMore] = useState(false);
-  const [skip, setSkip] = useState(0);
+  const [cursor, setCursor] = useState(null);
   
   // Filters
   const [filters, setFilters] = useState({
@@ -112,7 +112,7 @@ const FlattenedMarketplace = ({
       if (filters.condition) params.append('condition', filters.condition);
       params.append('sort', filters.sort);
       params.append('limit', limit.toString());
-      params.append('skip', loadMore ? skip.toString() : '0');
+      if (loadMore && cursor) params.append('cursor', cursor);
       params.append('track_impression', 'true');
 
       const response = await axios.get(`${API}/marketplace/items?${params.toString()}`);
@@ -126,11 +126,10 @@ const FlattenedMarketplace = ({
       
       if (loadMore) {
         setItems(prev => [...prev, ...fetchedItems]);
-        setSkip(prev => prev + limit);
       } else {
         setItems(fetchedItems);
-        setSkip(limit);
       }
+      setCursor(response.data.next_cursor || null);
       
       setTotal(response.data.total || fetchedItems.length);
       setHasMore(response.data.has_more || false);
@@ -152,7 +151,7 @@ const FlattenedMarketplace = ({
 
   const handleFilterChange = (key, value) => {
     setFilters(prev => ({ ...prev, [key]: value }));
-    setSkip(0);
+    setCursor(null);
   };
 
   const openQuickBid = (item, e) => {
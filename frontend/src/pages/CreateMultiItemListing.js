@@ -76,7 +76,7 @@ const CreateMultiItemListing = () => {
 
   // Step 4: Documents, Shipping, Visit, Auction Terms
   const [documents, setDocuments] = useState({
-    terms_conditions: null, // {filename, content_type, base64_content}
+    terms_conditions: null, // {blob_id, filename, content_type, size, sha256}
     important_info: null,
     catalogue: null
   });
@@ -1345,21 +1345,21 @@ const CreateMultiItemListing = () => {
         return;
       }
 
-      // Convert to base64
-      const reader = new FileReader();
-      reader.onloadend = () => {
-        const base64 = reader.result.split(',')[1];
+      // Upload to blob storage; the listing keeps the returned reference
+      try {
+        const formData = new FormData();
+        formData.append('file', file);
+        const response = await axios.post(`${API}/blobs`, formData, {
+          headers: { 'Content-Type': 'multipart/form-data' }
+        });
         setDocuments(prev => ({
           ...prev,
-          [docType]: {
-            filename: file.name,
-            content_type: file.type,
-            base64_content: base64
-          }
+          [docType]: response.data
         }));
         toast.success(`${file.name} uploaded successfully`);
-      };
-      reader.readAsDataURL(file);
+      } catch (error) {
+        toast.error(error.response?.data?.detail || `Failed to upload ${file.name}`);
+      }
     };
 
     return (
@@ -192,8 +192,36 @@ const ItemDetailsCard = ({ data }) => (
   </div>
 );
 
+// ========== ATTACHMENT URL ==========
+// Blob-stored attachments need the auth header, so they are fetched and shown
+// through an object URL; legacy attachments keep their direct URL
+const useAttachmentUrl = (attachment) => {
+  const [objectUrl, setObjectUrl] = useState(null);
+  const blobUrl = attachment?.blob_id ? attachment.url : null;
+
+  useEffect(() => {
+    if (!blobUrl) return undefined;
+    let revoked = false;
+    let created = null;
+    axios.get(blobUrl, { responseType: 'blob' })
+      .then((response) => {
+        if (revoked) return;
+        created = URL.createObjectURL(response.data);
+        setObjectUrl(created);
+      })
+      .catch((error) => console.error('Failed to load attachment:', error));
+    return () => {
+      revoked = true;
+      if (created) URL.revokeObjectURL(created);
+    };
+  }, [blobUrl]);
+
+  return blobUrl ? objectUrl : attachment?.url;
+};
+
 // ========== ATTACHMENT PREVIEW ==========
 const AttachmentPreview = ({ attachment, onView }) => {
+  const src = useAttachmentUrl(attachment);
   const isImage = attachment.type?.startsWith('image/') || /\.(jpg|jpeg|png|gif|webp)$/i.test(attachment.url);
   const isPDF = attachment.type === 'application/pdf' || /\.pdf$/i.test(attachment.url);
   
@@ -203,7 +231,7 @@ const AttachmentPreview = ({ attachment, onView }) => {
       onClick={() => onView(attachment)}
     >
       {isImage ? (
-        <img src={attachment.url} alt={attachment.name} className="w-40 h-32 object-cover" />
+        <img src={src || undefined} alt={attachment.name} className="w-40 h-32 object-cover" />
       ) : isPDF ? (
         <div className="w-40 h-32 flex flex-col items-center justify-center bg-red-50 dark:bg-red-900/20">
           <FileText className="h-10 w-10 text-red-500" />
@@ -224,6 +252,7 @@ const AttachmentPreview = ({ attachment, onView }) => {
 
 // ========== LIGHTBOX PREVIEW ==========
 const Lightbox = ({ attachment, onClose }) => {
+  const src = useAttachmentUrl(attachment);
   if (!attachment) return null;
   
   const isImage = attachment.type?.startsWith('image/') || /\.(jpg|jpeg|png|gif|webp)$/i.test(attachment.url);
@@ -241,7 +270,7 @@ const Lightbox = ({ attachment, onClose }) => {
       </button>
       
       <a 
-        href={attachment.url}
+        href={src || undefined}
         download={attachment.name}
         className="absolute top-4 right-16 p-2 bg-white/10 rounded-full hover:bg-white/20 transition-colors"
         onClick={(e) => e.stopPropagation()}
@@ -251,10 +280,10 @@ const Lightbox = ({ attachment, onClose }) => {
       
       <div className="max-w-4xl max-h-[90vh] overflow-auto" onClick={(e) => e.stopPropagation()}>
         {isImage ? (
-          <img src={attachment.url} alt={attachment.name} className="max-w-full max-h-[85vh] object-contain rounded-lg" />
+          <img src={src || undefined} alt={attachment.name} className="max-w-full max-h-[85vh] object-contain rounded-lg" />
         ) : (
           <iframe 
-            src={attachment.url} 
+            src={src || undefined} 
             title={attachment.name}
             className="w-[90vw] h-[85vh] bg-white rounded-lg"
           />
@@ -475,10 +475,7 @@ const MultiItemListingDetailPage = () => {
                               variant="outline"
                               className="w-full justify-start"
                               onClick={() => {
-                                const link = document.createElement('a');
-                                link.href = `data:${listing.documents.terms_conditions.content_type};base64,${listing.documents.terms_conditions.base64_content}`;
-                                link.download = listing.documents.terms_conditions.filename;
-                                link.click();
+                                window.open(`${API}/multi-item-listings/${listing.id}/documents/terms_conditions`, '_blank');
                               }}
                             >
                               📃 Terms & Conditions
@@ -489,10 +486,7 @@ const MultiItemListingDetailPage = () => {
                               variant="outline"
                               className="w-full justify-start"
                               onClick={() => {
-                                const link = document.createElement('a');
-                                link.href = `data:${listing.documents.important_info.content_type};base64,${listing.documents.important_info.base64_content}`;
-                                link.download = listing.documents.important_info.filename;
-                                link.click();
+                                window.open(`${API}/multi-item-listings/${listing.id}/documents/important_info`, '_blank');
                               }}
                             >
                               ℹ️ Important Information
@@ -503,10 +497,7 @@ const MultiItemListingDetailPage = () => {
                               variant="outline"
                               className="w-full justify-start"
                               onClick={() => {
-                                const link = document.createElement('a');
-                                link.href = `data:${listing.documents.catalogue.content_type};base64,${listing.documents.catalogue.base64_content}`;
-                                link.download = listing.documents.catalogue.filename;
-                                link.click();
+                                window.open(`${API}/multi-item-listings/${listing.id}/documents/catalogue`, '_blank');
                               }}
                             >
                               📚 Catalogue
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Increment schedule benchmark
+Compares the table (bisect) lookup with the original if/elif helper, and a
+server-side 10-step ladder with 10 client round trips' worth of lookups.
+
+    python increment_schedule_benchmark.py [--count 200000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from services.increment_schedule import SCHEDULES, next_valid_bids
+
+
+def if_chain_tiered(current_bid):
+    if current_bid < 100:
+        return 5
+    elif current_bid < 500:
+        return 10
+    elif current_bid < 1000:
+        return 25
+    elif current_bid < 5000:
+        return 50
+    elif current_bid < 10000:
+        return 100
+    elif current_bid < 50000:
+        return 250
+    elif current_bid < 100000:
+        return 500
+    else:
+        return 1000
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Increment schedule benchmark")
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    prices = [round(rng.uniform(0, 150_000), 2) for _ in range(args.count)]
+    tiered = SCHEDULES["tiered"]
+
+    mismatches = sum(tiered.increment(p) != if_chain_tiered(p) for p in prices)
+    print(f"{args.count} lookups, {mismatches} mismatches against the if/elif helper\n")
+
+    print(f"{'if/elif chain':<24}{timed(lambda: [if_chain_tiered(p) for p in prices]):>10.1f} ms")
+    print(f"{'bisect table':<24}{timed(lambda: [tiered.increment(p) for p in prices]):>10.1f} ms")
+
+    auction = {"increment_option": "tiered"}
+    ladders = prices[: args.count // 10]
+    print(f"\n{len(ladders)} ten-step ladders")
+    print(f"{'next_valid_bids':<24}{timed(lambda: [next_valid_bids(auction, 10, p) for p in ladders]):>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Invoice template microbenchmark
+Renders each invoice document for 1, 50 and 500 lots (en + fr) and reports
+time per render and HTML size. HTML size matters twice: it is hashed for the
+PDF cache key and parsed by WeasyPrint on every miss.
+
+    python invoice_template_benchmark.py [--iterations 200]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+started = time.perf_counter()
+from invoice_templates_bilingual import lots_won_template
+from invoice_templates_complete import (
+    payment_letter_template,
+    seller_statement_template,
+    seller_receipt_template,
+    commission_invoice_template,
+)
+import_ms = (time.perf_counter() - started) * 1000
+
+LOT_COUNTS = (1, 50, 500)
+
+
+def sample_data(lot_count: int) -> dict:
+    lots = [
+        {
+            "lot_number": n,
+            "title": f"Lot {n} - Vintage oak dresser & mirror",
+            "description": "Solid oak, original hardware, minor wear on the top surface. " * 2,
+            "quantity": 1,
+            "hammer_price": 125.0 + n,
+            "status": "sold" if n % 4 else "unsold",
+            "buyer_name": "Marie Tremblay",
+            "paddle_number": 100 + n,
+        }
+        for n in range(1, lot_count + 1)
+    ]
+    hammer_total = sum(lot["hammer_price"] for lot in lots)
+    return {
+        "invoice_number": "BV-2026-000123",
+        "receipt_number": "RC-2026-000123",
+        "statement_number": "ST-2026-000123",
+        "currency": "CAD",
+        "paddle_number": 42,
+        "auction": {
+            "title": "Estate Sale - Plateau Mont-Royal",
+            "auction_end_date": datetime(2026, 3, 14, 19, 0),
+            "city": "Montréal",
+            "region": "QC",
+        },
+        "buyer": {"name": "Marie Tremblay", "email": "marie@example.com", "phone": "514-555-0100", "company_name": ""},
+        "seller": {"name": "Jean Roy", "email": "jean@example.com", "phone": "514-555-0101", "company_name": "Roy Antiques"},
+        "lots": lots,
+        "lots_count": lot_count,
+        "total_lots": lot_count,
+        "lots_sold": sum(1 for lot in lots if lot["status"] == "sold"),
+        "premium_percentage": 5.0,
+        "tax_rate_gst": 5.0,
+        "tax_rate_qst": 9.975,
+        "hammer_total": hammer_total,
+        "premium_amount": hammer_total * 0.05,
+        "total_tax": hammer_total * 0.15,
+        "grand_total": hammer_total * 1.2,
+        "total_hammer": hammer_total,
+        "commission_rate": 0.0,
+        "commission_amount": hammer_total * 0.1,
+        "net_payout": hammer_total,
+    }
+
+
+DOCUMENTS = {
+    "lots_won": lots_won_template,
+    "payment_letter": payment_letter_template,
+    "seller_statement": seller_statement_template,
+    "seller_receipt": seller_receipt_template,
+    "commission_invoice": commission_invoice_template,
+}
+
+
+def bench(template, data, lang, iterations):
+    template(data, lang)  # first render outside the timing
+    started = time.perf_counter()
+    for _ in range(iterations):
+        html = template(data, lang)
+    return (time.perf_counter() - started) * 1000 / iterations, len(html.encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"Template import + compile: {import_ms:.1f} ms\n")
+    print(f"{'document':<20}{'lots':>6}{'lang':>6}{'ms/render':>12}{'html KB':>10}")
+    for lot_count in LOT_COUNTS:
+        data = sample_data(lot_count)
+        iterations = max(5, args.iterations // max(1, lot_count // 10))
+        for name, template in DOCUMENTS.items():
+            for lang in ("en", "fr"):
+                ms, size = bench(template, data, lang, iterations)
+                print(f"{name:<20}{lot_count:>6}{lang:>6}{ms:>12.3f}{size / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
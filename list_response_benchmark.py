@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+List response benchmark
+Serializes a seeded /multi-item-listings page (50 auctions x 50 lots by
+default) the old way - MultiItemListing(**doc) per row with nested Lot
+models, FastAPI's jsonable_encoder and the stdlib JSON encoder - and through
+the fast path (projected dicts, defaults filled, orjson).
+
+The models are loaded from server.py's source so the comparison tracks them.
+
+    python list_response_benchmark.py [--auctions 50] [--lots 50]
+"""
+import argparse
+import ast
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from services import fast_response
+from services.fast_response import ModelShape
+
+SERVER = Path(__file__).parent / 'backend' / 'server.py'
+
+
+def load_models(*names):
+    """Exec the named pydantic model classes out of server.py"""
+    tree = ast.parse(SERVER.read_text())
+    namespace = {
+        "BaseModel": BaseModel, "ConfigDict": ConfigDict, "Field": Field, "Optional": Optional,
+        "List": List, "Dict": Dict, "Any": Any, "datetime": datetime, "timezone": timezone, "uuid": uuid,
+    }
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name in names:
+            exec(compile(ast.Module([node], []), str(SERVER), "exec"), namespace)
+    return [namespace[name] for name in names]
+
+
+Lot, MultiItemListing = load_models("Lot", "MultiItemListing")
+SHAPE = ModelShape(MultiItemListing, nested={"lots": ModelShape(Lot)})
+
+
+def seed(auctions, lots, rng):
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    docs = []
+    for a in range(auctions):
+        end = now + timedelta(days=rng.randint(1, 14))
+        docs.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))), "seller_id": f"seller-{a % 7}",
+            "title": f"Estate auction #{a}", "description": "Furniture, tools and collectibles. " * 10,
+            "category": "estate", "location": "123 Rue Principale", "city": "Montréal", "region": "QC",
+            "auction_end_date": end, "status": "active", "created_at": now - timedelta(days=a),
+            "total_lots": lots, "views": rng.randint(0, 9000), "currency": "CAD",
+            "premium_percentage": 5.0, "commission_rate": 4.0,
+            "shipping_info": {"available": True, "methods": ["pickup", "courier"]},
+            "auction_terms_en": "<p>All sales final.</p>" * 20,
+            "lots": [{
+                "lot_number": n + 1, "title": f"Lot {n + 1}", "description": "Good condition, see photos. " * 6,
+                "quantity": 1, "starting_price": 5.0, "current_price": rng.randint(500, 90_000) / 100,
+                "condition": "used", "images": [f"/uploads/{a}-{n}-{i}.jpg" for i in range(3)],
+                "lot_end_time": end + timedelta(minutes=n), "bid_count": rng.randint(0, 25),
+                "available_quantity": 1,
+            } for n in range(lots)],
+        })
+    return docs
+
+
+def legacy(docs):
+    from fastapi.encoders import jsonable_encoder
+    models = [MultiItemListing(**doc) for doc in docs]
+    return json.dumps(jsonable_encoder(models), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast(docs):
+    return fast_response.dumps(SHAPE.fill_many(docs))
+
+
+def timed(fn, make_input, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        docs = make_input()
+        started = time.perf_counter()
+        fn(docs)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List response benchmark")
+    parser.add_argument("--auctions", type=int, default=50)
+    parser.add_argument("--lots", type=int, default=50)
+    args = parser.parse_args()
+
+    catalogue = seed(args.auctions, args.lots, random.Random(42))
+    # Fresh copies per run: the fast path fills defaults in place
+    make_input = lambda: [{**doc, "lots": [dict(lot) for lot in doc["lots"]]} for doc in catalogue]
+
+    same = json.loads(legacy(make_input())) == json.loads(fast(make_input()))
+    print(f"/multi-item-listings page: {args.auctions} auctions x {args.lots} lots (identical JSON: {same})\n")
+    print(f"{'models + jsonable_encoder':<30}{timed(legacy, make_input):>10.1f} ms")
+    label = "fast path (orjson)" if fast_response.orjson is not None else "fast path (json)"
+    print(f"{label:<30}{timed(fast, make_input):>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Local fakes for the Twilio SDK client and the SendGrid HTTP API.
+The Twilio fake blocks the calling thread for `latency` seconds, exactly like
+the real SDK; the SendGrid fake is an async httpx transport. Both can be told
+to fail the first N calls to exercise retries.
+The render fakes stand in for WeasyPrint inside PDF renderer worker processes.
+measure_loop_stall checks that work awaited on the event loop never blocks it.
+"""
+import time
+import asyncio
+import threading
+import itertools
+
+
+class _FakeTwilioMessage:
+    def __init__(self, sid):
+        self.sid = sid
+        self.status = "queued"
+        self.num_segments = 1
+
+
+class _FakeTwilioMessages:
+    def __init__(self, client):
+        self._client = client
+
+    def create(self, body, from_, to):
+        return self._client._send(body=body, from_=from_, to=to)
+
+
+class FakeTwilioClient:
+    """Stands in for twilio.rest.Client"""
+
+    def __init__(self, latency=0.2, fail_first=0):
+        self.latency = latency
+        self.fail_first = fail_first
+        self.sent = []
+        self.threads = set()
+        self.messages = _FakeTwilioMessages(self)
+        self._calls = itertools.count()
+        self._lock = threading.Lock()
+
+    def _send(self, **message):
+        time.sleep(self.latency)
+        with self._lock:
+            self.threads.add(threading.current_thread().name)
+            if next(self._calls) < self.fail_first:
+                raise RuntimeError("Twilio 503: service unavailable")
+            self.sent.append(message)
+            return _FakeTwilioMessage(f"SM{len(self.sent):032d}")
+
+
+class FakeSendGridTransport:
+    """
+    Stands in for the SendGrid v3 /mail/send endpoint as an httpx transport
+    (pass it to EmailService(transport=...)). Responds after `latency`
+    seconds without blocking the loop; `throttle_first` requests get a 429.
+    """
+
+    def __init__(self, latency=0.2, throttle_first=0, retry_after="0"):
+        import httpx
+
+        self._httpx = httpx
+        self.latency = latency
+        self.throttle_first = throttle_first
+        self.retry_after = retry_after
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._calls = itertools.count()
+
+    async def handle_async_request(self, request):
+        import json
+        import asyncio
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        if next(self._calls) < self.throttle_first:
+            return self._httpx.Response(429, headers={"Retry-After": self.retry_after}, text="too many requests")
+        self.requests.append(json.loads(request.content))
+        return self._httpx.Response(202, headers={"X-Message-Id": f"msg-{len(self.requests)}"})
+
+    async def aclose(self):
+        pass
+
+    @property
+    def recipients(self):
+        return [p["to"][0]["email"] for body in self.requests for p in body["personalizations"]]
+
+
+def fake_render(html_content, pdf_path):
+    """Stands in for WeasyPrint in the PDF renderer's worker processes: burns CPU-ish time, writes a stub PDF"""
+    import os
+    time.sleep(0.3)
+    with open(pdf_path, "wb") as f:
+        f.write(b"%PDF-1.7\n" + html_content.encode())
+    return f"{pdf_path}:{os.getpid()}"
+
+
+def hung_render(html_content, pdf_path):
+    """A render that never finishes (e.g. a pathological table layout)"""
+    if "hang" in html_content:
+        time.sleep(3600)
+    return fake_render(html_content, pdf_path)
+
+
+async def measure_loop_stall(work):
+    """Run `work` while a heartbeat ticks every 10ms; return (result, worst heartbeat gap)"""
+    gaps, running = [], True
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    result = await work
+    running = False
+    await beat
+    return result, max(gaps)
@@ -0,0 +1,187 @@
+"""
+Test Suite for the batched Auction Close Pipeline
+Tests:
+1. A burst of ended listings and lots closes with the right winners
+2. Overlapping runs never double-close or double-notify
+3. A re-run after everything closed is a no-op
+4. Timer-driven closes touch only the due listings and lots
+5. Listings still inside the bid grace period are not claimed, and the winner
+   is the committed leader even when its bid document is not written yet
+
+Requires a MongoDB instance: set MONGO_URL (a throwaway database is created and dropped).
+"""
+import os
+import sys
+import uuid
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+MONGO_URL = os.environ.get('MONGO_URL')
+
+pytestmark = pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set - close pipeline test needs MongoDB")
+
+ENDED_LISTINGS = 300
+ENDED_LOTS = 200
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.sent = []
+
+    async def send_to_user(self, user_id, payload):
+        self.sent.append((user_id, payload["type"], payload["listing_id"]))
+
+
+async def seed(db):
+    from services.db_indexes import ensure_indexes
+
+    await ensure_indexes(db)
+    ended = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+    listings, bids = [], []
+    for n in range(ENDED_LISTINGS):
+        listing_id = f"listing-{n}"
+        listings.append({"id": listing_id, "seller_id": "seller", "title": f"Item {n}",
+                         "status": "active", "auction_end_date": ended})
+        if n % 3:  # every third listing gets no bids
+            bids += [{"id": str(uuid.uuid4()), "listing_id": listing_id, "bidder_id": f"bidder-{n}-{amount}",
+                      "amount": float(amount)} for amount in (10, 30, 20)]
+    await db.listings.insert_many(listings)
+    await db.bids.insert_many(bids)
+
+    await db.multi_item_listings.insert_one({"id": "auction-1", "seller_id": "seller", "title": "Estate",
+                                             "status": "active", "lots": []})
+    await db.lots.insert_many([{"id": f"lot-{n}", "auction_id": "auction-1", "lot_number": n,
+                                "lot_status": "active", "auction_end_date": ended} for n in range(ENDED_LOTS)])
+    await db.lot_bids.insert_many([{"id": str(uuid.uuid4()), "lot_id": f"lot-{n}", "bidder_id": f"lot-bidder-{n}",
+                                    "amount": 5.0} for n in range(ENDED_LOTS)])
+
+
+async def run_overlapping_closes(runs):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from services.auction_close import close_ended_auctions
+
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[f"bidvex_close_test_{uuid.uuid4().hex[:8]}"]
+    try:
+        await seed(db)
+        notifier = RecordingNotifier()
+        summaries = await asyncio.gather(*(close_ended_auctions(db, notifier) for _ in range(runs)))
+        rerun = await close_ended_auctions(db, notifier)
+        state = {
+            "listings": await db.listings.find({}, {"_id": 0}).to_list(None),
+            "lots": await db.lots.find({}, {"_id": 0}).to_list(None),
+            "auction": await db.multi_item_listings.find_one({"id": "auction-1"}, {"_id": 0}),
+            "notifications": await db.notifications.find({}, {"_id": 0}).to_list(None),
+            "messages": await db.messages.count_documents({"message_type": "auction_won"}),
+            "conversations": await db.conversations.count_documents({}),
+        }
+        return summaries, rerun, state, notifier.sent
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+class TestAuctionClosePipeline:
+
+    def test_overlapping_runs_close_once(self):
+        summaries, rerun, state, pushes = asyncio.run(run_overlapping_closes(runs=4))
+
+        assert sum(s["listings"] for s in summaries) == ENDED_LISTINGS
+        assert sum(s["lots"] for s in summaries) == ENDED_LOTS
+        assert rerun == {"listings": 0, "lots": 0, "auctions": 0}
+
+        for listing in state["listings"]:
+            n = int(listing["id"].split("-")[1])
+            if n % 3:
+                assert listing["status"] == "ended"
+                assert listing["winner_id"] == f"bidder-{n}-30" and listing["final_price"] == 30.0
+            else:
+                assert listing["status"] == "ended_no_bids"
+            assert "close_claim" not in listing
+        assert all(lot["lot_status"] == "sold" for lot in state["lots"])
+        assert state["auction"]["status"] == "ended"
+        print(f"✅ {ENDED_LISTINGS} listings + {ENDED_LOTS} lots closed by 4 overlapping runs")
+
+        keys = Counter(n["idempotency_key"] for n in state["notifications"])
+        assert max(keys.values()) == 1
+        wins = ENDED_LISTINGS - ENDED_LISTINGS // 3
+        assert len(state["notifications"]) == wins * 2 + ENDED_LISTINGS // 3 + ENDED_LOTS * 2
+        assert state["messages"] == state["conversations"] == wins + ENDED_LOTS
+        assert len(pushes) == len(set(pushes)) == wins * 2 + ENDED_LOTS
+        print("✅ Every notification, handshake and push exists exactly once")
+
+
+async def run_due_closes():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from services.auction_close import close_due
+
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[f"bidvex_close_test_{uuid.uuid4().hex[:8]}"]
+    try:
+        await seed(db)
+        keys = [("listing", "listing-1"), ("listing", "listing-3"), ("lot", "auction-1", 1)]
+        keys += [("lot_doc", f"lot-{n}") for n in range(ENDED_LOTS)]
+        summary = await close_due(db, RecordingNotifier(), keys)
+        state = {
+            "closed": await db.listings.distinct("id", {"status": {"$ne": "active"}}),
+            "auction": await db.multi_item_listings.find_one({"id": "auction-1"}, {"_id": 0}),
+        }
+        return summary, state
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+class TestDueCloses:
+
+    def test_only_due_keys_close(self):
+        summary, state = asyncio.run(run_due_closes())
+
+        assert summary == {"listings": 2, "lots": ENDED_LOTS, "auctions": 1}
+        assert sorted(state["closed"]) == ["listing-1", "listing-3"]
+        assert state["auction"]["status"] == "ended"
+        print("✅ Due keys close their own documents and roll up only their parents")
+
+
+async def run_grace_closes():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from services.auction_close import close_ended_auctions
+    from services.bid_engine import BID_GRACE_PERIOD
+
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[f"bidvex_close_test_{uuid.uuid4().hex[:8]}"]
+    try:
+        now = datetime.now(timezone.utc)
+        past_grace = (now - timedelta(seconds=BID_GRACE_PERIOD + 1)).isoformat()
+        await db.listings.insert_many([
+            # Ended a moment ago: a bid can still land
+            {"id": "in-grace", "seller_id": "seller", "title": "Lamp", "status": "active",
+             "auction_end_date": now.isoformat()},
+            # The last bid's listing update committed, its bid document is not inserted yet
+            {"id": "late-bid", "seller_id": "seller", "title": "Chair", "status": "active",
+             "auction_end_date": past_grace, "current_price": 40.0, "highest_bidder_id": "late"},
+        ])
+        await db.bids.insert_one({"id": "b1", "listing_id": "late-bid", "bidder_id": "early", "amount": 30.0})
+        summary = await close_ended_auctions(db, RecordingNotifier(), now=now)
+        listings = {l["id"]: l async for l in db.listings.find({}, {"_id": 0})}
+        return summary, listings
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+class TestGracePeriod:
+
+    def test_grace_period_and_committed_winner(self):
+        summary, listings = asyncio.run(run_grace_closes())
+
+        assert summary["listings"] == 1
+        assert listings["in-grace"]["status"] == "active"
+        assert listings["late-bid"]["status"] == "ended"
+        assert listings["late-bid"]["winner_id"] == "late" and listings["late-bid"]["final_price"] == 40.0
+        print("✅ In-grace listings stay open; the committed leader wins")
@@ -0,0 +1,174 @@
+"""
+Test Suite for the Auction Timer Wheel
+Tests:
+1. Keys fire on the tick of their deadline, not before
+2. Far deadlines cascade down through the wheel levels and overflow
+3. Rescheduling (anti-sniping) moves a key; cancel removes it
+4. Everything due in the same tick is returned as one batch
+5. Schedules published on the backplane reach the local wheel
+6. load() and track_auction() only schedule keys the close pipeline handles,
+   with every load query bounded by the horizon
+7. Closes fire after the bid grace period, never at the bare end time
+"""
+import os
+import sys
+import math
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.auction_timer import TimerWheel, AuctionTimer
+from services.bid_engine import BID_GRACE_PERIOD
+from services.realtime_backplane import InProcessBackplane
+
+START = 1_700_000_000.0
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    """Records every query; find() returns the seeded documents unfiltered"""
+
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return FakeCursor(self.docs)
+
+    async def find_one(self, query, projection=None):
+        self.queries.append(query)
+        return self.docs[0] if self.docs else None
+
+
+class FakeDB:
+    def __init__(self, listings=(), lots=(), multi_item_listings=()):
+        self.listings = FakeCollection(listings)
+        self.lots = FakeCollection(lots)
+        self.multi_item_listings = FakeCollection(multi_item_listings)
+
+
+class TestTimerWheel:
+
+    def test_fires_on_deadline_tick(self):
+        wheel = TimerWheel(start=START)
+        wheel.schedule(("listing", "a"), START + 5)
+        assert wheel.advance(START + 4) == []
+        assert wheel.advance(START + 5) == [("listing", "a")]
+        assert len(wheel) == 0
+        print("✅ Key fires exactly at its deadline")
+
+    def test_far_deadlines_cascade(self):
+        wheel = TimerWheel(start=START)
+        offsets = [59, 61, 3_599, 3_601, 86_401, 40 * 86_400]
+        for offset in offsets:
+            wheel.schedule(("listing", offset), START + offset)
+        fired = {}
+        for offset in offsets:
+            for key in wheel.advance(START + offset):
+                fired[key[1]] = wheel.current_tick - int(START)
+        assert fired == {offset: offset for offset in offsets}
+        print("✅ Seconds, minutes, hours, days and overflow all fire on time")
+
+    def test_reschedule_and_cancel(self):
+        wheel = TimerWheel(start=START)
+        wheel.schedule(("lot", "auction-1", 1), START + 10)
+        wheel.schedule(("lot", "auction-1", 2), START + 10)
+        wheel.schedule(("lot", "auction-1", 1), START + 130)  # anti-sniping extension
+        wheel.cancel(("lot", "auction-1", 2))
+        assert wheel.advance(START + 129) == []
+        assert wheel.advance(START + 130) == [("lot", "auction-1", 1)]
+        print("✅ Extensions move the key; cancelled keys never fire")
+
+    def test_same_tick_batch(self):
+        wheel = TimerWheel(start=START)
+        for i in range(500):
+            wheel.schedule(("listing", i), START + 30 + (i % 10) / 10)
+        due = wheel.advance(START + 31)
+        assert len(due) == 500
+        print("✅ 500 closes in the same second returned as one batch")
+
+    def test_past_deadline_fires_next_tick(self):
+        wheel = TimerWheel(start=START)
+        wheel.schedule(("listing", "late"), START - 60)
+        assert wheel.advance(START + 1) == [("listing", "late")]
+        print("✅ Already-ended auctions fire on the next tick")
+
+
+class TestAuctionTimer:
+
+    def test_schedule_through_backplane(self):
+        async def scenario():
+            timer = AuctionTimer(db=None)
+            timer.attach_backplane(InProcessBackplane())
+            await timer.schedule(("listing", "x"), "2030-01-01T00:00:00+00:00")
+            return timer.wheel.deadlines
+
+        deadlines = asyncio.run(scenario())
+        assert ("listing", "x") in deadlines
+        print("✅ Published schedules land in the local wheel")
+
+    def test_load_is_bounded_and_skips_embedded_lots(self):
+        """Embedded lots are never scheduled - nothing closes them when a key fires"""
+        db = FakeDB(
+            listings=[{"id": "l1", "auction_end_date": "2030-01-01T00:00:00+00:00"}],
+            lots=[{"id": "lot-1", "auction_end_date": "2030-01-01T00:05:00+00:00"}],
+            multi_item_listings=[{"id": "a1", "auction_end_date": "2030-01-01T00:00:00+00:00",
+                                  "lots": [{"lot_number": 1, "lot_status": "active"}]}],
+        )
+
+        timer = AuctionTimer(db)
+        loaded = asyncio.run(timer.load())
+
+        assert loaded == 2
+        assert set(timer.wheel.deadlines) == {("listing", "l1"), ("lot_doc", "lot-1")}
+        assert db.multi_item_listings.queries == []
+        for query in db.listings.queries + db.lots.queries:
+            assert "auction_end_date" in str(query) and "$lte" in str(query)
+        print("✅ Load reads only horizon-bounded listings and lot documents")
+
+    def test_track_auction_schedules_lot_documents(self):
+        db = FakeDB(
+            lots=[{"id": "lot-1", "auction_end_date": "2030-01-01T00:05:00+00:00"},
+                  {"id": "lot-2", "auction_end_date": "2030-01-01T00:06:00+00:00"}],
+            multi_item_listings=[{"id": "a1"}],
+        )
+        timer = AuctionTimer(db)
+        asyncio.run(timer.track_auction("a1"))
+
+        assert set(timer.wheel.deadlines) == {("lot_doc", "lot-1"), ("lot_doc", "lot-2")}
+        assert db.lots.queries == [{"auction_id": "a1", "lot_status": "active"}]
+        print("✅ Tracking an auction schedules its lot documents")
+
+    def test_close_waits_out_grace_period(self):
+        """A bid accepted in the grace period must land before the close claims the listing"""
+        end = START + 3600
+        db = FakeDB(listings=[{"id": "l1", "auction_end_date": end}])
+
+        async def scenario():
+            timer = AuctionTimer(db)
+            timer.wheel = TimerWheel(start=START)
+            await timer.schedule(("listing", "l2"), end)
+            await timer.load()
+            return timer.wheel
+
+        wheel = asyncio.run(scenario())
+        expected = math.ceil(end + BID_GRACE_PERIOD)
+        assert wheel.deadlines == {("listing", "l1"): expected, ("listing", "l2"): expected}
+        assert wheel.advance(end + BID_GRACE_PERIOD - 1) == []
+        assert sorted(wheel.advance(end + BID_GRACE_PERIOD)) == [("listing", "l1"), ("listing", "l2")]
+        print("✅ Closes fire once the grace period is over")
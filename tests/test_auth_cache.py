@@ -0,0 +1,117 @@
+"""
+Test Suite for the Auth Cache
+Tests:
+1. Decoded JWT subjects are cached; decode errors are not
+2. Users are loaded once per TTL and invalidated on writes
+3. LRU bound evicts the least recently used user
+"""
+import os
+import sys
+import time
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.auth_cache import AuthCache, LRUCache
+from services.realtime_backplane import InProcessBackplane
+
+
+class FakeUser:
+    def __init__(self, user_id, status="active"):
+        self.id = user_id
+        self.status = status
+
+    def model_copy(self):
+        return FakeUser(self.id, self.status)
+
+
+class TestTokenCache:
+
+    def test_subject_decoded_once(self):
+        cache = AuthCache()
+        calls = []
+
+        def decode(token):
+            calls.append(token)
+            return {"sub": "user-1", "exp": time.time() + 3600}
+
+        assert [cache.token_subject("t1", decode) for _ in range(5)] == ["user-1"] * 5
+        assert calls == ["t1"]
+        print("✅ JWT decoded once for 5 requests")
+
+    def test_decode_errors_are_not_cached(self):
+        cache = AuthCache()
+
+        def bad_decode(token):
+            raise ValueError("signature mismatch")
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                cache.token_subject("forged", bad_decode)
+        assert len(cache.tokens) == 0
+        print("✅ Invalid tokens are re-verified every time")
+
+    def test_expired_token_not_served(self):
+        cache = AuthCache()
+        calls = []
+
+        def decode(token):
+            calls.append(token)
+            return {"sub": "user-1", "exp": time.time() - 1}
+
+        cache.token_subject("old", decode)
+        cache.token_subject("old", decode)
+        assert len(calls) == 2
+        print("✅ Cache never outlives the token's exp")
+
+
+class TestUserCache:
+
+    def test_user_loaded_once_and_invalidated(self):
+        async def scenario():
+            cache = AuthCache(user_ttl=30)
+            cache.attach_backplane(InProcessBackplane())
+            loads = []
+
+            async def load(user_id):
+                loads.append(user_id)
+                return FakeUser(user_id, status="active" if len(loads) == 1 else "suspended")
+
+            first = [await cache.get_user("user-1", load) for _ in range(10)]
+            await cache.invalidate_user("user-1")
+            after = await cache.get_user("user-1", load)
+            return first, after, loads
+
+        first, after, loads = asyncio.run(scenario())
+        assert all(u.status == "active" for u in first)
+        assert after.status == "suspended"
+        assert loads == ["user-1", "user-1"]
+        print("✅ 10 requests, 1 user load; suspension visible right after invalidation")
+
+    def test_missing_user_not_cached(self):
+        async def scenario():
+            cache, loads = AuthCache(), []
+
+            async def load(user_id):
+                loads.append(user_id)
+                return None
+
+            await cache.get_user("ghost", load)
+            await cache.get_user("ghost", load)
+            return loads
+
+        assert asyncio.run(scenario()) == ["ghost", "ghost"]
+        print("✅ Unknown users are not cached")
+
+    def test_lru_bound(self):
+        lru = LRUCache(max_size=2)
+        far = time.monotonic() + 60
+        lru.set("a", 1, far)
+        lru.set("b", 2, far)
+        lru.get("a")  # a is now most recently used
+        lru.set("c", 3, far)
+        assert lru.get("b") is None
+        assert lru.get("a") == 1 and lru.get("c") == 3
+        print("✅ LRU evicts the least recently used entry")
@@ -0,0 +1,117 @@
+"""
+Test Suite for the Bid Engine under contention
+Tests:
+1. 500 concurrent bids on one lot: no lost updates, one consistent leader
+2. Same load with lock shards disabled (pure compare-and-set + retry)
+3. Sibling lots are never clobbered by a positional lot bid
+
+Requires a MongoDB instance: set MONGO_URL (a throwaway database is created and dropped).
+"""
+import os
+import sys
+import uuid
+import random
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+MONGO_URL = os.environ.get('MONGO_URL')
+
+pytestmark = pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set - bid engine load test needs MongoDB")
+
+CONCURRENT_BIDS = 500
+
+
+def flat_increment(_auction, _current_price):
+    return 1.0
+
+
+async def run_bidding_war(lock_shards, max_attempts):
+    """Fire CONCURRENT_BIDS bids at lot 1 and return (outcomes, stored auction, stored bids)"""
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from services.bid_engine import BidEngine, BidRejected
+
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[f"bidvex_bid_engine_test_{uuid.uuid4().hex[:8]}"]
+    try:
+        auction_id = str(uuid.uuid4())
+        end_time = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+        await db.multi_item_listings.insert_one({
+            "id": auction_id,
+            "seller_id": "seller",
+            "status": "active",
+            "lots": [
+                {"lot_number": 1, "title": "Hot lot", "current_price": 0.0, "starting_price": 0.0,
+                 "lot_status": "active", "lot_end_time": end_time, "bid_count": 0},
+                {"lot_number": 2, "title": "Quiet lot", "current_price": 42.0, "starting_price": 42.0,
+                 "lot_status": "active", "lot_end_time": end_time, "bid_count": 0},
+            ],
+        })
+
+        engine = BidEngine(db, lock_shards=lock_shards, max_attempts=max_attempts)
+        amounts = [float(n) for n in range(1, CONCURRENT_BIDS + 1)]
+        random.shuffle(amounts)
+
+        async def bid(amount):
+            bidder_id = f"bidder-{int(amount)}"
+            bid_doc = {"id": str(uuid.uuid4()), "listing_id": auction_id, "lot_number": 1,
+                       "bidder_id": bidder_id, "amount": amount}
+            try:
+                await engine.place_lot_bid(auction_id, 1, bidder_id, amount, bid_doc, min_increment_for=flat_increment)
+                return amount, "committed"
+            except BidRejected as e:
+                return amount, e.status_code
+
+        outcomes = await asyncio.gather(*(bid(amount) for amount in amounts))
+        auction = await db.multi_item_listings.find_one({"id": auction_id}, {"_id": 0})
+        bids = await db.lot_bids.find({"listing_id": auction_id}, {"_id": 0}).to_list(None)
+        return outcomes, auction, bids, engine.stats
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+def assert_no_lost_updates(outcomes, auction, bids):
+    committed = sorted(amount for amount, result in outcomes if result == "committed")
+    hot_lot, quiet_lot = auction["lots"]
+
+    assert committed, "At least one bid must commit"
+    # Every committed bid is recorded exactly once and counted exactly once
+    assert len(bids) == len(committed)
+    assert sorted(b["amount"] for b in bids) == committed
+    assert hot_lot["bid_count"] == len(committed)
+    # The stored leader is the highest committed bid
+    assert hot_lot["current_price"] == committed[-1]
+    assert hot_lot["highest_bidder_id"] == f"bidder-{int(committed[-1])}"
+    # Every rejection is a legitimate outbid (400) or an exhausted retry (409)
+    assert all(result in ("committed", 400, 409) for _, result in outcomes)
+    # The sibling lot was not touched
+    assert quiet_lot["current_price"] == 42.0
+    assert quiet_lot["bid_count"] == 0
+    return committed
+
+
+class TestBidEngineConcurrency:
+    """500 concurrent bids on a single lot must never lose an update"""
+
+    def test_concurrent_bids_with_lock_shards(self):
+        """With per-listing lock shards the highest bid always wins"""
+        outcomes, auction, bids, stats = asyncio.run(run_bidding_war(lock_shards=64, max_attempts=5))
+        committed = assert_no_lost_updates(outcomes, auction, bids)
+
+        # Serialized in-process: no CAS conflicts, the top bid must have committed
+        assert stats["conflicts"] == 0
+        assert committed[-1] == float(CONCURRENT_BIDS)
+        print(f"✅ Lock shards: {len(committed)} committed, leader ${committed[-1]:.2f}, 0 conflicts")
+
+    def test_concurrent_bids_pure_cas(self):
+        """Without lock shards compare-and-set + bounded retry still keeps the lot consistent"""
+        outcomes, auction, bids, stats = asyncio.run(run_bidding_war(lock_shards=0, max_attempts=50))
+        committed = assert_no_lost_updates(outcomes, auction, bids)
+
+        # Each commit is strictly above the price it replaced, so the log is a strict ladder
+        assert len(set(committed)) == len(committed)
+        print(f"✅ Pure CAS: {len(committed)} committed, leader ${committed[-1]:.2f}, {stats['conflicts']} conflicts retried")
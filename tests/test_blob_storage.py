@@ -0,0 +1,310 @@
+"""
+Test Suite for Blob Storage
+Tests:
+1. parse_range handles open, closed and suffix ranges and rejects unsatisfiable ones
+2. Uploads stream into the local backend, dedupe by sha256 and read back any byte range
+3. Oversized uploads are rejected mid-stream and leave nothing behind
+4. Inline base64 auction documents are replaced by blob references; the
+   migration leaves documents a seller replaced mid-run alone
+5. A listing can only reference blobs its seller uploaded, never a message attachment
+6. Message attachments are readable only by their conversation's members;
+   blobs no message references stay public
+7. GridFS backend round trip (requires MongoDB: set MONGO_URL)
+"""
+import os
+import sys
+import uuid
+import copy
+import base64
+import asyncio
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.blob_storage import (
+    BlobStorage,
+    BlobTooLarge,
+    LocalBackend,
+    RangeNotSatisfiable,
+    bytes_chunks,
+    message_blob_access,
+    migrate_documents,
+    parse_range,
+    store_documents,
+)
+
+MONGO_URL = os.environ.get('MONGO_URL')
+
+PAYLOAD = bytes(range(256)) * 4096  # 1MB
+
+
+class FakeBlobs:
+    """db.blobs with the unique id index"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query, projection=None):
+        doc = self.docs.get(query["id"])
+        if doc and "uploaders" in query and query["uploaders"] not in doc.get("uploaders", []):
+            return None
+        return dict(doc) if doc else None
+
+    async def insert_one(self, doc):
+        if doc["id"] in self.docs:
+            raise DuplicateKeyError("blobs_id")
+        self.docs[doc["id"]] = dict(doc)
+
+    async def update_one(self, query, update):
+        uploaders = self.docs[query["id"]].setdefault("uploaders", [])
+        for uploader in update["$addToSet"].values():
+            if uploader not in uploaders:
+                uploaders.append(uploader)
+
+
+class FakeAuctions:
+    """multi_item_listings: find yields snapshots; update_one honours equality guards on dotted paths"""
+
+    def __init__(self, docs, edit_before_update=None):
+        self.docs = docs
+        self.edit_before_update = edit_before_update
+
+    async def find(self, query, projection=None):
+        for doc in self.docs:
+            yield copy.deepcopy(doc)
+
+    async def update_one(self, query, update):
+        if self.edit_before_update:
+            self.edit_before_update(self.docs, query["_id"])
+
+        def value(doc, path):
+            for key in path.split("."):
+                doc = doc.get(key) if isinstance(doc, dict) else None
+            return doc
+
+        modified = 0
+        for doc in self.docs:
+            if doc["_id"] == query["_id"] and all(value(doc, k) == v for k, v in query.items() if k != "_id"):
+                for path, new in update["$set"].items():
+                    parent, leaf = path.rsplit(".", 1)
+                    value(doc, parent)[leaf] = new
+                modified = 1
+                break
+        return SimpleNamespace(modified_count=modified)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs[:length]
+
+
+class FakeMessages:
+    """find on attachments.blob_id; conversations find_one on id $in + participants"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        if "attachments.blob_id" in query:
+            blob_id = query["attachments.blob_id"]
+            return FakeCursor([d for d in self.docs if any(a.get("blob_id") == blob_id for a in d.get("attachments", []))])
+        return FakeCursor([])
+
+    async def find_one(self, query, projection=None):
+        return next((d for d in self.docs
+                     if d["id"] in query["id"]["$in"] and query["participants"] in d["participants"]), None)
+
+
+class FakeDB:
+    def __init__(self, auctions=(), messages=(), conversations=()):
+        self.blobs = FakeBlobs()
+        self.multi_item_listings = FakeAuctions(list(auctions))
+        self.messages = FakeMessages(list(messages))
+        self.conversations = FakeMessages(list(conversations))
+
+
+def local_storage(tmp_path, **kwargs):
+    return BlobStorage(FakeDB(), LocalBackend(str(tmp_path)), **kwargs)
+
+
+async def read_all(storage, blob, start=0, end=None):
+    return b"".join([chunk async for chunk in storage.stream(blob, start, end)])
+
+
+class TestParseRange:
+
+    def test_ranges(self):
+        assert parse_range(None, 100) is None
+        assert parse_range("bytes=0-9", 100) == (0, 9)
+        assert parse_range("bytes=90-", 100) == (90, 99)
+        assert parse_range("bytes=90-500", 100) == (90, 99)
+        assert parse_range("bytes=-10", 100) == (90, 99)
+        assert parse_range("bytes=0-1,5-6", 100) is None
+        assert parse_range("items=0-1", 100) is None
+        print("✅ Ranges parsed")
+
+    def test_unsatisfiable(self):
+        for header in ("bytes=100-", "bytes=5-2", "bytes=-0"):
+            with pytest.raises(RangeNotSatisfiable):
+                parse_range(header, 100)
+        print("✅ Unsatisfiable ranges rejected")
+
+
+class TestLocalStorage:
+
+    def test_put_dedupe_and_ranges(self, tmp_path):
+        """Same bytes twice: one stored file, one record, same reference"""
+        storage = local_storage(tmp_path)
+
+        async def scenario():
+            first = await storage.put(bytes_chunks(PAYLOAD, 64 * 1024), "a.pdf", "application/pdf")
+            second = await storage.put_bytes(PAYLOAD, "copy.pdf", "application/pdf")
+            blob = await storage.get(first["blob_id"])
+            return first, second, blob, await read_all(storage, blob), await read_all(storage, blob, 1000, 300_000)
+
+        first, second, blob, whole, part = asyncio.run(scenario())
+
+        assert first["blob_id"] == hashlib.sha256(PAYLOAD).hexdigest() == second["blob_id"]
+        assert first["size"] == len(PAYLOAD) and second["filename"] == "copy.pdf"
+        assert len(storage.db.blobs.docs) == 1
+        assert whole == PAYLOAD and part == PAYLOAD[1000:300_001]
+        stored = [p for p in tmp_path.rglob("*") if p.is_file()]
+        assert len(stored) == 1 and stored[0].name == first["blob_id"]
+        print("✅ Streamed, deduped and read back by range")
+
+    def test_too_large(self, tmp_path):
+        """The cap is enforced while streaming; the staged file is removed"""
+        storage = local_storage(tmp_path, max_bytes=100_000)
+
+        with pytest.raises(BlobTooLarge):
+            asyncio.run(storage.put_bytes(PAYLOAD, "big.pdf", "application/pdf"))
+
+        assert storage.db.blobs.docs == {}
+        assert not [p for p in tmp_path.rglob("*") if p.is_file()]
+        print("✅ Oversized upload rejected")
+
+
+class TestStoreDocuments:
+
+    def test_inline_documents_become_references(self, tmp_path):
+        storage = local_storage(tmp_path)
+        catalogue = asyncio.run(storage.put_bytes(b"%PDF-1.4 catalogue", "catalogue.pdf", "application/pdf", uploader_id="seller"))
+        documents = {
+            "terms_conditions": {
+                "filename": "terms.pdf", "content_type": "application/pdf",
+                "base64_content": "data:application/pdf;base64," + base64.b64encode(b"%PDF-1.4 terms").decode(),
+            },
+            "catalogue": {"blob_id": catalogue["blob_id"], "filename": "catalogue.pdf"},
+            "important_info": None,
+        }
+
+        stored = asyncio.run(store_documents(storage, documents, "seller"))
+
+        ref = stored["terms_conditions"]
+        assert "base64_content" not in ref and ref["size"] == len(b"%PDF-1.4 terms")
+        assert ref["blob_id"] == hashlib.sha256(b"%PDF-1.4 terms").hexdigest()
+        assert storage.db.blobs.docs[ref["blob_id"]]["uploaders"] == ["seller"]
+        assert stored["catalogue"] == documents["catalogue"] and stored["important_info"] is None
+        assert asyncio.run(store_documents(storage, None, "seller")) is None
+        print("✅ Documents stored as references")
+
+    def test_only_own_non_message_blobs_can_be_mounted(self, tmp_path):
+        """A private attachment's hash can't be put on a listing to serve it publicly"""
+        db = FakeDB(messages=[{"id": "m1", "conversation_id": "c1", "sender_id": "alice", "receiver_id": "bob",
+                               "attachments": [{"blob_id": hashlib.sha256(b"%PDF secret").hexdigest()}]}])
+        storage = BlobStorage(db, LocalBackend(str(tmp_path)))
+        secret = asyncio.run(storage.put_bytes(b"%PDF secret", "secret.pdf", "application/pdf", uploader_id="alice"))
+        other = asyncio.run(storage.put_bytes(b"%PDF bob's", "bob.pdf", "application/pdf", uploader_id="bob"))
+
+        def mount(blob_id, owner_id):
+            return asyncio.run(store_documents(storage, {"catalogue": {"blob_id": blob_id}}, owner_id))
+
+        for blob_id, owner_id in ((secret["blob_id"], "mallory"), (secret["blob_id"], "alice"),
+                                  (other["blob_id"], "mallory"), ("0" * 64, "mallory")):
+            with pytest.raises(ValueError):
+                mount(blob_id, owner_id)
+
+        # Uploading the same content again makes the uploader an owner of the deduplicated blob
+        asyncio.run(storage.put_bytes(b"%PDF bob's", "mine.pdf", "application/pdf", uploader_id="mallory"))
+        assert mount(other["blob_id"], "mallory")["catalogue"]["blob_id"] == other["blob_id"]
+        assert db.blobs.docs[other["blob_id"]]["uploaders"] == ["bob", "mallory"]
+        print("✅ Listings mount only their seller's public uploads")
+
+    def test_migration_skips_documents_changed_mid_run(self, tmp_path):
+        def inline(data):
+            return {"filename": "terms.pdf", "content_type": "application/pdf",
+                    "base64_content": base64.b64encode(data).decode()}
+
+        db = FakeDB(auctions=[
+            {"_id": 1, "id": "a1", "documents": {"terms_conditions": inline(b"%PDF a1")}},
+            {"_id": 2, "id": "a2", "documents": {"terms_conditions": inline(b"%PDF a2 old")}},
+        ])
+
+        def seller_replaces_a2(docs, updating):
+            if updating == 2:
+                docs[1]["documents"]["terms_conditions"] = inline(b"%PDF a2 new")
+
+        db.multi_item_listings.edit_before_update = seller_replaces_a2
+        stats = asyncio.run(migrate_documents(db, BlobStorage(db, LocalBackend(str(tmp_path)))))
+
+        a1, a2 = (doc["documents"]["terms_conditions"] for doc in db.multi_item_listings.docs)
+        assert a1["blob_id"] == hashlib.sha256(b"%PDF a1").hexdigest() and "base64_content" not in a1
+        assert base64.b64decode(a2["base64_content"]) == b"%PDF a2 new"
+        assert stats == {"auctions": 1, "documents": 1, "invalid": 0, "changed": 1}
+        print("✅ Migration never overwrites a document replaced mid-run")
+
+
+class TestMessageBlobAccess:
+
+    def test_only_conversation_members_read_attachments(self):
+        db = FakeDB(
+            messages=[{"id": "m1", "conversation_id": "c1", "sender_id": "alice", "receiver_id": "bob",
+                       "attachments": [{"blob_id": "secret"}]}],
+            conversations=[{"id": "c1", "participants": ["alice", "bob", "carol"]}],
+        )
+
+        def access(blob_id, user_id):
+            return asyncio.run(message_blob_access(db, blob_id, user_id))
+
+        assert access("catalogue", None) is None  # Not a message attachment - public
+        assert access("secret", "alice") and access("secret", "bob")
+        assert access("secret", "carol")  # Participant, neither sender nor receiver
+        assert access("secret", "mallory") is False
+        assert access("secret", None) is False
+        print("✅ Attachments readable by conversation members only")
+
+
+@pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set - GridFS test needs MongoDB")
+class TestGridFSMongo:
+
+    def test_round_trip(self):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from services.blob_storage import GridFSBackend
+
+        async def scenario():
+            client = AsyncIOMotorClient(MONGO_URL)
+            db = client[f"bidvex_blobs_test_{uuid.uuid4().hex[:8]}"]
+            try:
+                await db.blobs.create_index("id", unique=True)
+                storage = BlobStorage(db, GridFSBackend(db))
+                ref = await storage.put_bytes(PAYLOAD, "a.pdf", "application/pdf")
+                await storage.put_bytes(PAYLOAD, "b.pdf", "application/pdf")
+                blob = await storage.get(ref["blob_id"])
+                files = await db.blob_data.files.count_documents({})
+                return blob, files, await read_all(storage, blob, 5, 700_000)
+            finally:
+                await client.drop_database(db.name)
+                client.close()
+
+        blob, files, part = asyncio.run(scenario())
+
+        assert blob["backend"] == "gridfs" and files == 1
+        assert part == PAYLOAD[5:700_001]
+        print("✅ GridFS round trip")
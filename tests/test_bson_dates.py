@@ -0,0 +1,124 @@
+"""
+Test Suite for BSON Date Storage
+Tests:
+1. to_datetime normalizes ISO strings with any offset, naive and aware datetimes to aware UTC
+2. date_range matches native dates, plus legacy strings while LEGACY_STRING_DATES is on
+3. The migration converts top-level and embedded-lot strings with a guarded update
+4. migrate() converts a live collection in batches and leaves bad values alone
+   (requires MongoDB: set MONGO_URL)
+"""
+import os
+import sys
+import uuid
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import bson_dates
+from services.bson_dates import conversion_update, conversions, date_range, to_datetime
+
+MONGO_URL = os.environ.get('MONGO_URL')
+
+UTC_NOON = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class TestToDatetime:
+
+    def test_mixed_offsets_normalize(self):
+        """The same instant written with different offsets is one datetime"""
+        values = ["2026-03-01T12:00:00+00:00", "2026-03-01T07:00:00-05:00", "2026-03-01T12:00:00Z",
+                  datetime(2026, 3, 1, 12, 0), UTC_NOON.astimezone(timezone(timedelta(hours=2)))]
+        for value in values:
+            parsed = to_datetime(value)
+            assert parsed == UTC_NOON and parsed.utcoffset() == timedelta(0), value
+        # ...while their strings sort in the wrong order
+        assert "2026-03-01T07:00:00-05:00" < "2026-03-01T11:00:00+00:00"
+        print("✅ Offsets normalized to UTC")
+
+    def test_unparseable(self):
+        assert to_datetime(None) is None
+        assert to_datetime("next tuesday") is None
+        assert to_datetime(42) is None
+        print("✅ Unparseable values return None")
+
+
+class TestDateRange:
+
+    def test_native_and_legacy(self, monkeypatch):
+        """Both representations match until the legacy branch is switched off"""
+        monkeypatch.setattr(bson_dates, "LEGACY_STRING_DATES", True)
+        assert date_range("auction_end_date", {"$lte": UTC_NOON}) == {"$or": [
+            {"auction_end_date": {"$lte": UTC_NOON}},
+            {"auction_end_date": {"$lte": "2026-03-01T12:00:00+00:00"}},
+        ]}
+
+        monkeypatch.setattr(bson_dates, "LEGACY_STRING_DATES", False)
+        later = UTC_NOON + timedelta(hours=24)
+        assert date_range("auction_end_date", {"$gte": UTC_NOON, "$lte": later}) == {
+            "auction_end_date": {"$gte": UTC_NOON, "$lte": later}
+        }
+        print("✅ Range filters cover both representations")
+
+
+class TestConversions:
+
+    def test_top_level_and_lots(self):
+        """Embedded lots convert by position; bad strings are reported, not written"""
+        doc = {
+            "_id": 1,
+            "created_at": "2026-03-01T12:00:00+00:00",
+            "auction_end_date": UTC_NOON,
+            "lots": [{"lot_end_time": "2026-03-01T07:01:00-05:00"}, {}, {"lot_end_time": "soon"}],
+        }
+        found = conversions(doc, bson_dates.DATE_FIELDS["multi_item_listings"])
+
+        assert set(found) == {"created_at", "lots.0.lot_end_time", "lots.2.lot_end_time"}
+        assert found["lots.0.lot_end_time"][1] == UTC_NOON + timedelta(minutes=1)
+        assert found["lots.2.lot_end_time"] == ("soon", None)
+
+        update = conversion_update(1, found)
+        assert update._filter == {
+            "_id": 1,
+            "created_at": "2026-03-01T12:00:00+00:00",
+            "lots.0.lot_end_time": "2026-03-01T07:01:00-05:00",
+        }
+        assert update._doc == {"$set": {"created_at": UTC_NOON, "lots.0.lot_end_time": UTC_NOON + timedelta(minutes=1)}}
+        assert conversion_update(2, {"created_at": ("soon", None)}) is None
+        print("✅ Guarded conversions built")
+
+
+@pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set - migration test needs MongoDB")
+class TestMigrationMongo:
+
+    def test_migrate_collection(self):
+        """Strings become BSON dates in small batches; dry runs write nothing"""
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def scenario():
+            client = AsyncIOMotorClient(MONGO_URL, **bson_dates.CLIENT_OPTIONS)
+            db = client[f"bidvex_dates_test_{uuid.uuid4().hex[:8]}"]
+            try:
+                await db.listings.insert_many([
+                    {"id": str(i), "created_at": (UTC_NOON + timedelta(minutes=i)).isoformat(),
+                     "auction_end_date": UTC_NOON + timedelta(days=7)} for i in range(7)
+                ] + [{"id": "bad", "created_at": "yesterday", "auction_end_date": UTC_NOON}])
+                dry = await bson_dates.migrate(db, batch_size=3, dry_run=True, collections=["listings"])
+                still_strings = await db.listings.count_documents({"created_at": {"$type": "string"}})
+                report = await bson_dates.migrate(db, batch_size=3, collections=["listings"])
+                stored = await db.listings.find_one({"id": "6"})
+                bad = await db.listings.find_one({"id": "bad"})
+                return dry, still_strings, report, stored, bad
+            finally:
+                await client.drop_database(db.name)
+                client.close()
+
+        dry, still_strings, report, stored, bad = asyncio.run(scenario())
+
+        assert dry["listings"]["converted"] == 7 and still_strings == 8
+        assert report["listings"] == {"scanned": 8, "converted": 7, "skipped": 0, "invalid": 1}
+        assert stored["created_at"] == UTC_NOON + timedelta(minutes=6) and stored["created_at"].tzinfo is not None
+        assert bad["created_at"] == "yesterday"
+        print("✅ Migration converts in batches")
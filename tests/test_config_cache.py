@@ -0,0 +1,80 @@
+"""
+Test Suite for the Config Cache
+Tests:
+1. Repeated reads within the TTL hit the cache (one loader call)
+2. Concurrent misses are single-flighted
+3. Invalidation via the backplane drops the entry and the next read reloads
+4. Returned values are private copies
+"""
+import os
+import sys
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.config_cache import ConfigCache
+from services.realtime_backplane import InProcessBackplane
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"minimum_bid_increment": 1.0, "version": self.calls}
+
+
+class TestConfigCache:
+
+    def test_hits_within_ttl(self):
+        async def scenario():
+            cache, loader = ConfigCache(ttl=60), CountingLoader()
+            for _ in range(10):
+                await cache.get("marketplace_settings", loader)
+            return loader.calls
+
+        assert asyncio.run(scenario()) == 1
+        print("✅ 10 reads, 1 database load")
+
+    def test_concurrent_misses_single_flight(self):
+        async def scenario():
+            cache, loader = ConfigCache(ttl=60), CountingLoader()
+            await asyncio.gather(*(cache.get("site_config", loader) for _ in range(50)))
+            return loader.calls
+
+        assert asyncio.run(scenario()) == 1
+        print("✅ 50 concurrent misses, 1 database load")
+
+    def test_invalidate_through_backplane_reloads(self):
+        async def scenario():
+            cache, loader = ConfigCache(ttl=60), CountingLoader()
+            cache.attach_backplane(InProcessBackplane())
+            first = await cache.get("email_templates", loader)
+            await cache.invalidate("email_templates")
+            second = await cache.get("email_templates", loader)
+            return first["version"], second["version"]
+
+        assert asyncio.run(scenario()) == (1, 2)
+        print("✅ Invalidation forces a reload")
+
+    def test_expired_entry_reloads(self):
+        async def scenario():
+            cache, loader = ConfigCache(ttl=0), CountingLoader()
+            await cache.get("site_config", loader)
+            await cache.get("site_config", loader)
+            return loader.calls
+
+        assert asyncio.run(scenario()) == 2
+        print("✅ TTL expiry forces a reload")
+
+    def test_callers_get_private_copies(self):
+        async def scenario():
+            cache, loader = ConfigCache(ttl=60), CountingLoader()
+            value = await cache.get("marketplace_settings", loader)
+            value["minimum_bid_increment"] = 999
+            return await cache.get("marketplace_settings", loader)
+
+        assert asyncio.run(scenario())["minimum_bid_increment"] == 1.0
+        print("✅ Mutating a result does not corrupt the cache")
@@ -0,0 +1,87 @@
+"""
+Test Suite for Bulk Email Sending
+Tests:
+1. Recipients are packed into SendGrid personalizations, 1,000 per API call
+2. Bulk requests respect the concurrency bound
+3. 429 responses are retried after Retry-After
+4. The token bucket caps request rate
+"""
+import os
+import sys
+import time
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+pytest.importorskip("httpx")
+
+from fake_providers import FakeSendGridTransport
+
+os.environ.setdefault("SENDGRID_API_KEY", "SG.test")
+
+
+def make_service(transport):
+    from services.email_service import EmailService
+    return EmailService(transport=transport)
+
+
+def recipients(count):
+    return [{"email": f"user{n}@example.com", "data": {"first_name": f"User {n}"}} for n in range(count)]
+
+
+class TestBulkSend:
+
+    def test_personalizations_batched(self):
+        """2,500 recipients go out in 3 API calls, each recipient exactly once"""
+        transport = FakeSendGridTransport(latency=0.01)
+        service = make_service(transport)
+
+        result = asyncio.run(service.send_bulk_email(recipients(2500), "d-test"))
+
+        assert result["success"] == 2500 and result["failed"] == 0
+        assert [len(body["personalizations"]) for body in transport.requests] == [1000, 1000, 500]
+        assert sorted(transport.recipients) == sorted(r["email"] for r in recipients(2500))
+        print("✅ 2,500 recipients sent in 3 requests")
+
+    def test_concurrency_bound(self):
+        """No more than SENDGRID_BULK_CONCURRENCY requests are in flight"""
+        from services import email_service
+
+        transport = FakeSendGridTransport(latency=0.05)
+        service = make_service(transport)
+        service.rate_limiter = email_service.TokenBucket(1000)
+
+        result = asyncio.run(service.send_bulk_email(recipients(12000), "d-test"))
+
+        assert result["success"] == 12000
+        assert 1 < transport.peak_in_flight <= email_service.SENDGRID_BULK_CONCURRENCY
+        print(f"✅ 12 requests with at most {transport.peak_in_flight} in flight")
+
+    def test_throttled_request_retried(self):
+        """A 429 is retried and the batch still succeeds"""
+        transport = FakeSendGridTransport(latency=0.01, throttle_first=1)
+        service = make_service(transport)
+
+        result = asyncio.run(service.send_email("user@example.com", "d-test", {}))
+
+        assert result["success"]
+        assert len(transport.requests) == 1
+        print("✅ 429 retried after Retry-After")
+
+    def test_token_bucket_rate(self):
+        """20 acquisitions at 20/s with a burst of 10 take about half a second"""
+        from services.email_service import TokenBucket
+
+        async def scenario():
+            bucket = TokenBucket(rate=20, capacity=10)
+            started = time.perf_counter()
+            for _ in range(20):
+                await bucket.acquire()
+            return time.perf_counter() - started
+
+        elapsed = asyncio.run(scenario())
+        assert 0.4 < elapsed < 1.0
+        print(f"✅ Token bucket paced 20 sends over {elapsed:.2f}s")
@@ -0,0 +1,191 @@
+"""
+Test Suite for the Fast List Response Path
+Tests:
+1. ModelShape projects exactly the model's fields, nested lot fields included
+2. Filled documents encode to the same JSON as the Pydantic models they replace
+3. Summary shapes never read attachments and carry a trimmed lot preview
+4. select() applies a fields= sparse fieldset and rejects unknown or detail-only names
+5. dumps() matches Pydantic's datetime format with and without orjson
+6. Keys read beyond the model (sort keys, internal fields, _id) never reach the response
+"""
+import os
+import ast
+import sys
+import json
+import uuid
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from pydantic import BaseModel, ConfigDict, Field
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import fast_response
+from services.fast_response import ModelShape, dumps
+
+SERVER = Path(__file__).resolve().parent.parent / 'backend' / 'server.py'
+
+
+def load_models(*names):
+    """The real response models, exec'd out of server.py (importing it needs the full app environment)"""
+    tree = ast.parse(SERVER.read_text())
+    namespace = {
+        "BaseModel": BaseModel, "ConfigDict": ConfigDict, "Field": Field, "Optional": Optional,
+        "List": List, "Dict": Dict, "Any": Any, "datetime": datetime, "timezone": timezone, "uuid": uuid,
+    }
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name in names:
+            exec(compile(ast.Module([node], []), str(SERVER), "exec"), namespace)
+    return [namespace[name] for name in names]
+
+
+Listing, Lot, MultiItemListing = load_models("Listing", "Lot", "MultiItemListing")
+END = datetime(2026, 6, 1, 18, 30, tzinfo=timezone.utc)
+
+
+def auction_doc():
+    return {
+        "id": "a1", "seller_id": "s1", "title": "Estate", "description": "Contents", "category": "estate",
+        "location": "1 Rue", "city": "Montréal", "region": "QC", "auction_end_date": END,
+        "created_at": END - timedelta(days=3), "status": "active", "views": 12,
+        "lots": [
+            {"lot_number": 1, "title": "Dresser", "description": "Oak", "quantity": 2, "starting_price": 10.0,
+             "current_price": 45.5, "condition": "used", "lot_end_time": END + timedelta(minutes=1)},
+            {"lot_number": 2, "title": "Lamp", "description": "Brass", "quantity": 1, "starting_price": 5.0,
+             "current_price": 5.0, "condition": "new", "images": ["/uploads/lamp.jpg"], "bid_count": 3},
+        ],
+    }
+
+
+class TestModelShape:
+
+    def test_projection(self):
+        """Model fields only; internal fields are never read"""
+        shape = ModelShape(MultiItemListing, nested={"lots": ModelShape(Lot)})
+
+        assert shape.projection["_id"] == 0
+        assert shape.projection["title"] == 1 and shape.projection["auction_terms_en"] == 1
+        assert shape.projection["lots.lot_end_time"] == 1 and shape.projection["lots.clicks"] == 1
+        assert "lots" not in shape.projection and "lots._id" not in shape.projection
+        assert "agreement_metadata" not in shape.projection and "search_terms" not in shape.projection
+        print("✅ Projection derived from the response model")
+
+    def test_same_json_as_models(self):
+        """Defaults filled in place give byte-for-byte the model output"""
+        shape = ModelShape(MultiItemListing, nested={"lots": ModelShape(Lot)})
+        expected = MultiItemListing(**auction_doc()).model_dump(mode="json")
+
+        assert json.loads(dumps(shape.fill(auction_doc()))) == expected
+
+        listing = {"id": "l1", "seller_id": "s1", "title": "Bike", "description": "Road", "category": "sport",
+                   "condition": "used", "starting_price": 50.0, "current_price": 75.0, "location": "x",
+                   "city": "Laval", "region": "QC", "auction_end_date": END, "created_at": END}
+        assert json.loads(dumps(ModelShape(Listing).fill(dict(listing)))) == Listing(**listing).model_dump(mode="json")
+        print("✅ Fast path JSON matches the models")
+
+    def test_extra_keys_dropped(self):
+        """A projection widened by a sort key cannot leak internal fields or an ObjectId"""
+        from bson import ObjectId
+        doc = {"id": "l1", "title": "Bike", "_id": ObjectId(), "search_terms": ["bike"],
+               "agreement_metadata": {"ip_address": "10.0.0.1", "user_email": "s@x.com"}}
+        filled = ModelShape(Listing).fill(doc)
+
+        assert "_id" not in filled and "agreement_metadata" not in filled and "search_terms" not in filled
+        assert filled["title"] == "Bike"
+        json.loads(dumps(filled))
+        print("✅ Non-model keys dropped")
+
+    def test_listing_sort_whitelist(self):
+        """GET /listings only accepts sort keys that are public Listing fields"""
+        tree = ast.parse(SERVER.read_text())
+        node = next(n for n in tree.body if isinstance(n, ast.Assign)
+                    and getattr(n.targets[0], "id", None) == "LISTING_SORT_FIELDS")
+        allowed = ast.literal_eval(node.value)
+        assert set(allowed) <= set(Listing.model_fields)
+        assert "agreement_metadata" not in allowed and "_id" not in allowed
+        print("✅ Sort keys whitelisted")
+
+    def test_defaults_are_not_shared(self):
+        """Mutable defaults are copied per document"""
+        shape = ModelShape(Lot)
+        first, second = shape.fill({}), shape.fill({})
+        first["images"].append("x")
+        assert second["images"] == []
+        print("✅ Mutable defaults copied")
+
+
+def summary_shape():
+    return ModelShape(
+        MultiItemListing,
+        nested={"lots": ModelShape(Lot, exclude=("description",))},
+        exclude=("documents", "auction_terms_en", "auction_terms_fr"),
+        slices={"lots": 3},
+    )
+
+
+class TestSummaryShapes:
+
+    def test_summary_projection(self):
+        """Attachments and terms are not read; lots come back as a $slice preview"""
+        shape = summary_shape()
+
+        assert "documents" not in shape.projection and "auction_terms_en" not in shape.projection
+        assert shape.projection["lots"] == {"$slice": 3}
+        assert not any(key.startswith("lots.") for key in shape.projection)
+        assert "documents" not in shape.fields
+        print("✅ Summary projection leaves attachments out")
+
+    def test_preview_lots_trimmed(self):
+        """Whole $slice elements are cut back to the lot summary fields"""
+        doc = auction_doc()
+        doc["lots"][0]["internal_note"] = "x"
+        filled = summary_shape().fill(doc)
+
+        assert all("description" not in lot and "internal_note" not in lot for lot in filled["lots"])
+        assert filled["lots"][1]["bid_count"] == 3 and filled["lots"][0]["images"] == []
+        assert "documents" not in filled
+        print("✅ Preview lots trimmed")
+
+
+class TestSparseFieldsets:
+
+    def test_select(self):
+        """Only the requested fields are returned; id is always read for cursors"""
+        shape = summary_shape().select("title, lots")
+
+        assert shape.projection == {"_id": 0, "title": 1, "lots": {"$slice": 3}, "id": 1}
+        doc = {"id": "a1", "title": "Estate", "created_at": END, "lots": [{"title": "Lamp", "description": "Brass"}]}
+        filled = shape.fill(doc)
+        assert set(filled) == {"title", "lots"}
+        assert filled["lots"][0]["title"] == "Lamp" and "description" not in filled["lots"][0]
+        whole = summary_shape()
+        assert whole.select(None) is whole and whole.select("") is whole
+        print("✅ Sparse fieldset applied")
+
+    def test_rejects_unknown_and_detail_only(self):
+        with pytest.raises(ValueError, match="documents"):
+            summary_shape().select("id,documents")
+        with pytest.raises(ValueError, match="agreement_metadata"):
+            summary_shape().select("agreement_metadata")
+        print("✅ Unknown and detail-only fields rejected")
+
+
+class TestDumps:
+
+    def test_datetime_format(self, monkeypatch):
+        """UTC as Z, other offsets kept, naive left naive - with or without orjson"""
+        content = {
+            "utc": END, "offset": END.astimezone(timezone(timedelta(hours=-5))),
+            "naive": datetime(2026, 6, 1, 12, 0), "text": "Montréal", "n": [1, 2.5, None, True],
+        }
+        expected = {
+            "utc": "2026-06-01T18:30:00Z", "offset": "2026-06-01T13:30:00-05:00",
+            "naive": "2026-06-01T12:00:00", "text": "Montréal", "n": [1, 2.5, None, True],
+        }
+        assert json.loads(dumps(content)) == expected
+
+        monkeypatch.setattr(fast_response, "orjson", None)
+        assert json.loads(dumps(content)) == expected
+        print("✅ Datetimes encoded like Pydantic")
@@ -0,0 +1,111 @@
+"""
+Test Suite for Batch Fee Quotes
+Tests:
+1. Batch results equal the scalar calculate_buyer_total rounded to the cent
+   (randomized over every tier / region / seller type)
+2. The pure-Python path matches the NumPy path
+3. Edge cases: empty batch, zero, negative and non-finite prices
+4. 10,000 prices quote faster in one batch than one at a time
+"""
+import os
+import sys
+import time
+import random
+from decimal import Decimal, ROUND_HALF_UP
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import fee_calculator
+from services.fee_calculator import (
+    BATCH_QUOTE_FIELDS,
+    SUBSCRIPTION_FEES,
+    TAX_RATES,
+    calculate_buyer_total,
+    calculate_buyer_totals,
+)
+
+
+def to_cent(value: float) -> float:
+    return float(Decimal(repr(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def random_prices(rng, count):
+    # Mix of small bids, round numbers and large lots, all whole cents
+    return [
+        rng.choice([
+            rng.randint(1, 999) / 100,
+            rng.randint(1, 5000),
+            rng.randint(100, 10_000_000) / 100,
+        ])
+        for _ in range(count)
+    ]
+
+
+class TestBatchQuote:
+
+    def test_matches_scalar_path(self):
+        """Every field equals the scalar result rounded to the cent"""
+        rng = random.Random(1337)
+        cases = 0
+        for tier in SUBSCRIPTION_FEES:
+            for region in (*TAX_RATES, "XX"):
+                for business in (False, True):
+                    prices = random_prices(rng, 60)
+                    batch = calculate_buyer_totals(prices, tier, region, business)
+                    for i, price in enumerate(prices):
+                        scalar = calculate_buyer_total(price, tier, region, business)
+                        for field in BATCH_QUOTE_FIELDS:
+                            assert batch[field][i] == to_cent(scalar[field]), (tier, region, business, price, field)
+                        for name, column in batch["tax_breakdown"].items():
+                            assert column[i] == to_cent(scalar["tax_breakdown"][name]), (tier, region, business, price, name)
+                        rates = {k: v for k, v in scalar["tax_breakdown"].items() if k.endswith("_rate")}
+                        assert batch["tax_rates"] == rates
+                        assert batch["buyer_premium_percent"] == scalar["buyer_premium_percent"]
+                        cases += 1
+        print(f"✅ {cases} randomized quotes match the scalar path")
+
+    def test_python_path_matches_numpy(self, monkeypatch):
+        """Results do not depend on NumPy being installed"""
+        pytest.importorskip("numpy")
+        prices = random_prices(random.Random(7), 500)
+        with_numpy = calculate_buyer_totals(prices, "premium", "QC", True)
+
+        monkeypatch.setattr(fee_calculator, "np", None)
+        without_numpy = calculate_buyer_totals(prices, "premium", "QC", True)
+
+        assert with_numpy == without_numpy
+        print("✅ NumPy and pure-Python paths agree")
+
+    def test_edge_cases(self):
+        """Empty batches, zero prices, negative and non-finite prices"""
+        empty = calculate_buyer_totals([], "free", "QC")
+        assert empty["count"] == 0 and empty["total"] == []
+
+        zero = calculate_buyer_totals([0], "free", "ON", True)
+        assert zero["total"] == [0.0]
+
+        with pytest.raises(ValueError):
+            calculate_buyer_totals([10, -1], "free", "QC")
+        # NaN / Infinity parse from JSON; the endpoint turns ValueError into a 400
+        for bad in (float("nan"), float("inf"), float("-inf")):
+            with pytest.raises(ValueError):
+                calculate_buyer_totals([10, bad], "free", "QC")
+        print("✅ Edge cases handled")
+
+    def test_batch_faster_than_scalar(self):
+        """10,000 prices: one batch call beats 10,000 scalar calls"""
+        prices = random_prices(random.Random(42), 10_000)
+
+        started = time.perf_counter()
+        for price in prices:
+            calculate_buyer_total(price, "vip", "QC", True)
+        scalar_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        calculate_buyer_totals(prices, "vip", "QC", True)
+        batch_seconds = time.perf_counter() - started
+
+        assert batch_seconds < scalar_seconds
+        print(f"✅ 10k quotes: scalar {scalar_seconds * 1000:.0f} ms, batch {batch_seconds * 1000:.0f} ms")
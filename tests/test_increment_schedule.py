@@ -0,0 +1,113 @@
+"""
+Test Suite for Increment Schedules
+Tests:
+1. Table lookups match the original if/elif helpers at every boundary and on random prices
+2. Schedule descriptions match the bands the increment-info endpoint used to hard-code
+3. next_valid_bids walks the ladder across band boundaries
+4. Single listings without an increment_option keep the flat settings increment
+"""
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.increment_schedule import (
+    MAX_LADDER_STEPS,
+    SCHEDULES,
+    minimum_increment,
+    next_valid_bids,
+    schedule_for,
+)
+
+
+# Reference copies of the helpers server.py used before the schedule tables
+def legacy_tiered(current_bid):
+    if current_bid < 100:
+        return 5
+    elif current_bid < 500:
+        return 10
+    elif current_bid < 1000:
+        return 25
+    elif current_bid < 5000:
+        return 50
+    elif current_bid < 10000:
+        return 100
+    elif current_bid < 50000:
+        return 250
+    elif current_bid < 100000:
+        return 500
+    else:
+        return 1000
+
+
+def legacy_simplified(current_bid):
+    if current_bid <= 100:
+        return 1
+    elif current_bid <= 1000:
+        return 5
+    elif current_bid <= 10000:
+        return 25
+    else:
+        return 100
+
+
+LEGACY = {"tiered": legacy_tiered, "simplified": legacy_simplified}
+
+
+class TestIncrementSchedule:
+
+    def test_matches_legacy_helpers(self):
+        """Bisect lookup agrees with the if/elif chains"""
+        rng = random.Random(2024)
+        for name, legacy in LEGACY.items():
+            schedule = SCHEDULES[name]
+            prices = [0, 0.01, 250_000]
+            for threshold in schedule.thresholds:
+                prices += [threshold - 0.01, threshold, threshold + 0.01]
+            prices += [round(rng.uniform(0, 200_000), 2) for _ in range(5000)]
+            for price in prices:
+                assert schedule.increment(price) == legacy(price), (name, price)
+        print("✅ Tiered and simplified lookups match the original helpers")
+
+    def test_describe_matches_endpoint_bands(self):
+        """increment-info bands are generated from the tables"""
+        assert SCHEDULES["tiered"].describe() == [
+            {"range": "$0-$99.99", "increment": "$5"},
+            {"range": "$100-$499.99", "increment": "$10"},
+            {"range": "$500-$999.99", "increment": "$25"},
+            {"range": "$1,000-$4,999.99", "increment": "$50"},
+            {"range": "$5,000-$9,999.99", "increment": "$100"},
+            {"range": "$10,000-$49,999.99", "increment": "$250"},
+            {"range": "$50,000-$99,999.99", "increment": "$500"},
+            {"range": "$100,000+", "increment": "$1,000"}
+        ]
+        assert SCHEDULES["simplified"].describe() == [
+            {"range": "$0-$100", "increment": "$1"},
+            {"range": "$100-$1,000", "increment": "$5"},
+            {"range": "$1,000-$10,000", "increment": "$25"},
+            {"range": "$10,000+", "increment": "$100"}
+        ]
+        print("✅ Schedule descriptions unchanged")
+
+    def test_ladder_crosses_bands(self):
+        """Each rung is the minimum bid if the previous rung were placed"""
+        auction = {"increment_option": "tiered"}
+        assert next_valid_bids(auction, 4, current_price=90) == [95, 100, 110, 120]
+        assert next_valid_bids({"increment_option": "simplified"}, 3, current_price=99.5) == [100.5, 105.5, 110.5]
+
+        ladder = next_valid_bids(auction, 100, current_price=0)
+        assert len(ladder) == MAX_LADDER_STEPS
+        for previous, bid in zip([0] + ladder, ladder):
+            assert bid == previous + legacy_tiered(previous)
+        print("✅ Ladder walks across increment bands")
+
+    def test_single_listing_flat_increment(self):
+        """No increment_option: flat settings increment, otherwise tiered"""
+        listing = {"id": "l1", "current_price": 40}
+
+        assert minimum_increment(listing, 40, flat_increment=2.5) == 2.5
+        assert next_valid_bids(listing, 3, flat_increment=2.5) == [42.5, 45, 47.5]
+        assert schedule_for(listing).name == "tiered"
+        assert schedule_for({"increment_option": "unknown"}).name == "tiered"
+        print("✅ Single listings keep the flat increment")
@@ -0,0 +1,119 @@
+"""
+Test Suite for the Invoice Template Engine
+Tests:
+1. Documents reference the shared logo and stylesheets instead of inlining base64
+2. Lot data is HTML-escaped
+3. French documents use the French translations
+4. Every document renders in both languages from precompiled templates
+"""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+pytest.importorskip("jinja2")
+
+
+def sample_data(lot_count=3):
+    lots = [
+        {
+            "lot_number": n,
+            "title": f"Lamp <b>{n}</b> & shade",
+            "description": "Brass table lamp",
+            "quantity": 1,
+            "hammer_price": 100.0 * n,
+            "status": "sold",
+            "buyer_name": "Marie",
+            "paddle_number": 7,
+        }
+        for n in range(1, lot_count + 1)
+    ]
+    total = sum(lot["hammer_price"] for lot in lots)
+    return {
+        "invoice_number": "BV-1",
+        "receipt_number": "RC-1",
+        "currency": "CAD",
+        "paddle_number": 7,
+        "auction": {"title": "Spring Sale", "auction_end_date": datetime(2026, 3, 14), "city": "Montréal", "region": "QC"},
+        "buyer": {"name": "Marie", "email": "marie@example.com", "phone": "", "company_name": ""},
+        "seller": {"name": "Jean", "email": "jean@example.com", "phone": "", "company_name": ""},
+        "lots": lots,
+        "lots_count": lot_count,
+        "total_lots": lot_count,
+        "lots_sold": lot_count,
+        "premium_percentage": 5.0,
+        "tax_rate_gst": 5.0,
+        "tax_rate_qst": 9.975,
+        "hammer_total": total,
+        "premium_amount": total * 0.05,
+        "total_tax": total * 0.15,
+        "grand_total": total * 1.2,
+        "total_hammer": total,
+        "commission_rate": 10.0,
+        "commission_amount": total * 0.1,
+        "net_payout": total,
+    }
+
+
+def all_templates():
+    from invoice_templates_bilingual import lots_won_template
+    from invoice_templates_complete import (
+        payment_letter_template,
+        seller_statement_template,
+        seller_receipt_template,
+        commission_invoice_template,
+    )
+    return [lots_won_template, payment_letter_template, seller_statement_template,
+            seller_receipt_template, commission_invoice_template]
+
+
+class TestInvoiceEngine:
+
+    def test_shared_assets(self):
+        """The logo and CSS are linked files, not inline data"""
+        from invoice_engine import STATIC_DIR
+        from invoice_templates_bilingual import lots_won_template
+
+        html = lots_won_template(sample_data(), "en")
+
+        assert "base64" not in html
+        assert (STATIC_DIR / "bidvex_logo.png").as_uri() in html
+        assert (STATIC_DIR / "invoice_base.css").as_uri() in html
+        assert len(html) < 20_000
+        print(f"✅ Lots won document is {len(html) / 1024:.1f} KB with linked assets")
+
+    def test_lot_data_escaped(self):
+        """User-supplied titles cannot inject markup"""
+        from invoice_templates_bilingual import lots_won_template
+
+        html = lots_won_template(sample_data(), "en")
+
+        assert "<b>1</b>" not in html
+        assert "Lamp &lt;b&gt;1&lt;/b&gt; &amp; shade" in html
+        print("✅ Lot titles escaped")
+
+    def test_french_translations(self):
+        """fr renders French strings; unknown languages fall back to English"""
+        from invoice_translations import get_translation
+        from invoice_templates_complete import seller_receipt_template
+
+        fr = seller_receipt_template(sample_data(), "fr")
+        en = seller_receipt_template(sample_data(), "de")
+
+        assert get_translation("seller_receipt", "fr") in fr
+        assert get_translation("seller_receipt", "en") in en
+        print("✅ French and fallback translations rendered")
+
+    def test_all_documents_render(self):
+        """Every document renders in both languages"""
+        from invoice_engine import _compiled, DOCUMENTS, LANGUAGES
+
+        assert len(_compiled) == len(DOCUMENTS) * len(LANGUAGES)
+        for template in all_templates():
+            for lang in LANGUAGES:
+                html = template(sample_data(), lang)
+                assert html.lstrip().startswith("<!DOCTYPE html>")
+        print("✅ 5 documents x 2 languages rendered")
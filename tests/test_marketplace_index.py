@@ -0,0 +1,382 @@
+"""
+Test Suite for the Marketplace Item Index
+Tests:
+1. Precomputed sort keys: promotion weight then newest; featured first, soonest end, undated last
+2. Every sort pages by cursor over every item exactly once, in the documented order
+3. Cursors are bound to their sort; legacy skip returns the same rows as walking cursors
+4. sync_listing materializes active listings and drops them (and their search status) on transition
+5. rebuild_marketplace_items re-materializes active sources and removes stale items
+6. Cursor pages against MongoDB's own query engine (requires MongoDB: set MONGO_URL)
+"""
+import os
+import sys
+import uuid
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import marketplace_index
+from services.marketplace_index import build_listing_item, build_lot_item, fetch_page, sort_keys
+from services.pagination import InvalidCursor
+
+MONGO_URL = os.environ.get('MONGO_URL')
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _rank(value):
+    """MongoDB's cross-type sort order for the values these documents hold"""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (4, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, value)
+
+
+def _get(doc, path):
+    for part in path.split("."):
+        doc = doc.get(part) if isinstance(doc, dict) else None
+    return doc
+
+
+def _matches(doc, query):
+    """Just enough of MongoDB's matcher for the marketplace filters"""
+    for key, cond in query.items():
+        if key == "$and":
+            if not all(_matches(doc, q) for q in cond):
+                return False
+        elif key == "$or":
+            if not any(_matches(doc, q) for q in cond):
+                return False
+        elif isinstance(cond, dict) and any(op.startswith("$") for op in cond):
+            value = _get(doc, key)
+            for op, operand in cond.items():
+                comparable = value is not None and _rank(value)[0] == _rank(operand)[0]
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$exists" and (value is not None) != operand:
+                    return False
+                if op == "$all" and not set(operand) <= set(value or []):
+                    return False
+                if op == "$type":
+                    return False
+                if op == "$gt" and not (comparable and value > operand):
+                    return False
+                if op == "$gte" and not (comparable and value >= operand):
+                    return False
+                if op == "$lt" and not (comparable and value < operand):
+                    return False
+                if op == "$lte" and not (comparable and value <= operand):
+                    return False
+        elif _get(doc, key) != cond:
+            return False
+    return True
+
+
+def _project(doc, projection):
+    if not projection:
+        return dict(doc)
+    included = [k for k, v in projection.items() if v and k != "_id"]
+    if included:
+        return {k: doc[k] for k in included if k in doc}
+    return {k: v for k, v in doc.items() if projection.get(k, 1) and k != "_id"}
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, spec):
+        for field, direction in reversed(spec):
+            self.docs.sort(key=lambda d: _rank(d.get(field)), reverse=direction < 0)
+        return self
+
+    def skip(self, n):
+        self.docs = self.docs[n:]
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, n):
+        return self.docs[:n]
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class Result:
+    def __init__(self, count):
+        self.deleted_count = self.modified_count = count
+
+
+class FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = [dict(d) for d in docs]
+        self.queries = 0
+
+    def find(self, query, projection=None):
+        self.queries += 1
+        return FakeCursor([_project(d, projection) for d in self.docs if _matches(d, query)])
+
+    async def find_one(self, query, projection=None):
+        found = [_project(d, projection) for d in self.docs if _matches(d, query)]
+        return found[0] if found else None
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs = [d for d in self.docs if not _matches(d, query)] + [dict(doc)]
+
+    async def update_many(self, query, update):
+        hits = [d for d in self.docs if _matches(d, query)]
+        for d in hits:
+            d.update(update["$set"])
+        return Result(len(hits))
+
+    async def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            target = next((d for d in self.docs if _matches(d, op._filter)), None)
+            if target is None:
+                self.docs.append(target := {})
+            target.update(op._doc["$set"])
+
+    async def delete_many(self, query):
+        before = len(self.docs)
+        self.docs = [d for d in self.docs if not _matches(d, query)]
+        return Result(before - len(self.docs))
+
+    async def delete_one(self, query):
+        for n, d in enumerate(self.docs):
+            if _matches(d, query):
+                del self.docs[n]
+                return Result(1)
+        return Result(0)
+
+
+class FakeDB:
+    def __init__(self, items=(), listings=(), auctions=(), users=()):
+        self.marketplace_items = FakeCollection(items)
+        self.listings = FakeCollection(listings)
+        self.multi_item_listings = FakeCollection(auctions)
+        self.users = FakeCollection(users)
+        self.search_index = FakeCollection()
+
+
+def listing(n, **overrides):
+    doc = {
+        "id": f"l{n:02d}", "seller_id": "s1", "title": f"Item {n}", "description": "Good", "category": "tools",
+        "starting_price": 5.0, "current_price": float(n % 7), "status": "active",
+        "created_at": NOW - timedelta(days=n), "auction_end_date": NOW + timedelta(hours=n),
+    }
+    doc.update(overrides)
+    return doc
+
+
+def catalogue():
+    """Items across every segment: featured/urgent, featured, urgent, promoted tiers, undated"""
+    docs = []
+    for n in range(24):
+        overrides = {}
+        if n % 5 == 0:
+            overrides["is_featured"] = True
+        if n % 3 == 0:
+            overrides["promotion_tier"] = ("premium", "standard", "basic")[n % 9 // 3]
+        if n % 4 == 0:
+            overrides["auction_end_date"] = NOW + timedelta(minutes=5 + n)  # ending within the hour
+        if n % 11 == 0:
+            overrides["auction_end_date"] = None
+        docs.append(build_listing_item(listing(n, **overrides), False))
+    return docs
+
+
+def reference_order(items, sort):
+    """The documented order: featured, then ending within the hour (soonest first), then tier and newest"""
+    def end(item):
+        return item["lot_end_time"]
+
+    if sort == "ending_soon":
+        return sorted(items, key=lambda x: (0 if x.get("is_featured") else 1, end(x) or datetime.max.replace(tzinfo=timezone.utc)))
+    if sort == "-promoted":
+        def urgent(x):
+            return end(x) is not None and NOW < end(x) <= NOW + timedelta(hours=1)
+        return sorted(items, key=lambda x: (
+            -1 if x.get("is_featured") else 0,
+            (0, end(x).timestamp(), 0) if urgent(x) else (1, -x["promotion_weight"], -x["created_at"].timestamp()),
+        ))
+    if sort == "price":
+        return sorted(items, key=lambda x: (x["current_price"], x["id"]))
+    return sorted(items, key=lambda x: -x["created_at"].timestamp())
+
+
+def walk(db, sort, limit, query=None):
+    async def run():
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = await fetch_page(db, query or {}, sort, limit, cursor, now=NOW)
+            seen.extend(page.items)
+            pages += 1
+            if page.next_cursor is None:
+                return seen, pages
+            cursor = page.next_cursor
+    return asyncio.run(run())
+
+
+class TestSortKeys:
+
+    def test_ending_key(self):
+        """Featured first, then soonest end; undated items after every dated one"""
+        def key(featured, end):
+            return sort_keys({"promotion_weight": 0, "is_featured": featured, "lot_end_time": end})["ending_key"]
+
+        ordered = [key(True, NOW), key(True, None), key(False, NOW - timedelta(days=1)), key(False, NOW), key(False, None)]
+        assert ordered == sorted(ordered)
+        print("✅ ending_key orders featured, dated, undated")
+
+    def test_promotion_key(self):
+        """Weight first, then newest, compared as text"""
+        def key(weight, created):
+            return sort_keys({"promotion_weight": weight, "created_at": created})["promotion_key"]
+
+        ordered = [key(3, NOW - timedelta(days=30)), key(2, NOW), key(2, NOW - timedelta(seconds=1)), key(0, NOW), key(0, None)]
+        assert ordered == sorted(ordered, reverse=True)
+        print("✅ promotion_key orders weight then newest")
+
+    def test_keys_not_public(self):
+        item = build_lot_item({"id": "a1", "title": "Estate", "auction_end_date": NOW},
+                              {"lot_number": 2, "title": "Lamp", "description": "Brass"}, False)
+        assert item["ending_key"].startswith("1|") and item["promotion_key"].startswith("0|")
+        assert marketplace_index.PUBLIC_PROJECTION["ending_key"] == 0
+        assert marketplace_index.PUBLIC_PROJECTION["promotion_key"] == 0
+        print("✅ Sort keys stored, never returned")
+
+
+class TestCursorPages:
+
+    @pytest.mark.parametrize("sort", ["-promoted", "ending_soon", "price", "newest"])
+    def test_walk_matches_reference_order(self, sort):
+        """Small pages across segment boundaries give the full order, each item once"""
+        items = catalogue()
+        seen, pages = walk(FakeDB(items), sort, 4)
+
+        assert [i["id"] for i in seen] == [i["id"] for i in reference_order(items, sort)]
+        assert pages >= len(items) // 4
+        assert all("ending_key" not in i and "promotion_key" not in i and "lot_end_time" not in i for i in seen)
+        print(f"✅ {sort} pages in order")
+
+    def test_undated_last_when_ending_soon(self):
+        seen, _ = walk(FakeDB(catalogue()), "ending_soon", 50)
+        plain = [i["auction_end_date"] is None for i in seen if not i.get("is_featured")]
+        assert plain == sorted(plain) and plain[-1]
+        print("✅ Undated items sort last")
+
+    def test_no_counts_or_offsets(self):
+        """A deep page costs one query per segment it touches, whatever its depth"""
+        db = FakeDB(catalogue())
+        _, pages = walk(db, "newest", 2)
+        assert db.marketplace_items.queries == pages
+        print("✅ One keyset query per page")
+
+    def test_cursor_bound_to_sort_and_skip(self):
+        db = FakeDB(catalogue())
+
+        async def run():
+            first = await fetch_page(db, {}, "price", 5, now=NOW)
+            with pytest.raises(InvalidCursor):
+                await fetch_page(db, {}, "ending_soon", 5, first.next_cursor)
+            with pytest.raises(InvalidCursor):
+                await fetch_page(db, {}, "price", 5, "not-a-cursor")
+            skipped = await fetch_page(db, {}, "-promoted", 5, skip=7, now=NOW)
+            past_end = await fetch_page(db, {}, "-promoted", 5, skip=500, now=NOW)
+            return skipped, past_end
+
+        skipped, past_end = asyncio.run(run())
+        walked, _ = walk(db, "-promoted", 50)
+        assert [i["id"] for i in skipped.items] == [i["id"] for i in walked[7:12]]
+        assert past_end.items == [] and past_end.next_cursor is None
+        print("✅ Cursors bound to sort; legacy skip agrees")
+
+
+class TestSync:
+
+    def test_sync_listing(self):
+        db = FakeDB(listings=[listing(1)], users=[{"id": "s1", "is_tax_registered": True}])
+        db.search_index.docs.append({"id": "l01", "status": "active"})
+
+        async def run():
+            await marketplace_index.sync_listing(db, "l01")
+            synced = [dict(d) for d in db.marketplace_items.docs]
+            db.listings.docs[0]["status"] = "sold"
+            await marketplace_index.sync_listing(db, "l01")
+            return synced
+
+        synced = asyncio.run(run())
+
+        assert [d["id"] for d in synced] == ["l01"] and synced[0]["seller_is_business"]
+        assert synced[0]["ending_key"] and synced[0]["synced_at"]
+        assert db.marketplace_items.docs == []
+        assert db.search_index.docs[0]["status"] == "sold"
+        print("✅ Listing synced, then removed on transition")
+
+    def test_reconcile(self):
+        """Active sources are (re)built; anything the run did not touch is removed"""
+        auction = {"id": "a1", "seller_id": "s1", "title": "Estate", "status": "active", "created_at": NOW,
+                   "auction_end_date": NOW + timedelta(days=1),
+                   "lots": [{"lot_number": 1, "title": "Lamp", "description": "Brass"},
+                            {"lot_number": 2, "title": "Desk", "description": "Oak", "lot_status": "sold_out"}]}
+        stale = {**build_listing_item(listing(9), False), "synced_at": NOW - timedelta(days=1)}
+        db = FakeDB(items=[stale], listings=[listing(1), listing(2, status="ended")], auctions=[auction])
+
+        report = asyncio.run(marketplace_index.rebuild_marketplace_items(db))
+
+        assert sorted(d["id"] for d in db.marketplace_items.docs) == ["a1_lot1", "l01"]
+        assert report == {"upserted": 2, "removed": 1}
+        print("✅ Reconcile rebuilt active items and removed stale ones")
+
+
+@pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set - marketplace index test needs MongoDB")
+class TestCursorPagesMongo:
+
+    def test_walk_against_mongo(self):
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def scenario():
+            client = AsyncIOMotorClient(MONGO_URL, tz_aware=True)
+            db = client[f"bidvex_marketplace_test_{uuid.uuid4().hex[:8]}"]
+            try:
+                await db.marketplace_items.insert_many([dict(item) for item in catalogue()])
+                orders = {}
+                for sort in ("-promoted", "ending_soon", "price"):
+                    seen, cursor = [], None
+                    while True:
+                        page = await fetch_page(db, {}, sort, 3, cursor, now=NOW)
+                        seen.extend(item["id"] for item in page.items)
+                        if page.next_cursor is None:
+                            break
+                        cursor = page.next_cursor
+                    orders[sort] = seen
+                return orders
+            finally:
+                await client.drop_database(db.name)
+                client.close()
+
+        orders = asyncio.run(scenario())
+
+        for sort, seen in orders.items():
+            assert seen == [i["id"] for i in reference_order(catalogue(), sort)]
+        print("✅ Cursor pages against MongoDB")
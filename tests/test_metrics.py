@@ -0,0 +1,76 @@
+"""
+Test Suite for In-Process Metrics
+Tests:
+1. Percentiles over a full reservoir match the sorted samples
+2. Once the reservoir is full, count/mean/max still cover every sample and
+   the reservoir stays bounded
+3. Counters, gauges and timers show up in the snapshot; reset clears them
+"""
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.metrics import LatencyHistogram, MetricsRegistry
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram(size=1000)
+        values = [n / 1000 for n in range(1, 101)]
+        for value in random.sample(values, len(values)):
+            histogram.observe(value)
+
+        assert histogram.percentile(0) == 0.001
+        assert histogram.percentile(50) == 0.051  # round(0.5 * 99) = 50 -> 51st sample
+        assert histogram.percentile(90) == 0.090
+        assert histogram.percentile(99) == 0.099
+        assert histogram.percentile(100) == 0.100
+        assert LatencyHistogram().percentile(50) is None
+        print("✅ Percentiles read from the sorted reservoir")
+
+    def test_reservoir_is_bounded(self):
+        random.seed(7)
+        histogram = LatencyHistogram(size=100)
+        for n in range(10_000):
+            histogram.observe(n / 10_000)
+
+        assert len(histogram.samples) == 100
+        assert histogram.count == 10_000 and histogram.max == 0.9999
+        summary = histogram.summary()
+        assert summary["count"] == 10_000
+        assert summary["mean_ms"] == round(sum(n / 10_000 for n in range(10_000)) / 10_000 * 1000, 3)
+        assert summary["max_ms"] == 999.9
+        # A uniform sample of a uniform stream - the median lands near the middle
+        assert 300 < summary["p50_ms"] < 700
+        print("✅ Reservoir stays bounded; totals cover every sample")
+
+    def test_empty_summary(self):
+        assert LatencyHistogram().summary() == {
+            "count": 0, "mean_ms": None, "p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None,
+        }
+        print("✅ Empty histogram summarised without dividing by zero")
+
+
+class TestMetricsRegistry:
+
+    def test_snapshot_and_reset(self):
+        registry = MetricsRegistry()
+        registry.inc("ws_sent")
+        registry.inc("ws_sent", 4)
+        registry.set_gauge("auction_timer_pending", 12)
+        registry.observe("ws_send_seconds", 0.004)
+        with registry.timer("ws_fanout_seconds"):
+            pass
+
+        snapshot = registry.snapshot()
+        assert snapshot["counters"] == {"ws_sent": 5}
+        assert snapshot["gauges"] == {"auction_timer_pending": 12}
+        assert snapshot["latency"]["ws_send_seconds"]["p50_ms"] == 4.0
+        assert snapshot["latency"]["ws_fanout_seconds"]["count"] == 1
+
+        registry.reset()
+        assert registry.snapshot() == {"counters": {}, "gauges": {}, "latency": {}}
+        print("✅ Counters, gauges and timers snapshot and reset")
@@ -0,0 +1,169 @@
+"""
+Test Suite for the Notification Outbox
+Tests:
+1. Twilio (thread pool) and SendGrid (async HTTP) sends never block the event loop
+2. Duplicate outbox rows are dropped by idempotency key
+3. Failed deliveries retry with backoff and end as "failed" after max attempts
+4. Per-channel concurrency limits are respected
+
+Tests 2-4 require a MongoDB instance: set MONGO_URL (a throwaway database is created and dropped).
+"""
+import os
+import sys
+import time
+import uuid
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_providers import FakeTwilioClient, FakeSendGridTransport, measure_loop_stall
+
+MONGO_URL = os.environ.get('MONGO_URL')
+needs_mongo = pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set - outbox dispatch tests need MongoDB")
+
+
+class _Collection:
+    def __init__(self):
+        self.docs = []
+
+    async def insert_one(self, doc):
+        self.docs.append(doc)
+
+
+class SmsLogDB:
+    """Only what send_sms touches"""
+    def __init__(self):
+        self.sms_logs = _Collection()
+
+
+class TestProviderThreadPool:
+
+    def test_twilio_send_does_not_block_loop(self):
+        from services.sms_notification_service import SMSNotificationService
+
+        service = SMSNotificationService(SmsLogDB())
+        service.client, service.from_number = FakeTwilioClient(latency=0.2), "+15550000000"
+
+        async def scenario():
+            sends = asyncio.gather(*(service.send_sms(f"+1555000{n:04d}", "outbid", "outbid") for n in range(8)))
+            return await measure_loop_stall(sends)
+
+        started = time.perf_counter()
+        results, worst_gap = asyncio.run(scenario())
+        elapsed = time.perf_counter() - started
+
+        assert all(r["status"] == "sent" for r in results)
+        assert worst_gap < 0.1
+        assert elapsed < 8 * 0.2
+        assert all(name.startswith("twilio") for name in service.client.threads)
+        print(f"✅ 8 Twilio sends in {elapsed:.2f}s, worst loop stall {worst_gap * 1000:.0f}ms")
+
+    def test_sendgrid_send_does_not_block_loop(self):
+        pytest.importorskip("httpx")
+        from services.email_service import EmailService
+
+        os.environ.setdefault("SENDGRID_API_KEY", "SG.test")
+        transport = FakeSendGridTransport(latency=0.2)
+        service = EmailService(transport=transport)
+
+        async def scenario():
+            sends = asyncio.gather(*(service.send_email(f"user{n}@example.com", "d-test", {}) for n in range(8)))
+            return await measure_loop_stall(sends)
+
+        results, worst_gap = asyncio.run(scenario())
+        assert all(r["success"] for r in results)
+        assert worst_gap < 0.1
+        assert transport.peak_in_flight > 1
+        print(f"✅ 8 SendGrid sends, worst loop stall {worst_gap * 1000:.0f}ms")
+
+
+async def with_outbox(scenario, **outbox_kwargs):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from services.db_indexes import ensure_indexes
+    from services.notification_outbox import NotificationOutbox
+
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[f"bidvex_outbox_test_{uuid.uuid4().hex[:8]}"]
+    try:
+        await ensure_indexes(db)
+        return await scenario(db, NotificationOutbox(db, **outbox_kwargs))
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+@needs_mongo
+class TestOutboxDispatch:
+
+    def test_duplicates_dropped(self):
+        from services.notification_outbox import outbox_entry
+
+        async def scenario(db, outbox):
+            delivered = []
+
+            async def handler(entry):
+                delivered.append(entry["idempotency_key"])
+                return "sent"
+
+            outbox.register_channel("in_app", handler)
+            for _ in range(3):  # a client retrying the same bid
+                await outbox.enqueue([outbox_entry("in_app", "outbid", "user-1", {"id": "n1"}, "outbid:bid-1")])
+            while await outbox.dispatch_once("in_app"):
+                pass
+            return delivered
+
+        assert asyncio.run(with_outbox(scenario)) == ["in_app:outbid:bid-1"]
+        print("✅ Same idempotency key queued 3 times, delivered once")
+
+    def test_retries_then_fails(self):
+        from services.notification_outbox import outbox_entry
+
+        async def scenario(db, outbox):
+            calls = {"flaky": 0, "dead": 0}
+
+            async def handler(entry):
+                calls[entry["payload"]["name"]] += 1
+                if entry["payload"]["name"] == "dead" or calls["flaky"] < 3:
+                    raise RuntimeError("provider down")
+                return "sent"
+
+            outbox.register_channel("sms", handler)
+            await outbox.enqueue([
+                outbox_entry("sms", "outbid", "user-1", {"name": "flaky"}, "flaky"),
+                outbox_entry("sms", "outbid", "user-2", {"name": "dead"}, "dead"),
+            ])
+            for _ in range(10):
+                await outbox.dispatch_once("sms")
+            rows = await db.notification_outbox.find({}, {"_id": 0}).to_list(None)
+            return {r["payload"]["name"]: (r["status"], r["attempts"]) for r in rows}
+
+        states = asyncio.run(with_outbox(scenario, max_attempts=4, retry_base=0))
+        assert states == {"flaky": ("sent", 3), "dead": ("failed", 4)}
+        print("✅ Flaky provider retried to success; dead provider parked as failed")
+
+    def test_channel_concurrency_limit(self):
+        from services.notification_outbox import outbox_entry
+
+        async def scenario(db, outbox):
+            in_flight, peak = 0, 0
+
+            async def handler(entry):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.02)
+                in_flight -= 1
+                return "sent"
+
+            outbox.register_channel("sms", handler, concurrency=3)
+            await outbox.enqueue([outbox_entry("sms", "outbid", f"user-{n}", {}, f"k{n}") for n in range(30)])
+            while await outbox.dispatch_once("sms"):
+                pass
+            return peak, await db.notification_outbox.count_documents({"status": "sent"})
+
+        peak, sent = asyncio.run(with_outbox(scenario))
+        assert peak <= 3 and sent == 30
+        print(f"✅ 30 SMS delivered with at most {peak} in flight")
@@ -0,0 +1,229 @@
+"""
+Test Suite for Keyset Pagination
+Tests:
+1. Cursors round-trip (sort_key, id), including datetimes, and are bound to their sort
+2. Malformed cursors are rejected
+3. keyset_filter selects rows strictly after the cursor, ties broken by id
+4. Walking fetch_page cursors visits every row exactly once, even with equal sort keys and nulls
+5. merge_pages pages two sources as one stream
+6. Mixed ISO-string / BSON-date sort keys page in MongoDB's type order without skipping rows
+"""
+import os
+import sys
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.pagination import (
+    InvalidCursor,
+    bson_type,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    keyset_filter,
+    merge_pages,
+)
+
+
+def _matches(doc, query):
+    """Just enough of MongoDB's matcher for the filters pagination builds"""
+    for key, cond in query.items():
+        if key == "$and":
+            if not all(_matches(doc, q) for q in cond):
+                return False
+        elif key == "$or":
+            if not any(_matches(doc, q) for q in cond):
+                return False
+        elif isinstance(cond, dict):
+            value = doc.get(key)
+            for op, operand in cond.items():
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$type" and (value is None or bson_type(value) != operand):
+                    return False
+                if op in ("$lt", "$gt", "$in") and value is None:
+                    return False
+                # Comparisons only match values of the operand's BSON type
+                if op in ("$lt", "$gt") and bson_type(value) != bson_type(operand):
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+        elif doc.get(key) != cond:
+            return False
+    return True
+
+
+def bson_key(value):
+    """MongoDB's cross-type sort order: null < numbers < strings < dates"""
+    rank = {None: 0, "number": 1, "string": 2, "date": 3}[bson_type(value) if value is not None else None]
+    return (rank, value if value is not None else 0)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.skipped = 0
+
+    def sort(self, spec):
+        for field, direction in reversed(spec):
+            self.docs.sort(key=lambda d: bson_key(d.get(field)), reverse=direction < 0)
+        return self
+
+    def skip(self, n):
+        self.skipped = n
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[self.skipped:self.skipped + n]
+        return self
+
+    async def to_list(self, n):
+        return self.docs[:n]
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return FakeCursor([dict(d) for d in self.docs if _matches(d, query)])
+
+
+def walk(collection, query, field, direction, limit):
+    async def run():
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = await fetch_page(collection, query, field, direction, limit, cursor)
+            seen.extend(item["id"] for item in page.items)
+            pages += 1
+            if page.next_cursor is None:
+                return seen, pages
+            cursor = page.next_cursor
+    return asyncio.run(run())
+
+
+class TestCursorContract:
+
+    def test_round_trip(self):
+        """A cursor decodes to the sort key and id it was built from"""
+        when = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+        for value in ["2026-03-01T12:30:00+00:00", 125.5, when, None]:
+            cursor = encode_cursor("created_at", -1, value, "abc")
+            assert decode_cursor(cursor, "created_at", -1) == (value, "abc")
+        print("✅ Cursors round-trip")
+
+    def test_bound_to_sort(self):
+        """Replaying a cursor against another sort is rejected"""
+        cursor = encode_cursor("created_at", -1, "2026-01-01", "abc")
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor, "created_at", 1)
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor, "current_price", -1)
+        print("✅ Cursor bound to its sort")
+
+    def test_malformed(self):
+        """Garbage cursors raise InvalidCursor (HTTP 400), not 500"""
+        for bad in ["not-a-cursor", "e30", "!!!!"]:
+            with pytest.raises(InvalidCursor):
+                decode_cursor(bad, "created_at", -1)
+        print("✅ Malformed cursors rejected")
+
+    def test_keyset_filter(self):
+        """Strictly after (value, id) with id as tiebreak"""
+        assert keyset_filter("created_at", -1, "2026", "m") == {"$or": [
+            {"created_at": {"$lt": "2026"}},
+            {"created_at": "2026", "id": {"$lt": "m"}},
+            {"created_at": None},
+        ]}
+        assert keyset_filter("current_price", 1, 10, "m") == {"$or": [
+            {"current_price": {"$gt": 10}},
+            {"current_price": 10, "id": {"$gt": "m"}},
+        ]}
+        print("✅ Keyset filter shape")
+
+
+class TestFetchPage:
+
+    def test_walk_visits_every_row_once(self):
+        """Duplicate sort keys and nulls neither repeat nor drop rows"""
+        docs = [{"id": f"{i:03d}", "status": "active", "created_at": f"2026-01-{i % 7:02d}"} for i in range(53)]
+        docs += [{"id": f"n{i}", "status": "active", "created_at": None} for i in range(4)]
+        docs.append({"id": "sold", "status": "sold", "created_at": "2026-01-01"})
+        expected = sorted(
+            (d for d in docs if d["status"] == "active"),
+            key=lambda d: (d["created_at"] is not None, d["created_at"], d["id"]),
+        )
+
+        for direction in (-1, 1):
+            order = [d["id"] for d in (reversed(expected) if direction < 0 else expected)]
+            seen, pages = walk(FakeCollection(docs), {"status": "active"}, "created_at", direction, 10)
+            assert seen == order
+            assert pages == 6
+        print("✅ Cursor walk is complete and stable")
+
+    def test_cursor_query_is_keyset(self):
+        """Later pages add a keyset predicate instead of skipping"""
+        collection = FakeCollection([{"id": str(i), "created_at": i} for i in range(30)])
+        walk(collection, {}, "created_at", -1, 10)
+        assert collection.queries[0] == {}
+        assert "$or" in collection.queries[1]
+        print("✅ Later pages seek by key")
+
+    def test_merge_pages(self):
+        """Two collections page as one stream newest first"""
+        singles = FakeCollection([{"id": f"s{i}", "seller_id": "S", "created_at": f"2026-01-{i * 2 + 1:02d}"} for i in range(8)])
+        multis = FakeCollection([{"id": f"m{i}", "seller_id": "S", "created_at": f"2026-01-{i * 2 + 2:02d}"} for i in range(5)])
+
+        async def run():
+            pages, cursor = [], None
+            while True:
+                (single, multi), cursor = await merge_pages(
+                    [(singles, {"seller_id": "S"}), (multis, {"seller_id": "S"})], "created_at", -1, 4, cursor
+                )
+                pages.append(([d["id"] for d in single], [d["id"] for d in multi]))
+                if cursor is None:
+                    return pages
+
+        pages = asyncio.run(run())
+        assert pages[0] == (["s7", "s6", "s5"], ["m4"])
+        merged = [i for single, multi in pages for i in single + multi]
+        assert sorted(merged) == sorted([f"s{i}" for i in range(8)] + [f"m{i}" for i in range(5)])
+        assert all(len(s) + len(m) <= 4 for s, m in pages)
+        print("✅ Seller listings merged under one cursor")
+
+    def test_mixed_string_and_date_keys(self):
+        """Half-migrated created_at: every row visited once in both directions, merge does not raise"""
+        docs = [{"id": f"d{i}", "created_at": datetime(2026, 2, i + 1, tzinfo=timezone.utc)} for i in range(7)]
+        docs += [{"id": f"s{i}", "created_at": f"2026-01-{i + 1:02d}T00:00:00+00:00"} for i in range(6)]
+        docs += [{"id": "n0", "created_at": None}]
+        everything = sorted(d["id"] for d in docs)
+
+        for direction in (-1, 1):
+            seen, _ = walk(FakeCollection(docs), {}, "created_at", direction, 3)
+            assert sorted(seen) == everything and len(seen) == len(everything)
+        newest_first, _ = walk(FakeCollection(docs), {}, "created_at", -1, 3)
+        assert newest_first[:7] == [f"d{i}" for i in reversed(range(7))] and newest_first[-1] == "n0"
+
+        async def run():
+            pages, cursor = [], None
+            while True:
+                (single, multi), cursor = await merge_pages(
+                    [(FakeCollection(docs[:7] + docs[10:]), {}), (FakeCollection(docs[7:10]), {})],
+                    "created_at", -1, 4, cursor
+                )
+                pages.extend(d["id"] for d in single + multi)
+                if cursor is None:
+                    return pages
+
+        merged = asyncio.run(run())
+        assert sorted(merged) == everything and len(merged) == len(everything)
+        print("✅ Mixed-type sort keys page without gaps")
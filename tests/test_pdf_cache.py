@@ -0,0 +1,105 @@
+"""
+Test Suite for the PDF Cache
+Tests:
+1. Identical HTML renders once; repeats are served from disk and linked to per-user paths
+2. A template version change misses the cache
+3. Concurrent requests for the same document render once
+4. LRU eviction keeps the store under its byte budget
+5. If-None-Match matching (strong, weak, lists, *)
+"""
+import os
+import sys
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+
+class CountingRenderer:
+    """Renderer double: writes the HTML as the 'PDF' and counts renders"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.renders = 0
+
+    async def render(self, html_content, pdf_path):
+        self.renders += 1
+        await asyncio.sleep(self.delay)
+        with open(pdf_path, "wb") as f:
+            f.write(b"%PDF-1.7\n" + html_content.encode())
+        return str(pdf_path)
+
+
+def make_cache(tmp_path, **kwargs):
+    from services.pdf_cache import PDFCache
+    renderer = kwargs.pop("renderer", CountingRenderer())
+    return PDFCache(directory=tmp_path / "cache", renderer=renderer, **{"version": "v1", **kwargs}), renderer
+
+
+class TestPDFCache:
+
+    def test_repeat_render_is_a_hit(self, tmp_path):
+        cache, renderer = make_cache(tmp_path)
+
+        async def scenario():
+            first = await cache.get_or_render("<p>invoice</p>", dest_path=tmp_path / "user-1" / "Invoice.pdf")
+            second = await cache.get_or_render("<p>invoice</p>", dest_path=tmp_path / "user-1" / "Invoice.pdf")
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert renderer.renders == 1
+        assert (first.hit, second.hit) == (False, True)
+        assert first.etag == second.etag
+        assert os.path.samefile(second.path, tmp_path / "user-1" / "Invoice.pdf")
+        print("✅ Second request served from the cache, per-user file linked to it")
+
+    def test_template_version_misses(self, tmp_path):
+        cache_v1, renderer = make_cache(tmp_path)
+        cache_v2, _ = make_cache(tmp_path, version="v2", renderer=renderer)
+
+        async def scenario():
+            a = await cache_v1.get_or_render("<p>terms</p>")
+            b = await cache_v2.get_or_render("<p>terms</p>")
+            return a, b
+
+        a, b = asyncio.run(scenario())
+        assert a.etag != b.etag and renderer.renders == 2
+        print("✅ New template version re-renders")
+
+    def test_concurrent_requests_render_once(self, tmp_path):
+        cache, renderer = make_cache(tmp_path, renderer=CountingRenderer(delay=0.05))
+
+        async def scenario():
+            return await asyncio.gather(*(cache.get_or_render("<p>statement</p>") for _ in range(10)))
+
+        results = asyncio.run(scenario())
+        assert renderer.renders == 1
+        assert len({r.path for r in results}) == 1
+        print("✅ 10 concurrent requests, 1 render")
+
+    def test_lru_eviction(self, tmp_path):
+        doc = lambda n: f"<p>{n}</p>" + "x" * 1000
+        cache, renderer = make_cache(tmp_path, max_bytes=3500)
+
+        async def scenario():
+            for n in range(3):
+                await cache.get_or_render(doc(n))
+            await cache.get_or_render(doc(0))   # 0 becomes most recently used
+            await cache.get_or_render(doc(3))   # over budget: evicts 1
+            return [os.path.exists(cache.path_for(cache.key(doc(n)))) for n in range(4)]
+
+        present = asyncio.run(scenario())
+        assert present == [True, False, True, True]
+        assert cache._bytes <= 3500
+        print("✅ Least recently used document evicted")
+
+    def test_etag_matching(self):
+        from services.pdf_cache import etag_matches
+
+        assert etag_matches('"abc"', "abc")
+        assert etag_matches('W/"abc"', "abc")
+        assert etag_matches('"zzz", "abc"', "abc")
+        assert etag_matches("*", "abc")
+        assert not etag_matches('"zzz"', "abc")
+        assert not etag_matches(None, "abc")
+        print("✅ If-None-Match parsing")
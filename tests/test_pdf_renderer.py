@@ -0,0 +1,81 @@
+"""
+Test Suite for the PDF Renderer
+Tests:
+1. Renders run in worker processes, in parallel, without stalling the event loop
+2. A hung render times out and the pool recovers for the next job
+3. The bounded queue rejects work once it is full
+"""
+import os
+import sys
+import time
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_providers import fake_render, hung_render, measure_loop_stall
+
+
+class TestPDFRenderer:
+
+    def test_parallel_renders_do_not_block_loop(self, tmp_path):
+        from services.pdf_renderer import PDFRenderer
+
+        async def scenario():
+            renderer = PDFRenderer(workers=4, render_fn=fake_render)
+            try:
+                await renderer.warm()
+                jobs = [await renderer.submit(f"<p>invoice {n}</p>", tmp_path / f"invoice_{n}.pdf") for n in range(8)]
+                started = time.perf_counter()
+                results, worst_gap = await measure_loop_stall(asyncio.gather(*(job.result() for job in jobs)))
+                return jobs, results, worst_gap, time.perf_counter() - started
+            finally:
+                renderer.stop()
+
+        jobs, results, worst_gap, elapsed = asyncio.run(scenario())
+
+        assert all(job.status == "done" for job in jobs)
+        assert all((tmp_path / f"invoice_{n}.pdf").read_bytes().startswith(b"%PDF") for n in range(8))
+        assert len({r.rsplit(":", 1)[1] for r in results}) > 1
+        assert int(results[0].rsplit(":", 1)[1]) != os.getpid()
+        assert worst_gap < 0.1
+        assert elapsed < 8 * 0.3
+        print(f"✅ 8 renders in {elapsed:.2f}s across worker processes, worst loop stall {worst_gap * 1000:.0f}ms")
+
+    def test_hung_render_times_out(self, tmp_path):
+        from services.pdf_renderer import PDFRenderer, RenderTimeout
+
+        async def scenario():
+            renderer = PDFRenderer(workers=2, timeout=1.0, render_fn=hung_render)
+            try:
+                hung = await renderer.submit("<p>hang</p>", tmp_path / "hung.pdf")
+                with pytest.raises(RenderTimeout):
+                    await hung.result()
+                after = await renderer.render("<p>ok</p>", tmp_path / "ok.pdf")
+                return hung, after
+            finally:
+                renderer.stop()
+
+        hung, after = asyncio.run(scenario())
+        assert hung.status == "timeout"
+        assert after.startswith(str(tmp_path / "ok.pdf"))
+        print("✅ Hung render timed out; recycled pool rendered the next job")
+
+    def test_queue_full(self, tmp_path):
+        from services.pdf_renderer import PDFRenderer, RenderQueueFull
+
+        async def scenario():
+            renderer = PDFRenderer(workers=1, queue_size=1, queue_timeout=0.05, render_fn=fake_render)
+            try:
+                first = await renderer.submit("<p>1</p>", tmp_path / "1.pdf")
+                second = await renderer.submit("<p>2</p>", tmp_path / "2.pdf")
+                with pytest.raises(RenderQueueFull):
+                    await renderer.submit("<p>3</p>", tmp_path / "3.pdf")
+                await asyncio.gather(first.result(), second.result())
+            finally:
+                renderer.stop()
+
+        asyncio.run(scenario())
+        print("✅ Third job rejected while one renders and one waits")
@@ -0,0 +1,258 @@
+"""
+Test Suite for Proxy (Auto-Bid) Bidding
+Tests:
+1. A max bid answers a manual bid at one increment above it
+2. Competing max bids: the highest wins at runner-up max + increment
+3. The winner never pays more than its own max; ties go to the earlier max bid
+4. Max bids that cannot beat the price by a full increment do nothing
+5. Max bids of owners who fail the bidder gate (phone, payment method) are ignored
+6. A max bid resolved inside the anti-snipe window extends the auction end
+7. The engine commits the whole sequence with one listing update and one insert
+   (requires MongoDB: set MONGO_URL)
+"""
+import os
+import sys
+import uuid
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.bid_engine import BidRejected, check_bidder
+from services.proxy_bidding import ProxyBiddingEngine, resolve_proxy_bids
+
+MONGO_URL = os.environ.get('MONGO_URL')
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def proxy(user_id, max_bid, minutes=0):
+    return {"user_id": user_id, "max_bid": max_bid, "created_at": T0 + timedelta(minutes=minutes)}
+
+
+def five(_price):
+    return 5
+
+
+class TestResolveProxyBids:
+
+    def test_answers_manual_bid(self):
+        """B's max bid answers A's manual $100 bid at $105"""
+        result = resolve_proxy_bids(100, "A", [proxy("B", 150)], five)
+
+        assert result.leader_id == "B" and result.price == 105
+        assert result.bids == [("B", 105, 150)]
+        print("✅ Max bid answered at one increment")
+
+    def test_highest_max_wins_at_runner_up_plus_increment(self):
+        """C (max 180) beats B (max 150) and pays $155"""
+        result = resolve_proxy_bids(100, "A", [proxy("B", 150), proxy("C", 180)], five)
+
+        assert result.leader_id == "C" and result.price == 155
+        assert result.bids == [("B", 150, 150), ("C", 155, 180)]
+        print("✅ Winner pays runner-up max + increment")
+
+    def test_leader_max_holds(self):
+        """The leader's own max bid is raised just enough to stay ahead"""
+        result = resolve_proxy_bids(100, "A", [proxy("A", 200), proxy("B", 150)], five)
+
+        assert result.leader_id == "A" and result.price == 155
+        assert result.bids == [("B", 150, 150), ("A", 155, 200)]
+        print("✅ Leader's max bid holds the lead")
+
+    def test_price_capped_at_winner_max(self):
+        """B (max 152) beats the leader's max of 150 but pays only $152"""
+        result = resolve_proxy_bids(100, "A", [proxy("A", 150), proxy("B", 152)], five)
+
+        assert result.leader_id == "B" and result.price == 152
+        assert result.bids == [("A", 150, 150), ("B", 152, 152)]
+        print("✅ Price capped at the winner's max")
+
+    def test_ties_go_to_earlier_max(self):
+        """Equal max bids: the earlier one wins at that max"""
+        result = resolve_proxy_bids(100, "A", [proxy("C", 150, minutes=5), proxy("B", 150, minutes=1)], five)
+        assert result.leader_id == "B" and result.price == 150
+
+        held = resolve_proxy_bids(100, "A", [proxy("A", 150, minutes=0), proxy("B", 150, minutes=1)], five)
+        assert held.leader_id == "A" and held.price == 150
+        print("✅ Ties resolved by time")
+
+    def test_no_contest(self):
+        """A max bid below price + increment, or only the leader's own max, changes nothing"""
+        assert resolve_proxy_bids(100, "A", [proxy("B", 103)], five) is None
+        assert resolve_proxy_bids(100, "A", [proxy("A", 500)], five) is None
+        assert resolve_proxy_bids(100, "A", [], five) is None
+        print("✅ No contest, no bids")
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, *_args):
+        return self
+
+    def limit(self, _n):
+        return self
+
+    async def to_list(self, _length):
+        return list(self.docs)
+
+
+class FakeResult:
+    def __init__(self, modified_count):
+        self.modified_count = modified_count
+
+
+class FakeCollection:
+    def __init__(self, docs=None):
+        self.docs = docs or []
+        self.updates = []
+        self.inserted = []
+
+    async def find_one(self, query, _projection=None):
+        return next((dict(d) for d in self.docs if d.get("id") == query.get("id")), None)
+
+    def find(self, query, _projection=None):
+        ids = query.get("id", {}).get("$in")
+        return FakeCursor([d for d in self.docs if ids is None or d["id"] in ids])
+
+    async def distinct(self, key, query):
+        ids = query["user_id"]["$in"]
+        return list({d[key] for d in self.docs if d[key] in ids})
+
+    async def count_documents(self, query, **_kwargs):
+        return sum(1 for d in self.docs if d["user_id"] == query["user_id"])
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+        return FakeResult(1)
+
+    async def insert_many(self, docs):
+        self.inserted.extend(docs)
+
+
+class FakeDB:
+    def __init__(self, listing, proxies, users, payment_user_ids):
+        self.listings = FakeCollection([listing])
+        self.auto_bids = FakeCollection(proxies)
+        self.users = FakeCollection(users)
+        self.payment_methods = FakeCollection([{"user_id": u} for u in payment_user_ids])
+        self.bids = FakeCollection()
+
+
+def listing_ending_in(seconds):
+    return {
+        "id": "L1", "seller_id": "S", "status": "active", "current_price": 100.0,
+        "highest_bidder_id": "A", "bid_count": 1,
+        "auction_end_date": (datetime.now(timezone.utc) + timedelta(seconds=seconds)).isoformat(),
+    }
+
+
+def verified(*user_ids):
+    return [{"id": u, "role": "user", "phone_verified": True} for u in user_ids]
+
+
+class TestProxyEngineGate:
+
+    def test_check_bidder(self):
+        """Phone verification and a payment method are both required; admins are exempt"""
+        db = FakeDB(listing_ending_in(3600), [], [], payment_user_ids=["B"])
+
+        async def rejection(user_id, role, phone_verified):
+            try:
+                await check_bidder(db, user_id, role, phone_verified)
+            except BidRejected as e:
+                return e.status_code, e.message
+            return None
+
+        assert asyncio.run(rejection("B", "user", True)) is None
+        assert asyncio.run(rejection("X", "admin", False)) is None
+        status, message = asyncio.run(rejection("B", "user", False))
+        assert status == 403 and "Phone verification" in message
+        status, message = asyncio.run(rejection("C", "user", True))
+        assert status == 403 and "Payment method" in message
+        print("✅ Bidder gate enforced")
+
+    def test_unverified_owner_ignored(self):
+        """A stored max bid from an unverified user (or one without a card) never bids"""
+        proxies = [proxy("B", 150), proxy("C", 180), proxy("D", 300)]
+        users = verified("B", "C") + [{"id": "D", "role": "user", "phone_verified": False}]
+        db = FakeDB(listing_ending_in(3600), proxies, users, payment_user_ids=["B", "D"])
+
+        outcome = asyncio.run(ProxyBiddingEngine(db).run("L1", increment_for=lambda _l, _p: 5))
+
+        assert outcome["leader_id"] == "B" and outcome["price"] == 105
+        assert {b["bidder_id"] for b in db.bids.inserted} == {"B"}
+        print("✅ Max bids of ineligible owners skipped")
+
+    def test_max_bid_inside_window_extends(self):
+        """A max bid resolved 10s before the end pushes the end out by the window"""
+        db = FakeDB(listing_ending_in(10), [proxy("B", 150)], verified("B"), payment_user_ids=["B"])
+
+        outcome = asyncio.run(ProxyBiddingEngine(db).run("L1", increment_for=lambda _l, _p: 5, anti_snipe_window=120))
+
+        assert outcome["extension_applied"]
+        assert outcome["new_end"] - datetime.now(timezone.utc) > timedelta(seconds=110)
+        query, update = db.listings.updates[0]
+        assert "$gt" in query["auction_end_date"]
+        assert update["$set"]["auction_end_date"] == outcome["new_end"].isoformat()
+        assert update["$inc"]["extension_count"] == 1
+        print("✅ Late max bid extends the auction")
+
+    def test_max_bid_outside_window_keeps_end(self):
+        """Outside the window (or with anti-sniping off) the end time is untouched"""
+        db = FakeDB(listing_ending_in(3600), [proxy("B", 150)], verified("B"), payment_user_ids=["B"])
+        outcome = asyncio.run(ProxyBiddingEngine(db).run("L1", increment_for=lambda _l, _p: 5, anti_snipe_window=120))
+        assert not outcome["extension_applied"] and outcome["new_end"] is None
+        assert "auction_end_date" not in db.listings.updates[0][1]["$set"]
+
+        late = FakeDB(listing_ending_in(10), [proxy("B", 150)], verified("B"), payment_user_ids=["B"])
+        outcome = asyncio.run(ProxyBiddingEngine(late).run("L1", increment_for=lambda _l, _p: 5))
+        assert not outcome["extension_applied"]
+        print("✅ No extension outside the window")
+
+
+@pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set - proxy engine test needs MongoDB")
+class TestProxyBiddingEngine:
+
+    def test_single_update_and_bulk_insert(self):
+        """The resolved sequence lands in bids and the listing in one step"""
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def scenario():
+            client = AsyncIOMotorClient(MONGO_URL)
+            db = client[f"bidvex_proxy_test_{uuid.uuid4().hex[:8]}"]
+            try:
+                listing_id = str(uuid.uuid4())
+                await db.listings.insert_one({
+                    "id": listing_id, "seller_id": "S", "status": "active", "current_price": 100.0,
+                    "highest_bidder_id": "A", "bid_count": 3,
+                    "auction_end_date": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+                })
+                await db.users.insert_many([{"id": u, "role": "user", "phone_verified": True} for u in "BCS"])
+                await db.payment_methods.insert_many([{"id": f"pm-{u}", "user_id": u} for u in "BCS"])
+                await db.auto_bids.insert_many([
+                    {"id": "p1", "listing_id": listing_id, "is_active": True, **proxy("B", 150)},
+                    {"id": "p2", "listing_id": listing_id, "is_active": True, **proxy("C", 180)},
+                    {"id": "p3", "listing_id": listing_id, "is_active": True, **proxy("S", 999)},
+                ])
+                engine = ProxyBiddingEngine(db)
+                outcome = await engine.run(listing_id, increment_for=lambda _listing, _price: 5)
+                stored = await db.listings.find_one({"id": listing_id})
+                bids = await db.bids.find({"listing_id": listing_id}).sort("created_at", 1).to_list(10)
+                again = await engine.run(listing_id, increment_for=lambda _listing, _price: 5)
+                return outcome, stored, bids, again
+            finally:
+                await client.drop_database(db.name)
+                client.close()
+
+        outcome, stored, bids, again = asyncio.run(scenario())
+
+        assert outcome["leader_id"] == "C" and outcome["price"] == 155
+        assert stored["current_price"] == 155 and stored["highest_bidder_id"] == "C" and stored["bid_count"] == 5
+        assert [(b["bidder_id"], b["amount"], b["bid_type"]) for b in bids] == [("B", 150, "auto"), ("C", 155, "auto")]
+        assert again is None
+        print("✅ Proxy contest committed in one update + one insert")
@@ -0,0 +1,166 @@
+"""
+Test Suite for the Realtime Backplane
+Tests:
+1. In-process backplane delivers each publish exactly once, locally
+   Redis envelopes carry datetime payloads (encoded as ISO strings)
+2. Multi-process harness: an event published on worker A reaches worker B
+   (Redis with REDIS_URL, MongoDB change streams with MONGO_URL on a replica set)
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import multiprocessing
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+REDIS_URL = os.environ.get('REDIS_URL')
+MONGO_URL = os.environ.get('MONGO_URL')
+
+
+def run_worker(kind, name, is_publisher, received, ready, go, db_name):
+    """Child process: one 'uvicorn worker' with its own backplane instance"""
+    sys.path.insert(0, BACKEND_DIR)
+
+    async def main():
+        from services.realtime_backplane import create_backplane
+
+        db = None
+        if kind == "mongo":
+            from motor.motor_asyncio import AsyncIOMotorClient
+            db = AsyncIOMotorClient(MONGO_URL)[db_name]
+
+        backplane = create_backplane(kind, db=db, redis_url=REDIS_URL)
+
+        async def on_bid_update(payload):
+            received.put((name, payload["listing_id"], payload["bid_data"]["amount"]))
+
+        backplane.register("bid_update", on_bid_update)
+        await backplane.start()
+        await asyncio.sleep(0.5)  # Let the subscription settle
+        ready.set()
+
+        while not go.is_set():
+            await asyncio.sleep(0.05)
+        if is_publisher:
+            await backplane.publish("bid_update", {"listing_id": "listing-1", "bid_data": {"amount": 125.0}, "listing_data": {}})
+        await asyncio.sleep(2)
+        await backplane.stop()
+
+    asyncio.run(main())
+
+
+def run_harness(kind):
+    """Start two workers, publish on A, return everything both workers received"""
+    ctx = multiprocessing.get_context("spawn")
+    received = ctx.Queue()
+    go = ctx.Event()
+    db_name = f"bidvex_backplane_test_{uuid.uuid4().hex[:8]}"
+    workers = []
+    ready_events = []
+    for name, is_publisher in (("worker-a", True), ("worker-b", False)):
+        ready = ctx.Event()
+        proc = ctx.Process(target=run_worker, args=(kind, name, is_publisher, received, ready, go, db_name))
+        proc.start()
+        workers.append(proc)
+        ready_events.append(ready)
+
+    for ready in ready_events:
+        assert ready.wait(timeout=20), "Worker did not start its backplane"
+    go.set()
+    for proc in workers:
+        proc.join(timeout=20)
+
+    deliveries = []
+    deadline = time.time() + 2
+    while time.time() < deadline:
+        try:
+            deliveries.append(received.get(timeout=0.2))
+        except Exception:
+            break
+
+    if kind == "mongo":
+        from pymongo import MongoClient
+        MongoClient(MONGO_URL).drop_database(db_name)
+    return deliveries
+
+
+class TestInProcessBackplane:
+    """Single-worker default: local delivery only"""
+
+    def test_publish_delivers_once_locally(self):
+        from services.realtime_backplane import InProcessBackplane
+
+        backplane = InProcessBackplane()
+        seen = []
+
+        async def handler(payload):
+            seen.append(payload)
+
+        backplane.register("user_message", handler)
+        asyncio.run(backplane.publish("user_message", {"user_id": "u1", "message": {"type": "notification"}}))
+
+        assert seen == [{"user_id": "u1", "message": {"type": "notification"}}]
+        assert backplane.stats["delivered_local"] == 1
+        assert backplane.stats["delivered_remote"] == 0
+        print("✅ In-process backplane delivered exactly once")
+
+    def test_unregistered_topic_is_ignored(self):
+        from services.realtime_backplane import InProcessBackplane
+
+        backplane = InProcessBackplane()
+        asyncio.run(backplane.publish("unknown", {"x": 1}))
+        assert backplane.stats["errors"] == 0
+        print("✅ Unregistered topic ignored")
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, channel, data):
+        self.published.append((channel, data))
+
+
+class TestRedisEnvelope:
+    """Forwarding only - no Redis server needed"""
+
+    def test_datetime_payload_is_forwarded(self):
+        from datetime import datetime, timezone
+        from services.realtime_backplane import RedisBackplane, WORKER_ID
+
+        backplane = RedisBackplane("redis://unused")
+        backplane._redis = RecordingRedis()
+        ends = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+        asyncio.run(backplane.publish("bid_update", {"listing_id": "listing-1", "auction_end_date": ends}))
+
+        assert backplane.stats["errors"] == 0
+        (channel, data), = backplane._redis.published
+        envelope = json.loads(data)
+        assert channel == "bidvex:realtime:bid_update"
+        assert envelope == {"origin": WORKER_ID, "topic": "bid_update",
+                            "payload": {"listing_id": "listing-1", "auction_end_date": "2030-01-01T12:00:00Z"}}
+        print("✅ Datetime payloads published over Redis")
+
+
+class TestCrossWorkerDelivery:
+    """Events published on one worker must reach sockets held by another"""
+
+    @pytest.mark.skipif(not REDIS_URL, reason="REDIS_URL not set")
+    def test_redis_backplane_crosses_workers(self):
+        pytest.importorskip("redis")
+        deliveries = run_harness("redis")
+        assert sorted(deliveries) == [("worker-a", "listing-1", 125.0), ("worker-b", "listing-1", 125.0)]
+        print("✅ Redis backplane: worker-a publish reached worker-b exactly once")
+
+    @pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set (change streams also need a replica set)")
+    def test_mongo_change_stream_backplane_crosses_workers(self):
+        pytest.importorskip("motor")
+        deliveries = run_harness("mongo")
+        assert sorted(deliveries) == [("worker-a", "listing-1", 125.0), ("worker-b", "listing-1", 125.0)]
+        print("✅ Change-stream backplane: worker-a publish reached worker-b exactly once")
@@ -0,0 +1,144 @@
+"""
+Test Suite for the Search Index
+Tests:
+1. The tokenizer folds accents, splits French elisions, drops EN/FR stopwords and reduces plurals
+2. Auction entries index every lot's title and description; prefixes come from titles only
+3. Marketplace searches use the embedded term index instead of $regex
+4. Entries carry the status and filter fields the list endpoints filter on
+5. Ranked search, filters and autocomplete against MongoDB (requires MongoDB: set MONGO_URL)
+"""
+import os
+import sys
+import uuid
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import marketplace_index
+from services.search_index import auction_entry, listing_entry, query_terms, search_ids, tokenize
+
+MONGO_URL = os.environ.get('MONGO_URL')
+
+
+class TestTokenizer:
+
+    def test_accents_and_case(self):
+        """Élégant, ÉLÉGANT and elegant are the same term"""
+        assert tokenize("Élégant") == tokenize("ÉLÉGANT") == tokenize("elegant") == ["elegant"]
+        assert tokenize("Crème brûlée") == ["creme", "brulee"]
+        print("✅ Accents folded")
+
+    def test_elisions_and_stopwords(self):
+        """l'armoire -> armoire; le/de/the/of are dropped"""
+        assert tokenize("L'armoire de la grand-mère") == ["armoire", "grand", "mere"]
+        assert tokenize("The chair of the year") == ["chair", "year"]
+        assert query_terms("de la") == []
+        print("✅ Elisions split, stopwords dropped")
+
+    def test_plurals(self):
+        """Plural and singular query the same term in both languages"""
+        assert tokenize("chairs") == tokenize("chair")
+        assert tokenize("chaises") == tokenize("chaise")
+        assert tokenize("chevaux") == tokenize("cheval")
+        assert tokenize("bijoux") == tokenize("bijou")
+        assert tokenize("glass") == ["glass"]
+        assert tokenize("1975 ps5") == ["1975", "ps5"]
+        print("✅ Plurals reduced")
+
+    def test_regex_metacharacters_are_plain_text(self):
+        """A search for "(.*" no longer reaches MongoDB as a pattern"""
+        assert query_terms("(.*") == []
+        assert query_terms("c++ [book]") == ["book"]
+        print("✅ Metacharacters ignored")
+
+
+class TestEntries:
+
+    def test_auction_entry_covers_lots(self):
+        """Lot titles and descriptions are searchable on the parent auction"""
+        entry = auction_entry({
+            "id": "a1", "title": "Estate Sale", "description": "Contents of a country house",
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "lots": [
+                {"title": "Oak Dresser", "description": "Solid oak, three drawers"},
+                {"title": "Lampe en laiton", "description": "Années 1950"},
+            ],
+        })
+        assert {"estate", "sale", "oak", "dresser", "drawer", "lampe", "laiton", "annee", "1950"} <= set(entry["terms"])
+        assert entry["title_terms"] == ["estate", "sale"]
+        assert "es" in entry["prefixes"] and "esta" in entry["prefixes"] and "oak" not in entry["prefixes"]
+        print("✅ Auction entry covers every lot")
+
+    def test_listing_entry(self):
+        entry = listing_entry({"id": "l1", "title": "Vélo de route", "description": "Cadre carbone"})
+        assert entry["kind"] == "listing"
+        assert entry["terms"] == ["cadre", "carbone", "route", "velo"]
+        assert "vel" in entry["prefixes"]
+        print("✅ Listing entry")
+
+    def test_entries_carry_filter_fields(self):
+        """Status and filter fields are matched inside the index, before the candidate cap"""
+        entry = listing_entry({"id": "l1", "title": "Vélo", "status": "sold", "category": "sport", "city": "Laval"})
+        assert entry["status"] == "sold" and entry["category"] == "sport" and entry["city"] == "Laval"
+        assert entry["region"] is None
+        auction = auction_entry({"id": "a1", "title": "Estate", "status": "upcoming", "currency": "CAD"})
+        assert auction["status"] == "upcoming" and auction["currency"] == "CAD"
+        with pytest.raises(ValueError, match="current_price"):
+            asyncio.run(search_ids(None, "listing", "velo", {"current_price": {"$lte": 5}}))
+        print("✅ Entries carry filter fields")
+
+    def test_marketplace_query(self):
+        """Marketplace items embed their terms and are matched with $all"""
+        auction = {"id": "a1", "title": "Estate Sale", "category": "furniture", "created_at": "2026-01-01T00:00:00+00:00"}
+        lot = {"lot_number": 1, "title": "Chaises pliantes", "description": "Lot de 4"}
+        item = marketplace_index.build_lot_item(auction, lot, False)
+
+        assert {"chaise", "pliante", "estate"} <= set(item["search_terms"])
+        assert marketplace_index.build_query(search="chaise PLIANTE") == {"search_terms": {"$all": ["chaise", "pliante"]}}
+        assert marketplace_index.build_query(search="le") == {}
+        assert marketplace_index.PUBLIC_PROJECTION["search_terms"] == 0
+        print("✅ Marketplace search uses embedded terms")
+
+
+@pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set - search index test needs MongoDB")
+class TestSearchIndexMongo:
+
+    def test_rank_and_suggest(self):
+        """Title hits outrank description hits; prefixes drive autocomplete"""
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from services.search_index import index_listing, remove, set_status, suggest
+
+        async def scenario():
+            client = AsyncIOMotorClient(MONGO_URL)
+            db = client[f"bidvex_search_test_{uuid.uuid4().hex[:8]}"]
+            try:
+                await index_listing(db, {"id": "desc", "title": "Lot divers", "description": "Une chaise en bois",
+                                         "created_at": "2026-01-02T00:00:00+00:00", "status": "active"})
+                await index_listing(db, {"id": "title", "title": "Chaise en bois", "description": "Très bon état",
+                                         "created_at": "2026-01-01T00:00:00+00:00", "status": "active"})
+                await index_listing(db, {"id": "other", "title": "Table", "description": "Bois",
+                                         "created_at": "2026-01-03T00:00:00+00:00", "status": "active"})
+                await index_listing(db, {"id": "sold", "title": "Chaise en bois massif", "description": "Bois",
+                                         "created_at": "2026-01-04T00:00:00+00:00", "status": "sold"})
+                ranked = await search_ids(db, "listing", "chaises bois", {"status": "active"})
+                unranked = await search_ids(db, "listing", "bois", {"status": "active"}, ranked=False)
+                suggestions = await suggest(db, "chai")
+                await set_status(db, ["sold"], "active")
+                relisted = await search_ids(db, "listing", "chaise", {"status": "active"})
+                await remove(db, "title")
+                after_remove = await search_ids(db, "listing", "chaise", {"status": "active"})
+                return ranked, unranked, suggestions, relisted, after_remove
+            finally:
+                await client.drop_database(db.name)
+                client.close()
+
+        ranked, unranked, suggestions, relisted, after_remove = asyncio.run(scenario())
+
+        assert ranked == ["title", "desc"]
+        assert sorted(unranked) == ["desc", "other", "title"]
+        assert [s["id"] for s in suggestions] == ["title"]
+        assert relisted[0] == "sold"
+        assert after_remove == ["sold", "desc"]
+        print("✅ Ranked search and autocomplete")
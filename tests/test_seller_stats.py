@@ -0,0 +1,276 @@
+"""
+Test Suite for Seller Stats Aggregates
+Tests:
+1. Pickup-speed scoring thresholds and rating $inc documents
+2. Trust score, rating summary and admin score read from one stats document
+   match the per-request recomputation they replace
+3. Listing status transitions and paid webhooks are counted once
+4. Incremental updates agree with a full rebuild, and a rating recorded while
+   the rebuild is computing is not lost (requires MongoDB: set MONGO_URL)
+"""
+import os
+import sys
+import uuid
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+import pytest
+from pymongo import ReturnDocument
+
+import services.seller_stats as seller_stats_module
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.seller_stats import (
+    empty_stats,
+    get_stats,
+    pickup_score,
+    rating_increments,
+    rating_summary,
+    record_payment,
+    record_rating,
+    rebuild_seller_stats,
+    seller_trust,
+    set_listing_status,
+    trust_score,
+)
+
+MONGO_URL = os.environ.get('MONGO_URL')
+
+END = datetime(2026, 6, 1, 18, 0, tzinfo=timezone.utc)
+
+
+def apply(stats, inc):
+    """Apply a dotted $inc to a stats dict the way MongoDB would"""
+    for path, amount in inc.items():
+        *parents, leaf = path.split(".")
+        node = stats
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = node.get(leaf, 0) + amount
+    return stats
+
+
+class FakeCollection:
+    """find_one_and_update on {"<key>": x, "<field>": {"$ne": v}} with $set"""
+
+    def __init__(self, key, docs):
+        self.key = key
+        self.docs = {doc[key]: dict(doc) for doc in docs}
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=ReturnDocument.BEFORE):
+        doc = self.docs.get(query[self.key])
+        field, condition = next((k, v) for k, v in query.items() if k != self.key)
+        if doc is None or doc.get(field) == condition["$ne"]:
+            return None
+        before = dict(doc)
+        doc.update(update["$set"])
+        return dict(before if return_document == ReturnDocument.BEFORE else doc)
+
+
+class FakeStats:
+    def __init__(self):
+        self.docs = {}
+
+    async def update_one(self, query, update, upsert=False):
+        apply(self.docs.setdefault(query["id"], empty_stats(query["id"])), update["$inc"])
+
+
+class FakeDB:
+    def __init__(self, listings=(), payment_transactions=()):
+        self.listings = FakeCollection("id", listings)
+        self.payment_transactions = FakeCollection("session_id", payment_transactions)
+        self.seller_stats = FakeStats()
+
+
+class TestIncrements:
+
+    def test_pickup_score(self):
+        """Days from auction end to pickup; ISO strings and BSON dates alike"""
+        assert pickup_score(END + timedelta(days=3, hours=5), END) == 5
+        assert pickup_score((END + timedelta(days=6)).isoformat(), END.isoformat()) == 4
+        assert pickup_score(END + timedelta(days=14), END) == 3
+        assert pickup_score(END + timedelta(days=30), END) == 2
+        assert pickup_score(None, END) is None
+        print("✅ Pickup speed scored")
+
+    def test_rating_increments(self):
+        """Only metrics the rater filled in are counted"""
+        inc = rating_increments({"rating": 4, "metrics": {"item_accuracy": 5, "communication": None}})
+        assert inc == {
+            "ratings.count": 1, "ratings.sum": 4, "ratings.stars.4": 1,
+            "rating_metrics.item_accuracy.count": 1, "rating_metrics.item_accuracy.sum": 5,
+        }
+        assert rating_increments({"rating": 2}) == {"ratings.count": 1, "ratings.sum": 2, "ratings.stars.2": 1}
+        print("✅ Rating increments built")
+
+
+class TestReads:
+
+    def test_trust_from_ratings(self):
+        stats = empty_stats("s1")
+        for rating in ({"rating": 5, "metrics": {"pickup_speed": 4, "communication": 5}},
+                       {"rating": 4, "metrics": {"communication": 4}},
+                       {"rating": 5}):
+            apply(stats, rating_increments(rating))
+        apply(stats, {"pickups.count": 2, "pickups.scored": 1, "pickups.score_sum": 2})
+
+        trust = seller_trust(stats)
+
+        assert trust["overall_score"] == 4.67 and trust["is_trusted"]
+        assert trust["badge"] == "BidVex Trusted Seller"
+        assert trust["total_ratings"] == 3 and trust["total_transactions"] == 2
+        assert trust["metrics"] == {"pickup_speed": 4.0, "item_accuracy": 0, "communication": 4.5}
+        summary = rating_summary(stats)
+        assert summary == {
+            "average_rating": 4.67, "total_ratings": 3,
+            "ratings_breakdown": {"1": 0, "2": 0, "3": 0, "4": 1, "5": 2},
+        }
+        print("✅ Trust score from ratings")
+
+    def test_trust_from_pickups_and_new_seller(self):
+        """No ratings: automated pickup speed; no data at all: zero"""
+        stats = apply(empty_stats("s1"), {"pickups.count": 3, "pickups.scored": 2, "pickups.score_sum": 7})
+        trust = seller_trust(stats)
+        assert trust["overall_score"] == 3.5 and trust["metrics"]["pickup_speed"] == 3.5
+        assert not trust["is_trusted"] and trust["badge"] is None
+
+        new = seller_trust(empty_stats("s2"))
+        assert new["overall_score"] == 0 and new["total_transactions"] == 0
+        assert rating_summary(empty_stats("s2"))["average_rating"] == 0
+        print("✅ Pickup-only and new sellers scored")
+
+    def test_admin_trust_score(self):
+        now = END + timedelta(days=95)
+        user = {"created_at": END.isoformat(), "email_verified": True}
+        stats = apply(empty_stats("u1"), {
+            "paid_transactions": 3, "reports_against": 1, "listings.sold": 3, "listings.cancelled": 1,
+        })
+        # 50 + 9 (age) + 10 (email) + 6 (payments) - 5 (report) + 7 (completion)
+        assert trust_score(user, stats, now=now) == 77
+        assert trust_score({"created_at": END}, apply(empty_stats("u2"), {"reports_against": 20}), now=now) == 0
+        print("✅ Admin trust score")
+
+
+class TestGuardedTransitions:
+
+    def test_listing_status_counted_once(self):
+        db = FakeDB(listings=[{"id": "l1", "seller_id": "s1", "status": "active"}])
+
+        async def scenario():
+            first = await set_listing_status(db, "l1", "sold")
+            repeat = await set_listing_status(db, "l1", "sold")
+            await set_listing_status(db, "l1", "cancelled")
+            return first, repeat
+
+        first, repeat = asyncio.run(scenario())
+
+        assert first["status"] == "active" and repeat is None
+        assert db.seller_stats.docs["s1"]["listings"] == {"sold": 0, "cancelled": 1}
+        print("✅ Listing transitions counted once")
+
+    def test_payment_counted_once(self):
+        """Status polling and the webhook both see the same session"""
+        db = FakeDB(payment_transactions=[
+            {"session_id": "cs_1", "user_id": "b1", "listing_id": "l1", "payment_status": "pending"},
+        ])
+
+        async def scenario():
+            return await record_payment(db, "cs_1"), await record_payment(db, "cs_1")
+
+        first, second = asyncio.run(scenario())
+
+        assert first["payment_status"] == "paid" and first["listing_id"] == "l1"
+        assert second is None
+        assert db.seller_stats.docs["b1"]["paid_transactions"] == 1
+        print("✅ Payment counted once")
+
+
+@pytest.mark.skipif(not MONGO_URL, reason="MONGO_URL not set - rebuild test needs MongoDB")
+class TestRebuildMongo:
+
+    def test_incremental_matches_rebuild(self):
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def scenario():
+            client = AsyncIOMotorClient(MONGO_URL, tz_aware=True)
+            db = client[f"bidvex_seller_stats_test_{uuid.uuid4().hex[:8]}"]
+            try:
+                ratings = [
+                    {"target_user_id": "s1", "rating": 5, "metrics": {"item_accuracy": 4}},
+                    {"target_user_id": "s1", "rating": 3},
+                    {"target_user_id": "s2", "rating": 4, "metrics": {"pickup_speed": 5}},
+                ]
+                for rating in ratings:
+                    await db.ratings.insert_one(dict(rating))
+                    await record_rating(db, rating)
+                await db.listings.insert_many([
+                    {"id": "l1", "seller_id": "s1", "status": "active"},
+                    {"id": "l2", "seller_id": "s1", "status": "active"},
+                ])
+                await set_listing_status(db, "l1", "sold")
+                await set_listing_status(db, "l2", "cancelled")
+                await db.handshakes.insert_one({
+                    "seller_id": "s2", "status": "picked_up",
+                    "marked_picked_up_at": END + timedelta(days=2), "auction_end_date": END,
+                })
+                await db.seller_stats.insert_one({"id": "gone", "ratings": {"count": 9}})
+
+                incremental = {user_id: await get_stats(db, user_id) for user_id in ("s1", "s2")}
+                report = await rebuild_seller_stats(db, batch_size=1)
+                rebuilt = {doc["id"]: doc async for doc in db.seller_stats.find({}, {"_id": 0, "updated_at": 0, "rebuilt_at": 0})}
+                return incremental, report, rebuilt
+            finally:
+                await client.drop_database(db.name)
+                client.close()
+
+        incremental, report, rebuilt = asyncio.run(scenario())
+
+        assert report == {"users": 2, "created": 0, "removed": 1, "conflicts": 0}
+        assert set(rebuilt) == {"s1", "s2"}
+        for user_id in ("s1", "s2"):
+            assert seller_trust(rebuilt[user_id]) == seller_trust(incremental[user_id])
+            assert rating_summary(rebuilt[user_id]) == rating_summary(incremental[user_id])
+        assert rebuilt["s1"]["listings"] == {"sold": 1, "cancelled": 1}
+        assert rebuilt["s2"]["pickups"] == {"count": 1, "scored": 1, "score_sum": 5}
+        assert rating_summary(rebuilt["s1"])["average_rating"] == 4.0
+        print("✅ Rebuild matches incremental updates")
+
+    def test_increment_during_rebuild_is_kept(self, monkeypatch):
+        """A rating lands after compute_all read the sources but before the write"""
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        compute_all = seller_stats_module.compute_all
+        calls = []
+
+        async def scenario():
+            client = AsyncIOMotorClient(MONGO_URL, tz_aware=True)
+            db = client[f"bidvex_seller_stats_test_{uuid.uuid4().hex[:8]}"]
+
+            async def racing_compute_all(db_):
+                stats = await compute_all(db_)
+                calls.append(len(stats))
+                if len(calls) == 1:
+                    late = {"target_user_id": "s1", "rating": 1}
+                    await db.ratings.insert_one(dict(late))
+                    await record_rating(db, late)
+                return stats
+
+            monkeypatch.setattr(seller_stats_module, "compute_all", racing_compute_all)
+            try:
+                await db.seller_stats.create_index("id", unique=True)
+                for rating in ({"target_user_id": "s1", "rating": 5}, {"target_user_id": "s2", "rating": 4}):
+                    await db.ratings.insert_one(dict(rating))
+                    await record_rating(db, rating)
+                report = await rebuild_seller_stats(db)
+                return report, await get_stats(db, "s1"), await get_stats(db, "s2")
+            finally:
+                await client.drop_database(db.name)
+                client.close()
+
+        report, s1, s2 = asyncio.run(scenario())
+
+        assert len(calls) == 2 and report["conflicts"] == 0
+        assert s1["ratings"]["count"] == 2 and s1["ratings"]["sum"] == 6
+        assert s2["ratings"]["count"] == 1
+        print("✅ Rating recorded mid-rebuild survives it")
@@ -0,0 +1,159 @@
+"""
+Test Suite for WebSocket outbound queues
+Tests:
+1. Frames are delivered in order
+2. Newer BID_UPDATE frames supersede unsent older ones (last value wins)
+3. Queue overflow and slow sends evict the socket
+4. A held queue sends the initial frames first, then what was buffered meanwhile
+5. Bid updates are encoded once and spliced per status; each subscriber
+   gets the frame for its own status
+"""
+import os
+import sys
+import json
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.ws_outbound import OutboundQueue, bid_status_targets, coalesce_key_for, status_frames
+
+
+class FakeWebSocket:
+    """Records frames; can be gated to simulate a client that is behind"""
+
+    def __init__(self, delay: float = 0.0):
+        self.frames = []
+        self.delay = delay
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send_text(self, frame):
+        await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(frame)
+
+
+class TestOutboundQueue:
+
+    def test_frames_delivered_in_order(self):
+        async def scenario():
+            ws = FakeWebSocket()
+            queue = OutboundQueue(ws, on_dead=lambda w, r: None)
+            for n in range(5):
+                queue.enqueue(f"frame-{n}")
+            await asyncio.sleep(0.05)
+            queue.close()
+            return ws.frames
+
+        assert asyncio.run(scenario()) == [f"frame-{n}" for n in range(5)]
+        print("✅ Frames delivered in order")
+
+    def test_bid_updates_coalesce_last_value_wins(self):
+        async def scenario():
+            ws = FakeWebSocket()
+            ws.gate.clear()  # Client is behind: nothing can be sent yet
+            queue = OutboundQueue(ws, on_dead=lambda w, r: None)
+            key = coalesce_key_for({"type": "BID_UPDATE"}, "listing-1")
+
+            queue.enqueue("chat-1")
+            for price in range(100, 150):
+                queue.enqueue(f"bid-{price}", coalesce_key=key)
+            queue.enqueue("chat-2")
+            depth_while_blocked = queue.depth
+
+            ws.gate.set()
+            await asyncio.sleep(0.05)
+            queue.close()
+            return depth_while_blocked, ws.frames
+
+        depth, frames = asyncio.run(scenario())
+        # The first frame may already be in flight; the 50 bids collapse into one slot
+        assert depth <= 3
+        assert frames == ["chat-1", "bid-149", "chat-2"]
+        print("✅ 50 BID_UPDATE frames coalesced into the latest one")
+
+    def test_non_coalesced_types_have_no_key(self):
+        assert coalesce_key_for({"type": "BUY_NOW_PURCHASE"}, "listing-1") is None
+        assert coalesce_key_for({"type": "TIME_EXTENSION", "lot_number": 2}, "a") == ("TIME_EXTENSION", "a", 2)
+        print("✅ Only BID_UPDATE / TIME_EXTENSION coalesce")
+
+    def test_overflow_evicts_socket(self):
+        async def scenario():
+            ws = FakeWebSocket()
+            ws.gate.clear()
+            evicted = []
+            queue = OutboundQueue(ws, on_dead=lambda w, r: evicted.append(r), max_frames=3)
+            results = [queue.enqueue(f"frame-{n}") for n in range(6)]
+            await asyncio.sleep(0)
+            return results, evicted, queue.closed
+
+        results, evicted, closed = asyncio.run(scenario())
+        assert closed
+        assert evicted == ["outbound queue full"]
+        assert results.count(False) >= 1
+        print("✅ Overflowing queue evicts the slow consumer")
+
+    def test_held_queue_sends_initial_state_first(self):
+        """A bid landing while INITIAL_STATE is being built is delivered after it, never before"""
+        async def scenario():
+            ws = FakeWebSocket()
+            queue = OutboundQueue(ws, on_dead=lambda w, r: None, held=True)
+            key = coalesce_key_for({"type": "BID_UPDATE"}, "listing-1")
+            queue.enqueue("bid-105", coalesce_key=key)
+            queue.enqueue("bid-110", coalesce_key=key)
+            await asyncio.sleep(0.02)
+            sent_while_held = list(ws.frames)
+
+            queue.release(["connected", "initial-state"])
+            queue.enqueue("pong")
+            await asyncio.sleep(0.05)
+            queue.close()
+            return sent_while_held, ws.frames
+
+        sent_while_held, frames = asyncio.run(scenario())
+        assert sent_while_held == []
+        assert frames == ["connected", "initial-state", "bid-110", "pong"]
+        print("✅ Initial state precedes buffered bid updates")
+
+    def test_send_timeout_evicts_socket(self):
+        async def scenario():
+            ws = FakeWebSocket(delay=0.5)
+            evicted = []
+            queue = OutboundQueue(ws, on_dead=lambda w, r: evicted.append(r), send_timeout=0.05)
+            queue.enqueue("frame")
+            await asyncio.sleep(0.2)
+            return evicted, queue.closed
+
+        evicted, closed = asyncio.run(scenario())
+        assert closed
+        assert evicted and evicted[0].startswith("send failed")
+        print("✅ Send timeout evicts the slow consumer")
+
+
+class TestBidStatusFrames:
+
+    def test_spliced_frames_are_valid_json(self):
+        message = {"type": "BID_UPDATE", "listing_id": "l1", "current_price": 125.0,
+                   "bid_data": {"bidder_id": "u1", "note": 'quote " and }'}}
+        frames = status_frames(message)
+
+        assert set(frames) == {"LEADING", "OUTBID", "VIEWER"}
+        for status, frame in frames.items():
+            decoded = json.loads(frame)
+            assert decoded == {**message, "bid_status": status}
+            assert list(decoded)[-1] == "bid_status"
+        assert json.loads(status_frames({}, ["VIEWER"])["VIEWER"]) == {"bid_status": "VIEWER"}
+        print("✅ One encode, three valid frames")
+
+    def test_each_subscriber_gets_its_status(self):
+        frames = status_frames({"type": "BID_UPDATE", "listing_id": "l1"})
+        leader, rival, anonymous = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        viewers = {"u1": leader, "u2": rival}
+
+        targets = bid_status_targets(viewers, [leader, rival, anonymous], "u1", frames)
+
+        statuses = {id(ws): json.loads(frame)["bid_status"] for ws, frame in targets}
+        assert len(targets) == 3
+        assert statuses == {id(leader): "LEADING", id(rival): "OUTBID", id(anonymous): "VIEWER"}
+        print("✅ Leader, outbid viewer and anonymous viewer each get their frame")